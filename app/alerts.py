@@ -4,14 +4,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import sqlite3
 
 try:  # pragma: no cover - runtime import guard
-    from app.db import get_connection
+    from app.db import get_change_cursor, get_connection
 except ModuleNotFoundError:  # pragma: no cover
-    from db import get_connection
+    from db import get_change_cursor, get_connection
 
 
 @dataclass(frozen=True)
@@ -41,6 +41,16 @@ class AlertChip:
         return f"{prefix}:{start}..{end}"
 
 
+@dataclass(frozen=True)
+class _AlertSource:
+    """Table, date column and extra filter a category is counted from."""
+
+    category_key: str
+    table: str
+    column: str
+    extra_where: str = ""
+
+
 class AlertsScanner:
     """Scans the database for upcoming events within given timeframes."""
 
@@ -71,15 +81,12 @@ class AlertsScanner:
             ),
             "label": "Tebligat",
         },
+        # Vadeler taksitlerdedir; eski sürümlerin ``odeme_plani.vade_tarihi``
+        # sütunu güncellenmez ve change_log'a yazmadığı için önbelleği de bozar.
         "payment": {
-            "tables": (
-                {"table": "odeme_plani", "columns": ("vade_tarihi",)},
-                {
-                    "table": "taksitler",
-                    "columns": ("vade_tarihi",),
-                    "extra_where": "AND (odeme_tarihi IS NULL OR TRIM(odeme_tarihi) = '')",
-                },
-            ),
+            "table": "taksitler",
+            "columns": ("vade_tarihi",),
+            "extra_where": "AND (odeme_tarihi IS NULL OR TRIM(odeme_tarihi) = '')",
             "label": "Ödeme",
         },
         "mediation": {
@@ -95,142 +102,145 @@ class AlertsScanner:
 
     def __init__(self) -> None:
         self._table_columns_cache: Dict[str, Tuple[str, ...]] = {}
+        self._sources: Optional[List[_AlertSource]] = None
+        self._cache_key: Optional[Tuple[date, int]] = None
+        self._cached_chips: List[AlertChip] = []
 
     def scan(self, *, reference_date: Optional[date] = None) -> List[AlertChip]:
-        """Return alert chips for upcoming events."""
+        """Return alert chips for upcoming events.
+
+        All timeframes are counted with one query per table. The result is
+        cached by reference date and change-log cursor, so repeated scans
+        without intervening writes do not touch the tables.
+        """
 
         today = reference_date or date.today()
-        chips: List[AlertChip] = []
+        cache_key = (today, get_change_cursor())
+        if cache_key == self._cache_key:
+            return list(self._cached_chips)
 
-        conn = get_connection()
-        try:
-            for timeframe_key, timeframe_label, offsets in self._TIMEFRAMES:
-                start = today + timedelta(days=offsets[0])
-                end = today + timedelta(days=offsets[1])
-                if end < start:
-                    continue
-                for category_key in self._CATEGORY_ORDER:
-                    config = self._CATEGORY_CONFIG.get(category_key)
-                    if not config:
-                        continue
-                    count = self._count_for_category(conn, config, start, end)
-                    if count <= 0:
-                        continue
-                    label = str(config.get("label", category_key.title()))
-                    chips.append(
-                        AlertChip(
-                            timeframe_key=timeframe_key,
-                            timeframe_label=timeframe_label,
-                            category_key=category_key,
-                            category_label=label,
-                            count=int(count),
-                            start_date=start,
-                            end_date=end,
+        windows: List[Tuple[str, str, date, date]] = []
+        for timeframe_key, timeframe_label, offsets in self._TIMEFRAMES:
+            start = today + timedelta(days=offsets[0])
+            end = today + timedelta(days=offsets[1])
+            if end < start:
+                continue
+            windows.append((timeframe_key, timeframe_label, start, end))
+
+        chips: List[AlertChip] = []
+        if windows:
+            conn = get_connection()
+            try:
+                if self._sources is None:
+                    self._sources = self._resolve_sources(conn)
+                for source in self._sources:
+                    counts = self._count_windows(conn, source, windows)
+                    label = str(
+                        self._CATEGORY_CONFIG[source.category_key].get(
+                            "label", source.category_key.title()
                         )
                     )
-        finally:
-            conn.close()
+                    for (timeframe_key, timeframe_label, start, end), count in zip(
+                        windows, counts
+                    ):
+                        if count <= 0:
+                            continue
+                        chips.append(
+                            AlertChip(
+                                timeframe_key=timeframe_key,
+                                timeframe_label=timeframe_label,
+                                category_key=source.category_key,
+                                category_label=label,
+                                count=count,
+                                start_date=start,
+                                end_date=end,
+                            )
+                        )
+            finally:
+                conn.close()
 
         chips.sort(key=self._chip_sort_key)
-        return chips
+        self._cache_key = cache_key
+        self._cached_chips = chips
+        return list(chips)
+
+    def invalidate(self) -> None:
+        """Drop the cached chips and the resolved table/column mapping."""
+
+        self._table_columns_cache.clear()
+        self._sources = None
+        self._cache_key = None
+        self._cached_chips = []
 
     def _chip_sort_key(self, chip: AlertChip) -> Tuple[int, int, str]:
         timeframe_index = self._TIMEFRAME_ORDER.index(chip.timeframe_key)
         category_index = self._CATEGORY_ORDER.index(chip.category_key)
         return (timeframe_index, category_index, chip.category_label)
 
-    def _count_for_category(
+    def _count_windows(
         self,
         conn: sqlite3.Connection,
-        config: Dict[str, object],
-        start: date,
-        end: date,
-    ) -> int:
-        table_entry = config.get("table")
-        if isinstance(table_entry, str):
-            count = self._count_in_table(
-                conn,
-                table_entry,
-                tuple(config.get("columns", ())),
-                start,
-                end,
-                extra_where=str(config.get("extra_where", "")),
+        source: _AlertSource,
+        windows: Sequence[Tuple[str, str, date, date]],
+    ) -> List[int]:
+        """Count every timeframe for ``source`` in a single query.
+
+        Half-open text ranges replace ``DATE(column) BETWEEN`` so the date
+        index stays usable; values with a time part ("2024-03-05 10:00")
+        still land on their day.
+        """
+
+        column_expr = f'"{source.column}"'
+        select_parts: List[str] = []
+        params: List[str] = []
+        for _key, _label, start, end in windows:
+            select_parts.append(
+                f"COALESCE(SUM({column_expr} >= ? AND {column_expr} < ?), 0)"
             )
-            return count if count >= 0 else 0
-
-        tables = config.get("tables")
-        if isinstance(tables, Iterable):
-            for entry in tables:
-                if not isinstance(entry, dict):
-                    continue
-                table_name = entry.get("table")
-                columns = tuple(entry.get("columns", ()))
-                extra_where = str(entry.get("extra_where", ""))
-                if not table_name:
-                    continue
-                count = self._count_in_table(
-                    conn,
-                    str(table_name),
-                    columns,
-                    start,
-                    end,
-                    extra_where=extra_where,
-                )
-                if count >= 0:
-                    return count
-        return 0
-
-    def _count_in_table(
-        self,
-        conn: sqlite3.Connection,
-        table_name: str,
-        columns: Sequence[str],
-        start: date,
-        end: date,
-        *,
-        extra_where: str = "",
-    ) -> int:
-        if not self._table_exists(conn, table_name):
-            return -1
-        column = self._first_existing_column(conn, table_name, columns)
-        if column is None:
-            return -1
-        column_expr = f'"{column}"'
-        table_expr = f'"{table_name}"'
-        where_clauses = [f"{column_expr} IS NOT NULL", f"DATE({column_expr}) BETWEEN ? AND ?"]
-        extra = extra_where.strip()
-        available = self._get_columns(conn, table_name)
-        if extra and "is_archived" in extra and "is_archived" not in available:
-            extra = ""
-        if extra and "odeme_tarihi" in extra and "odeme_tarihi" not in available:
-            extra = ""
-        if extra:
-            if extra.upper().startswith("AND "):
-                where_clauses.append(extra[4:])
-            else:
-                where_clauses.append(extra)
-        where_sql = " AND ".join(where_clauses)
-        query = f"SELECT COUNT(*) FROM {table_expr} WHERE {where_sql}"
-        cur = conn.cursor()
+            params.extend((start.isoformat(), (end + timedelta(days=1)).isoformat()))
+        window_start = min(window[2] for window in windows)
+        window_end = max(window[3] for window in windows) + timedelta(days=1)
+        where_sql = f"{column_expr} >= ? AND {column_expr} < ?"
+        params.extend((window_start.isoformat(), window_end.isoformat()))
+        if source.extra_where:
+            where_sql += f" AND {source.extra_where}"
+        query = (
+            f"SELECT {', '.join(select_parts)} "
+            f'FROM "{source.table}" WHERE {where_sql}'
+        )
         try:
-            cur.execute(query, (start.isoformat(), end.isoformat()))
+            row = conn.execute(query, params).fetchone()
         except sqlite3.OperationalError:
-            return -1
-        row = cur.fetchone()
+            return [0] * len(windows)
         if not row:
-            return 0
-        try:
-            return int(row[0] or 0)
-        except (TypeError, ValueError):
-            return 0
+            return [0] * len(windows)
+        return [int(value or 0) for value in row]
+
+    def _resolve_sources(self, conn: sqlite3.Connection) -> List[_AlertSource]:
+        """Pick the table and date column for each category once."""
 
-    def _table_exists(self, conn: sqlite3.Connection, table_name: str) -> bool:
         cur = conn.cursor()
-        cur.execute(
-            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=? LIMIT 1",
-            (table_name,),
-        )
-        return cur.fetchone() is not None
+        cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        existing = {row[0] for row in cur.fetchall()}
+
+        sources: List[_AlertSource] = []
+        for category_key in self._CATEGORY_ORDER:
+            config = self._CATEGORY_CONFIG.get(category_key)
+            if not config:
+                continue
+            table_name = str(config.get("table") or "")
+            if not table_name or table_name not in existing:
+                continue
+            column = self._first_existing_column(
+                conn, table_name, tuple(config.get("columns", ()))
+            )
+            if column is None:
+                continue
+            extra = str(config.get("extra_where", "")).strip()
+            if extra.upper().startswith("AND "):
+                extra = extra[4:]
+            sources.append(_AlertSource(category_key, table_name, column, extra))
+        return sources
 
     def _first_existing_column(
         self,
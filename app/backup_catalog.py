@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Yedek kataloğu: yedek dizinindeki dosyaların önbelleğe alınmış bilgileri.
+
+Yedek listesi eskiden her açılışta her dosyanın başlığını okuyor, düz
+yedekleri açıp satır saydırıyor, doğrulama da şifre çözüp
+``integrity_check`` çalıştırıyordu. Katalog (``yedek_katalogu.json``) her
+yedek için oluşturulduğu anda bilinenleri saklar:
+
+* tür, dosya boyutu ve (anlık görüntülerde) veritabanı boyutu,
+* dosyanın SHA-256 özeti,
+* satır sayıları ve şema özeti,
+* son doğrulama sonucu ve zamanı.
+
+Kayıt, dosyanın boyutu ve değişiklik zamanı kayıttakiyle aynıysa geçerlidir;
+katalogda olmayan dosyanın bilgisini çağıran üretip kaydeder. Kataloğa
+girdikten sonra değişen bir yedeğin ilk özeti korunur: içerik aynıysa
+(ör. kopyalama mtime'ı değiştirdiyse) kayıt yenilenir, değilse yedek
+geçersiz işaretlenir. Liste böylece yedek başına tek bir ``stat`` ile
+oluşturulur.
+Özetler arka planda, eskiyen kayıtlardan başlayarak tembelce yeniden
+denetlenir (bkz. ``db.verify_backup_catalog``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CATALOG_FILENAME = "yedek_katalogu.json"
+CATALOG_FORMAT = "TAKIBI_BACKUP_CATALOG_V1"
+CHECKSUM_BLOCK_SIZE = 1024 * 1024
+CHANGED_MESSAGE = "Yedek dosyası oluşturulduktan sonra değişmiş (özet uyuşmuyor)."
+
+# Okuma-değiştirme-yazma adımları aynı anda çalışmamalı
+_CATALOG_LOCK = threading.Lock()
+# Katalog yolu -> ((boyut, mtime_ns), kayıtlar); dosya değişmedikçe yeniden okunmaz
+_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Dict[str, Any]]]] = {}
+
+
+def file_checksum(path: str) -> str:
+    """Dosyanın SHA-256 özetini (hex) döndür."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(CHECKSUM_BLOCK_SIZE)
+            if not block:
+                return digest.hexdigest()
+            digest.update(block)
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class BackupCatalog:
+    """``root`` dizinindeki yedeklerin kataloğu (dosya adına göre)."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.path = os.path.join(root, CATALOG_FILENAME)
+
+    # --- Depolama ---
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Kayıtları döndür; çağıran değiştirmeden önce kopyalamalıdır."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return {}
+        key = (st.st_size, st.st_mtime_ns)
+        cached = _CACHE.get(self.path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # Bozuk katalog yok sayılır; kayıtlar yedeklerden yeniden üretilir
+            return {}
+        entries = data.get("entries", {}) if data.get("format") == CATALOG_FORMAT else {}
+        _CACHE[self.path] = (key, entries)
+        return entries
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"format": CATALOG_FORMAT, "entries": entries}, f, separators=(', ', ': '))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        st = os.stat(self.path)
+        _CACHE[self.path] = ((st.st_size, st.st_mtime_ns), entries)
+
+    def _name(self, backup_path: str) -> Optional[str]:
+        """Katalogdaki anahtar; yedek bu dizinde değilse None."""
+        directory, name = os.path.split(os.path.abspath(backup_path))
+        if os.path.normcase(directory) != os.path.normcase(os.path.abspath(self.root)):
+            return None
+        return name
+
+    # --- Kayıtlar ---
+
+    def lookup(self, backup_path: str, stat: Optional[os.stat_result] = None) -> Optional[Dict[str, Any]]:
+        """
+        Yedeğin güncel kaydını döndür.
+
+        Dosya katalogda yoksa, bu dizinde değilse ya da kayıttan sonra
+        değiştiyse (boyut veya değişiklik zamanı farklı) None döner.
+        """
+        name = self._name(backup_path)
+        if name is None:
+            return None
+        entry = self._load().get(name)
+        if entry is None:
+            return None
+        try:
+            st = stat or os.stat(backup_path)
+        except OSError:
+            return None
+        if entry.get("file_size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+            return None
+        return dict(entry)
+
+    def recorded(self, backup_path: str) -> Optional[Dict[str, Any]]:
+        """Yedeğin kaydını dosya sonradan değişmiş olsa da döndür; kayıt yoksa None."""
+        name = self._name(backup_path)
+        entry = self._load().get(name) if name else None
+        return dict(entry) if entry is not None else None
+
+    def record(self, backup_path: str, checksum: Optional[str] = None, **fields: Any) -> Optional[Dict[str, Any]]:
+        """
+        Yedeğin bilgilerini kaydet (önceki kaydın yerine geçer).
+
+        Args:
+            backup_path: Yedek dosyası (bu dizinde olmalı)
+            checksum: Dosyanın SHA-256 özeti (None ise hesaplanır)
+            **fields: ``type``, ``size``, ``counts``, ``schema``, ``encrypted``,
+                ``validation`` gibi alanlar
+
+        Returns:
+            Kaydedilen kayıt veya yedek bu dizinde değilse None
+        """
+        name = self._name(backup_path)
+        if name is None:
+            return None
+        st = os.stat(backup_path)
+        entry = dict(fields)
+        entry.update(
+            file_size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            checksum=checksum or file_checksum(backup_path),
+            recorded_at=_now(),
+        )
+        entry.setdefault("validation", None)
+        with _CATALOG_LOCK:
+            entries = dict(self._load())
+            entries[name] = entry
+            self._save(entries)
+        return dict(entry)
+
+    def record_validation(self, backup_path: str, is_valid: bool, message: str) -> None:
+        """Katalogdaki yedeğin doğrulama sonucunu kaydet."""
+        name = self._name(backup_path)
+        if name is None:
+            return
+        with _CATALOG_LOCK:
+            entries = dict(self._load())
+            if name not in entries:
+                return
+            entries[name] = dict(entries[name], validation={
+                "ok": bool(is_valid),
+                "message": message,
+                "checked_at": _now(),
+            })
+            self._save(entries)
+
+    def forget(self, *backup_paths: str) -> None:
+        """Silinen yedeklerin kayıtlarını kaldır."""
+        names = {self._name(path) for path in backup_paths} - {None}
+        with _CATALOG_LOCK:
+            entries = self._load()
+            if not names & entries.keys():
+                return
+            self._save({name: entry for name, entry in entries.items() if name not in names})
+
+    def prune(self, existing: Iterable[str]) -> int:
+        """Artık dizinde olmayan dosyaların kayıtlarını kaldır; kaldırılan sayıyı döndür."""
+        keep = set(existing)
+        with _CATALOG_LOCK:
+            entries = self._load()
+            stale = entries.keys() - keep
+            if stale:
+                self._save({name: entry for name, entry in entries.items() if name in keep})
+            return len(stale)
+
+    def pending_checks(self, max_age: timedelta, limit: Optional[int] = None) -> List[str]:
+        """
+        Yeniden denetlenmesi gereken yedeklerin yolları.
+
+        Hiç doğrulanmamış kayıtlar önce, ardından son denetimi ``max_age``'den
+        eski olanlar en eskiden başlayarak sıralanır.
+        """
+        threshold = (datetime.now() - max_age).isoformat(timespec="seconds")
+        pending = []
+        for name, entry in self._load().items():
+            validation = entry.get("validation")
+            checked_at = validation["checked_at"] if validation else ""
+            if checked_at <= threshold:
+                pending.append((checked_at, name))
+        pending.sort()
+        return [os.path.join(self.root, name) for _, name in pending[:limit]]
+
+    def verify_checksum(self, backup_path: str) -> Tuple[bool, str]:
+        """Dosyanın özetini yeniden hesaplayıp kayıttakiyle karşılaştır."""
+        name = self._name(backup_path)
+        entry = self._load().get(name) if name else None
+        if entry is None:
+            return False, "Yedek katalogda kayıtlı değil."
+        try:
+            checksum = file_checksum(backup_path)
+        except OSError as exc:
+            return False, f"Yedek dosyası okunamadı: {exc}"
+        if checksum != entry.get("checksum"):
+            return False, CHANGED_MESSAGE
+        return True, "Yedek özeti doğrulandı."
@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+"""
+Arka planda çalışan yedekleme zamanlayıcısı.
+
+Otomatik yedek eskiden ana pencere açılmadan önce GUI iş parçacığında
+alınıyordu; geri yükleme ve doğrulama da ``PRAGMA integrity_check`` ile
+tüm dosyayı arayüzü dondurarak tarıyordu. ``BackupScheduler`` tek bir işçi
+iş parçacığında sırayla çalışan bir iş kuyruğudur:
+
+* açılıştan ``startup_delay`` saniye sonra ve ardından her
+  ``interval_hours`` saatte bir otomatik yedek alır, ardından saklama
+  politikasını (``RetentionPolicy``) uygular,
+* arayüzden gelen yedekleme, doğrulama ve geri yükleme işlerini aynı
+  kuyrukta çalıştırır; işler birbiriyle çakışmaz (örneğin geri yükleme
+  sürerken otomatik yedek başlamaz),
+* her otomatik yedekten sonra yedek kataloğundaki birkaç yedeği tembelce
+  yeniden denetler (``db.verify_backup_catalog``),
+* her işin başlangıç, ilerleme ve sonuç olaylarını dinleyicilere
+  ``BackupEvent`` olarak bildirir.
+
+Dinleyiciler işçi iş parçacığında çağrılır; arayüz bunları bir Qt sinyaline
+aktararak GUI iş parçacığına taşır (bkz. ``workers.BackupEventBridge``).
+Modül Qt'ye bağımlı değildir.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, List, Optional
+
+try:  # pragma: no cover - runtime import guard
+    from app import db
+except ModuleNotFoundError:  # pragma: no cover
+    import db
+
+logger = logging.getLogger(__name__)
+
+# Otomatik yedekleme ayarlarının varsayılanları
+DEFAULT_INTERVAL_HOURS = 1
+STARTUP_DELAY_SECONDS = 5.0
+# İlerleme olayları en fazla bu sıklıkta yayınlanır
+PROGRESS_INTERVAL = 0.1
+
+STATE_STARTED = "started"
+STATE_PROGRESS = "progress"
+STATE_FINISHED = "finished"
+STATE_FAILED = "failed"
+
+_STOP = object()
+_WAKE = object()
+
+
+class BackupJobError(Exception):
+    """Arka plan işi kullanıcıya gösterilecek bir hatayla sonuçlandı."""
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Yedek saklama politikası (bkz. ``db.select_backups_to_keep``)."""
+
+    keep_count: int = 10
+    hourly: int = 24
+    daily: int = 7
+    weekly: int = 4
+
+
+@dataclass(frozen=True)
+class BackupEvent:
+    """Bir arka plan işinin durum bildirimi."""
+
+    job_id: int
+    kind: str
+    label: str
+    state: str
+    done: int = 0
+    total: int = 0
+    result: Any = None
+    error: Optional[str] = None
+
+
+class BackupFuture(Future):
+    """Kuyruğa eklenen işin sonucu; olaylarla eşleştirmek için ``job_id`` taşır."""
+
+    def __init__(self, job_id: int) -> None:
+        super().__init__()
+        self.job_id = job_id
+
+
+@dataclass
+class _Job:
+    job_id: int
+    kind: str
+    label: str
+    fn: Callable[[Callable[[int, int], None]], Any]
+    future: BackupFuture
+
+
+def load_schedule_settings(settings: Any) -> dict:
+    """
+    Zamanlayıcı ayarlarını ``QSettings`` benzeri bir nesneden okur.
+
+    Returns:
+        ``BackupScheduler.configure`` anahtar kelime argümanları
+    """
+    policy = RetentionPolicy(
+        keep_count=settings.value("backup/keep_count", RetentionPolicy.keep_count, type=int),
+        hourly=settings.value("backup/hourly", RetentionPolicy.hourly, type=int),
+        daily=settings.value("backup/daily", RetentionPolicy.daily, type=int),
+        weekly=settings.value("backup/weekly", RetentionPolicy.weekly, type=int),
+    )
+    return {
+        "auto_backup": settings.value("backup/auto_backup", True, type=bool),
+        "interval_hours": settings.value("backup/interval_hours", DEFAULT_INTERVAL_HOURS, type=int),
+        "policy": policy,
+    }
+
+
+def run_backup(
+    progress: Optional[Callable[[int, int], None]] = None,
+    policy: Optional[RetentionPolicy] = None,
+    validate: bool = False,
+) -> str:
+    """
+    Yedek alır, istenirse doğrular ve saklama politikasını uygular.
+
+    Args:
+        progress: ``(yapılan, toplam)`` ile çağrılan ilerleme bildirimi
+        policy: Yedekten sonra uygulanacak saklama politikası
+        validate: Alınan yedeği doğrula; geçersizse sil
+
+    Returns:
+        Yedek dosyasının yolu
+
+    Raises:
+        BackupJobError: Yedek alınamadı veya doğrulanamadı
+    """
+    backup_path = db.create_backup(progress=progress)
+    if not backup_path:
+        raise BackupJobError("Yedekleme oluşturulamadı.")
+
+    if validate:
+        is_valid, validation_msg = db.validate_backup_file(backup_path)
+        if not is_valid:
+            db.safe_delete_file(backup_path)
+            raise BackupJobError(
+                f"Yedekleme oluşturuldu ancak doğrulama başarısız:\n{validation_msg}\n\n"
+                "Yedek dosyası silindi."
+            )
+
+    if policy is not None:
+        db.apply_retention_policy(**asdict(policy))
+    return backup_path
+
+
+class BackupScheduler:
+    """Yedekleme işlerini tek bir işçi iş parçacığında sırayla çalıştırır."""
+
+    def __init__(
+        self,
+        *,
+        auto_backup: bool = True,
+        interval_hours: float = DEFAULT_INTERVAL_HOURS,
+        policy: Optional[RetentionPolicy] = None,
+        startup_delay: float = STARTUP_DELAY_SECONDS,
+    ) -> None:
+        self._auto_backup = auto_backup
+        self._interval = max(0.0, float(interval_hours)) * 3600
+        self._policy = policy or RetentionPolicy()
+        self._startup_delay = max(0.0, startup_delay)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._listeners: List[Callable[[BackupEvent], None]] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._next_due: Optional[float] = None
+        self._current: Optional[_Job] = None
+
+    # --- Yapılandırma ---
+
+    @property
+    def policy(self) -> RetentionPolicy:
+        return self._policy
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def busy(self) -> bool:
+        """Çalışan veya kuyrukta bekleyen bir iş var mı?"""
+        return self._current is not None or not self._queue.empty()
+
+    def configure(
+        self,
+        *,
+        auto_backup: Optional[bool] = None,
+        interval_hours: Optional[float] = None,
+        policy: Optional[RetentionPolicy] = None,
+    ) -> None:
+        """Ayarları değiştirir; bir sonraki otomatik yedeğin zamanı yeniden hesaplanır."""
+        with self._lock:
+            if auto_backup is not None:
+                self._auto_backup = auto_backup
+            if interval_hours is not None:
+                self._interval = max(0.0, float(interval_hours)) * 3600
+            if policy is not None:
+                self._policy = policy
+            if not self._auto_backup:
+                self._next_due = None
+            elif self._interval:
+                next_due = time.monotonic() + self._interval
+                if self._next_due is None or self._next_due > next_due:
+                    self._next_due = next_due
+        self._queue.put(_WAKE)
+
+    def add_listener(self, listener: Callable[[BackupEvent], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[BackupEvent], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    # --- Yaşam döngüsü ---
+
+    def start(self) -> None:
+        """İşçi iş parçacığını başlatır; açılış yedeği ``startup_delay`` sonra alınır."""
+        if self.is_running:
+            return
+        with self._lock:
+            self._stopping = False
+            self._next_due = (
+                time.monotonic() + self._startup_delay if self._auto_backup else None
+            )
+        self._thread = threading.Thread(target=self._run, name="backup-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 30.0) -> bool:
+        """
+        Zamanlayıcıyı durdurur.
+
+        Çalışan iş tamamlanana kadar (en fazla ``timeout`` saniye) beklenir;
+        kuyrukta bekleyen işler iptal edilir.
+
+        Returns:
+            İşçi iş parçacığı durduysa True
+        """
+        thread = self._thread
+        if thread is None:
+            return True
+        self._stopping = True
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Yedekleme işi %s saniyede bitmedi", timeout)
+            return False
+        self._thread = None
+        return True
+
+    # --- İşler ---
+
+    def submit(
+        self, kind: str, label: str, fn: Callable[[Callable[[int, int], None]], Any]
+    ) -> BackupFuture:
+        """
+        İşi kuyruğa ekler.
+
+        Args:
+            kind: İş türü ("backup", "verify", "restore" ...)
+            label: Kullanıcıya gösterilecek açıklama
+            fn: ``progress(yapılan, toplam)`` alan ve sonucu döndüren fonksiyon
+
+        Returns:
+            İşin sonucunu taşıyan ``Future`` (``result`` veya ``exception``)
+        """
+        job_id = next(self._ids)
+        job = _Job(job_id, kind, label, fn, BackupFuture(job_id))
+        if self._stopping:
+            job.future.cancel()
+            return job.future
+        self._queue.put(job)
+        return job.future
+
+    def backup_now(self, validate: bool = True) -> BackupFuture:
+        """Elle yedek alma işini kuyruğa ekler; sonuç yedek dosyasının yoludur."""
+        return self.submit(
+            "backup",
+            "Yedekleme",
+            lambda progress: run_backup(progress, self._policy, validate=validate),
+        )
+
+    def _scheduled_backup(self) -> _Job:
+        job_id = next(self._ids)
+        return _Job(
+            job_id,
+            "backup",
+            "Otomatik yedekleme",
+            lambda progress: run_backup(progress, self._policy),
+            BackupFuture(job_id),
+        )
+
+    def _catalog_check(self) -> _Job:
+        job_id = next(self._ids)
+        return _Job(
+            job_id,
+            "verify",
+            "Yedekler denetleniyor",
+            lambda progress: db.verify_backup_catalog(progress),
+            BackupFuture(job_id),
+        )
+
+    # --- İşçi ---
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                due = self._next_due
+            timeout = None if due is None else max(0.0, due - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._execute(self._scheduled_backup())
+                item = self._catalog_check()
+
+            if item is _STOP:
+                break
+            if item is _WAKE:
+                continue
+            if self._stopping:
+                item.future.cancel()
+                continue
+            self._execute(item)
+
+        # Durdurulurken kuyrukta kalan işler çalıştırılmaz
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _Job):
+                item.future.cancel()
+
+    def _execute(self, job: _Job) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return
+        self._current = job
+        self._emit(BackupEvent(job.job_id, job.kind, job.label, STATE_STARTED))
+        last_emit = 0.0
+
+        def progress(done: int, total: int) -> None:
+            nonlocal last_emit
+            now = time.monotonic()
+            if done >= total or now - last_emit >= PROGRESS_INTERVAL:
+                last_emit = now
+                self._emit(
+                    BackupEvent(job.job_id, job.kind, job.label, STATE_PROGRESS, done, total)
+                )
+
+        try:
+            result = job.fn(progress)
+        except Exception as exc:
+            if not isinstance(exc, BackupJobError):
+                logger.exception("Yedekleme işi başarısız: %s", job.label)
+            job.future.set_exception(exc)
+            self._emit(BackupEvent(job.job_id, job.kind, job.label, STATE_FAILED, error=str(exc)))
+        else:
+            job.future.set_result(result)
+            self._emit(BackupEvent(job.job_id, job.kind, job.label, STATE_FINISHED, result=result))
+        finally:
+            self._current = None
+            if job.kind == "backup":
+                # Elle alınan yedek de bir sonraki otomatik yedeği erteler
+                with self._lock:
+                    if self._auto_backup and self._interval:
+                        self._next_due = time.monotonic() + self._interval
+                    elif self._next_due is not None and self._next_due <= time.monotonic():
+                        self._next_due = None
+
+    def _emit(self, event: BackupEvent) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:  # pragma: no cover - dinleyici hatası işi bozmamalı
+                logger.exception("Yedekleme olayı dinleyicisi hata verdi")
+
+
+_SCHEDULER: Optional[BackupScheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_backup_scheduler() -> BackupScheduler:
+    """Uygulama genelinde paylaşılan zamanlayıcıyı döndürür (başlatılmamış olabilir)."""
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = BackupScheduler()
+        return _SCHEDULER
@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+"""
+Artımlı, tekilleştirilmiş yedek deposu.
+
+Her otomatik yedek eskiden veritabanının tam bir kopyasıydı; ``keep_count``
+kopya, veritabanı boyutu kadar diskin katları ve her açılışta tam bir
+kopyalama + şifreleme demekti. ``SnapshotStore`` veritabanını sayfa sınırına
+hizalı ``CHUNK_SIZE``'lık parçalara böler ve her parçayı içeriğinden türeyen
+kimliğiyle (içerik adresli) bir kez saklar:
+
+* ``parcalar/ab/abcd...``: zlib ile sıkıştırılmış, anahtar varsa AES-256-GCM
+  ile şifrelenmiş parça. Kimlik, düz içeriğin anahtarlı HMAC-SHA256'sıdır;
+  aynı içerik aynı kimliğe (ve aynı şifreli metne) düşer, parça okunurken
+  kimlik yeniden hesaplanarak bütünlük doğrulanır.
+* ``data_backup_<zaman>.snap``: anlık görüntünün manifesti (JSON); boyut,
+  parça kimlikleri sırası, kaynak dosyanın parmak izi, satır sayıları ve
+  şema özeti.
+
+Değişmemiş bir veritabanının anlık görüntüsü, kaynak dosyanın parmak izi
+önceki manifestinkiyle aynıysa dosya okunmadan önceki parça listesiyle
+yazılır. Değişen veritabanında dosya okunur ama yalnızca yeni parçalar
+diske yazılır. Manifesti silinen anlık görüntülerin parçaları
+``collect_garbage`` ile temizlenir.
+
+Tutarlılık: kaynak dosya SQLite'a uğramadan okunur. Okuma süresince açık
+tutulan okuma işlemi, rollback journal kipinde yazıcıları, WAL kipinde
+(WAL boşken başlatıldığı için) checkpoint'lerin ana dosyaya yazmasını
+engeller; WAL kipinde yazıcılar çalışmaya devam eder.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+SNAPSHOT_FORMAT = "TAKIBI_SNAPSHOT_V1"
+SNAPSHOT_PREFIX = "data_backup_"
+SNAPSHOT_SUFFIX = ".snap"
+CHUNK_DIRNAME = "parcalar"
+CHUNK_SIZE = 64 * 1024  # SQLite sayfa boyutlarının (512-65536) katı
+COMPRESS_LEVEL = 1
+SNAPSHOT_RETRIES = 5
+# Manifestte satır sayısı kaydedilen tablolar (yedek listesinde gösterilir)
+COUNTED_TABLES = ("dosyalar", "users")
+
+_NONCE_SIZE = 12
+# Parça yazma ile çöp toplama aynı anda çalışmamalı
+_STORE_LOCK = threading.Lock()
+
+
+class SnapshotError(Exception):
+    """Anlık görüntü alınamadı, okunamadı veya bozuk."""
+
+
+def is_snapshot_manifest(path: str) -> bool:
+    """Dosyanın bir anlık görüntü manifesti olup olmadığını kontrol et."""
+    if not path.endswith(SNAPSHOT_SUFFIX):
+        return False
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(64)
+    except OSError:
+        return False
+    return head.startswith(b'{"format": "' + SNAPSHOT_FORMAT.encode() + b'"')
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """Manifesti oku; geçersizse ``SnapshotError`` yükseltir."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as exc:
+        raise SnapshotError(f"Manifest okunamadı: {exc}") from exc
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise SnapshotError("Bilinmeyen manifest formatı")
+    return manifest
+
+
+def _file_fingerprint(path: str) -> Dict[str, int]:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+
+
+def _fsync_dir(path: str) -> None:
+    """Dizin girdilerini diske indir; dizin açılamayan platformlarda (Windows) atlanır."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _begin_stable_read(conn: sqlite3.Connection) -> None:
+    """
+    Ana dosyanın okuma boyunca değişmeyeceği bir okuma işlemi başlat.
+
+    WAL kipinde önce WAL ana dosyaya aktarılıp sıfırlanır; ``data_version``
+    checkpoint ile ``BEGIN`` arasında başka bir bağlantının yazmadığını
+    doğrular. Böylece işlem WAL boşken başlamıştır ve tüm sayfalar ana
+    dosyadan okunur.
+    """
+    wal = conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+    for attempt in range(SNAPSHOT_RETRIES):
+        before = conn.execute("PRAGMA data_version").fetchone()[0]
+        if wal:
+            busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+            if busy:
+                time.sleep(0.05 * (attempt + 1))
+                continue
+        conn.execute("BEGIN")
+        conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        if not wal or conn.execute("PRAGMA data_version").fetchone()[0] == before:
+            return
+        conn.execute("ROLLBACK")
+    raise SnapshotError("Veritabanı sürekli yazıldığı için anlık görüntü alınamadı")
+
+
+def table_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """``COUNTED_TABLES`` tablolarının satır sayıları (olmayan tablolar atlanır)."""
+    counts = {}
+    for table in COUNTED_TABLES:
+        try:
+            counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        except sqlite3.Error:
+            continue
+    return counts
+
+
+def schema_fingerprint(conn: sqlite3.Connection) -> Optional[str]:
+    """Şema sürümü: ``sqlite_master`` tanımlarının kısa özeti (şema değişince değişir)."""
+    try:
+        rows = conn.execute(
+            "SELECT type, name, sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY type, name"
+        ).fetchall()
+    except sqlite3.Error:
+        return None
+    return hashlib.sha256(json.dumps(rows).encode('utf-8')).hexdigest()[:16]
+
+
+class SnapshotStore:
+    """``root`` dizinindeki içerik adresli parça deposu ve anlık görüntü manifestleri."""
+
+    def __init__(self, root: str, keys: Optional[Tuple[bytes, bytes]] = None):
+        """
+        Args:
+            root: Yedek dizini (manifestler burada, parçalar ``parcalar/`` altında)
+            keys: (kimlik HMAC anahtarı, AES-GCM anahtarı); None ise parçalar
+                şifrelenmez ve kimlik düz SHA-256 olur
+        """
+        self.root = root
+        self.chunk_dir = os.path.join(root, CHUNK_DIRNAME)
+        self._id_key, self._enc_key = keys if keys else (None, None)
+
+    # --- Parçalar ---
+
+    def _chunk_id(self, data: bytes) -> str:
+        if self._id_key is None:
+            return hashlib.sha256(data).hexdigest()
+        return hmac.new(self._id_key, data, hashlib.sha256).hexdigest()
+
+    def _chunk_path(self, chunk_id: str) -> str:
+        return os.path.join(self.chunk_dir, chunk_id[:2], chunk_id)
+
+    def _put_chunk(self, data: bytes, dirty_dirs: Optional[set] = None) -> Tuple[str, int]:
+        """
+        Parçayı sakla; (kimlik, diske yeni yazılan bayt) döndürür.
+
+        Parça dosyası fsync edilir, dizini ``dirty_dirs``'e eklenir; manifest
+        yazılmadan önce bu dizinler de ``_sync_dirs`` ile diske indirilir.
+        Sıkıştırma ve şifreleme deterministik olduğundan mevcut bir parçanın
+        boyutu beklenen boyuttan farklıysa (çökme sonrası boş/yarım kalmış)
+        parça yeniden yazılır.
+        """
+        chunk_id = self._chunk_id(data)
+        path = self._chunk_path(chunk_id)
+
+        payload = zlib.compress(data, COMPRESS_LEVEL)
+        if self._enc_key is not None:
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+            # Nonce kimlikten türer: aynı nonce yalnızca aynı düz metinle kullanılır
+            raw_id = bytes.fromhex(chunk_id)
+            payload = AESGCM(self._enc_key).encrypt(raw_id[:_NONCE_SIZE], payload, raw_id)
+
+        try:
+            if os.path.getsize(path) == len(payload):
+                return chunk_id, 0
+        except OSError:
+            pass
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        if dirty_dirs is not None:
+            dirty_dirs.add(os.path.dirname(path))
+            dirty_dirs.add(self.chunk_dir)
+        return chunk_id, len(payload)
+
+    def _get_chunk(self, chunk_id: str) -> bytes:
+        """Parçayı oku, çöz ve kimliğini doğrula."""
+        try:
+            with open(self._chunk_path(chunk_id), 'rb') as f:
+                payload = f.read()
+        except OSError as exc:
+            raise SnapshotError(f"Yedek parçası eksik: {chunk_id[:12]}") from exc
+
+        try:
+            if self._enc_key is not None:
+                from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+                raw_id = bytes.fromhex(chunk_id)
+                payload = AESGCM(self._enc_key).decrypt(raw_id[:_NONCE_SIZE], payload, raw_id)
+            data = zlib.decompress(payload)
+        except Exception as exc:
+            raise SnapshotError(f"Yedek parçası bozuk: {chunk_id[:12]}") from exc
+        if not hmac.compare_digest(self._chunk_id(data), chunk_id):
+            raise SnapshotError(f"Yedek parçası bozuk: {chunk_id[:12]}")
+        return data
+
+    # --- Manifestler ---
+
+    def manifest_paths(self) -> List[str]:
+        """Manifest yolları, en eskiden yeniye."""
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(self.root, name)
+            for name in sorted(names)
+            if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)
+        ]
+
+    def _new_manifest_path(self, created_at: datetime) -> str:
+        stamp = created_at.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.root, f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}")
+        counter = 1
+        while os.path.exists(path):
+            path = os.path.join(self.root, f"{SNAPSHOT_PREFIX}{stamp}_{counter}{SNAPSHOT_SUFFIX}")
+            counter += 1
+        return path
+
+    def _latest_manifest(self) -> Optional[Dict[str, Any]]:
+        for path in reversed(self.manifest_paths()):
+            try:
+                return read_manifest(path)
+            except SnapshotError:
+                continue
+        return None
+
+    def _write_manifest(self, path: str, manifest: Dict[str, Any]) -> None:
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(', ', ': '))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        _fsync_dir(self.root)
+
+    @staticmethod
+    def _sync_dirs(dirs: Iterable[str]) -> None:
+        """Yeni parça girdilerini diske indir (alt dizinler üst dizinden önce)."""
+        for path in sorted(dirs, key=len, reverse=True):
+            _fsync_dir(path)
+
+    # --- Anlık görüntü ---
+
+    def snapshot(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        db_path: str,
+        read_blocks: Callable[[str, int], Iterable[bytes]],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Canlı veritabanının anlık görüntüsünü al.
+
+        Args:
+            connect: Canlı veritabanına yeni bir bağlantı açan fonksiyon
+            db_path: Veritabanı dosyası (parmak izi ve okuma için)
+            read_blocks: ``(yol, blok_boyutu)`` alıp dosyanın düz içeriğini
+                bloklar halinde üreten fonksiyon
+            progress: ``(okunan_bayt, toplam_bayt)`` ile çağrılır; toplam,
+                kaynak dosyanın diskteki boyutudur
+
+        Returns:
+            (manifest yolu, manifest)
+        """
+        os.makedirs(self.root, exist_ok=True)
+        started = time.perf_counter()
+        conn = connect()
+        conn.isolation_level = None
+        try:
+            _begin_stable_read(conn)
+            try:
+                fingerprint = _file_fingerprint(db_path)
+                counts = table_counts(conn)
+                schema = schema_fingerprint(conn)
+                with _STORE_LOCK:
+                    manifest = self._build_manifest(db_path, fingerprint, read_blocks, progress)
+                    manifest["counts"] = counts
+                    manifest["schema"] = schema
+                    manifest["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                    path = self._new_manifest_path(datetime.fromisoformat(manifest["created_at"]))
+                    self._write_manifest(path, manifest)
+            finally:
+                conn.execute("ROLLBACK")
+        finally:
+            conn.close()
+        return path, manifest
+
+    def _build_manifest(
+        self,
+        db_path: str,
+        fingerprint: Dict[str, int],
+        read_blocks: Callable[[str, int], Iterable[bytes]],
+        progress: Optional[Callable[[int, int], None]],
+    ) -> Dict[str, Any]:
+        manifest = {
+            "format": SNAPSHOT_FORMAT,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "encrypted": self._enc_key is not None,
+            "chunk_size": CHUNK_SIZE,
+        }
+
+        previous = self._latest_manifest()
+        if (
+            previous is not None
+            and previous.get("source") == fingerprint
+            and previous.get("chunk_size") == CHUNK_SIZE
+            and previous.get("encrypted") == manifest["encrypted"]
+        ):
+            # Kaynak dosya son anlık görüntüden beri değişmedi: okumadan aynı parçalar
+            manifest.update(size=previous["size"], chunks=previous["chunks"], new_bytes=0)
+        else:
+            size = new_bytes = 0
+            chunks = []
+            dirty_dirs: set = set()
+            for block in read_blocks(db_path, CHUNK_SIZE):
+                chunk_id, written = self._put_chunk(block, dirty_dirs)
+                chunks.append(chunk_id)
+                size += len(block)
+                new_bytes += written
+                if progress is not None:
+                    progress(min(size, fingerprint["size"]), fingerprint["size"])
+            # Manifest ancak işaret ettiği parçalar kalıcı olduktan sonra yazılır
+            self._sync_dirs(dirty_dirs)
+            manifest.update(size=size, chunks=chunks, new_bytes=new_bytes)
+
+        if progress is not None:
+            progress(manifest["size"], manifest["size"])
+        manifest["source"] = fingerprint
+        return manifest
+
+    def iter_snapshot(self, manifest_path: str) -> Iterator[bytes]:
+        """Anlık görüntünün düz içeriğini parça parça üret (her parça doğrulanır)."""
+        manifest = read_manifest(manifest_path)
+        for chunk_id in manifest["chunks"]:
+            yield self._get_chunk(chunk_id)
+
+    def export(self, manifest_path: str, dest_path: str) -> int:
+        """Anlık görüntüyü ``dest_path``'e düz SQLite dosyası olarak yaz; boyutu döndürür."""
+        written = 0
+        try:
+            with open(dest_path, 'wb') as f:
+                for data in self.iter_snapshot(manifest_path):
+                    f.write(data)
+                    written += len(data)
+        except BaseException:
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            raise
+        return written
+
+    def verify(self, manifest_path: str) -> Tuple[bool, str]:
+        """Manifestteki tüm parçaların mevcut ve sağlam olduğunu doğrula."""
+        try:
+            manifest = read_manifest(manifest_path)
+            if manifest["encrypted"] != (self._enc_key is not None):
+                return False, "Yedek bu anahtarla açılamıyor"
+            # Tekrarlanan parçalar (ör. boş sayfalar) bir kez okunur
+            sizes = {chunk_id: len(self._get_chunk(chunk_id)) for chunk_id in set(manifest["chunks"])}
+        except SnapshotError as exc:
+            return False, str(exc)
+        if sum(sizes[chunk_id] for chunk_id in manifest["chunks"]) != manifest["size"]:
+            return False, "Yedek boyutu manifestle uyuşmuyor"
+        return True, "Anlık görüntü yedeği geçerli."
+
+    def collect_garbage(self) -> Tuple[int, int]:
+        """
+        Hiçbir manifestin kullanmadığı parçaları sil.
+
+        Returns:
+            (silinen parça sayısı, boşaltılan bayt)
+        """
+        with _STORE_LOCK:
+            referenced = set()
+            for path in self.manifest_paths():
+                try:
+                    referenced.update(read_manifest(path)["chunks"])
+                except SnapshotError:
+                    # Okunamayan manifestin parçaları silinmez; bozuk manifest elle incelenmeli
+                    return 0, 0
+
+            removed = freed = 0
+            if not os.path.isdir(self.chunk_dir):
+                return 0, 0
+            for prefix in os.listdir(self.chunk_dir):
+                prefix_dir = os.path.join(self.chunk_dir, prefix)
+                for name in os.listdir(prefix_dir):
+                    if name in referenced:
+                        continue
+                    path = os.path.join(prefix_dir, name)
+                    try:
+                        freed += os.path.getsize(path)
+                        os.remove(path)
+                        removed += 1
+                    except OSError:
+                        continue
+            return removed, freed
+
+    def disk_usage(self) -> int:
+        """Parça deposunun diskte kapladığı toplam bayt."""
+        total = 0
+        for dirpath, _, filenames in os.walk(self.chunk_dir):
+            for name in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+        return total
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Dosya listesi sorgu motoru.
+
+``fetch_dosyalar_by_color_hex`` eskiden her çağrıda ``statuses`` tablosuyla
+üç kez ``TRIM`` join yapıp tüm satırları çekiyor, metin aramasını ise her
+kayıt için Python'da ``normalize_str`` ile yapıyordu. Bu modül aynı sonucu
+``dosya_ozet`` özet tablosu üzerinden tek SQL sorgusuyla üretir:
+
+* renk filtresi, renge karşılık gelen durum adlarına çevrilip indeksli
+  ``durum_key``/``durum_2_key``/``aktif_key`` sütunlarında aranır,
+* metin araması ``arama_fts`` FTS5 indeksinde önek sorgusu olarak yapılır;
+  indeks yoksa önceden katlanmış ``arama_metni`` üzerinde ``instr`` ile
+  SQLite içinde taranır,
+* statü renk/sahip bilgisi satır başına join yerine küçük ``statuses``
+  tablosundan bir kez okunan sözlükten eklenir.
+"""
+
+from __future__ import annotations
+
+import calendar
+import sqlite3
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+try:  # pragma: no cover - runtime import guard
+    from app.db import get_connection
+    from app.search import build_match_query, case_id_filter
+    from app.utils import fold_search_text, normalize_hex, resolve_owner_label
+except ModuleNotFoundError:  # pragma: no cover
+    from db import get_connection
+    from search import build_match_query, case_id_filter
+    from utils import fold_search_text, normalize_hex, resolve_owner_label
+
+
+StatusInfo = tuple[Optional[str], Optional[str]]
+
+# Sayfalı (keyset) okuma anahtarı: (büro takip no var mı, büro takip no, id).
+# NULL takip numaraları SQLite sıralamasında olduğu gibi en başta yer alır.
+CasePageKey = tuple[bool, Any, int]
+
+_EMPTY_STATUS: StatusInfo = (None, None)
+
+
+def durusma_period_range(
+    period: str | None, today: date | None = None
+) -> tuple[date, date] | None:
+    """``bu_hafta``/``gelecek_hafta``/``bu_ay`` dönemleri için tarih aralığı döndürür."""
+    if not period:
+        return None
+    today = today or date.today()
+    if period == "bu_hafta":
+        start = today - timedelta(days=today.weekday())
+        return start, start + timedelta(days=6)
+    if period == "gelecek_hafta":
+        start = today + timedelta(days=7 - today.weekday())
+        return start, start + timedelta(days=6)
+    if period == "bu_ay":
+        last_day = calendar.monthrange(today.year, today.month)[1]
+        return today.replace(day=1), today.replace(day=last_day)
+    return None
+
+
+def case_page_key(record: Dict[str, Any]) -> CasePageKey:
+    """Kaydın ``ORDER BY buro_takip_no, id`` sırasındaki keyset anahtarı."""
+    bn = record.get("buro_takip_no")
+    return (bn is not None, bn if bn is not None else 0, int(record["id"]))
+
+
+def load_status_map(conn: sqlite3.Connection) -> Dict[str, StatusInfo]:
+    """``TRIM(ad)`` -> (normalize renk, çözümlenmiş sahip) sözlüğü döndürür."""
+    status_map: Dict[str, StatusInfo] = {}
+    for name, color_hex, owner in conn.execute(
+        "SELECT ad, color_hex, owner FROM statuses"
+    ):
+        key = (name or "").strip()
+        if not key or key in status_map:
+            continue
+        status_map[key] = (
+            normalize_hex(color_hex),
+            resolve_owner_label(owner, color_hex),
+        )
+    return status_map
+
+
+def _existing_tables(conn: sqlite3.Connection) -> set[str]:
+    return {
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' "
+            "AND name IN ('dosya_durumlari', 'arama_fts')"
+        )
+    }
+
+
+def query_cases(
+    hex6: str | None = None,
+    search_text: str | None = None,
+    open_only: bool | None = None,
+    other_filters: Optional[Dict[str, Any]] = None,
+    archived: bool = False,
+    assigned_user_id: int | None = None,
+    conn: sqlite3.Connection | None = None,
+    ids: Optional[Iterable[int]] = None,
+    after: CasePageKey | None = None,
+    limit: int | None = None,
+) -> List[Dict[str, Any]]:
+    """Dosya kayıtlarını verilen filtrelere göre tek sorguyla döndürür.
+
+    Dönen kayıtlar ``dosyalar`` sütunlarına ek olarak ``aktif_durum``,
+    ``status_color``, ``dava_durumu_color``, ``tekrar_dava_durumu_2_color``,
+    ``dava_durumu_owner`` ve ``tekrar_dava_durumu_2_owner`` alanlarını içerir.
+    ``ids`` verilirse sonuç bu dosya kimlikleriyle sınırlanır (satır bazlı
+    yenileme için). ``after``/``limit`` ile ``buro_takip_no, id`` sırasında
+    keyset sayfalama yapılır (bkz. ``query_case_page``).
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        return _query_cases(
+            conn,
+            hex6,
+            search_text,
+            open_only,
+            other_filters,
+            archived,
+            assigned_user_id,
+            ids,
+            after,
+            limit,
+        )
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def _query_cases(
+    conn: sqlite3.Connection,
+    hex6: str | None,
+    search_text: str | None,
+    open_only: bool | None,
+    other_filters: Optional[Dict[str, Any]],
+    archived: bool,
+    assigned_user_id: int | None,
+    ids: Optional[Iterable[int]] = None,
+    after: CasePageKey | None = None,
+    limit: int | None = None,
+) -> List[Dict[str, Any]]:
+    id_list = sorted({int(value) for value in ids}) if ids is not None else None
+    if id_list is not None and not id_list:
+        return []
+    status_map = load_status_map(conn)
+    tables = _existing_tables(conn)
+    has_history = "dosya_durumlari" in tables
+
+    where_clauses: List[str] = ["d.is_archived = ?"]
+    params: List[Any] = [1 if archived else 0]
+
+    if id_list is not None:
+        # Özet tablonun birincil anahtarı: her iki join sırasında da indeksli
+        where_clauses.append(f"o.dosya_id IN ({', '.join('?' * len(id_list))})")
+        params.extend(id_list)
+
+    if has_history:
+        # Eski kurulumlardaki durum geçmişi: her dosyanın en son kaydı
+        select_aktif = "ls.aktif_durum AS aktif_durum"
+        aktif_key = "TRIM(ls.aktif_durum)"
+        join_history = """
+        LEFT JOIN (
+            SELECT dd.dosya_id, dd.durum AS aktif_durum, MAX(dd.created_at) AS max_ts
+            FROM dosya_durumlari dd
+            GROUP BY dd.dosya_id
+        ) ls ON ls.dosya_id = d.id
+        """
+    else:
+        select_aktif = (
+            "COALESCE(NULLIF(d.tekrar_dava_durumu_2,''), d.dava_durumu) AS aktif_durum"
+        )
+        aktif_key = "o.aktif_key"
+        join_history = ""
+
+    match_query = build_match_query(search_text) if "arama_fts" in tables else None
+    needle = "" if match_query else fold_search_text(search_text or "")
+
+    if hex6:
+        target = normalize_hex(hex6)
+        names = [name for name, (color, _) in status_map.items() if color == target]
+        if not names:
+            return []
+        placeholders = ", ".join("?" * len(names))
+        # Metin araması varsa eşleşen kümeden gidilir; tekli '+' durum
+        # indekslerini devre dışı bırakıp üç indeksli OR aramasını önler.
+        prefix = "+" if (match_query or needle) else ""
+        where_clauses.append(
+            f"({prefix}o.durum_key IN ({placeholders}) "
+            f"OR {prefix}o.durum_2_key IN ({placeholders}) "
+            f"OR {prefix}{aktif_key} IN ({placeholders}))"
+        )
+        params.extend(names * 3)
+
+    if assigned_user_id is not None:
+        where_clauses.append(
+            "EXISTS (SELECT 1 FROM dosya_atamalar da WHERE da.user_id = ? AND da.dosya_id = d.id)"
+        )
+        params.append(int(assigned_user_id))
+
+    if open_only and not archived:
+        where_clauses.append("o.kapali = 0")
+
+    if after is not None:
+        has_bn, bn, last_id = after
+        if has_bn:
+            # buro_takip_no UNIQUE: eşitlik durumu yok, indeks aralık taraması yeter
+            where_clauses.append("d.buro_takip_no > ?")
+            params.append(bn)
+        else:
+            where_clauses.append("(d.buro_takip_no IS NOT NULL OR d.id > ?)")
+            params.append(last_id)
+
+    period_range = durusma_period_range((other_filters or {}).get("durusma_period"))
+    if period_range:
+        where_clauses.append("d.durusma_tarihi BETWEEN ? AND ?")
+        params.extend(day.isoformat() for day in period_range)
+
+    if match_query:
+        fts_clause, fts_params = case_id_filter(match_query)
+        where_clauses.append(fts_clause)
+        params.extend(fts_params)
+        from_clause = "dosyalar d JOIN dosya_ozet o ON o.dosya_id = d.id"
+    elif needle:
+        where_clauses.append("instr(o.arama_metni, ?) > 0")
+        params.append(needle)
+        # Metin araması en seçici filtre: önce kompakt özet tablo taranır,
+        # eşleşen dosyalar birincil anahtarla okunur.
+        from_clause = "dosya_ozet o CROSS JOIN dosyalar d ON d.id = o.dosya_id"
+    else:
+        from_clause = "dosyalar d JOIN dosya_ozet o ON o.dosya_id = d.id"
+
+    sql = f"""
+        SELECT d.*, {select_aktif}
+        FROM {from_clause}
+        {join_history}
+        WHERE {" AND ".join(where_clauses)}
+        ORDER BY d.buro_takip_no, d.id
+    """
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(max(1, int(limit)))
+
+    cur = conn.cursor()
+    # sqlite3.Row yerine düz tuple: kayıtlar zaten sözlüğe çevriliyor
+    cur.row_factory = None
+    cur.execute(sql, params)
+    columns = [column[0] for column in cur.description]
+    rows = cur.fetchall()
+
+    records: List[Dict[str, Any]] = []
+    lookup = status_map.get
+    for values in rows:
+        record = dict(zip(columns, values))
+        durum = record.get("dava_durumu")
+        durum_2 = record.get("tekrar_dava_durumu_2")
+        aktif = record.get("aktif_durum")
+        color_1, owner_1 = lookup(durum.strip(), _EMPTY_STATUS) if durum else _EMPTY_STATUS
+        color_2, owner_2 = lookup(durum_2.strip(), _EMPTY_STATUS) if durum_2 else _EMPTY_STATUS
+        aktif_color = lookup(aktif.strip(), _EMPTY_STATUS)[0] if aktif else None
+        record["status_color"] = aktif_color
+        record["dava_durumu_color"] = color_1
+        record["tekrar_dava_durumu_2_color"] = color_2
+        record["dava_durumu_owner"] = owner_1
+        record["tekrar_dava_durumu_2_owner"] = owner_2
+        records.append(record)
+    return records
+
+
+def query_case_page(
+    limit: int,
+    after: CasePageKey | None = None,
+    **filters: Any,
+) -> tuple[List[Dict[str, Any]], CasePageKey | None]:
+    """``after`` anahtarından sonraki en fazla ``limit`` dosyayı döndürür.
+
+    Returns:
+        (kayıtlar, sonraki sayfanın ``after`` anahtarı); son sayfada anahtar
+        ``None`` olur.
+    """
+    records = query_cases(after=after, limit=limit, **filters)
+    next_after = case_page_key(records[-1]) if len(records) >= limit else None
+    return records, next_after
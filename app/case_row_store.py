@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+Dosya listesi için sütun bazlı (columnar) satır deposu.
+
+Dosya modeli eskiden her satır için ``d.*`` alanlarının tam bir ``dict``
+kopyasını tutuyordu; 20 küsur anahtarlı bir sözlük, tarih ve zaman damgası
+metinleri ile birlikte satır başına 2-3 KB ediyordu. ``CaseRowStore`` aynı
+kayıtları alan başına tek bir sütunda saklar:
+
+* tamsayı alanlar (``id``, ``buro_takip_no``, ``is_archived``) ``array('q')``,
+* ISO gün tarihleri (``durusma_tarihi`` vb.) gün sırası (ordinal) olarak
+  ``array('i')``; ``0`` boş tarihtir,
+* ``YYYY-MM-DD HH:MM:SS`` damgaları saniye olarak ``array('q')``,
+* durum, renk, sahip, mahkeme gibi az çeşitli metinler depo genelinde tek bir
+  ``sys.intern`` havuzunda tutulup ``array('I')`` indeksiyle,
+* kalan serbest metinler düz ``list`` olarak.
+
+Bir değer sütunun türüne uymazsa (ör. eski kurulumda ``dd.mm.yyyy`` tarih)
+yalnızca o sütun düz listeye çevrilir; okunan değerler her zaman yazılanla
+aynıdır. ``store[row]`` satırı sözlük olarak üretir, sıcak yollar (``data()``,
+sıralama, proxy filtresi) ise ``value``/``ordinal``/``code``/``view`` ile
+sütunlardan doğrudan okur.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from datetime import date, datetime
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+_INT = 0
+_DATE = 1
+_STAMP = 2
+_CODE = 3
+_OBJ = 4
+
+_TYPECODES = {_INT: "q", _DATE: "i", _STAMP: "q", _CODE: "I"}
+
+# array('q') içinde NULL yerine kullanılan değer
+_NULL = -(2**63)
+
+DATE_FIELDS = frozenset(
+    {"durusma_tarihi", "is_tarihi", "is_tarihi_2", "dava_acilis_tarihi"}
+)
+STAMP_FIELDS = frozenset({"created_at", "updated_at"})
+# Tekrarı yüksek, az çeşitli metin alanları: ortak havuzdan indekslenir
+CODE_FIELDS = frozenset(
+    {
+        "dava_durumu",
+        "tekrar_dava_durumu_2",
+        "aktif_durum",
+        "status_color",
+        "dava_durumu_color",
+        "tekrar_dava_durumu_2_color",
+        "dava_durumu_owner",
+        "tekrar_dava_durumu_2_owner",
+        "muvekkil_rolu",
+        "mahkeme_adi",
+        "dosya_konusu",
+    }
+)
+
+
+def _date_ordinal(value: Any) -> int:
+    if value is None:
+        return 0
+    if type(value) is not str or len(value) != 10:
+        raise ValueError(value)
+    parsed = date.fromisoformat(value)
+    if parsed.isoformat() != value:
+        raise ValueError(value)
+    return parsed.toordinal()
+
+
+def _decode_date(value: int) -> Optional[str]:
+    return date.fromordinal(value).isoformat() if value else None
+
+
+def _stamp_seconds(value: Any) -> int:
+    if value is None:
+        return _NULL
+    if type(value) is not str or len(value) != 19:
+        raise ValueError(value)
+    parsed = datetime.fromisoformat(value)
+    if parsed.isoformat(sep=" ") != value:
+        raise ValueError(value)
+    return (
+        parsed.toordinal() * 86400
+        + parsed.hour * 3600
+        + parsed.minute * 60
+        + parsed.second
+    )
+
+
+def _decode_stamp(value: int) -> Optional[str]:
+    if value == _NULL:
+        return None
+    days, seconds = divmod(value, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{date.fromordinal(days).isoformat()} {hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def _field_kind(field: str) -> int:
+    if field in DATE_FIELDS:
+        return _DATE
+    if field in STAMP_FIELDS:
+        return _STAMP
+    if field in CODE_FIELDS:
+        return _CODE
+    # Bilinmeyen alanlar tamsayı olarak başlar, ilk metinde listeye düşer
+    return _INT
+
+
+class RowView:
+    """Depodaki tek satırın sözlük benzeri, kopyasız görünümü."""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "CaseRowStore", row: int) -> None:
+        self._store = store
+        self._row = row
+
+    def get(self, field: str, default: Any = None) -> Any:
+        if field not in self._store._kinds:
+            return default
+        return self._store.value(self._row, field)
+
+    def __getitem__(self, field: str) -> Any:
+        if field not in self._store._kinds:
+            raise KeyError(field)
+        return self._store.value(self._row, field)
+
+    def __contains__(self, field: object) -> bool:
+        return field in self._store._kinds
+
+
+class CaseRowStore:
+    """Dosya kayıtlarını alan başına sıkıştırılmış sütunlarda tutan depo.
+
+    Liste gibi davranır: ``len(store)``, ``store[row]`` (kaydın sözlük
+    kopyası) ve ``for record in store`` desteklenir. Değişiklikler
+    ``append``/``extend``/``insert``/``pop``/``store[row] = kayıt``/``update``
+    ile yapılır; ``store[row]`` ile dönen sözlüğü değiştirmek depoyu
+    etkilemez.
+    """
+
+    __slots__ = ("_fields", "_kinds", "_columns", "_size", "_pool", "_pool_index")
+
+    def __init__(self, records: Iterable[Mapping[str, Any]] = ()) -> None:
+        self._fields: List[str] = []
+        self._kinds: Dict[str, int] = {}
+        self._columns: Dict[str, Any] = {}
+        self._size = 0
+        self._pool: List[Any] = [None]
+        self._pool_index: Dict[Any, int] = {}
+        self.extend(records)
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, row: int) -> Dict[str, Any]:
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError(row)
+        return {field: self._decode(field, self._columns[field][row]) for field in self._fields}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(self._size):
+            yield self[row]
+
+    @property
+    def fields(self) -> Sequence[str]:
+        return tuple(self._fields)
+
+    def value(self, row: int, field: str) -> Any:
+        """Tek hücrenin özgün değeri; alan yoksa ``None``."""
+        column = self._columns.get(field)
+        if column is None:
+            return None
+        return self._decode(field, column[row])
+
+    def ordinal(self, row: int, field: str) -> Optional[int]:
+        """Tarih alanının gün sırası (boşsa ``0``); sütun ordinal değilse ``None``."""
+        if self._kinds.get(field) != _DATE:
+            return None
+        return self._columns[field][row]
+
+    def code(self, row: int, field: str) -> Optional[int]:
+        """Havuzlu alanın değer indeksi (boşsa ``0``); aynı değer aynı indekstir."""
+        if self._kinds.get(field) != _CODE:
+            return None
+        return self._columns[field][row]
+
+    def code_value(self, code: int) -> Any:
+        return self._pool[code]
+
+    def column(self, field: str) -> List[Any]:
+        """Alanın tüm değerleri (çözülmüş) satır sırasıyla."""
+        column = self._columns.get(field)
+        if column is None:
+            return [None] * self._size
+        kind = self._kinds[field]
+        if kind == _OBJ:
+            return list(column)
+        if kind == _INT:
+            return [None if value == _NULL else value for value in column]
+        if kind == _CODE:
+            pool = self._pool
+            return [pool[value] for value in column]
+        return [self._decode(field, value) for value in column]
+
+    def view(self, row: int) -> RowView:
+        return RowView(self, row)
+
+    def index_by_id(self) -> Dict[Any, int]:
+        """``id`` -> satır numarası sözlüğü."""
+        return {
+            record_id: row
+            for row, record_id in enumerate(self.column("id"))
+            if record_id is not None
+        }
+
+    def copy(self) -> "CaseRowStore":
+        clone = CaseRowStore()
+        clone._fields = list(self._fields)
+        clone._kinds = dict(self._kinds)
+        clone._columns = {
+            field: column[:] for field, column in self._columns.items()
+        }
+        clone._size = self._size
+        clone._pool = list(self._pool)
+        clone._pool_index = dict(self._pool_index)
+        return clone
+
+    # ------------------------------------------------------------------
+    # Yazma
+    # ------------------------------------------------------------------
+    def append(self, record: Mapping[str, Any]) -> None:
+        self.insert(self._size, record)
+
+    def extend(self, records: Iterable[Mapping[str, Any]] | "CaseRowStore") -> None:
+        if isinstance(records, CaseRowStore):
+            self._extend_store(records)
+            return
+        records = list(records)
+        if not records:
+            return
+        for record in records:
+            for field in record:
+                if field not in self._kinds:
+                    self._add_field(field)
+        fields = self._fields
+        try:
+            if len(fields) < 2:
+                raise KeyError(fields)
+            # Sorgu kayıtlarının anahtarları aynıdır: satırları C düzeyinde çevir
+            values_by_field = list(zip(*map(itemgetter(*fields), records)))
+        except KeyError:
+            values_by_field = [[record.get(field) for record in records] for field in fields]
+        for field, values in zip(fields, values_by_field):
+            self._extend_column(field, values)
+        self._size += len(records)
+
+    def insert(self, row: int, record: Mapping[str, Any]) -> None:
+        row = max(0, min(row, self._size))
+        for field in record:
+            if field not in self._kinds:
+                self._add_field(field)
+        for field in self._fields:
+            value = record.get(field)
+            try:
+                encoded = self._encode(field, value)
+            except (TypeError, ValueError, OverflowError):
+                self._demote(field)
+                encoded = value
+            self._columns[field].insert(row, encoded)
+        self._size += 1
+
+    def pop(self, row: int) -> Dict[str, Any]:
+        record = self[row]
+        for column in self._columns.values():
+            column.pop(row)
+        self._size -= 1
+        return record
+
+    def __setitem__(self, row: int, record: Mapping[str, Any]) -> None:
+        """Satırı ``record`` ile değiştir; kayıtta olmayan alanlar boşalır."""
+        changes = {field: None for field in self._fields}
+        changes.update(record)
+        self.update(row, changes)
+
+    def update(self, row: int, changes: Mapping[str, Any]) -> None:
+        """Satırın yalnızca verilen alanlarını güncelle."""
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError(row)
+        for field, value in changes.items():
+            if field not in self._kinds:
+                self._add_field(field)
+            try:
+                encoded = self._encode(field, value)
+            except (TypeError, ValueError, OverflowError):
+                self._demote(field)
+                encoded = value
+            self._columns[field][row] = encoded
+
+    def reorder(self, order: Sequence[int]) -> None:
+        """Satırları ``order`` permütasyonuna göre yeniden diz."""
+        for field, column in self._columns.items():
+            values = [column[index] for index in order]
+            kind = self._kinds[field]
+            self._columns[field] = values if kind == _OBJ else array(_TYPECODES[kind], values)
+
+    # ------------------------------------------------------------------
+    # Sütun yardımcıları
+    # ------------------------------------------------------------------
+    def _add_field(self, field: str) -> None:
+        kind = _field_kind(field)
+        self._fields.append(field)
+        self._kinds[field] = kind
+        empty = self._encode(field, None)
+        if kind == _OBJ:
+            self._columns[field] = [empty] * self._size
+        else:
+            self._columns[field] = array(_TYPECODES[kind], [empty]) * self._size
+
+    def _demote(self, field: str) -> None:
+        """Sütunu çözülmüş değerlerle düz listeye çevir."""
+        if self._kinds[field] == _OBJ:
+            return
+        self._columns[field] = self.column(field)
+        self._kinds[field] = _OBJ
+
+    def _code_of(self, value: Any) -> int:
+        if value is None:
+            return 0
+        index = self._pool_index.get(value)
+        if index is None:
+            if type(value) is str:
+                value = sys.intern(value)
+            index = len(self._pool)
+            self._pool.append(value)
+            self._pool_index[value] = index
+        return index
+
+    def _encode(self, field: str, value: Any) -> Any:
+        kind = self._kinds[field]
+        if kind == _OBJ:
+            return value
+        if kind == _INT:
+            if value is None:
+                return _NULL
+            if type(value) is not int or value == _NULL:
+                raise TypeError(value)
+            return value
+        if kind == _DATE:
+            return _date_ordinal(value)
+        if kind == _STAMP:
+            return _stamp_seconds(value)
+        return self._code_of(value)
+
+    def _decode(self, field: str, stored: Any) -> Any:
+        kind = self._kinds[field]
+        if kind == _OBJ:
+            return stored
+        if kind == _INT:
+            return None if stored == _NULL else stored
+        if kind == _CODE:
+            return self._pool[stored]
+        if kind == _DATE:
+            return _decode_date(stored)
+        return _decode_stamp(stored)
+
+    def _extend_column(self, field: str, values: List[Any]) -> None:
+        kind = self._kinds[field]
+        column = self._columns[field]
+        if kind != _OBJ:
+            try:
+                if kind == _INT:
+                    if not all(
+                        type(value) is int and value != _NULL
+                        for value in values
+                        if value is not None
+                    ):
+                        raise TypeError(field)
+                    encoded = [_NULL if value is None else value for value in values]
+                elif kind == _DATE:
+                    # Aynı gün çok tekrarlanır: her metin bir kez çözülür
+                    ordinals: Dict[Any, int] = {}
+                    encoded = []
+                    for value in values:
+                        ordinal = ordinals.get(value)
+                        if ordinal is None:
+                            ordinal = ordinals[value] = _date_ordinal(value)
+                        encoded.append(ordinal)
+                elif kind == _STAMP:
+                    encoded = [_stamp_seconds(value) for value in values]
+                else:
+                    lookup = self._pool_index.get
+                    code_of = self._code_of
+                    encoded = [
+                        0 if value is None else (lookup(value) or code_of(value))
+                        for value in values
+                    ]
+                column.extend(array(_TYPECODES[kind], encoded))
+                return
+            except (TypeError, ValueError, OverflowError):
+                self._demote(field)
+                column = self._columns[field]
+        column.extend(values)
+
+    def _extend_store(self, other: "CaseRowStore") -> None:
+        if not other._size:
+            return
+        for field in other._fields:
+            if field not in self._kinds:
+                self._add_field(field)
+        remap: Optional[List[int]] = None
+        for field in self._fields:
+            kind = self._kinds[field]
+            other_kind = other._kinds.get(field)
+            source = other._columns.get(field)
+            if source is None:
+                self._extend_column(field, [None] * other._size)
+            elif kind == other_kind and kind != _CODE:
+                self._columns[field].extend(source)
+            elif kind == other_kind:
+                if remap is None:
+                    code_of = self._code_of
+                    remap = [code_of(value) for value in other._pool]
+                self._columns[field].extend(array("I", [remap[index] for index in source]))
+            else:
+                self._extend_column(field, other.column(field))
+        self._size += other._size
@@ -1,22 +1,39 @@
 # -*- coding: utf-8 -*-
+import atexit
 import json
 import os
+import re
 import shutil
 import sqlite3
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 try:  # pragma: no cover - runtime import guard
-    from app.utils import hash_password, iso_to_tr, normalize_hex, get_attachments_dir
+    from app.utils import (
+        hash_password,
+        iso_to_tr,
+        normalize_hex,
+        get_attachments_dir,
+        fold_search_sql,
+    )
 except ModuleNotFoundError:  # pragma: no cover
-    from utils import hash_password, iso_to_tr, normalize_hex, get_attachments_dir
+    from utils import (
+        hash_password,
+        iso_to_tr,
+        normalize_hex,
+        get_attachments_dir,
+        fold_search_sql,
+    )
 
 # SQLCipher / Fernet şifreleme entegrasyonu
 try:  # pragma: no cover
     from app.db_crypto import (
         SQLCIPHER_AVAILABLE,
         CRYPTOGRAPHY_AVAILABLE,
+        sqlcipher,
         get_encrypted_connection,
         is_encrypted_db,
         is_fernet_encrypted,
@@ -24,6 +41,13 @@ try:  # pragma: no cover
         derive_db_key,
         encrypt_file,
         decrypt_file,
+        # Sayfa şifreli VFS
+        enable_page_encryption,
+        is_page_encrypted,
+        page_encrypted_uri,
+        convert_to_page_encrypted,
+        iter_page_encrypted_file,
+        derive_snapshot_keys,
         # Parola bazlı yedek şifreleme
         encrypt_backup_with_password,
         decrypt_backup_with_password,
@@ -35,6 +59,7 @@ except ModuleNotFoundError:  # pragma: no cover
         from db_crypto import (
             SQLCIPHER_AVAILABLE,
             CRYPTOGRAPHY_AVAILABLE,
+            sqlcipher,
             get_encrypted_connection,
             is_encrypted_db,
             is_fernet_encrypted,
@@ -42,6 +67,13 @@ except ModuleNotFoundError:  # pragma: no cover
             derive_db_key,
             encrypt_file,
             decrypt_file,
+            # Sayfa şifreli VFS
+            enable_page_encryption,
+            is_page_encrypted,
+            page_encrypted_uri,
+            convert_to_page_encrypted,
+            iter_page_encrypted_file,
+            derive_snapshot_keys,
             # Parola bazlı yedek şifreleme
             encrypt_backup_with_password,
             decrypt_backup_with_password,
@@ -52,6 +84,7 @@ except ModuleNotFoundError:  # pragma: no cover
         # db_crypto modülü yüklenemezse, şifreleme devre dışı
         SQLCIPHER_AVAILABLE = False
         CRYPTOGRAPHY_AVAILABLE = False
+        sqlcipher = None
         get_encrypted_connection = None
         is_encrypted_db = lambda x: False
         is_fernet_encrypted = lambda x: False
@@ -59,14 +92,52 @@ except ModuleNotFoundError:  # pragma: no cover
         derive_db_key = lambda: ""
         encrypt_file = lambda x: False
         decrypt_file = lambda x: False
+        enable_page_encryption = lambda key=None: None
+        is_page_encrypted = lambda x: False
+        page_encrypted_uri = None
+        convert_to_page_encrypted = lambda x, vfs_name=None: False
+        iter_page_encrypted_file = None
+        derive_snapshot_keys = None
         encrypt_backup_with_password = lambda x, y, z="": False
         decrypt_backup_with_password = lambda x, y: False
         get_backup_hint = lambda x: None
         is_password_protected_backup = lambda x: False
 
+try:  # pragma: no cover - runtime import guard
+    from app.db_pool import CONNECTION_POOL, PoolBusyError, pooled_connection_class
+except ModuleNotFoundError:  # pragma: no cover
+    from db_pool import CONNECTION_POOL, PoolBusyError, pooled_connection_class
+
+try:  # pragma: no cover - runtime import guard
+    from app.backup_store import (
+        SNAPSHOT_SUFFIX,
+        SnapshotError,
+        SnapshotStore,
+        is_snapshot_manifest,
+        read_manifest,
+        schema_fingerprint,
+        table_counts,
+    )
+    from app.backup_catalog import CHANGED_MESSAGE, BackupCatalog, file_checksum
+except ModuleNotFoundError:  # pragma: no cover
+    from backup_store import (
+        SNAPSHOT_SUFFIX,
+        SnapshotError,
+        SnapshotStore,
+        is_snapshot_manifest,
+        read_manifest,
+        schema_fingerprint,
+        table_counts,
+    )
+    from backup_catalog import CHANGED_MESSAGE, BackupCatalog, file_checksum
+
 # Fernet şifreleme durumu (uygulama kapanırken şifrelemek için)
 _db_needs_encryption = False
 
+# Sayfa şifreli VFS durumu: None = henüz denenmedi, "" = kullanılamıyor
+_page_vfs_name = None
+_PAGE_VFS_LOCK = threading.Lock()
+
 
 def _get_documents_dir() -> str:
     """Windows ve diğer platformlarda Documents klasörünü güvenli şekilde bulur."""
@@ -578,17 +649,198 @@ DOSYALAR_OPTIONAL_COLUMNS = [
     ("is_tarihi_2", "DATE"),
 ]
 
+# Satır bazında değişiklik kaydı tutulan tablolar. Tebligat ve arabuluculuk
+# kayıtları UI yenilemesi tetiklemez; uyarı taraması imleci önbellek anahtarı
+# olarak kullandığı için kaydedilir.
+CHANGE_LOG_TABLES = ("dosyalar", "gorevler", "finans", "tebligatlar", "arabuluculuk")
+
+CHANGE_LOG_COLUMNS = [
+    ("row_id", "INTEGER"),
+    ("op", "TEXT"),
+]
+
+# change_log'da tutulacak en fazla kayıt; daha eski imleçler tam yenileme alır
+CHANGE_LOG_RETENTION = 20000
+
+# Yoklama sırasında budama, bu kadar fazla kayıt birikince yapılır
+CHANGE_LOG_PRUNE_SLACK = 2000
+
+# Tek seferde döndürülecek en fazla değişiklik kaydı
+CHANGE_FEED_LIMIT = 5000
+
 def get_connection():
     """
     Veritabanı bağlantısı al.
 
+    Bağlantılar iş parçacığı başına küçük bir havuzdan verilir; ``close()``
+    bağlantıyı havuza iade eder, commit edilmemiş değişiklikler geri alınır.
+
     Şifreleme öncelik sırası:
     1. SQLCipher (veritabanı seviyesi şifreleme)
     2. Fernet/Cryptography (dosya seviyesi şifreleme)
     3. Şifresiz SQLite (fallback)
     """
+    return CONNECTION_POOL.acquire(DB_PATH, _open_connection)
+
+
+@contextmanager
+def connection_scope():
+    """Havuzdan bağlantı alıp blok sonunda iade eden context manager.
+
+    Blok hatasız biterse açık işlem commit edilir, hata durumunda geri alınır::
+
+        with connection_scope() as conn:
+            conn.execute("UPDATE ...")
+    """
+    conn = get_connection()
+    try:
+        yield conn
+        if conn.in_transaction:
+            conn.commit()
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def close_all_connections() -> int:
+    """Havuzdaki tüm bağlantıları kapat.
+
+    Veritabanı dosyası şifrelenmeden, geri yüklenmeden veya değiştirilmeden
+    önce çağrılmalıdır.
+    """
+    return CONNECTION_POOL.close_all()
+
+
+# Geri yükleme sırasında özel erişim alınamazsa kullanıcıya gösterilen mesaj
+DATABASE_BUSY_MESSAGE = "Veritabanı başka bir işlem tarafından kullanılıyor. Lütfen biraz sonra tekrar deneyin."
+
+
+def exclusive_database_access():
+    """
+    Canlı veritabanını değiştiren işlemler için havuzu bu iş parçacığına ayır.
+
+    Diğer iş parçacıklarının sorguları bitene kadar beklenir, yeni
+    bağlantılar blok bitene kadar bekletilir. Süresinde bitmeyen sorgu
+    kalırsa ``PoolBusyError`` yükselir.
+    """
+    return CONNECTION_POOL.exclusive()
+
+
+def _page_vfs() -> str | None:
+    """SQLCipher yokken sayfa şifreli VFS'in adını döndür (ilk çağrıda kaydedilir)."""
+    global _page_vfs_name
+
+    if SQLCIPHER_AVAILABLE or not CRYPTOGRAPHY_AVAILABLE:
+        return None
+    with _PAGE_VFS_LOCK:
+        if _page_vfs_name is None:
+            _page_vfs_name = enable_page_encryption() or ""
+            if _page_vfs_name:
+                # Havuzdaki bağlantılar VFS modülü kapanmadan önce kapatılmalı
+                atexit.register(close_all_connections)
+        return _page_vfs_name or None
+
+
+def _page_encrypted_db_uri() -> str | None:
+    """
+    Canlı veritabanını sayfa şifreli VFS ile açan URI.
+
+    Düz veya dosya seviyesi şifreli veritabanı ilk açılışta bir kez sayfa
+    şifreli formata taşınır. VFS kullanılamıyorsa ya da geçiş başarısız
+    olursa None döner; çağıran dosya seviyesi şifrelemeye geri döner.
+    """
+    vfs_name = _page_vfs()
+    if vfs_name is None:
+        return None
+
+    with _PAGE_VFS_LOCK:
+        if os.path.exists(DB_PATH) and os.path.getsize(DB_PATH) > 0 and not is_page_encrypted(DB_PATH):
+            print("[db] Veritabanı sayfa şifreli formata taşınıyor...")
+            if not convert_to_page_encrypted(DB_PATH, vfs_name):
+                print("[db] HATA: Sayfa şifreli formata geçilemedi, dosya şifrelemesi kullanılacak")
+                return None
+            print("[db] Veritabanı sayfa şifreli formata taşındı")
+    return page_encrypted_uri(DB_PATH, vfs_name)
+
+
+def connect_database_file(path: str | None = None) -> sqlite3.Connection:
+    """
+    Havuz dışında bir veritabanı dosyasına doğrudan bağlantı aç.
+
+    Sayfa şifreli dosyalar (canlı veritabanı veya kopyası) şifreli VFS
+    üzerinden, diğerleri düz ``sqlite3.connect`` ile açılır.
+    """
+    path = path or DB_PATH
+    if is_page_encrypted(path):
+        vfs_name = _page_vfs()
+        if vfs_name is not None:
+            return sqlite3.connect(page_encrypted_uri(path, vfs_name), uri=True)
+    return sqlite3.connect(path)
+
+
+def copy_database_file(dest_path: str, plaintext: bool = False) -> None:
+    """
+    Canlı veritabanının tutarlı bir kopyasını ``dest_path``'e yaz.
+
+    Kopya canlı veritabanıyla aynı şekilde korunur: sayfa şifreli VFS
+    varsa sayfalar VFS üzerinden yazılır, SQLCipher dosyası olduğu gibi
+    kopyalanır, dosya seviyesi şifrelemede kopya Fernet ile şifrelenir.
+    Böylece geri yükleme öncesi güvenlik kopyaları diskte düz kalmaz ve
+    ``replace_database_file`` ile geri alınabilir. ``plaintext`` yalnızca
+    başka makineye taşınan aktarım paketi içindir.
+    """
+    if not plaintext and SQLCIPHER_AVAILABLE and is_encrypted_db(DB_PATH):
+        shutil.copy2(DB_PATH, dest_path)
+        return
+
+    vfs_name = None if plaintext else _page_vfs()
+    source = connect_database_file()
+    if vfs_name is not None:
+        dest = sqlite3.connect(page_encrypted_uri(dest_path, vfs_name), uri=True)
+    else:
+        dest = sqlite3.connect(dest_path)
+    try:
+        source.backup(dest)
+    finally:
+        dest.close()
+        source.close()
+
+    if vfs_name is None and not plaintext and CRYPTOGRAPHY_AVAILABLE and not encrypt_file(dest_path):
+        os.remove(dest_path)
+        raise RuntimeError("Veritabanı kopyası şifrelenemedi")
+
+
+def replace_database_file(source_path: str) -> None:
+    """
+    Canlı veritabanını başka bir veritabanı dosyasıyla değiştir.
+
+    Dosya doğrudan kopyalanmamalıdır: havuzdaki bağlantılar eski dosyayı
+    tutar ve eski (sayfa şifreli olabilen) WAL yeni dosyaya uygulanır.
+    Burada diğer iş parçacıklarının bağlantıları iade etmesi beklenip
+    havuz kapatılır, WAL/SHM dosyaları silinir, kopya yerine konur ve sayfa şifreli VFS kullanılıyorsa hemen şifreli formata
+    taşınır. Mevcut veritabanı gerekiyorsa önceden yedeklenmelidir.
+    """
+    with CONNECTION_POOL.exclusive():
+        temp_path = DB_PATH + ".replace.tmp"
+        shutil.copyfile(source_path, temp_path)
+        for suffix in ("-wal", "-shm", "-journal"):
+            if os.path.exists(DB_PATH + suffix):
+                os.remove(DB_PATH + suffix)
+        os.replace(temp_path, DB_PATH)
+        # Düz kopya bir sonraki açılışı beklemeden şifrelenir
+        _page_encrypted_db_uri()
+
+
+def _open_connection():
+    """Yeni, PRAGMA'ları uygulanmış bir veritabanı bağlantısı aç."""
     global _db_needs_encryption
 
+    # Havuzdaki bağlantılar kapanışta başka iş parçacığından kapatılabilir
+    connect_kwargs = {"check_same_thread": False}
+
     # SQLCipher varsa kullan
     if SQLCIPHER_AVAILABLE and get_encrypted_connection is not None:
         # Şifresiz veritabanı varsa migrate et
@@ -600,14 +852,25 @@ def get_connection():
                 print(f"[db] Şifreleme uyarısı: {msg}")
 
         try:
-            conn = get_encrypted_connection(DB_PATH)
+            conn = get_encrypted_connection(
+                DB_PATH,
+                factory=pooled_connection_class(sqlcipher.Connection),
+                **connect_kwargs,
+            )
             conn.row_factory = sqlite3.Row
         except Exception as e:
             print(f"[db] SQLCipher bağlantı hatası: {e}, sqlite3'e geçiliyor")
-            conn = sqlite3.connect(DB_PATH)
+            conn = sqlite3.connect(
+                DB_PATH, factory=pooled_connection_class(), **connect_kwargs
+            )
             conn.row_factory = sqlite3.Row
 
-    # SQLCipher yok ama Fernet varsa, dosya seviyesi şifreleme kullan
+    # SQLCipher yok ama cryptography varsa, sayfalar okunurken/yazılırken şifrelenir
+    elif CRYPTOGRAPHY_AVAILABLE and (page_uri := _page_encrypted_db_uri()) is not None:
+        conn = sqlite3.connect(page_uri, uri=True, factory=pooled_connection_class(), **connect_kwargs)
+        conn.row_factory = sqlite3.Row
+
+    # VFS kaydedilemezse dosya seviyesi şifreleme kullan
     elif CRYPTOGRAPHY_AVAILABLE:
         # Eğer veritabanı Fernet ile şifreli ise, önce çöz
         if os.path.exists(DB_PATH) and is_fernet_encrypted(DB_PATH):
@@ -621,12 +884,12 @@ def get_connection():
             # Veritabanı var ama şifreli değil - kapanışta şifrelenecek
             _db_needs_encryption = True
 
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(DB_PATH, factory=pooled_connection_class(), **connect_kwargs)
         conn.row_factory = sqlite3.Row
 
     else:
         # Ne SQLCipher ne Fernet var - şifresiz kullan
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(DB_PATH, factory=pooled_connection_class(), **connect_kwargs)
         conn.row_factory = sqlite3.Row
 
     conn.execute("PRAGMA foreign_keys = ON")
@@ -740,6 +1003,7 @@ def ensure_gorevler_columns(conn: sqlite3.Connection) -> None:
             cur.execute("ALTER TABLE gorevler ADD COLUMN dosya_id INTEGER")
         if "gorev_turu" not in columns:
             cur.execute("ALTER TABLE gorevler ADD COLUMN gorev_turu TEXT")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_gorevler_tarih ON gorevler(tarih)")
 
 
 def _mark_automatic_task_completed(
@@ -1144,6 +1408,479 @@ def setup_arabuluculuk_gorev_triggers(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+# Dosya listesi sorgularının taradığı, aramada kullanılan alanlar
+DOSYA_SEARCH_FIELDS = (
+    "dosya_esas_no",
+    "muvekkil_adi",
+    "karsi_taraf",
+    "dosya_konusu",
+    "mahkeme_adi",
+    "dava_durumu",
+    "aciklama",
+    "tekrar_dava_durumu_2",
+    "aciklama_2",
+)
+
+# Şema veya katlama kuralı değiştiğinde artırılır; tablo yeniden doldurulur.
+DOSYA_OZET_VERSION = "1"
+
+# ``dosya_ozet`` satırını ``dosyalar`` satırından üreten SELECT. Trigger'lar ve
+# toplu doldurma aynı ifadeyi kullanır; özel SQL fonksiyonu gerektirmez, böylece
+# ham ``sqlite3.connect`` ile yapılan yazmalar da özet tabloyu günceller.
+_DOSYA_OZET_SELECT = """
+    SELECT d.id,
+           NULLIF(TRIM(d.dava_durumu), ''),
+           NULLIF(TRIM(d.tekrar_dava_durumu_2), ''),
+           NULLIF(TRIM(COALESCE(NULLIF(d.tekrar_dava_durumu_2, ''), d.dava_durumu)), ''),
+           CASE WHEN UPPER(TRIM(COALESCE(d.dava_durumu, ''))) = 'DOSYA KAPANDI'
+                  OR UPPER(TRIM(COALESCE(d.tekrar_dava_durumu_2, ''))) = 'DOSYA KAPANDI'
+                THEN 1 ELSE 0 END,
+           {arama_metni}
+    FROM dosyalar d
+""".format(
+    arama_metni=fold_search_sql(
+        " || ' ' || ".join(f"COALESCE(d.{field}, '')" for field in DOSYA_SEARCH_FIELDS)
+    )
+)
+
+_DOSYA_OZET_INSERT = (
+    "INSERT OR REPLACE INTO dosya_ozet "
+    "(dosya_id, durum_key, durum_2_key, aktif_key, kapali, arama_metni)"
+    + _DOSYA_OZET_SELECT
+)
+
+
+def setup_dosya_ozet_table(conn: sqlite3.Connection) -> None:
+    """Dosya listesi için indeksli özet tabloyu ve senkron trigger'larını kurar.
+
+    ``dosya_ozet`` her dosya için TRIM edilmiş durum anahtarlarını, kapalı
+    bayrağını ve Türkçe katlanmış arama metnini tutar. Liste sorgusu böylece
+    ``statuses`` ile TRIM join yapmadan ve Python tarafında metin taramadan
+    tek SQL ile süzülür.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS dosya_ozet (
+            dosya_id INTEGER PRIMARY KEY,
+            durum_key TEXT,
+            durum_2_key TEXT,
+            aktif_key TEXT,
+            kapali INTEGER NOT NULL DEFAULT 0,
+            arama_metni TEXT NOT NULL DEFAULT ''
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_dosya_ozet_durum ON dosya_ozet(durum_key)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_dosya_ozet_durum_2 ON dosya_ozet(durum_2_key)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_dosya_ozet_aktif ON dosya_ozet(aktif_key)")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dosyalar_arsiv_takip ON dosyalar(is_archived, buro_takip_no)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dosyalar_durusma ON dosyalar(durusma_tarihi)"
+    )
+    # Takvim penceresi sorgusu üç tarih sütununu OR ile tarar
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_dosyalar_is_tarihi ON dosyalar(is_tarihi)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_dosyalar_is_tarihi_2 ON dosyalar(is_tarihi_2)")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dosya_atamalar_user ON dosya_atamalar(user_id, dosya_id)"
+    )
+
+    watched = ", ".join(("id",) + DOSYA_SEARCH_FIELDS)
+    cur.execute("DROP TRIGGER IF EXISTS tr_dosya_ozet_insert")
+    cur.execute("DROP TRIGGER IF EXISTS tr_dosya_ozet_update")
+    cur.execute("DROP TRIGGER IF EXISTS tr_dosya_ozet_delete")
+    cur.execute(
+        f"""
+        CREATE TRIGGER tr_dosya_ozet_insert AFTER INSERT ON dosyalar
+        BEGIN
+            {_DOSYA_OZET_INSERT} WHERE d.id = NEW.id;
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER tr_dosya_ozet_update AFTER UPDATE OF {watched} ON dosyalar
+        BEGIN
+            DELETE FROM dosya_ozet WHERE dosya_id = OLD.id AND OLD.id <> NEW.id;
+            {_DOSYA_OZET_INSERT} WHERE d.id = NEW.id;
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER tr_dosya_ozet_delete AFTER DELETE ON dosyalar
+        BEGIN
+            DELETE FROM dosya_ozet WHERE dosya_id = OLD.id;
+        END
+        """
+    )
+
+    # Sürüm değiştiyse ya da satır sayıları tutmuyorsa (trigger'sız eski
+    # kurulum, geri yüklenen yedek) tabloyu baştan doldur.
+    cur.execute("SELECT value FROM ayarlar WHERE key = 'dosya_ozet_version'")
+    row = cur.fetchone()
+    stored_version = row[0] if row else None
+    cur.execute(
+        "SELECT (SELECT COUNT(*) FROM dosyalar), (SELECT COUNT(*) FROM dosya_ozet)"
+    )
+    dosya_count, ozet_count = cur.fetchone()
+    if stored_version != DOSYA_OZET_VERSION or dosya_count != ozet_count:
+        rebuild_dosya_ozet(conn)
+        cur.execute(
+            "INSERT OR REPLACE INTO ayarlar (key, value) VALUES ('dosya_ozet_version', ?)",
+            (DOSYA_OZET_VERSION,),
+        )
+
+    conn.commit()
+
+
+def rebuild_dosya_ozet(conn: sqlite3.Connection) -> None:
+    """``dosya_ozet`` tablosunu ``dosyalar`` üzerinden yeniden oluşturur."""
+    cur = conn.cursor()
+    cur.execute("DELETE FROM dosya_ozet")
+    cur.execute(_DOSYA_OZET_INSERT)
+
+
+# Sürüm değişince özet bir kez yeniden kurulur (2: atama güncellemesi trigger'ı)
+FINANS_SUMMARY_VERSION = "2"
+
+# ``calculate_finance_total`` ile aynı kural: sabit ücret (TL ya da kuruş) +
+# hedefin yüzdesi, toplamda tek kez yukarı yuvarlanır. İçteki ROUND(.., 6)
+# REAL çarpımının 0,499999.. artığını temizler (1234.565 -> 123457).
+_FINANS_TOPLAM_SQL = """
+    CAST(ROUND(ROUND(
+        CASE
+            WHEN f.sozlesme_ucreti IS NOT NULL
+                 AND TRIM(CAST(f.sozlesme_ucreti AS TEXT)) != ''
+                THEN f.sozlesme_ucreti * 100.0
+            WHEN f.sozlesme_ucreti_cents IS NOT NULL
+                 AND TRIM(CAST(f.sozlesme_ucreti_cents AS TEXT)) != ''
+                THEN f.sozlesme_ucreti_cents * 1.0
+            ELSE 0
+        END
+        + CASE
+            WHEN COALESCE(f.sozlesme_yuzdesi, 0) != 0
+                 AND COALESCE(f.tahsil_hedef_cents, 0) != 0
+                THEN f.tahsil_hedef_cents * f.sozlesme_yuzdesi / 100.0
+            ELSE 0
+        END,
+    6)) AS INTEGER)
+"""
+
+_FINANS_SUMMARY_INSERT = f"""
+    INSERT OR REPLACE INTO finans_summary (
+        finans_id, dosya_id, toplam_ucret_cents, tahsil_edilen_cents,
+        masraf_toplam_cents, masraf_tahsil_cents, kalan_bakiye_cents,
+        next_due_date, assigned_user_ids
+    )
+    SELECT f.id,
+           f.dosya_id,
+           {_FINANS_TOPLAM_SQL},
+           COALESCE(f.tahsil_edilen_cents, 0),
+           COALESCE(f.masraf_toplam_cents, 0),
+           COALESCE(f.masraf_tahsil_cents, 0),
+           {_FINANS_TOPLAM_SQL}
+               - COALESCE(f.tahsil_edilen_cents, 0)
+               + COALESCE(f.masraf_toplam_cents, 0)
+               - COALESCE(f.masraf_tahsil_cents, 0),
+           (SELECT MIN(t.vade_tarihi) FROM taksitler t
+             WHERE t.finans_id = f.id AND t.durum != 'Ödendi'),
+           (SELECT GROUP_CONCAT(a.user_id) FROM dosya_atamalar a
+             WHERE a.dosya_id = f.dosya_id)
+    FROM finans f
+"""
+
+
+def setup_finans_summary_table(conn: sqlite3.Connection) -> None:
+    """Finans sekmesi için her kaydın hesaplanmış özetini tutan tabloyu kurar.
+
+    ``finans_summary`` sözleşme toplamı, tahsilat, masraf, kalan bakiye, en
+    yakın ödenmemiş taksit tarihi ve atanan kullanıcıları saklar. Trigger'lar
+    ``finans``, ``taksitler`` ve ``dosya_atamalar`` yazmalarında satırı
+    yeniler; ``recalculate_finans_totals`` toplamları ``finans`` üzerine
+    yazdığı için ayrıca çağrı gerekmez. Gecikme bayrağı güne bağlı olduğundan
+    saklanmaz, okurken ``next_due_date < DATE('now')`` ile türetilir.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finans_summary (
+            finans_id INTEGER PRIMARY KEY,
+            dosya_id INTEGER,
+            toplam_ucret_cents INTEGER NOT NULL DEFAULT 0,
+            tahsil_edilen_cents INTEGER NOT NULL DEFAULT 0,
+            masraf_toplam_cents INTEGER NOT NULL DEFAULT 0,
+            masraf_tahsil_cents INTEGER NOT NULL DEFAULT 0,
+            kalan_bakiye_cents INTEGER NOT NULL DEFAULT 0,
+            next_due_date TEXT,
+            assigned_user_ids TEXT
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_finans_summary_dosya ON finans_summary(dosya_id)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_finans_summary_vade ON finans_summary(next_due_date)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_taksitler_finans_vade ON taksitler(finans_id, vade_tarihi)"
+    )
+
+    refresh_old = f"{_FINANS_SUMMARY_INSERT} WHERE f.id = OLD.finans_id;"
+    refresh_new = f"{_FINANS_SUMMARY_INSERT} WHERE f.id = NEW.finans_id;"
+    triggers = {
+        "tr_finans_summary_insert": f"""
+            AFTER INSERT ON finans
+            BEGIN
+                {_FINANS_SUMMARY_INSERT} WHERE f.id = NEW.id;
+            END
+        """,
+        "tr_finans_summary_update": f"""
+            AFTER UPDATE OF id, dosya_id, sozlesme_ucreti, sozlesme_ucreti_cents,
+                sozlesme_yuzdesi, tahsil_hedef_cents, tahsil_edilen_cents,
+                masraf_toplam_cents, masraf_tahsil_cents ON finans
+            BEGIN
+                DELETE FROM finans_summary WHERE finans_id = OLD.id AND OLD.id <> NEW.id;
+                {_FINANS_SUMMARY_INSERT} WHERE f.id = NEW.id;
+            END
+        """,
+        "tr_finans_summary_delete": """
+            AFTER DELETE ON finans
+            BEGIN
+                DELETE FROM finans_summary WHERE finans_id = OLD.id;
+            END
+        """,
+        "tr_finans_summary_taksit_insert": f"""
+            AFTER INSERT ON taksitler
+            BEGIN
+                {refresh_new}
+            END
+        """,
+        "tr_finans_summary_taksit_update": f"""
+            AFTER UPDATE OF finans_id, vade_tarihi, durum ON taksitler
+            BEGIN
+                {refresh_old}
+                {refresh_new}
+            END
+        """,
+        "tr_finans_summary_taksit_delete": f"""
+            AFTER DELETE ON taksitler
+            BEGIN
+                {refresh_old}
+            END
+        """,
+        "tr_finans_summary_atama_insert": f"""
+            AFTER INSERT ON dosya_atamalar
+            BEGIN
+                {_FINANS_SUMMARY_INSERT} WHERE f.dosya_id = NEW.dosya_id;
+            END
+        """,
+        "tr_finans_summary_atama_update": f"""
+            AFTER UPDATE OF dosya_id, user_id ON dosya_atamalar
+            BEGIN
+                {_FINANS_SUMMARY_INSERT} WHERE f.dosya_id = OLD.dosya_id;
+                {_FINANS_SUMMARY_INSERT} WHERE f.dosya_id = NEW.dosya_id AND NEW.dosya_id IS NOT OLD.dosya_id;
+            END
+        """,
+        "tr_finans_summary_atama_delete": f"""
+            AFTER DELETE ON dosya_atamalar
+            BEGIN
+                {_FINANS_SUMMARY_INSERT} WHERE f.dosya_id = OLD.dosya_id;
+            END
+        """,
+    }
+    for name, body in triggers.items():
+        cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cur.execute(f"CREATE TRIGGER {name} {body}")
+
+    cur.execute("SELECT value FROM ayarlar WHERE key = 'finans_summary_version'")
+    row = cur.fetchone()
+    stored_version = row[0] if row else None
+    cur.execute(
+        "SELECT (SELECT COUNT(*) FROM finans), (SELECT COUNT(*) FROM finans_summary)"
+    )
+    finans_count, summary_count = cur.fetchone()
+    if stored_version != FINANS_SUMMARY_VERSION or finans_count != summary_count:
+        rebuild_finans_summary(conn)
+        cur.execute(
+            "INSERT OR REPLACE INTO ayarlar (key, value) VALUES ('finans_summary_version', ?)",
+            (FINANS_SUMMARY_VERSION,),
+        )
+
+    conn.commit()
+
+
+def rebuild_finans_summary(conn: sqlite3.Connection) -> None:
+    """``finans_summary`` tablosunu ``finans`` üzerinden yeniden oluşturur."""
+    cur = conn.cursor()
+    cur.execute("DELETE FROM finans_summary")
+    cur.execute(_FINANS_SUMMARY_INSERT)
+
+
+# Genel arama indeksi (FTS5). Her kaynak kaydının FTS satır numarası
+# ``id * ARAMA_ROWID_CARPANI + kod`` olarak hesaplanır; trigger'lar böylece
+# kaydı UNINDEXED sütun taraması yapmadan doğrudan rowid ile günceller.
+ARAMA_FTS_VERSION = "1"
+ARAMA_ROWID_CARPANI = 8
+
+# kaynak -> (tablo, kod, indekslenen ifadeler, koşul). ``{r}`` satır takma adıdır.
+ARAMA_KAYNAKLARI: dict[str, tuple[str, int, tuple[str, ...], str | None]] = {
+    "dosya": (
+        "dosyalar",
+        1,
+        ("{r}.buro_takip_no",) + tuple(f"{{r}}.{field}" for field in DOSYA_SEARCH_FIELDS),
+        None,
+    ),
+    "gorev": (
+        "gorevler",
+        2,
+        (
+            "{r}.konu",
+            "CASE WHEN substr({r}.aciklama, 1, 8) = '__META__' THEN '' ELSE {r}.aciklama END",
+            "{r}.atanan_kullanicilar",
+        ),
+        # Tebligat/arabuluculuk görevleri kaynak kaydın kopyasıdır
+        "COALESCE({r}.gorev_turu, '') NOT IN ('TEBLIGAT', 'ARABULUCULUK')",
+    ),
+    "tebligat": (
+        "tebligatlar",
+        3,
+        ("{r}.dosya_no", "{r}.kurum", "{r}.icerik"),
+        None,
+    ),
+    "arabuluculuk": (
+        "arabuluculuk",
+        4,
+        ("{r}.davaci", "{r}.davali", "{r}.arb_adi", "{r}.konu"),
+        None,
+    ),
+    "timeline": (
+        "dosya_timeline",
+        5,
+        ("{r}.title", "{r}.body", "{r}.user"),
+        None,
+    ),
+}
+
+
+def _arama_metin_sql(expressions: tuple[str, ...], alias: str) -> str:
+    joined = " || ' ' || ".join(
+        f"COALESCE({expr.format(r=alias)}, '')" for expr in expressions
+    )
+    return fold_search_sql(joined)
+
+
+def _arama_insert_sql(kaynak: str, alias: str) -> str:
+    """Tek kaynak satırını FTS tablosuna ekleyen ``INSERT ... SELECT`` döndürür."""
+    table, code, expressions, condition = ARAMA_KAYNAKLARI[kaynak]
+    sql = (
+        "INSERT INTO arama_fts (rowid, kaynak, metin) "
+        f"SELECT {alias}.id * {ARAMA_ROWID_CARPANI} + {code}, '{kaynak}', "
+        f"{_arama_metin_sql(expressions, alias)}"
+    )
+    if alias != "NEW":
+        sql += f" FROM {table} {alias}"
+    if condition:
+        sql += f" WHERE {condition.format(r=alias)}"
+    return sql
+
+
+def is_fts5_available(conn: sqlite3.Connection) -> bool:
+    """SQLite derlemesinde FTS5 modülü var mı?"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def setup_search_index(conn: sqlite3.Connection) -> None:
+    """Dosya, görev, tebligat, arabuluculuk ve zaman çizelgesi için FTS5 indeksini kurar.
+
+    Metin, ``fold_search_sql`` ile Türkçe katlanmış halde indekslenir
+    (İ/I/ı -> i, Ş -> ş ...); ``unicode61`` tokenizer'ı aksanları korur.
+    FTS5 bulunmayan SQLite derlemelerinde indeks kurulmaz, arama özet
+    tablodaki metin taramasına düşer.
+    """
+    if not is_fts5_available(conn):
+        print("[db] FTS5 bulunamadı, genel arama indeksi kurulmadı")
+        return
+
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS arama_fts USING fts5(
+            kaynak UNINDEXED,
+            metin,
+            tokenize = 'unicode61 remove_diacritics 0',
+            prefix = '2 3'
+        )
+        """
+    )
+
+    for kaynak, (table, code, expressions, condition) in ARAMA_KAYNAKLARI.items():
+        rowid_old = f"OLD.id * {ARAMA_ROWID_CARPANI} + {code}"
+        columns = sorted(
+            {"id"}
+            | {
+                match
+                for expr in expressions + ((condition,) if condition else ())
+                for match in re.findall(r"\{r\}\.(\w+)", expr)
+            }
+        )
+        for suffix in ("insert", "update", "delete"):
+            cur.execute(f"DROP TRIGGER IF EXISTS tr_arama_{kaynak}_{suffix}")
+        cur.execute(
+            f"""
+            CREATE TRIGGER tr_arama_{kaynak}_insert AFTER INSERT ON {table}
+            BEGIN
+                {_arama_insert_sql(kaynak, "NEW")};
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER tr_arama_{kaynak}_update AFTER UPDATE OF {", ".join(columns)} ON {table}
+            BEGIN
+                DELETE FROM arama_fts WHERE rowid = {rowid_old};
+                {_arama_insert_sql(kaynak, "NEW")};
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER tr_arama_{kaynak}_delete AFTER DELETE ON {table}
+            BEGIN
+                DELETE FROM arama_fts WHERE rowid = {rowid_old};
+            END
+            """
+        )
+
+    cur.execute("SELECT value FROM ayarlar WHERE key = 'arama_fts_version'")
+    row = cur.fetchone()
+    if (row[0] if row else None) != ARAMA_FTS_VERSION:
+        rebuild_search_index(conn)
+        cur.execute(
+            "INSERT OR REPLACE INTO ayarlar (key, value) VALUES ('arama_fts_version', ?)",
+            (ARAMA_FTS_VERSION,),
+        )
+
+    conn.commit()
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> None:
+    """``arama_fts`` indeksini kaynak tablolardan yeniden oluşturur."""
+    cur = conn.cursor()
+    cur.execute("DELETE FROM arama_fts")
+    for kaynak in ARAMA_KAYNAKLARI:
+        cur.execute(_arama_insert_sql(kaynak, "t"))
+    cur.execute("INSERT INTO arama_fts (arama_fts) VALUES ('optimize')")
+
+
 def migrate_existing_tebligatlar_to_gorevler(conn: sqlite3.Connection) -> None:
     """Migrate existing tebligatlar to gorevler table."""
     cur = conn.cursor()
@@ -1601,6 +2338,7 @@ def initialize_database():
 
     cur.execute(f"CREATE TABLE IF NOT EXISTS taksitler ({TAKSITLER_TABLE_SCHEMA})")
     _ensure_table_columns(cur, "taksitler", TAKSITLER_COLUMNS)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_taksitler_vade ON taksitler(vade_tarihi)")
 
     cur.execute(
         f"CREATE TABLE IF NOT EXISTS odeme_kayitlari ({ODEME_KAYIT_TABLE_SCHEMA})"
@@ -1775,7 +2513,8 @@ def initialize_database():
         """
     )
 
-    # Change log tablosu - değişiklik tespiti için
+    # Change log tablosu - değişiklik tespiti için. ``id`` artan sıra numarası
+    # (imleç) olarak kullanılır; ``row_id`` ve ``op`` satır bazında delta sağlar.
     cur.execute(
         """
         CREATE TABLE IF NOT EXISTS change_log (
@@ -1785,93 +2524,63 @@ def initialize_database():
         )
         """
     )
+    _ensure_table_columns(cur, "change_log", CHANGE_LOG_COLUMNS)
+
+    for table_name in CHANGE_LOG_TABLES:
+        for suffix, event, op, row_ref in (
+            ("insert", "INSERT", "I", "NEW.id"),
+            ("update", "UPDATE", "U", "NEW.id"),
+            ("delete", "DELETE", "D", "OLD.id"),
+        ):
+            trigger = f"tr_{table_name}_{suffix}"
+            cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cur.execute(
+                f"""
+                CREATE TRIGGER {trigger} AFTER {event} ON {table_name}
+                BEGIN
+                    INSERT INTO change_log (table_name, row_id, op)
+                    VALUES ('{table_name}', {row_ref}, '{op}');
+                END
+                """
+            )
 
-    # Dosyalar tablosu trigger'ları
-    cur.execute("DROP TRIGGER IF EXISTS tr_dosyalar_insert")
-    cur.execute("DROP TRIGGER IF EXISTS tr_dosyalar_update")
-    cur.execute("DROP TRIGGER IF EXISTS tr_dosyalar_delete")
-    cur.execute(
-        """
-        CREATE TRIGGER tr_dosyalar_insert AFTER INSERT ON dosyalar
-        BEGIN
-            INSERT INTO change_log (table_name) VALUES ('dosyalar');
-        END
-        """
-    )
-    cur.execute(
-        """
-        CREATE TRIGGER tr_dosyalar_update AFTER UPDATE ON dosyalar
-        BEGIN
-            INSERT INTO change_log (table_name) VALUES ('dosyalar');
-        END
-        """
-    )
-    cur.execute(
-        """
-        CREATE TRIGGER tr_dosyalar_delete AFTER DELETE ON dosyalar
-        BEGIN
-            INSERT INTO change_log (table_name) VALUES ('dosyalar');
-        END
-        """
-    )
-
-    # Gorevler tablosu trigger'ları
-    cur.execute("DROP TRIGGER IF EXISTS tr_gorevler_insert")
-    cur.execute("DROP TRIGGER IF EXISTS tr_gorevler_update")
-    cur.execute("DROP TRIGGER IF EXISTS tr_gorevler_delete")
-    cur.execute(
-        """
-        CREATE TRIGGER tr_gorevler_insert AFTER INSERT ON gorevler
-        BEGIN
-            INSERT INTO change_log (table_name) VALUES ('gorevler');
-        END
-        """
-    )
-    cur.execute(
-        """
-        CREATE TRIGGER tr_gorevler_update AFTER UPDATE ON gorevler
-        BEGIN
-            INSERT INTO change_log (table_name) VALUES ('gorevler');
-        END
-        """
-    )
-    cur.execute(
-        """
-        CREATE TRIGGER tr_gorevler_delete AFTER DELETE ON gorevler
-        BEGIN
-            INSERT INTO change_log (table_name) VALUES ('gorevler');
-        END
-        """
-    )
+    # Atama değişikliği dosyanın "bana atananlar" görünümünü etkiler;
+    # dosya satırının güncellenmesi olarak kaydedilir.
+    for suffix, event, row_ref in (
+        ("insert", "INSERT", "NEW.dosya_id"),
+        ("delete", "DELETE", "OLD.dosya_id"),
+    ):
+        trigger = f"tr_dosya_atamalar_{suffix}"
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cur.execute(
+            f"""
+            CREATE TRIGGER {trigger} AFTER {event} ON dosya_atamalar
+            BEGIN
+                INSERT INTO change_log (table_name, row_id, op)
+                VALUES ('dosyalar', {row_ref}, 'U');
+            END
+            """
+        )
 
-    # Finans tablosu trigger'ları
-    cur.execute("DROP TRIGGER IF EXISTS tr_finans_insert")
-    cur.execute("DROP TRIGGER IF EXISTS tr_finans_update")
-    cur.execute("DROP TRIGGER IF EXISTS tr_finans_delete")
-    cur.execute(
-        """
-        CREATE TRIGGER tr_finans_insert AFTER INSERT ON finans
-        BEGIN
-            INSERT INTO change_log (table_name) VALUES ('finans');
-        END
-        """
-    )
-    cur.execute(
-        """
-        CREATE TRIGGER tr_finans_update AFTER UPDATE ON finans
-        BEGIN
-            INSERT INTO change_log (table_name) VALUES ('finans');
-        END
-        """
-    )
-    cur.execute(
-        """
-        CREATE TRIGGER tr_finans_delete AFTER DELETE ON finans
-        BEGIN
-            INSERT INTO change_log (table_name) VALUES ('finans');
-        END
-        """
-    )
+    # Taksit vadeleri finans özetini (sonraki vade, gecikme) değiştirir;
+    # finans satırının güncellenmesi olarak kaydedilir.
+    for suffix, event, row_ref in (
+        ("insert", "INSERT", "NEW.finans_id"),
+        ("update", "UPDATE OF finans_id, vade_tarihi, durum, odeme_tarihi", "NEW.finans_id"),
+        ("delete", "DELETE", "OLD.finans_id"),
+    ):
+        trigger = f"tr_taksitler_{suffix}"
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cur.execute(
+            f"""
+            CREATE TRIGGER {trigger} AFTER {event} ON taksitler
+            BEGIN
+                INSERT INTO change_log (table_name, row_id, op)
+                VALUES ('finans', {row_ref}, 'U');
+            END
+            """
+        )
+    prune_change_log(conn)
 
     # ADIM 1: Dava durumu boşsa is_tarihi ve aciklama sıfırla (uygulama başlangıcında)
     # Mevcut tutarsız verileri düzelt
@@ -1892,6 +2601,11 @@ def initialize_database():
         """
     )
 
+    # Dosya listesi için indeksli özet tablo ve genel arama indeksi
+    setup_dosya_ozet_table(conn)
+    setup_finans_summary_table(conn)
+    setup_search_index(conn)
+
     conn.commit()
     conn.close()
 
@@ -2659,37 +3373,110 @@ def delete_manual_task(task_id: int) -> None:
 # --------------------------------------------------------------
 
 
-def get_pending_changes() -> dict[str, bool]:
-    """Bekleyen değişiklikleri kontrol et ve temizle.
+def get_change_cursor() -> int:
+    """Change log'un şu anki imlecini (son sıra numarası) döndür."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'change_log'"
+        ).fetchone()
+        if row is None:
+            row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM change_log").fetchone()
+        return int(row[0] or 0)
+    finally:
+        conn.close()
+
+
+def get_changes_since(cursor: int, limit: int = CHANGE_FEED_LIMIT) -> dict[str, Any]:
+    """``cursor`` sonrasındaki satır değişikliklerini döndür (log silinmez).
+
+    Aynı satıra ait birden fazla kayıt tek işleme indirgenir: satır sonunda
+    silinmişse ``"D"``, imleçten sonra eklenmişse ``"I"``, aksi halde
+    ``"U"``.
 
     Returns:
-        {"dosyalar": bool, "gorevler": bool, "finans": bool}
+        {
+            "cursor": int,            # bir sonraki çağrıda kullanılacak imleç
+            "rows": {tablo: {row_id: op}},
+            "tables": set[str],       # değişen tablolar
+            "overflow": bool,         # delta eksik; tam yenileme gerekli
+        }
     """
+    cursor = max(0, int(cursor or 0))
     conn = get_connection()
-    cur = conn.cursor()
-
-    # Hangi tablolarda değişiklik var?
-    cur.execute("SELECT DISTINCT table_name FROM change_log")
-    changed_tables = {row[0] for row in cur.fetchall()}
+    try:
+        oldest = conn.execute("SELECT MIN(id) FROM change_log").fetchone()[0]
+        rows = conn.execute(
+            "SELECT id, table_name, row_id, op FROM change_log WHERE id > ? ORDER BY id LIMIT ?",
+            (cursor, int(limit) + 1),
+        ).fetchall()
+    finally:
+        conn.close()
 
-    # Log'u temizle
-    cur.execute("DELETE FROM change_log")
-    conn.commit()
-    conn.close()
+    # İmleçten sonraki kayıtlar budanmışsa delta güvenilmez
+    overflow = oldest is not None and oldest > cursor + 1
+    if len(rows) > limit:
+        overflow = True
+        rows = rows[:limit]
+
+    result_rows: dict[str, dict[int, str]] = {}
+    tables: set[str] = set()
+    new_cursor = cursor
+    for seq, table_name, row_id, op in rows:
+        new_cursor = seq
+        tables.add(table_name)
+        if row_id is None or op is None:
+            # Eski sürüm trigger'ının yazdığı kayıt: hangi satır olduğu bilinmez
+            overflow = True
+            continue
+        table_rows = result_rows.setdefault(table_name, {})
+        previous = table_rows.get(row_id)
+        if op == "D":
+            table_rows[row_id] = "D"
+        elif previous == "I" or (previous is None and op == "I"):
+            table_rows[row_id] = "I"
+        else:
+            table_rows[row_id] = "U"
 
     return {
-        "dosyalar": "dosyalar" in changed_tables,
-        "gorevler": "gorevler" in changed_tables,
-        "finans": "finans" in changed_tables,
+        "cursor": new_cursor,
+        "rows": result_rows,
+        "tables": tables,
+        "overflow": bool(overflow),
     }
 
 
-def clear_change_log() -> None:
-    """Change log tablosunu temizle."""
-    conn = get_connection()
-    conn.execute("DELETE FROM change_log")
-    conn.commit()
-    conn.close()
+def prune_change_log(
+    conn: sqlite3.Connection | None = None,
+    keep: int = CHANGE_LOG_RETENTION,
+    before: int | None = None,
+    slack: int = 0,
+) -> int:
+    """Change log'u son ``keep`` kayıtla sınırla; silinen kayıt sayısını döndür.
+
+    ``before`` verilirse yalnızca bu imlece kadar okunmuş kayıtlar silinir.
+    Silinecek kayıt sayısı ``slack``'i aşmıyorsa hiçbir şey yapılmaz; arka
+    plan yoklaması böylece her seferinde yazma kilidi almaz.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        oldest, newest = conn.execute("SELECT MIN(id), MAX(id) FROM change_log").fetchone()
+        if newest is None:
+            return 0
+        limit = newest - int(keep)
+        if before is not None:
+            limit = min(limit, int(before))
+        if limit - oldest + 1 <= slack:
+            return 0
+        deleted = conn.execute("DELETE FROM change_log WHERE id <= ?", (limit,)).rowcount
+        if own_conn:
+            conn.commit()
+        return deleted
+    finally:
+        if own_conn:
+            conn.close()
 
 
 def get_case_tasks_between(
@@ -2798,16 +3585,241 @@ def get_backup_dir() -> str:
     return BACKUP_DIR
 
 
-def create_backup(custom_path: str | None = None, encrypt: bool = True) -> str | None:
+def get_snapshot_store(root: str | None = None) -> SnapshotStore | None:
+    """
+    Artımlı (tekilleştirilmiş) yedek deposunu döndürür.
+
+    Parçalar makine anahtarıyla şifrelenir; cryptography yoksa şifresiz
+    saklanır. SQLCipher kullanılıyorsa None döner: SQLCipher dosyası düz
+    SQLite olarak geri yüklenemez.
+
+    Args:
+        root: Depo dizini (None ise varsayılan yedek dizini)
+    """
+    if SQLCIPHER_AVAILABLE:
+        return None
+    keys = derive_snapshot_keys() if CRYPTOGRAPHY_AVAILABLE else None
+    return SnapshotStore(root or get_backup_dir(), keys)
+
+
+# Arka plan denetimi: bir çalıştırmada en fazla bu kadar yedek, her yedek
+# en fazla bu sıklıkla yeniden denetlenir
+CATALOG_VERIFY_BATCH = 5
+CATALOG_RECHECK_DAYS = 7
+
+
+def get_backup_catalog() -> BackupCatalog:
+    """Yedek dizinindeki yedek kataloğunu döndürür."""
+    return BackupCatalog(get_backup_dir())
+
+
+def _record_backup(backup_path: str, **fields: Any) -> None:
+    """Yeni yedeği kataloğa ekler; katalog hatası yedeği geçersiz kılmaz."""
+    try:
+        get_backup_catalog().record(backup_path, **fields)
+    except Exception as e:
+        print(f"[backup] Yedek kataloğu güncellenemedi: {e}")
+
+
+def _describe_backup(backup_path: str) -> dict[str, Any]:
+    """Katalogda kaydı olmayan yedeğin bilgilerini dosyanın kendisinden üretir."""
+    backup_type = _detect_backup_type(backup_path)
+    info: dict[str, Any] = {
+        "type": backup_type,
+        "size": os.path.getsize(backup_path),
+        "counts": None,
+        "schema": None,
+        "encrypted": backup_type in ('password', 'machine'),
+    }
+    if backup_type == 'snapshot':
+        manifest = read_manifest(backup_path)
+        info.update(
+            size=manifest["size"],
+            counts=manifest.get("counts"),
+            schema=manifest.get("schema"),
+            encrypted=manifest["encrypted"],
+        )
+    elif backup_type == 'plain':
+        conn = sqlite3.connect(backup_path)
+        try:
+            info.update(counts=table_counts(conn), schema=schema_fingerprint(conn))
+        finally:
+            conn.close()
+    return info
+
+
+def _catalog_entry(catalog: BackupCatalog, backup_path: str, stat: os.stat_result | None = None) -> dict[str, Any]:
+    """
+    Yedeğin katalog kaydını döndürür.
+
+    Kayıt yoksa bilgiler dosyadan üretilip kaydedilir; yedek dizini
+    dışındaki dosyalar için kaydetmeden döndürülür. Kaydedildikten sonra
+    değişen dosyanın ilk özeti korunur: içerik aynıysa yalnızca kayıt
+    yenilenir, değilse yedek geçersiz işaretlenir (sonraki doğrulamalar da
+    özet uyuşmazlığını bildirir).
+    """
+    entry = catalog.lookup(backup_path, stat)
+    if entry is not None:
+        return entry
+
+    previous = catalog.recorded(backup_path)
+    if previous is None:
+        described = _describe_backup(backup_path)
+        return catalog.record(backup_path, **described) or described
+
+    checksum = file_checksum(backup_path)
+    fields = {
+        key: value for key, value in previous.items()
+        if key not in ("file_size", "mtime_ns", "checksum", "recorded_at")
+    }
+    if checksum != previous.get("checksum"):
+        try:
+            fields.update(_describe_backup(backup_path))
+        except Exception as e:
+            print(f"Değişen yedek incelenemedi: {os.path.basename(backup_path)} - {e}")
+        fields["validation"] = {
+            "ok": False,
+            "message": CHANGED_MESSAGE,
+            "checked_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        print(f"[backup] Yedek kataloğa kaydedildikten sonra değişmiş: {os.path.basename(backup_path)}")
+    return catalog.record(backup_path, checksum=previous.get("checksum"), **fields)
+
+
+def _entry_count(entry: dict[str, Any], table: str) -> Any:
+    """Katalog kaydındaki satır sayısı; bilinmiyorsa gösterim işareti."""
+    counts = entry.get("counts")
+    if counts is None:
+        return "🔒" if entry.get("encrypted") else "?"
+    return counts.get(table, "?")
+
+
+def _read_database_blocks(path: str, block_size: int):
+    """Veritabanı dosyasının düz içeriğini ``block_size``'lık bloklar halinde üretir."""
+    if is_page_encrypted(path):
+        yield from iter_page_encrypted_file(path, block_size)
+        return
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+# Adım başına kopyalanan sayfa sayısı (4 KB sayfalarla 4 MB)
+BACKUP_STEP_PAGES = 1024
+
+
+def _copy_database(
+    source_conn: sqlite3.Connection,
+    dest_conn: sqlite3.Connection,
+    progress: Callable[[int, int], None] | None = None,
+) -> None:
+    """
+    ``source_conn`` içeriğini ``dest_conn``'a adım adım kopyalar.
+
+    Her adımda en fazla ``BACKUP_STEP_PAGES`` sayfa kopyalanır ve kaynaktaki
+    okuma kilidi adımlar arasında bırakılır; canlı veritabanına yazan
+    bağlantılar kopya sürerken beklemez. Kopya sırasında kaynak başka bir
+    bağlantıdan değiştirilirse SQLite kopyayı baştan alır, sonuç yine
+    tutarlıdır.
+
+    Args:
+        progress: ``(kopyalanan_sayfa, toplam_sayfa)`` ile çağrılır
+    """
+    def report(status: int, remaining: int, total: int) -> None:
+        if progress is not None:
+            progress(total - remaining, total)
+
+    with dest_conn:
+        source_conn.backup(dest_conn, pages=BACKUP_STEP_PAGES, progress=report)
+
+
+def _progress_phase(
+    progress: Callable[[int, int], None] | None, phase: int, phases: int
+) -> Callable[[int, int], None] | None:
+    """Çok adımlı bir işlemin ``phase``. adımının ilerlemesini binde birlik ölçeğe taşır."""
+    if progress is None:
+        return None
+
+    def report(done: int, total: int) -> None:
+        permille = done * 1000 // total if total else 1000
+        progress(phase * 1000 + permille, phases * 1000)
+
+    return report
+
+
+def create_snapshot_backup(progress: Callable[[int, int], None] | None = None) -> str | None:
+    """
+    Veritabanının artımlı anlık görüntüsünü alır.
+
+    Yalnızca önceki anlık görüntülerde bulunmayan parçalar diske yazılır;
+    veritabanı son anlık görüntüden beri değişmediyse dosya hiç okunmaz.
+
+    Args:
+        progress: ``(okunan_bayt, toplam_bayt)`` ile çağrılır
+
+    Returns:
+        Manifest dosyasının yolu veya hata durumunda None
+    """
+    store = get_snapshot_store()
+    if store is None or not os.path.exists(DB_PATH):
+        return None
+
+    try:
+        path, manifest = store.snapshot(
+            connect_database_file, DB_PATH, _read_database_blocks, progress=progress
+        )
+    except Exception as e:
+        print(f"[backup] Anlık görüntü hatası: {e}")
+        return None
+
+    print(
+        f"[backup] Anlık görüntü alındı: {os.path.basename(path)} "
+        f"({_format_size(manifest['new_bytes'])} yeni veri, {manifest['duration_ms']} ms)"
+    )
+    _record_backup(
+        path,
+        type='snapshot',
+        size=manifest["size"],
+        counts=manifest["counts"],
+        schema=manifest["schema"],
+        encrypted=manifest["encrypted"],
+    )
+    return path
+
+
+def _collect_snapshot_garbage() -> None:
+    """Silinen anlık görüntülerin artık kullanılmayan parçalarını temizler."""
+    store = get_snapshot_store()
+    if store is None:
+        return
+    try:
+        removed, freed = store.collect_garbage()
+        if removed:
+            print(f"[backup] {removed} kullanılmayan yedek parçası silindi ({_format_size(freed)})")
+    except Exception as e:
+        print(f"[backup] Yedek parçası temizleme hatası: {e}")
+
+
+def create_backup(
+    custom_path: str | None = None,
+    encrypt: bool = True,
+    progress: Callable[[int, int], None] | None = None,
+) -> str | None:
     """
     Veritabanının yedeğini alır (otomatik yedekler için).
 
     Otomatik yedekler makine anahtarıyla şifrelenir ve sadece
-    aynı bilgisayarda geri yüklenebilir.
+    aynı bilgisayarda geri yüklenebilir. Varsayılan dizine alınan şifreli
+    yedekler artımlı anlık görüntü olarak saklanır; anlık görüntü
+    alınamazsa tam kopyaya geri dönülür.
 
     Args:
         custom_path: Özel yedek yolu (None ise varsayılan dizine kaydeder)
         encrypt: Makine anahtarıyla şifrele (varsayılan: True)
+        progress: ``(yapılan, toplam)`` ile çağrılan ilerleme bildirimi
 
     Returns:
         Yedek dosyasının yolu veya hata durumunda None
@@ -2815,6 +3827,11 @@ def create_backup(custom_path: str | None = None, encrypt: bool = True) -> str |
     if not os.path.exists(DB_PATH):
         return None
 
+    if custom_path is None and encrypt:
+        snapshot_path = create_snapshot_backup(progress)
+        if snapshot_path:
+            return snapshot_path
+
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         if custom_path:
@@ -2822,31 +3839,53 @@ def create_backup(custom_path: str | None = None, encrypt: bool = True) -> str |
         else:
             backup_dir = get_backup_dir()
             backup_path = os.path.join(backup_dir, f"data_backup_{timestamp}.db")
+            # Aynı saniyede alınan yedek öncekinin üzerine yazmamalı
+            counter = 1
+            while os.path.exists(backup_path):
+                backup_path = os.path.join(backup_dir, f"data_backup_{timestamp}_{counter}.db")
+                counter += 1
 
         # SQLite WAL modunda güvenli yedekleme için bağlantı kullan
-        source_conn = sqlite3.connect(DB_PATH)
+        source_conn = connect_database_file()
         dest_conn = sqlite3.connect(backup_path)
 
-        with dest_conn:
-            source_conn.backup(dest_conn)
+        _copy_database(source_conn, dest_conn, progress)
+        # Katalog için satır sayıları ve şema, şifrelemeden önce kopyadan okunur
+        counts = table_counts(dest_conn)
+        schema = schema_fingerprint(dest_conn)
 
         source_conn.close()
         dest_conn.close()
 
         # Otomatik yedekleri makine anahtarıyla şifrele
+        encrypted = False
         if encrypt and CRYPTOGRAPHY_AVAILABLE:
             if encrypt_file(backup_path):
+                encrypted = True
                 print(f"[backup] Yedek şifrelendi: {backup_path}")
             else:
                 print(f"[backup] Yedek şifrelenemedi: {backup_path}")
 
+        _record_backup(
+            backup_path,
+            type='machine' if encrypted else 'plain',
+            size=os.path.getsize(backup_path),
+            counts=counts,
+            schema=schema,
+            encrypted=encrypted,
+        )
         return backup_path
     except Exception as e:
         print(f"Yedekleme hatası: {e}")
         return None
 
 
-def create_portable_backup(dest_path: str, password: str, hint: str = "") -> tuple[bool, str]:
+def create_portable_backup(
+    dest_path: str,
+    password: str,
+    hint: str = "",
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[bool, str]:
     """
     Taşınabilir yedek oluştur (manuel yedekler için).
 
@@ -2857,6 +3896,7 @@ def create_portable_backup(dest_path: str, password: str, hint: str = "") -> tup
         dest_path: Hedef dosya yolu
         password: Kullanıcı parolası
         hint: Parola ipucu (opsiyonel)
+        progress: ``(kopyalanan_sayfa, toplam_sayfa)`` ile çağrılır
 
     Returns:
         (başarılı, mesaj) tuple
@@ -2872,11 +3912,10 @@ def create_portable_backup(dest_path: str, password: str, hint: str = "") -> tup
 
     try:
         # Önce normal yedek al (şifresiz)
-        source_conn = sqlite3.connect(DB_PATH)
+        source_conn = connect_database_file()
         dest_conn = sqlite3.connect(dest_path)
 
-        with dest_conn:
-            source_conn.backup(dest_conn)
+        _copy_database(source_conn, dest_conn, progress)
 
         source_conn.close()
         dest_conn.close()
@@ -2901,25 +3940,47 @@ def list_backups() -> list[dict[str, Any]]:
     """
     Mevcut yedekleri listeler.
 
+    Bilgiler yedek kataloğundan okunur; yedek başına yalnızca bir ``stat``
+    yapılır. Katalogda olmayan veya değişmiş yedekler bir kez incelenip
+    kataloğa eklenir.
+
     Returns:
         Yedek bilgilerini içeren sözlük listesi
     """
     backup_dir = get_backup_dir()
+    catalog = get_backup_catalog()
     backups = []
 
     try:
-        for filename in os.listdir(backup_dir):
-            if filename.startswith("data_backup_") and filename.endswith(".db"):
-                filepath = os.path.join(backup_dir, filename)
-                stat = os.stat(filepath)
-                backups.append({
-                    "filename": filename,
-                    "filepath": filepath,
-                    "size_bytes": stat.st_size,
-                    "size_display": _format_size(stat.st_size),
-                    "created_at": datetime.fromtimestamp(stat.st_mtime),
-                    "created_display": datetime.fromtimestamp(stat.st_mtime).strftime("%d.%m.%Y %H:%M"),
-                })
+        filenames = [
+            filename for filename in os.listdir(backup_dir)
+            if filename.startswith("data_backup_") and filename.endswith((".db", SNAPSHOT_SUFFIX))
+        ]
+        for filename in filenames:
+            filepath = os.path.join(backup_dir, filename)
+            stat = os.stat(filepath)
+            try:
+                entry = _catalog_entry(catalog, filepath, stat)
+            except Exception as e:
+                print(f"Yedek incelenemedi: {filename} - {e}")
+                entry = {"type": "unknown", "size": stat.st_size}
+            # Anlık görüntünün boyutu geri yüklenecek veritabanınınkidir
+            size_bytes = entry.get("size", stat.st_size)
+            backups.append({
+                "filename": filename,
+                "filepath": filepath,
+                "size_bytes": size_bytes,
+                "size_display": _format_size(size_bytes),
+                "created_at": datetime.fromtimestamp(stat.st_mtime),
+                "created_display": datetime.fromtimestamp(stat.st_mtime).strftime("%d.%m.%Y %H:%M"),
+                "backup_type": entry.get("type", "unknown"),
+                "dava_count": _entry_count(entry, "dosyalar"),
+                "user_count": _entry_count(entry, "users"),
+                "schema": entry.get("schema"),
+                "checksum": entry.get("checksum"),
+                "validation": entry.get("validation"),
+            })
+        catalog.prune(filenames)
 
         # En yeniden eskiye sırala
         backups.sort(key=lambda x: x["created_at"], reverse=True)
@@ -2982,6 +4043,9 @@ def safe_delete_file(file_path: str) -> tuple[bool, str]:
     try:
         if os.path.exists(file_path):
             os.remove(file_path)
+            get_backup_catalog().forget(file_path)
+            if file_path.endswith(SNAPSHOT_SUFFIX):
+                _collect_snapshot_garbage()
             return True, "Dosya silindi."
         return False, "Dosya bulunamadı."
     except Exception as e:
@@ -2993,30 +4057,75 @@ def get_backup_count() -> int:
     return len(list_backups())
 
 
-def cleanup_old_backups(keep_count: int = 10) -> int:
+def select_backups_to_keep(
+    backups: list[dict[str, Any]],
+    keep_count: int = 10,
+    hourly: int = 0,
+    daily: int = 0,
+    weekly: int = 0,
+) -> set[str]:
     """
-    Eski yedekleri siler, son N tanesini tutar.
+    Saklama politikasına göre tutulacak yedeklerin yollarını seçer.
+
+    En yeni ``keep_count`` yedek (en az MINIMUM_BACKUP_COUNT) her zaman
+    tutulur. Saatlik/günlük/haftalık kurallar, yedeği bulunan en yeni N
+    saatin/günün/ISO haftasının her birinden en yeni yedeği ekler. Takvim
+    yerine yedeği olan dilimler sayıldığından uygulama uzun süre
+    açılmadığında eski yedekler topluca silinmez.
+
+    Args:
+        backups: ``list_backups()`` çıktısı
+        keep_count: Her zaman tutulacak en yeni yedek sayısı
+        hourly: Tutulacak saatlik yedek sayısı
+        daily: Tutulacak günlük yedek sayısı
+        weekly: Tutulacak haftalık yedek sayısı
+
+    Returns:
+        Tutulacak yedeklerin dosya yolları
+    """
+    ordered = sorted(backups, key=lambda x: x["created_at"], reverse=True)
+    keep = {backup["filepath"] for backup in ordered[:max(keep_count, MINIMUM_BACKUP_COUNT)]}
+
+    rules = (
+        (hourly, lambda moment: (moment.date(), moment.hour)),
+        (daily, lambda moment: moment.date()),
+        (weekly, lambda moment: moment.isocalendar()[:2]),
+    )
+    for limit, bucket_of in rules:
+        buckets: set[Any] = set()
+        for backup in ordered:
+            if len(buckets) >= limit:
+                break
+            bucket = bucket_of(backup["created_at"])
+            if bucket not in buckets:
+                # Sıralama yeniden eskiye: dilimin ilk yedeği en yenisidir
+                buckets.add(bucket)
+                keep.add(backup["filepath"])
+    return keep
+
+
+def apply_retention_policy(
+    keep_count: int = 10, hourly: int = 0, daily: int = 0, weekly: int = 0
+) -> int:
+    """
+    Saklama politikasının dışında kalan yedekleri siler.
 
     ÖNEMLİ: Minimum yedek sayısının (3) altına asla düşülmez.
 
     Args:
-        keep_count: Tutulacak yedek sayısı
+        keep_count: Her zaman tutulacak en yeni yedek sayısı
+        hourly: Tutulacak saatlik yedek sayısı
+        daily: Tutulacak günlük yedek sayısı
+        weekly: Tutulacak haftalık yedek sayısı
 
     Returns:
         Silinen yedek sayısı
     """
     backups = list_backups()
+    keep = select_backups_to_keep(backups, keep_count, hourly, daily, weekly)
+    to_delete = [backup for backup in backups if backup["filepath"] not in keep]
     deleted = 0
 
-    # Minimum yedek garantisi - en az MINIMUM_BACKUP_COUNT yedek tutulmalı
-    effective_keep = max(keep_count, MINIMUM_BACKUP_COUNT)
-
-    if len(backups) <= effective_keep:
-        return 0
-
-    # En yeni effective_keep kadarını tut, gerisini sil
-    to_delete = backups[effective_keep:]
-
     for backup in to_delete:
         # Ana veritabanı kontrolü (paranoyak güvenlik)
         if is_main_database(backup["filepath"]):
@@ -3029,9 +4138,29 @@ def cleanup_old_backups(keep_count: int = 10) -> int:
         except Exception as e:
             print(f"Yedek silme hatası: {backup['filename']} - {e}")
 
+    if to_delete:
+        get_backup_catalog().forget(*(backup["filepath"] for backup in to_delete))
+    if any(backup["filepath"].endswith(SNAPSHOT_SUFFIX) for backup in to_delete):
+        _collect_snapshot_garbage()
+
     return deleted
 
 
+def cleanup_old_backups(keep_count: int = 10) -> int:
+    """
+    Eski yedekleri siler, son N tanesini tutar.
+
+    ÖNEMLİ: Minimum yedek sayısının (3) altına asla düşülmez.
+
+    Args:
+        keep_count: Tutulacak yedek sayısı
+
+    Returns:
+        Silinen yedek sayısı
+    """
+    return apply_retention_policy(keep_count)
+
+
 def get_backup_type(backup_path: str) -> str:
     """
     Yedek dosyasının türünü belirle.
@@ -3039,13 +4168,24 @@ def get_backup_type(backup_path: str) -> str:
     Returns:
         'password': Parola korumalı (taşınabilir)
         'machine': Makine anahtarıyla şifreli (yerel)
+        'snapshot': Artımlı anlık görüntü manifesti (yerel)
         'plain': Şifresiz SQLite
         'unknown': Bilinmeyen format
     """
     if not os.path.exists(backup_path):
         return 'unknown'
 
-    if is_password_protected_backup(backup_path):
+    entry = get_backup_catalog().lookup(backup_path)
+    if entry is not None:
+        return entry["type"]
+    return _detect_backup_type(backup_path)
+
+
+def _detect_backup_type(backup_path: str) -> str:
+    """Yedek türünü dosya başlığından belirler (bkz. ``get_backup_type``)."""
+    if is_snapshot_manifest(backup_path):
+        return 'snapshot'
+    elif is_password_protected_backup(backup_path):
         return 'password'
     elif is_fernet_encrypted(backup_path):
         return 'machine'
@@ -3061,7 +4201,9 @@ def get_backup_type(backup_path: str) -> str:
         return 'unknown'
 
 
-def restore_backup(backup_path: str) -> tuple[bool, str]:
+def restore_backup(
+    backup_path: str, progress: Callable[[int, int], None] | None = None
+) -> tuple[bool, str]:
     """
     Yedekten geri yükleme yapar.
 
@@ -3076,12 +4218,27 @@ def restore_backup(backup_path: str) -> tuple[bool, str]:
     6. Geri yükleme yapılır
     7. Başarısız olursa pre-restore'dan geri dönülür
 
+    Geri yükleme süresince diğer iş parçacıklarının veritabanı erişimi
+    bekletilir (bkz. ``exclusive_database_access``).
+
     Args:
         backup_path: Yedek dosyasının yolu
+        progress: ``(yapılan, toplam)`` ile çağrılan ilerleme bildirimi
+            (güvenlik yedeği ve geri yükleme kopyası)
 
     Returns:
         (başarılı, mesaj) tuple
     """
+    try:
+        with exclusive_database_access():
+            return _restore_backup(backup_path, progress)
+    except PoolBusyError:
+        return False, DATABASE_BUSY_MESSAGE
+
+
+def _restore_backup(
+    backup_path: str, progress: Callable[[int, int], None] | None
+) -> tuple[bool, str]:
     import tempfile
 
     # 1. Yedek dosyası var mı?
@@ -3120,6 +4277,21 @@ def restore_backup(backup_path: str) -> tuple[bool, str]:
 
         actual_backup_path = temp_backup
 
+    if backup_type == 'snapshot':
+        store = get_snapshot_store(os.path.dirname(backup_path))
+        if store is None:
+            return False, "Anlık görüntü yedekleri SQLCipher ile kullanılamaz"
+
+        # Parçalardan geçici veritabanı dosyası oluştur
+        temp_fd, temp_backup = tempfile.mkstemp(suffix='.db')
+        os.close(temp_fd)
+        try:
+            store.export(backup_path, temp_backup)
+        except SnapshotError as e:
+            return False, f"Anlık görüntü okunamadı: {e}"
+
+        actual_backup_path = temp_backup
+
     try:
         # 5. Yedek dosyasını doğrula
         is_valid, validation_msg = validate_backup_file(actual_backup_path)
@@ -3134,10 +4306,9 @@ def restore_backup(backup_path: str) -> tuple[bool, str]:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         pre_restore_backup = os.path.join(get_backup_dir(), f"pre_restore_{timestamp}.db")
 
-        source_conn = sqlite3.connect(DB_PATH)
+        source_conn = connect_database_file()
         pre_conn = sqlite3.connect(pre_restore_backup)
-        with pre_conn:
-            source_conn.backup(pre_conn)
+        _copy_database(source_conn, pre_conn, _progress_phase(progress, 0, 2))
         source_conn.close()
         pre_conn.close()
 
@@ -3149,10 +4320,10 @@ def restore_backup(backup_path: str) -> tuple[bool, str]:
             return False, f"Güvenlik yedeği oluşturulamadı: {pre_msg}"
 
         # 8. Yedeği geri yükle (actual_backup_path kullan)
+        close_all_connections()
         backup_conn = sqlite3.connect(actual_backup_path)
-        dest_conn = sqlite3.connect(DB_PATH)
-        with dest_conn:
-            backup_conn.backup(dest_conn)
+        dest_conn = connect_database_file()
+        _copy_database(backup_conn, dest_conn, _progress_phase(progress, 1, 2))
         backup_conn.close()
         dest_conn.close()
 
@@ -3168,9 +4339,8 @@ def restore_backup(backup_path: str) -> tuple[bool, str]:
             print("Pre-restore yedeğinden geri dönülüyor...")
 
             rollback_conn = sqlite3.connect(pre_restore_backup)
-            rollback_dest = sqlite3.connect(DB_PATH)
-            with rollback_dest:
-                rollback_conn.backup(rollback_dest)
+            rollback_dest = connect_database_file()
+            _copy_database(rollback_conn, rollback_dest)
             rollback_conn.close()
             rollback_dest.close()
 
@@ -3190,9 +4360,8 @@ def restore_backup(backup_path: str) -> tuple[bool, str]:
                 print("Pre-restore yedeğinden geri dönülüyor...")
 
                 rollback_conn = sqlite3.connect(pre_restore_backup)
-                rollback_dest = sqlite3.connect(DB_PATH)
-                with rollback_dest:
-                    rollback_conn.backup(rollback_dest)
+                rollback_dest = connect_database_file()
+                _copy_database(rollback_conn, rollback_dest)
                 rollback_conn.close()
                 rollback_dest.close()
 
@@ -3203,17 +4372,33 @@ def restore_backup(backup_path: str) -> tuple[bool, str]:
         return False, f"Geri yükleme hatası: {e}"
 
 
-def restore_portable_backup(backup_path: str, password: str) -> tuple[bool, str]:
+def restore_portable_backup(
+    backup_path: str, password: str, progress: Callable[[int, int], None] | None = None
+) -> tuple[bool, str]:
     """
     Parola korumalı (taşınabilir) yedeği geri yükle.
 
+    Geri yükleme süresince diğer iş parçacıklarının veritabanı erişimi
+    bekletilir (bkz. ``exclusive_database_access``).
+
     Args:
         backup_path: Yedek dosyasının yolu
         password: Kullanıcı parolası
+        progress: ``(yapılan, toplam)`` ile çağrılan ilerleme bildirimi
 
     Returns:
         (başarılı, mesaj) tuple
     """
+    try:
+        with exclusive_database_access():
+            return _restore_portable_backup(backup_path, password, progress)
+    except PoolBusyError:
+        return False, DATABASE_BUSY_MESSAGE
+
+
+def _restore_portable_backup(
+    backup_path: str, password: str, progress: Callable[[int, int], None] | None
+) -> tuple[bool, str]:
     import tempfile
 
     if not os.path.exists(backup_path):
@@ -3246,18 +4431,17 @@ def restore_portable_backup(backup_path: str, password: str) -> tuple[bool, str]
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         pre_restore_backup = os.path.join(get_backup_dir(), f"pre_restore_{timestamp}.db")
 
-        source_conn = sqlite3.connect(DB_PATH)
+        source_conn = connect_database_file()
         pre_conn = sqlite3.connect(pre_restore_backup)
-        with pre_conn:
-            source_conn.backup(pre_conn)
+        _copy_database(source_conn, pre_conn, _progress_phase(progress, 0, 2))
         source_conn.close()
         pre_conn.close()
 
         # Yedeği geri yükle
+        close_all_connections()
         backup_conn = sqlite3.connect(temp_backup)
-        dest_conn = sqlite3.connect(DB_PATH)
-        with dest_conn:
-            backup_conn.backup(dest_conn)
+        dest_conn = connect_database_file()
+        _copy_database(backup_conn, dest_conn, _progress_phase(progress, 1, 2))
         backup_conn.close()
         dest_conn.close()
 
@@ -3269,9 +4453,8 @@ def restore_portable_backup(backup_path: str, password: str) -> tuple[bool, str]
         if not restored_valid:
             # Geri yükleme başarısız - pre-restore'dan geri dön
             rollback_conn = sqlite3.connect(pre_restore_backup)
-            rollback_dest = sqlite3.connect(DB_PATH)
-            with rollback_dest:
-                rollback_conn.backup(rollback_dest)
+            rollback_dest = connect_database_file()
+            _copy_database(rollback_conn, rollback_dest)
             rollback_conn.close()
             rollback_dest.close()
             return False, f"Geri yükleme başarısız: {restored_msg}"
@@ -3366,12 +4549,29 @@ def validate_backup_file(backup_path: str) -> tuple[bool, str]:
     Yedek dosyasının geçerli olduğunu kontrol eder.
     Şifreli ve şifresiz yedekleri destekler.
 
+    Katalogdaki yedeklerin özeti de kayıttakiyle karşılaştırılır (dosyanın
+    boyutu veya değişiklik zamanı kayıttan sonra değişmiş olsa da) ve sonuç
+    kataloğa yazılır.
+
     Args:
         backup_path: Yedek dosyasının yolu
 
     Returns:
         (geçerli, mesaj) tuple
     """
+    is_valid, message = _validate_backup_file(backup_path)
+    catalog = get_backup_catalog()
+    if is_valid and catalog.recorded(backup_path) is not None:
+        # Başlığı kontrol edilebilen şifreli yedeklerde bozulmayı özet yakalar
+        is_valid, checksum_msg = catalog.verify_checksum(backup_path)
+        if not is_valid:
+            message = checksum_msg
+    catalog.record_validation(backup_path, is_valid, message)
+    return is_valid, message
+
+
+def _validate_backup_file(backup_path: str) -> tuple[bool, str]:
+    """Dosyanın kendisini doğrular (bkz. ``validate_backup_file``)."""
     if not os.path.exists(backup_path):
         return False, "Dosya bulunamadı."
 
@@ -3380,29 +4580,36 @@ def validate_backup_file(backup_path: str) -> tuple[bool, str]:
         return False, "Dosya boş."
 
     try:
+        # Artımlı anlık görüntü: tüm parçalar mevcut ve kimlikleriyle uyumlu olmalı
+        if is_snapshot_manifest(backup_path):
+            store = get_snapshot_store(os.path.dirname(backup_path))
+            if store is None:
+                return False, "Anlık görüntü yedekleri SQLCipher ile kullanılamaz."
+            return store.verify(backup_path)
+
         with open(backup_path, "rb") as f:
             header = f.read(32)
 
-        # Parola korumalı yedek kontrolü (TAKIBI_BACKUP_V2 marker)
-        if header.startswith(b'TAKIBI_BACKUP_V2'):
+        # Parola korumalı yedek kontrolü (TAKIBI_BACKUP_V2/V3 marker)
+        if header.startswith((b'TAKIBI_BACKUP_V2', b'TAKIBI_BACKUP_V3')):
             # Minimum boyut kontrolü (marker + hint_len + salt + en az biraz veri)
             if file_size < 50:
                 return False, "Parola korumalı yedek dosyası bozuk (çok küçük)."
             return True, "Parola korumalı yedek dosyası geçerli."
 
-        # Fernet şifreli yedek kontrolü (makine anahtarıyla)
-        # Fernet token'lar 'gAAAAA' ile başlar (base64)
-        if header.startswith(b'gAAAAA'):
+        # Makine anahtarıyla şifreli yedek kontrolü (TAKIBI_ENC_V1/V2 marker,
+        # eski sürümlerde marker'sız Fernet token'ı: 'gAAAAA' ile başlar)
+        if header.startswith((b'TAKIBI_ENC_V1\x00', b'TAKIBI_ENC_V2\x00', b'gAAAAA')):
             if file_size < 100:
                 return False, "Şifreli yedek dosyası bozuk (çok küçük)."
             return True, "Şifreli yedek dosyası geçerli."
 
-        # Düz SQLite yedek kontrolü
-        if not header.startswith(b"SQLite format 3"):
+        # Düz veya sayfa şifreli SQLite kontrolü
+        if not header.startswith((b"SQLite format 3", b"TAKIBI_VFS_V1\x00")):
             return False, "Geçerli bir yedek dosyası değil."
 
         # Veritabanına bağlanmayı dene
-        conn = sqlite3.connect(backup_path)
+        conn = connect_database_file(backup_path)
         cursor = conn.cursor()
 
         # integrity_check çalıştır
@@ -3431,11 +4638,65 @@ def validate_backup_file(backup_path: str) -> tuple[bool, str]:
         return False, f"Doğrulama hatası: {e}"
 
 
+def verify_backup_catalog(
+    progress: Callable[[int, int], None] | None = None,
+    limit: int | None = CATALOG_VERIFY_BATCH,
+    max_age_days: float = CATALOG_RECHECK_DAYS,
+) -> list[tuple[str, bool, str]]:
+    """
+    Katalogdaki yedekleri arka planda tembelce denetler.
+
+    Hiç doğrulanmamış yedekler bir kez tam doğrulamadan geçer; daha önce
+    doğrulananların yalnızca özeti (anlık görüntülerde parçaları da)
+    yeniden hesaplanır. Her çalıştırmada en eski denetimden başlayarak en
+    fazla ``limit`` yedek ele alınır.
+
+    Args:
+        progress: ``(denetlenen, toplam)`` ile çağrılır
+        limit: Bu çalıştırmada denetlenecek en fazla yedek sayısı
+        max_age_days: Son denetimi bundan yeni olan yedekler atlanır
+
+    Returns:
+        (dosya adı, geçerli, mesaj) listesi
+    """
+    catalog = get_backup_catalog()
+    paths = catalog.pending_checks(timedelta(days=max_age_days), limit)
+    results = []
+    for index, path in enumerate(paths):
+        if progress is not None:
+            progress(index, len(paths))
+        if not os.path.exists(path):
+            catalog.forget(path)
+            continue
+
+        entry = catalog.lookup(path)
+        if entry is None or entry["validation"] is None:
+            is_valid, message = validate_backup_file(path)
+        else:
+            is_valid, message = catalog.verify_checksum(path)
+            if is_valid and entry["type"] == 'snapshot':
+                store = get_snapshot_store(os.path.dirname(path))
+                if store is None:
+                    is_valid, message = False, "Anlık görüntü yedekleri SQLCipher ile kullanılamaz."
+                else:
+                    is_valid, message = store.verify(path)
+            catalog.record_validation(path, is_valid, message)
+        if not is_valid:
+            print(f"[backup] Yedek denetimi başarısız: {os.path.basename(path)} - {message}")
+        results.append((os.path.basename(path), is_valid, message))
+
+    if progress is not None:
+        progress(len(paths), len(paths))
+    return results
+
+
 def get_backup_info(backup_path: str) -> dict[str, Any] | None:
     """
     Yedek dosyası hakkında detaylı bilgi döndürür.
     Şifreli ve şifresiz yedekleri destekler.
 
+    Yedek dizinindeki dosyaların bilgileri katalogdan okunur.
+
     Args:
         backup_path: Yedek dosyasının yolu
 
@@ -3447,41 +4708,21 @@ def get_backup_info(backup_path: str) -> dict[str, Any] | None:
 
     try:
         stat = os.stat(backup_path)
-        backup_type = get_backup_type(backup_path)
-
-        base_info = {
+        entry = _catalog_entry(get_backup_catalog(), backup_path, stat)
+        return {
             "filepath": backup_path,
             "filename": os.path.basename(backup_path),
-            "size_bytes": stat.st_size,
-            "size_display": _format_size(stat.st_size),
+            "size_bytes": entry["size"],
+            "size_display": _format_size(entry["size"]),
             "created_at": datetime.fromtimestamp(stat.st_mtime),
             "created_display": datetime.fromtimestamp(stat.st_mtime).strftime("%d.%m.%Y %H:%M"),
-            "backup_type": backup_type,
+            "backup_type": entry["type"],
+            "dava_count": _entry_count(entry, "dosyalar"),
+            "user_count": _entry_count(entry, "users"),
+            "encrypted": entry["encrypted"],
+            "schema": entry.get("schema"),
+            "validation": entry.get("validation"),
         }
-
-        # Şifreli yedekler için detaylı bilgi alınamaz
-        if backup_type in ('password', 'machine'):
-            base_info["dava_count"] = "🔒"
-            base_info["user_count"] = "🔒"
-            base_info["encrypted"] = True
-            return base_info
-
-        # Düz SQLite yedekler için detaylı bilgi al
-        conn = sqlite3.connect(backup_path)
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT COUNT(*) FROM dosyalar")
-        dosya_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM users")
-        user_count = cursor.fetchone()[0]
-
-        conn.close()
-
-        base_info["dava_count"] = dosya_count
-        base_info["user_count"] = user_count
-        base_info["encrypted"] = False
-        return base_info
     except Exception:
         return None
 
@@ -3605,7 +4846,7 @@ def get_case_folder_path(dosya_id: int) -> str | None:
     Returns:
         Klasör yolu veya None (dava bulunamazsa)
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_database_file()
     try:
         cur = conn.cursor()
         cur.execute(
@@ -3745,7 +4986,7 @@ def add_case_attachment(dosya_id: int, source_path: str, description: str = "")
     mime_type = mime_type or "application/octet-stream"
 
     # 8. Veritabanına kaydet
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_database_file()
     try:
         cur = conn.cursor()
         cur.execute(
@@ -3788,7 +5029,7 @@ def get_case_attachments(dosya_id: int) -> list[dict[str, Any]]:
     Returns:
         Ek listesi
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_database_file()
     try:
         cur = conn.cursor()
         cur.execute(
@@ -3840,7 +5081,7 @@ def remove_case_attachment(attachment_id: int, delete_file: bool = True) -> bool
     Returns:
         Başarılı ise True
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_database_file()
     try:
         cur = conn.cursor()
 
@@ -3919,7 +5160,7 @@ def open_attachment_file(attachment_id: int) -> bool:
     import subprocess
     import platform
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_database_file()
     try:
         cur = conn.cursor()
         cur.execute(
@@ -3988,8 +5229,11 @@ def encrypt_database_on_shutdown() -> bool:
         return False
 
     try:
+        # Havuzdaki açık bağlantılar şifrelenen dosyayı tutmamalı
+        close_all_connections()
+
         # WAL checkpoint yap - tüm değişiklikleri ana dosyaya yaz
-        conn = sqlite3.connect(DB_PATH)
+        conn = connect_database_file()
         conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
         conn.close()
 
@@ -11,8 +11,10 @@ import logging
 import os
 import shutil
 import sqlite3
+import struct
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Callable, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +68,30 @@ def get_machine_id() -> str:
         return hashlib.sha256(fallback.encode()).hexdigest()
 
 
+# Türetilmiş anahtarlar süreç boyunca değişmez; makine ID sorgusu (PowerShell/
+# lsblk) ve binlerce hash turu yalnızca ilk çağrıda yapılır.
+_KEY_CACHE: dict[str, Any] = {}
+_KEY_CACHE_LOCK = threading.Lock()
+
+
+def _cached_key(name: str, compute: Callable[[], Any]) -> Any:
+    value = _KEY_CACHE.get(name)
+    if value is not None:
+        return value
+    with _KEY_CACHE_LOCK:
+        value = _KEY_CACHE.get(name)
+        if value is None:
+            value = compute()
+            _KEY_CACHE[name] = value
+    return value
+
+
+def clear_key_cache() -> None:
+    """Önbelleğe alınmış anahtarları temizle (test ve benchmark için)."""
+    with _KEY_CACHE_LOCK:
+        _KEY_CACHE.clear()
+
+
 def derive_db_key() -> str:
     """
     Veritabanı şifreleme anahtarını türet.
@@ -74,9 +100,15 @@ def derive_db_key() -> str:
     - Makine ID (donanım parmak izi)
     - Uygulama secret
 
+    Sonuç süreç boyunca önbellekte tutulur.
+
     Returns:
         64 karakterlik hex string (256-bit anahtar)
     """
+    return _cached_key("db", _compute_db_key)
+
+
+def _compute_db_key() -> str:
     machine_id = get_machine_id()
     combined = f"{APP_SECRET}:{machine_id}"
 
@@ -92,12 +124,18 @@ def derive_fernet_key() -> bytes:
     """
     Cryptography/Fernet için anahtar türet.
 
+    Sonuç süreç boyunca önbellekte tutulur.
+
     Returns:
         32-byte base64-encoded key for Fernet
     """
     if not CRYPTOGRAPHY_AVAILABLE:
         raise RuntimeError("Cryptography kütüphanesi yüklü değil")
 
+    return _cached_key("fernet", _compute_fernet_key)
+
+
+def _compute_fernet_key() -> bytes:
     from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
     from cryptography.hazmat.primitives import hashes
     import base64
@@ -117,9 +155,113 @@ def derive_fernet_key() -> bytes:
     return key
 
 
+# ============ AKIŞLI ŞİFRELEME ============
+#
+# Dosya sabit boyutlu parçalar halinde AES-256-GCM ile şifrelenir; bellekte
+# en fazla iki parça tutulur ve base64 şişmesi olmaz. Her parçanın nonce'u
+# dosyaya özgü rastgele önek + parça sırası + son parça bayrağından oluşur:
+# parçaların yeri değiştirilemez, dosyanın parça sınırından kesilmesi de
+# fark edilir. Başlığın tamamı her parçaya ek veri (AAD) olarak bağlanır.
+#
+# Format (başlıktan sonra):
+# - 4 byte: parça boyutu (little-endian)
+# - 7 byte: nonce öneki
+# - Her parça: şifreli veri + 16 byte GCM etiketi
+
+ENC_MARKER_V1 = b'TAKIBI_ENC_V1\x00'  # 14 byte, tek Fernet token'ı (yalnızca okunur)
+ENC_MARKER = b'TAKIBI_ENC_V2\x00'  # 14 byte, akışlı format
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+_NONCE_PREFIX_SIZE = 7
+_GCM_TAG_SIZE = 16
+
+
+def _stream_key(fernet_key: bytes) -> bytes:
+    """Fernet anahtarından akışlı format için ayrı bir AES-256 anahtarı türet."""
+    import base64
+
+    raw = base64.urlsafe_b64decode(fernet_key)
+    return hashlib.sha256(b'TAKIBI_STREAM_V2:' + raw).digest()
+
+
+def _chunk_nonce(prefix: bytes, index: int, last: bool) -> bytes:
+    return prefix + struct.pack('>I?', index, last)
+
+
+def _stream_encrypt(src, dst, key: bytes, header: bytes, chunk_size: Optional[int] = None) -> None:
+    """``src`` içeriğini ``header`` ile başlayan akışlı formatta ``dst``'ye yaz."""
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    chunk_size = chunk_size or STREAM_CHUNK_SIZE
+    aead = AESGCM(key)
+    prefix = os.urandom(_NONCE_PREFIX_SIZE)
+    stream_header = header + struct.pack('<I', chunk_size) + prefix
+    dst.write(stream_header)
+
+    index = 0
+    chunk = src.read(chunk_size)
+    while True:
+        next_chunk = src.read(chunk_size)
+        last = not next_chunk
+        dst.write(aead.encrypt(_chunk_nonce(prefix, index, last), chunk, stream_header))
+        if last:
+            return
+        chunk = next_chunk
+        index += 1
+
+
+def _stream_decrypt(src, dst, key: bytes, header: bytes) -> None:
+    """
+    ``header`` okunmuş bir akışlı dosyanın kalanını çözüp ``dst``'ye yaz.
+
+    Bozuk, eksik veya yanlış anahtarla açılan dosyada
+    ``cryptography.exceptions.InvalidTag`` yükseltir.
+    """
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    params = src.read(4 + _NONCE_PREFIX_SIZE)
+    if len(params) != 4 + _NONCE_PREFIX_SIZE:
+        raise ValueError("Şifreli dosya başlığı eksik")
+    chunk_size = struct.unpack('<I', params[:4])[0]
+    prefix = params[4:]
+    stream_header = header + params
+    aead = AESGCM(key)
+
+    block_size = chunk_size + _GCM_TAG_SIZE
+    index = 0
+    block = src.read(block_size)
+    while True:
+        next_block = src.read(block_size)
+        last = not next_block
+        dst.write(aead.decrypt(_chunk_nonce(prefix, index, last), block, stream_header))
+        if last:
+            return
+        block = next_block
+        index += 1
+
+
+def _rewrite_atomically(file_path: str, transform: Callable[[Any, Any], None]) -> None:
+    """
+    ``transform(src, dst)`` çıktısını geçici dosyaya yazıp ``file_path`` ile değiştir.
+
+    Yarıda kalan bir işlem özgün dosyaya dokunmaz.
+    """
+    temp_path = f"{file_path}.tmp"
+    try:
+        with open(file_path, 'rb') as src, open(temp_path, 'wb') as dst:
+            transform(src, dst)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 def encrypt_file(file_path: str, key: bytes = None) -> bool:
     """
-    Dosyayı Fernet ile şifrele.
+    Dosyayı makine anahtarıyla akışlı formatta şifrele.
 
     Args:
         file_path: Şifrelenecek dosya
@@ -132,23 +274,14 @@ def encrypt_file(file_path: str, key: bytes = None) -> bool:
         logger.warning("Cryptography yüklü değil, dosya şifrelenmedi")
         return False
 
-    from cryptography.fernet import Fernet as FernetClass
-
     try:
         if key is None:
             key = derive_fernet_key()
+        stream_key = _stream_key(key)
 
-        fernet = FernetClass(key)
-
-        with open(file_path, 'rb') as f:
-            data = f.read()
-
-        encrypted = fernet.encrypt(data)
-
-        # Şifreli dosyayı yaz (marker ile başla)
-        with open(file_path, 'wb') as f:
-            f.write(b'TAKIBI_ENC_V1\x00')  # 14 byte marker
-            f.write(encrypted)
+        _rewrite_atomically(
+            file_path, lambda src, dst: _stream_encrypt(src, dst, stream_key, ENC_MARKER)
+        )
 
         logger.info(f"Dosya şifrelendi: {file_path}")
         return True
@@ -160,7 +293,10 @@ def encrypt_file(file_path: str, key: bytes = None) -> bool:
 
 def decrypt_file(file_path: str, key: bytes = None) -> bool:
     """
-    Fernet ile şifrelenmiş dosyayı çöz.
+    Makine anahtarıyla şifrelenmiş dosyayı çöz.
+
+    Akışlı format (``TAKIBI_ENC_V2``) ile eski tek parça Fernet formatını
+    (``TAKIBI_ENC_V1``) okur.
 
     Args:
         file_path: Şifresi çözülecek dosya
@@ -179,19 +315,20 @@ def decrypt_file(file_path: str, key: bytes = None) -> bool:
         if key is None:
             key = derive_fernet_key()
 
-        fernet = FernetClass(key)
-
-        with open(file_path, 'rb') as f:
-            marker = f.read(14)
-            if marker != b'TAKIBI_ENC_V1\x00':
-                logger.warning("Dosya Fernet ile şifreli değil")
-                return False
-            encrypted = f.read()
-
-        decrypted = fernet.decrypt(encrypted)
+        def transform(src, dst):
+            marker = src.read(len(ENC_MARKER))
+            if marker == ENC_MARKER:
+                _stream_decrypt(src, dst, _stream_key(key), marker)
+            elif marker == ENC_MARKER_V1:
+                dst.write(FernetClass(key).decrypt(src.read()))
+            else:
+                raise ValueError("Dosya şifreli değil")
+
+        if not is_fernet_encrypted(file_path):
+            logger.warning("Dosya Fernet ile şifreli değil")
+            return False
 
-        with open(file_path, 'wb') as f:
-            f.write(decrypted)
+        _rewrite_atomically(file_path, transform)
 
         logger.info(f"Dosya şifresi çözüldü: {file_path}")
         return True
@@ -202,18 +339,153 @@ def decrypt_file(file_path: str, key: bytes = None) -> bool:
 
 
 def is_fernet_encrypted(file_path: str) -> bool:
-    """Dosyanın Fernet ile şifreli olup olmadığını kontrol et."""
+    """Dosyanın makine anahtarıyla şifreli olup olmadığını kontrol et (her iki format)."""
     try:
         with open(file_path, 'rb') as f:
             marker = f.read(14)
-        return marker == b'TAKIBI_ENC_V1\x00'
+        return marker in (ENC_MARKER, ENC_MARKER_V1)
     except Exception:
         return False
 
 
+# ============ SAYFA ŞİFRELİ VERİTABANI ============
+#
+# SQLCipher yokken canlı veritabanı db_vfs'teki şifreli VFS üzerinden açılır:
+# sayfalar okunurken/yazılırken şifrelenir, dosyanın tamamı hiçbir zaman düz
+# metne çevrilmez. Açılışta çöz / kapanışta şifrele akışı yalnızca VFS
+# kaydedilemezse kullanılır.
+
+PAGE_CIPHER_VFS_NAME = "takibi_enc"
+
+
+def derive_page_key(fernet_key: bytes = None) -> bytes:
+    """Fernet anahtarından sayfa şifreleme için 64 byte'lık AES-256-XTS anahtarı türet."""
+    import base64
+
+    if fernet_key is None:
+        fernet_key = derive_fernet_key()
+    raw = base64.urlsafe_b64decode(fernet_key)
+    return hashlib.sha512(b'TAKIBI_VFS_V1:' + raw).digest()
+
+
+def _db_vfs():
+    try:  # pragma: no cover - runtime import guard
+        from app import db_vfs
+    except ModuleNotFoundError:  # pragma: no cover
+        import db_vfs
+    return db_vfs
+
+
+def enable_page_encryption(key: bytes = None) -> Optional[str]:
+    """
+    Sayfa şifreli VFS'i kaydet.
+
+    Args:
+        key: Fernet anahtarı (None ise otomatik türetilir)
+
+    Returns:
+        VFS adı; cryptography yoksa veya VFS kaydedilemezse None
+    """
+    if not CRYPTOGRAPHY_AVAILABLE:
+        return None
+
+    try:
+        vfs = _db_vfs().register_page_cipher_vfs(PAGE_CIPHER_VFS_NAME, derive_page_key(key))
+    except Exception as e:
+        logger.error(f"Şifreli VFS hatası: {e}")
+        return None
+    return vfs.name if vfs is not None else None
+
+
+def is_page_encrypted(file_path: str) -> bool:
+    """Dosyanın sayfa şifreli veritabanı olup olmadığını kontrol et."""
+    return _db_vfs().is_page_encrypted(file_path)
+
+
+def page_encrypted_uri(db_path: str, vfs_name: str = PAGE_CIPHER_VFS_NAME) -> str:
+    """Veritabanını şifreli VFS ile açan URI (``sqlite3.connect(..., uri=True)`` için)."""
+    return _db_vfs().uri_for(db_path, vfs_name)
+
+
+def iter_page_encrypted_file(file_path: str, block_size: int, vfs_name: str = PAGE_CIPHER_VFS_NAME):
+    """Sayfa şifreli veritabanı dosyasının düz içeriğini bloklar halinde üret."""
+    return _db_vfs().iter_plaintext(file_path, vfs_name, block_size)
+
+
+def derive_snapshot_keys(fernet_key: bytes = None) -> Tuple[bytes, bytes]:
+    """
+    Artımlı yedek deposu için anahtarları türet.
+
+    Returns:
+        (parça kimliği için HMAC anahtarı, parça şifrelemesi için AES-256-GCM anahtarı)
+    """
+    import base64
+
+    if fernet_key is None:
+        fernet_key = derive_fernet_key()
+    raw = base64.urlsafe_b64decode(fernet_key)
+    return (
+        hashlib.sha256(b'TAKIBI_SNAPSHOT_ID_V1:' + raw).digest(),
+        hashlib.sha256(b'TAKIBI_SNAPSHOT_ENC_V1:' + raw).digest(),
+    )
+
+
+def convert_to_page_encrypted(db_path: str, vfs_name: str = PAGE_CIPHER_VFS_NAME) -> bool:
+    """
+    Düz veya dosya seviyesi şifreli veritabanını sayfa şifreli formata taşı.
+
+    Tek seferlik bir geçiştir: içerik SQLite backup API'siyle VFS üzerinden
+    geçici dosyaya kopyalanır ve özgün dosyanın yerine konur. Veritabanına
+    açık bağlantı olmamalıdır.
+
+    Returns:
+        Başarılı ise (veya dosya zaten sayfa şifreli ise) True
+    """
+    if is_page_encrypted(db_path):
+        return True
+
+    if is_fernet_encrypted(db_path) and not decrypt_file(db_path):
+        return False
+
+    temp_path = db_path + ".vfs.tmp"
+    leftovers = [temp_path + suffix for suffix in ("", "-journal", "-wal", "-shm")]
+    try:
+        for path in leftovers:
+            if os.path.exists(path):
+                os.remove(path)
+
+        src = sqlite3.connect(db_path)
+        try:
+            src.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            dst = sqlite3.connect(page_encrypted_uri(temp_path, vfs_name), uri=True)
+            try:
+                src.backup(dst)
+            finally:
+                dst.close()
+        finally:
+            src.close()
+
+        os.replace(temp_path, db_path)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+        logger.info(f"Veritabanı sayfa şifreli formata taşındı: {db_path}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Sayfa şifrelemeye geçiş hatası: {e}")
+        for path in leftovers:
+            if os.path.exists(path):
+                os.remove(path)
+        return False
+
+
 # ============ PAROLA BAZLI YEDEK ŞİFRELEME ============
 
-BACKUP_MARKER = b'TAKIBI_BACKUP_V2'  # 16 byte
+BACKUP_MARKER_V2 = b'TAKIBI_BACKUP_V2'  # 16 byte, tek Fernet token'ı (yalnızca okunur)
+BACKUP_MARKER = b'TAKIBI_BACKUP_V3'  # 16 byte, akışlı format
+BACKUP_MARKERS = (BACKUP_MARKER, BACKUP_MARKER_V2)
 
 
 def derive_key_from_password(password: str, salt: bytes) -> bytes:
@@ -250,11 +522,11 @@ def encrypt_backup_with_password(file_path: str, password: str, hint: str = "")
     Yedek dosyasını kullanıcı parolasıyla şifrele.
 
     Format:
-    - 16 byte: TAKIBI_BACKUP_V2 marker
+    - 16 byte: TAKIBI_BACKUP_V3 marker
     - 2 byte: hint uzunluğu (little-endian)
     - N byte: hint (UTF-8)
     - 16 byte: salt
-    - Rest: Fernet encrypted data
+    - Rest: akışlı şifreli veri (parça boyutu, nonce öneki, parçalar)
 
     Args:
         file_path: Şifrelenecek dosya
@@ -268,35 +540,18 @@ def encrypt_backup_with_password(file_path: str, password: str, hint: str = "")
         logger.warning("Cryptography yüklü değil")
         return False
 
-    from cryptography.fernet import Fernet as FernetClass
-    import os as _os
-
     try:
         # Salt oluştur
-        salt = _os.urandom(16)
+        salt = os.urandom(16)
 
         # Paroladan anahtar türet
-        key = derive_key_from_password(password, salt)
-        fernet = FernetClass(key)
-
-        # Dosyayı oku
-        with open(file_path, 'rb') as f:
-            data = f.read()
-
-        # Şifrele
-        encrypted = fernet.encrypt(data)
+        key = _stream_key(derive_key_from_password(password, salt))
 
         # Hint'i encode et
         hint_bytes = hint.encode('utf-8') if hint else b''
-        hint_len = len(hint_bytes)
+        header = BACKUP_MARKER + len(hint_bytes).to_bytes(2, 'little') + hint_bytes + salt
 
-        # Dosyaya yaz
-        with open(file_path, 'wb') as f:
-            f.write(BACKUP_MARKER)  # 16 byte marker
-            f.write(hint_len.to_bytes(2, 'little'))  # 2 byte hint length
-            f.write(hint_bytes)  # hint
-            f.write(salt)  # 16 byte salt
-            f.write(encrypted)  # encrypted data
+        _rewrite_atomically(file_path, lambda src, dst: _stream_encrypt(src, dst, key, header))
 
         logger.info(f"Yedek parolayla şifrelendi: {file_path}")
         return True
@@ -310,6 +565,9 @@ def decrypt_backup_with_password(file_path: str, password: str) -> bool:
     """
     Parola ile şifrelenmiş yedeği çöz.
 
+    Akışlı format (``TAKIBI_BACKUP_V3``) ile eski tek parça Fernet formatını
+    (``TAKIBI_BACKUP_V2``) okur.
+
     Args:
         file_path: Şifreli yedek dosyası
         password: Kullanıcı parolası
@@ -324,35 +582,26 @@ def decrypt_backup_with_password(file_path: str, password: str) -> bool:
     from cryptography.fernet import Fernet as FernetClass
 
     try:
-        with open(file_path, 'rb') as f:
-            # Marker kontrol
-            marker = f.read(16)
-            if marker != BACKUP_MARKER:
-                logger.warning("Dosya parola korumalı yedek değil")
-                return False
-
-            # Hint uzunluğunu oku
-            hint_len = int.from_bytes(f.read(2), 'little')
-
-            # Hint'i atla
-            f.read(hint_len)
-
-            # Salt oku
-            salt = f.read(16)
-
-            # Şifreli veriyi oku
-            encrypted = f.read()
+        if not is_password_protected_backup(file_path):
+            logger.warning("Dosya parola korumalı yedek değil")
+            return False
 
-        # Paroladan anahtar türet
-        key = derive_key_from_password(password, salt)
-        fernet = FernetClass(key)
+        def transform(src, dst):
+            # Marker, hint ve salt başlığı oluşturur
+            marker = src.read(16)
+            hint_len_bytes = src.read(2)
+            hint_bytes = src.read(int.from_bytes(hint_len_bytes, 'little'))
+            salt = src.read(16)
 
-        # Çöz
-        decrypted = fernet.decrypt(encrypted)
+            # Paroladan anahtar türet
+            key = derive_key_from_password(password, salt)
+            if marker == BACKUP_MARKER:
+                header = marker + hint_len_bytes + hint_bytes + salt
+                _stream_decrypt(src, dst, _stream_key(key), header)
+            else:
+                dst.write(FernetClass(key).decrypt(src.read()))
 
-        # Dosyaya yaz
-        with open(file_path, 'wb') as f:
-            f.write(decrypted)
+        _rewrite_atomically(file_path, transform)
 
         logger.info(f"Yedek şifresi çözüldü: {file_path}")
         return True
@@ -375,7 +624,7 @@ def get_backup_hint(file_path: str) -> str | None:
     try:
         with open(file_path, 'rb') as f:
             marker = f.read(16)
-            if marker != BACKUP_MARKER:
+            if marker not in BACKUP_MARKERS:
                 return None
 
             hint_len = int.from_bytes(f.read(2), 'little')
@@ -394,7 +643,7 @@ def is_password_protected_backup(file_path: str) -> bool:
     try:
         with open(file_path, 'rb') as f:
             marker = f.read(16)
-        return marker == BACKUP_MARKER
+        return marker in BACKUP_MARKERS
     except Exception:
         return False
 
@@ -423,13 +672,15 @@ def is_encrypted_db(db_path: str) -> bool:
         return False
 
 
-def get_encrypted_connection(db_path: str, key: Optional[str] = None):
+def get_encrypted_connection(db_path: str, key: Optional[str] = None, **connect_kwargs):
     """
     Şifreli veritabanı bağlantısı al.
 
     Args:
         db_path: Veritabanı dosya yolu
         key: Şifreleme anahtarı (None ise otomatik türetilir)
+        **connect_kwargs: Sürücünün ``connect`` fonksiyonuna aktarılır
+            (ör. ``factory``, ``check_same_thread``)
 
     Returns:
         sqlite3.Connection veya sqlcipher.Connection
@@ -438,7 +689,7 @@ def get_encrypted_connection(db_path: str, key: Optional[str] = None):
         key = derive_db_key()
 
     if SQLCIPHER_AVAILABLE and sqlcipher is not None:
-        conn = sqlcipher.connect(db_path)
+        conn = sqlcipher.connect(db_path, **connect_kwargs)
         conn.execute(f"PRAGMA key = '{key}'")
         # SQLCipher ayarları
         conn.execute("PRAGMA cipher_page_size = 4096")
@@ -449,7 +700,7 @@ def get_encrypted_connection(db_path: str, key: Optional[str] = None):
     else:
         # SQLCipher yok, normal sqlite3 kullan
         logger.warning("SQLCipher bulunamadı, şifresiz bağlantı kullanılıyor")
-        return sqlite3.connect(db_path)
+        return sqlite3.connect(db_path, **connect_kwargs)
 
 
 def migrate_to_encrypted(src_path: str, dst_path: str, key: Optional[str] = None) -> bool:
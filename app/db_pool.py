@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+TakibiEsasi Veritabanı Bağlantı Havuzu
+
+``db.get_connection()`` her çağrıda şifreleme anahtarını türetip PRAGMA'ları
+yeniden uyguluyordu. Bu modül, yapılandırılmış bağlantıları iş parçacığı
+başına küçük bir havuzda sıcak tutar. Havuzdan alınan bağlantının ``close()``
+metodu bağlantıyı kapatmak yerine havuza iade eder; böylece mevcut
+``conn = get_connection() ... conn.close()`` kalıbı değişmeden çalışır.
+
+Modül ``db.py``'nin hem ``app.db`` hem ``db`` olarak yüklendiği durumlarda da
+tek bir havuz paylaşılsın diye ayrı tutulmuştur.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# İş parçacığı başına sıcak tutulacak en fazla boşta bağlantı sayısı
+DEFAULT_MAX_IDLE_PER_THREAD = 2
+
+# exclusive() kullanımdaki bağlantıların iadesini en fazla bu kadar bekler (saniye)
+DEFAULT_EXCLUSIVE_TIMEOUT = 30.0
+
+
+class PoolBusyError(RuntimeError):
+    """Kullanımdaki bağlantılar süresinde iade edilmediği için özel erişim alınamadı."""
+
+
+class _PooledConnectionMixin:
+    """``close()`` çağrısını havuza iade işlemine çeviren bağlantı katmanı."""
+
+    _pool: "ConnectionPool | None" = None
+    _pool_key: Any = None
+    _pool_generation: int = -1
+    _pool_idle: bool = False
+
+    def close(self) -> None:  # type: ignore[override]
+        pool = self._pool
+        if pool is not None and pool.release(self):
+            return
+        self._pool_idle = False
+        super().close()  # type: ignore[misc]
+
+    def close_physical(self) -> None:
+        """Bağlantıyı havuzu atlayarak gerçekten kapat."""
+        self._pool = None
+        self._pool_idle = False
+        super().close()  # type: ignore[misc]
+
+
+_FACTORY_CACHE: dict[type, type] = {}
+_FACTORY_LOCK = threading.Lock()
+
+
+def pooled_connection_class(base: type = sqlite3.Connection) -> type:
+    """Verilen sürücü bağlantı sınıfı için havuz destekli alt sınıf döndür.
+
+    SQLCipher sürücüleri kendi ``Connection`` sınıflarını kullandığından alt
+    sınıf, sürücüye göre tembel olarak oluşturulur.
+    """
+    cls = _FACTORY_CACHE.get(base)
+    if cls is not None:
+        return cls
+    with _FACTORY_LOCK:
+        cls = _FACTORY_CACHE.get(base)
+        if cls is None:
+            cls = type("PooledConnection", (_PooledConnectionMixin, base), {})
+            _FACTORY_CACHE[base] = cls
+    return cls
+
+
+class ConnectionPool:
+    """İş parçacığı başına boşta bağlantı tutan küçük havuz.
+
+    SQLite bağlantıları iş parçacıkları arasında paylaşılmaz: her iş
+    parçacığı kendi boşta listesinden bağlantı alır. Aynı iş parçacığında iç
+    içe çağrılar (bir model fonksiyonunun diğerini çağırması) ayrı bağlantı
+    alır, böylece işlem (transaction) sınırları eskisi gibi kalır.
+    """
+
+    def __init__(self, max_idle_per_thread: int = DEFAULT_MAX_IDLE_PER_THREAD) -> None:
+        self.max_idle_per_thread = max(0, int(max_idle_per_thread))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._generation = 0
+        # close_all() için tüm boşta bağlantıların zayıf referansları
+        self._registry: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        # Kullanımdaki bağlantılar -> alan iş parçacığı; iade edilmeden
+        # bırakılan bağlantılar çöp toplamayla kendiliğinden düşer
+        self._leased: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+        # Kapıdan geçip bağlantısı henüz kaydedilmemiş acquire çağrıları
+        self._acquiring = 0
+        self._exclusive_owner: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def _idle_list(self) -> list:
+        idle = getattr(self._local, "idle", None)
+        if idle is None:
+            idle = []
+            self._local.idle = idle
+        return idle
+
+    def acquire(self, key: Any, opener: Callable[[], sqlite3.Connection]) -> sqlite3.Connection:
+        """``key`` (genellikle veritabanı yolu) için bağlantı al.
+
+        Boşta uygun bağlantı yoksa ``opener`` çağrılır. ``opener``,
+        :func:`pooled_connection_class` ile üretilmiş bir sınıfın örneğini
+        döndürmelidir; aksi halde bağlantı havuza hiç iade edilmez.
+        Başka bir iş parçacığı :meth:`exclusive` içindeyse çağrı onun
+        bitmesini bekler.
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            while self._exclusive_owner not in (None, ident):
+                self._released.wait()
+            self._acquiring += 1
+        try:
+            conn = self._acquire(key, opener)
+        finally:
+            with self._lock:
+                self._acquiring -= 1
+                self._released.notify_all()
+        return conn
+
+    def _acquire(self, key: Any, opener: Callable[[], sqlite3.Connection]) -> sqlite3.Connection:
+        idle = self._idle_list()
+        while idle:
+            conn = idle.pop()
+            with self._lock:
+                self._registry.discard(conn)
+                current = conn._pool_generation == self._generation
+                if current and conn._pool_key == key:
+                    self._leased[conn] = threading.get_ident()
+            if current and conn._pool_key == key:
+                conn._pool_idle = False
+                self.hits += 1
+                return conn
+            self._discard(conn)
+
+        self.misses += 1
+        conn = opener()
+        if isinstance(conn, _PooledConnectionMixin):
+            conn._pool = self
+            conn._pool_key = key
+            conn._pool_generation = self._generation
+            conn._pool_idle = False
+            with self._lock:
+                self._leased[conn] = threading.get_ident()
+        return conn
+
+    def release(self, conn: Any) -> bool:
+        """Bağlantıyı havuza iade etmeyi dene.
+
+        Returns:
+            Bağlantı havuzda tutulduysa True, çağıranın kapatması gerekiyorsa False
+        """
+        if conn._pool_idle:
+            # Aynı bağlantı iki kez kapatıldı, ikinci çağrı etkisiz
+            return True
+        with self._lock:
+            if self._leased.pop(conn, None) is not None:
+                self._released.notify_all()
+        if conn._pool_generation != self._generation:
+            return False
+        try:
+            # Commit edilmemiş değişiklikler eskiden close() ile atılıyordu
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            return False
+
+        idle = self._idle_list()
+        if len(idle) >= self.max_idle_per_thread:
+            return False
+        conn._pool_idle = True
+        idle.append(conn)
+        with self._lock:
+            self._registry.add(conn)
+        return True
+
+    def close_all(self) -> int:
+        """Tüm boşta bağlantıları kapat ve kullanımdakileri geçersiz kıl.
+
+        Kullanımdaki bağlantılar iade edildiklerinde gerçekten kapatılır.
+        Veritabanı dosyası şifrelenmeden, geri yüklenmeden veya taşınmadan
+        önce çağrılmalıdır.
+
+        Returns:
+            Kapatılan boşta bağlantı sayısı
+        """
+        with self._lock:
+            self._generation += 1
+            pending = list(self._registry)
+            self._registry = weakref.WeakSet()
+        closed = 0
+        for conn in pending:
+            try:
+                conn.close_physical()
+                closed += 1
+            except Exception as exc:  # pragma: no cover - kapanış güvenliği
+                logger.debug("Havuz bağlantısı kapatılamadı: %s", exc)
+        self._local = threading.local()
+        return closed
+
+    @contextmanager
+    def exclusive(self, timeout: float = DEFAULT_EXCLUSIVE_TIMEOUT) -> Iterator[None]:
+        """Veritabanı dosyası değiştirilirken havuzu çağıran iş parçacığına ayır.
+
+        Diğer iş parçacıklarının yeni ``acquire`` çağrıları blok bitene kadar
+        bekletilir; kullanımdaki bağlantılarının iadesi beklenir, ardından
+        tüm boşta bağlantılar kapatılır (:meth:`close_all`). Böylece geri
+        yükleme gibi işlemler başka iş parçacığının sorgusu sürerken
+        bağlantı kapatmaz.
+
+        Raises:
+            PoolBusyError: ``timeout`` saniye içinde iade edilmeyen bağlantı
+                kaldıysa (havuz eski haline döner)
+        """
+        ident = threading.get_ident()
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while self._exclusive_owner not in (None, ident):
+                self._released.wait()
+            if self._exclusive_owner == ident:
+                # İç içe kullanım: dış blok erişimi zaten tutuyor
+                nested = True
+            else:
+                nested = False
+                self._exclusive_owner = ident
+                while self._acquiring or any(owner != ident for owner in self._leased.values()):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._exclusive_owner = None
+                        self._released.notify_all()
+                        raise PoolBusyError("Veritabanı bağlantıları iade edilmedi")
+                    # Çöp toplanan bağlantılar bildirim yapmaz; kısa aralıklarla yeniden bakılır
+                    self._released.wait(min(remaining, 0.05))
+        if nested:
+            yield
+            return
+        try:
+            self.close_all()
+            yield
+        finally:
+            with self._lock:
+                self._exclusive_owner = None
+                self._released.notify_all()
+
+    def _discard(self, conn: Any) -> None:
+        try:
+            conn.close_physical()
+        except Exception:  # pragma: no cover - kapanış güvenliği
+            pass
+
+    def stats(self) -> dict[str, int]:
+        """Havuz isabet istatistiklerini döndür (benchmark ve teşhis için)."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "idle": len(self._registry),
+            "generation": self._generation,
+        }
+
+
+# Süreç genelinde paylaşılan havuz
+CONNECTION_POOL = ConnectionPool()
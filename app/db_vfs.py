@@ -0,0 +1,591 @@
+# -*- coding: utf-8 -*-
+"""
+TakibiEsasi Sayfa Şifreli SQLite VFS Katmanı
+
+SQLCipher kurulu değilken veritabanı, ``sqlite3`` modülünün kullandığı
+SQLite kütüphanesine ctypes ile kaydedilen bir "shim" VFS üzerinden açılır.
+VFS her işi varsayılan VFS'e (unix/win32) devreder; yalnızca kalıcı
+dosyaların (ana veritabanı, rollback journal, WAL) okuma ve yazmalarını
+4 KiB'lık birimler halinde AES-256-XTS ile şifreler/çözer. Böylece
+veritabanı hiçbir zaman diskte düz metin olarak bulunmaz ve açılış süresi
+dosya boyutundan bağımsızdır.
+
+Şifreli dosya düzeni:
+- 4096 byte başlık: marker, mantıksal boyut, dosya tuzu, anahtar doğrulama
+- Her 4096 byte'lık birim ayrı şifrelenir (tweak = birim numarası + dosya tuzu)
+
+XTS uzunluk koruyan bir disk şifreleme kipidir; bütünlük doğrulaması
+yapmaz. Kısmi birim yazmaları oku-değiştir-yaz ile yapıldığından VFS,
+SQLite'a sektör boyutu olarak birim boyutunu bildirir ve "powersafe
+overwrite" yeteneğini gizler; SQLite bu durumda birimleri bütün olarak
+journal'a alır.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import hmac
+import logging
+import os
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+from typing import Dict, Iterator, Optional
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+VFS_MARKER = b'TAKIBI_VFS_V1\x00'  # 14 byte
+UNIT_SIZE = 4096
+HEADER_SIZE = UNIT_SIZE
+_SIZE_OFFSET = 16
+_SALT_OFFSET = 24
+_CHECK_OFFSET = 32
+
+# sqlite3.h sabitleri
+SQLITE_OK = 0
+SQLITE_IOERR = 10
+SQLITE_NOTFOUND = 12
+SQLITE_NOTADB = 26
+SQLITE_IOERR_SHORT_READ = SQLITE_IOERR | (2 << 8)
+SQLITE_OPEN_MAIN_DB = 0x00000100
+SQLITE_OPEN_MAIN_JOURNAL = 0x00000800
+SQLITE_OPEN_SUBJOURNAL = 0x00002000
+SQLITE_OPEN_SUPER_JOURNAL = 0x00004000
+SQLITE_OPEN_WAL = 0x00080000
+SQLITE_FCNTL_SIZE_HINT = 5
+SQLITE_IOCAP_ATOMIC_MASK = 0x000001FF  # SQLITE_IOCAP_ATOMIC ... ATOMIC64K
+SQLITE_IOCAP_POWERSAFE_OVERWRITE = 0x00001000
+
+# Diskte kalan dosyalar şifrelenir; geçici dosyalar doğrudan alttaki VFS'e gider
+_ENCRYPTED_FILE_TYPES = (
+    SQLITE_OPEN_MAIN_DB | SQLITE_OPEN_MAIN_JOURNAL | SQLITE_OPEN_SUBJOURNAL
+    | SQLITE_OPEN_SUPER_JOURNAL | SQLITE_OPEN_WAL
+)
+
+_c_int = ctypes.c_int
+_c_int64 = ctypes.c_int64
+_c_void_p = ctypes.c_void_p
+_CFUNC = ctypes.CFUNCTYPE
+
+
+class sqlite3_file(ctypes.Structure):
+    _fields_ = [("pMethods", _c_void_p)]
+
+
+class sqlite3_io_methods(ctypes.Structure):
+    _fields_ = [
+        ("iVersion", _c_int),
+        ("xClose", _CFUNC(_c_int, _c_void_p)),
+        ("xRead", _CFUNC(_c_int, _c_void_p, _c_void_p, _c_int, _c_int64)),
+        ("xWrite", _CFUNC(_c_int, _c_void_p, _c_void_p, _c_int, _c_int64)),
+        ("xTruncate", _CFUNC(_c_int, _c_void_p, _c_int64)),
+        ("xSync", _CFUNC(_c_int, _c_void_p, _c_int)),
+        ("xFileSize", _CFUNC(_c_int, _c_void_p, ctypes.POINTER(_c_int64))),
+        ("xLock", _CFUNC(_c_int, _c_void_p, _c_int)),
+        ("xUnlock", _CFUNC(_c_int, _c_void_p, _c_int)),
+        ("xCheckReservedLock", _CFUNC(_c_int, _c_void_p, ctypes.POINTER(_c_int))),
+        ("xFileControl", _CFUNC(_c_int, _c_void_p, _c_int, _c_void_p)),
+        ("xSectorSize", _CFUNC(_c_int, _c_void_p)),
+        ("xDeviceCharacteristics", _CFUNC(_c_int, _c_void_p)),
+        ("xShmMap", _CFUNC(_c_int, _c_void_p, _c_int, _c_int, _c_int, _c_void_p)),
+        ("xShmLock", _CFUNC(_c_int, _c_void_p, _c_int, _c_int, _c_int)),
+        ("xShmBarrier", _CFUNC(None, _c_void_p)),
+        ("xShmUnmap", _CFUNC(_c_int, _c_void_p, _c_int)),
+        ("xFetch", _CFUNC(_c_int, _c_void_p, _c_int64, _c_int, _c_void_p)),
+        ("xUnfetch", _CFUNC(_c_int, _c_void_p, _c_int64, _c_void_p)),
+    ]
+
+
+class sqlite3_vfs(ctypes.Structure):
+    pass
+
+
+sqlite3_vfs._fields_ = [
+    ("iVersion", _c_int),
+    ("szOsFile", _c_int),
+    ("mxPathname", _c_int),
+    ("pNext", _c_void_p),
+    ("zName", ctypes.c_char_p),
+    ("pAppData", _c_void_p),
+    ("xOpen", _CFUNC(_c_int, _c_void_p, _c_void_p, _c_void_p, _c_int, ctypes.POINTER(_c_int))),
+    ("xDelete", _CFUNC(_c_int, _c_void_p, _c_void_p, _c_int)),
+    ("xAccess", _CFUNC(_c_int, _c_void_p, _c_void_p, _c_int, ctypes.POINTER(_c_int))),
+    ("xFullPathname", _CFUNC(_c_int, _c_void_p, _c_void_p, _c_int, _c_void_p)),
+    ("xDlOpen", _CFUNC(_c_void_p, _c_void_p, _c_void_p)),
+    ("xDlError", _CFUNC(None, _c_void_p, _c_int, _c_void_p)),
+    ("xDlSym", _CFUNC(_c_void_p, _c_void_p, _c_void_p, _c_void_p)),
+    ("xDlClose", _CFUNC(None, _c_void_p, _c_void_p)),
+    ("xRandomness", _CFUNC(_c_int, _c_void_p, _c_int, _c_void_p)),
+    ("xSleep", _CFUNC(_c_int, _c_void_p, _c_int)),
+    ("xCurrentTime", _CFUNC(_c_int, _c_void_p, ctypes.POINTER(ctypes.c_double))),
+    ("xGetLastError", _CFUNC(_c_int, _c_void_p, _c_int, _c_void_p)),
+    ("xCurrentTimeInt64", _CFUNC(_c_int, _c_void_p, ctypes.POINTER(_c_int64))),
+]
+
+# Alttaki VFS'in sqlite3_file yapısı bu kaydırmadan başlar (ilk alan bizim pMethods)
+_INNER_OFFSET = ctypes.sizeof(_c_void_p)
+
+
+class PageCipher:
+    """Birim numarasını ve dosya tuzunu tweak olarak kullanan AES-256-XTS."""
+
+    def __init__(self, key: bytes):
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+        if len(key) != 64:
+            raise ValueError("XTS anahtarı 64 byte olmalı")
+        self._key = key
+        self._cipher = lambda tweak: Cipher(algorithms.AES(key), modes.XTS(tweak))
+        self.key_check = hmac.new(key, VFS_MARKER, hashlib.sha256).digest()[:16]
+
+    def file_salt(self, path: bytes) -> bytes:
+        return hmac.new(self._key, b'salt:' + path, hashlib.sha256).digest()[:8]
+
+    @staticmethod
+    def _tweak(salt: bytes, index: int) -> bytes:
+        return struct.pack('<Q', index) + salt
+
+    def encrypt(self, salt: bytes, index: int, data: bytes) -> bytes:
+        encryptor = self._cipher(self._tweak(salt, index)).encryptor()
+        return encryptor.update(data) + encryptor.finalize()
+
+    def decrypt(self, salt: bytes, index: int, data: bytes) -> bytes:
+        decryptor = self._cipher(self._tweak(salt, index)).decryptor()
+        return decryptor.update(data) + decryptor.finalize()
+
+
+class _EncryptedFile:
+    """Bir şifreli dosyanın alttaki VFS dosyası üzerindeki okuma/yazma mantığı."""
+
+    def __init__(self, inner: int, methods: sqlite3_io_methods, cipher: PageCipher):
+        self.inner = inner
+        self.methods = methods
+        self.cipher = cipher
+        self.salt = b''
+
+    def _read(self, length: int, offset: int) -> tuple:
+        buf = ctypes.create_string_buffer(length)
+        rc = self.methods.xRead(self.inner, buf, length, offset)
+        return rc, buf.raw
+
+    def _write(self, data: bytes, offset: int) -> int:
+        return self.methods.xWrite(self.inner, data, len(data), offset)
+
+    def initialize(self, path: bytes) -> int:
+        """Yeni dosyaya başlık yazar, mevcut dosyanın başlığını ve anahtarını doğrular."""
+        size = _c_int64(0)
+        rc = self.methods.xFileSize(self.inner, ctypes.byref(size))
+        if rc != SQLITE_OK:
+            return rc
+        if size.value == 0:
+            # Tuz yoldan türetilir: aynı dosyayı aynı anda oluşturan iki bağlantı
+            # (ör. WAL) birbirinin başlığını farklı bir tuzla ezemez
+            self.salt = self.cipher.file_salt(path)
+            header = bytearray(HEADER_SIZE)
+            header[:len(VFS_MARKER)] = VFS_MARKER
+            header[_SALT_OFFSET:_SALT_OFFSET + 8] = self.salt
+            header[_CHECK_OFFSET:_CHECK_OFFSET + 16] = self.cipher.key_check
+            # Salt okunur açılışta yazılamaz; dosya boş kalır ve boyutu 0 okunur
+            self._write(bytes(header), 0)
+            return SQLITE_OK
+
+        rc, header = self._read(_CHECK_OFFSET + 16, 0)
+        if rc != SQLITE_OK or not header.startswith(VFS_MARKER):
+            logger.error("Dosya sayfa şifreli formatta değil")
+            return SQLITE_NOTADB
+        if not hmac.compare_digest(header[_CHECK_OFFSET:_CHECK_OFFSET + 16], self.cipher.key_check):
+            logger.error("Sayfa şifreli veritabanı bu anahtarla açılamıyor")
+            return SQLITE_NOTADB
+        self.salt = header[_SALT_OFFSET:_SALT_OFFSET + 8]
+        return SQLITE_OK
+
+    def logical_size(self) -> int:
+        # Başka bağlantılar dosyayı büyütmüş olabilir; boyut her seferinde başlıktan okunur
+        rc, raw = self._read(8, _SIZE_OFFSET)
+        return struct.unpack('<Q', raw)[0] if rc == SQLITE_OK else 0
+
+    def _set_logical_size(self, size: int) -> int:
+        return self._write(struct.pack('<Q', size), _SIZE_OFFSET)
+
+    def _load_unit(self, index: int, logical_size: int) -> bytearray:
+        """Birimin düz metni; mantıksal boyutun ötesi sıfırdır."""
+        start = index * UNIT_SIZE
+        if start >= logical_size:
+            return bytearray(UNIT_SIZE)
+        rc, raw = self._read(UNIT_SIZE, HEADER_SIZE + start)
+        if rc != SQLITE_OK:
+            return bytearray(UNIT_SIZE)
+        plain = bytearray(self.cipher.decrypt(self.salt, index, raw))
+        valid = logical_size - start
+        if valid < UNIT_SIZE:
+            plain[valid:] = bytes(UNIT_SIZE - valid)
+        return plain
+
+    def read(self, buf: int, amount: int, offset: int) -> int:
+        logical_size = self.logical_size()
+        end = min(offset + amount, logical_size)
+        copied = 0
+        if end > offset:
+            first, last = offset // UNIT_SIZE, (end - 1) // UNIT_SIZE
+            count = last - first + 1
+            rc, raw = self._read(count * UNIT_SIZE, HEADER_SIZE + first * UNIT_SIZE)
+            if rc not in (SQLITE_OK, SQLITE_IOERR_SHORT_READ):
+                return rc
+            if rc == SQLITE_IOERR_SHORT_READ:
+                # Başlıkta yazan boyuta karşılık birim yok (yarım kalmış yazma)
+                return self._read_units_individually(buf, offset, end, amount, logical_size)
+            plain = b''.join(
+                self.cipher.decrypt(self.salt, first + i, raw[i * UNIT_SIZE:(i + 1) * UNIT_SIZE])
+                for i in range(count)
+            )
+            skip = offset - first * UNIT_SIZE
+            copied = end - offset
+            ctypes.memmove(buf, plain[skip:skip + copied], copied)
+        if copied < amount:
+            ctypes.memset(buf + copied, 0, amount - copied)
+            return SQLITE_IOERR_SHORT_READ
+        return SQLITE_OK
+
+    def _read_units_individually(self, buf: int, offset: int, end: int, amount: int,
+                                 logical_size: int) -> int:
+        plain = b''.join(
+            bytes(self._load_unit(index, logical_size))
+            for index in range(offset // UNIT_SIZE, (end - 1) // UNIT_SIZE + 1)
+        )
+        skip = offset % UNIT_SIZE
+        ctypes.memmove(buf, plain[skip:skip + end - offset], end - offset)
+        if end - offset < amount:
+            ctypes.memset(buf + end - offset, 0, amount - (end - offset))
+            return SQLITE_IOERR_SHORT_READ
+        return SQLITE_OK
+
+    def write(self, data: bytes, offset: int) -> int:
+        logical_size = self.logical_size()
+        end = offset + len(data)
+        first, last = offset // UNIT_SIZE, (end - 1) // UNIT_SIZE
+        # Mantıksal sonun ötesine yazılıyorsa aradaki birimler şifreli sıfırla doldurulur
+        start = min(first, logical_size // UNIT_SIZE)
+
+        encrypted = []
+        for index in range(start, last + 1):
+            unit_start = index * UNIT_SIZE
+            lo, hi = max(offset, unit_start), min(end, unit_start + UNIT_SIZE)
+            if lo == unit_start and hi == unit_start + UNIT_SIZE:
+                plain = data[lo - offset:hi - offset]
+            else:
+                plain = self._load_unit(index, logical_size)
+                if hi > lo:
+                    plain[lo - unit_start:hi - unit_start] = data[lo - offset:hi - offset]
+            encrypted.append(self.cipher.encrypt(self.salt, index, bytes(plain)))
+
+        rc = self._write(b''.join(encrypted), HEADER_SIZE + start * UNIT_SIZE)
+        if rc == SQLITE_OK and end > logical_size:
+            rc = self._set_logical_size(end)
+        return rc
+
+    def truncate(self, size: int) -> int:
+        logical_size = self.logical_size()
+        if size > logical_size:
+            return self.write(bytes(size - logical_size), logical_size)
+        if size % UNIT_SIZE:
+            # Son birimin kesilen kısmı sonradan büyüyünce sıfır okunmalı
+            index = size // UNIT_SIZE
+            plain = self._load_unit(index, size)
+            rc = self._write(self.cipher.encrypt(self.salt, index, bytes(plain)), HEADER_SIZE + index * UNIT_SIZE)
+            if rc != SQLITE_OK:
+                return rc
+        units = -(-size // UNIT_SIZE)
+        rc = self.methods.xTruncate(self.inner, HEADER_SIZE + units * UNIT_SIZE)
+        if rc != SQLITE_OK:
+            return rc
+        return self._set_logical_size(size)
+
+
+def _guarded(default_rc: int):
+    """VFS geri çağrısındaki Python hatasını SQLite hata koduna çevirir."""
+
+    def decorate(fn):
+        # Yorumlayıcı kapanırken açık kalan bağlantılar modül silindikten sonra
+        # kapatılabilir; SQLite hatayı görür, WAL bir sonraki açılışta işlenir
+        def wrapper(*args, _logger=logger, _finalizing=sys.is_finalizing):
+            try:
+                return fn(*args)
+            except Exception:
+                if not _finalizing():
+                    _logger.exception(f"Şifreli VFS hatası ({fn.__name__})")
+                return default_rc
+
+        wrapper.__name__ = fn.__name__
+        return wrapper
+
+    return decorate
+
+
+class PageCipherVFS:
+    """Varsayılan VFS'i saran ve kalıcı dosyaları ``PageCipher`` ile şifreleyen VFS."""
+
+    def __init__(self, name: str, cipher: PageCipher, lib: ctypes.CDLL):
+        self.name = name
+        self.cipher = cipher
+        self._lib = lib
+        self._files: Dict[int, _EncryptedFile] = {}
+        self._files_lock = threading.Lock()
+
+        lib.sqlite3_vfs_find.restype = ctypes.POINTER(sqlite3_vfs)
+        lib.sqlite3_vfs_find.argtypes = [ctypes.c_char_p]
+        lib.sqlite3_vfs_register.argtypes = [ctypes.POINTER(sqlite3_vfs), _c_int]
+        lib.sqlite3_vfs_unregister.argtypes = [ctypes.POINTER(sqlite3_vfs)]
+
+        inner_ptr = lib.sqlite3_vfs_find(None)
+        if not inner_ptr:
+            raise RuntimeError("Varsayılan SQLite VFS bulunamadı")
+        self._inner_ptr = ctypes.cast(inner_ptr, _c_void_p).value
+        self._inner = inner_ptr.contents
+
+        self._io_methods = self._build_io_methods()
+        self._name_bytes = name.encode('utf-8')
+        self._vfs = self._build_vfs()
+
+    # ----- VFS -----
+
+    def _build_vfs(self) -> sqlite3_vfs:
+        inner = self._inner
+        fields = dict(sqlite3_vfs._fields_)
+
+        def delegate(field: str, rc: int = SQLITE_IOERR):
+            target = getattr(inner, field)
+            return fields[field](_guarded(rc)(lambda _vfs, *args: target(self._inner_ptr, *args)))
+
+        vfs = sqlite3_vfs()
+        vfs.iVersion = 2
+        vfs.szOsFile = _INNER_OFFSET + inner.szOsFile
+        vfs.mxPathname = inner.mxPathname
+        vfs.zName = self._name_bytes
+        vfs.xOpen = fields["xOpen"](_guarded(SQLITE_IOERR)(self._x_open))
+        for field in ("xDelete", "xAccess", "xFullPathname", "xRandomness", "xSleep",
+                      "xCurrentTime", "xGetLastError"):
+            setattr(vfs, field, delegate(field))
+        for field in ("xDlOpen", "xDlError", "xDlSym", "xDlClose"):
+            setattr(vfs, field, delegate(field, None))
+        if inner.iVersion >= 2 and inner.xCurrentTimeInt64:
+            vfs.xCurrentTimeInt64 = delegate("xCurrentTimeInt64")
+        return vfs
+
+    def register(self) -> None:
+        self._lib.sqlite3_vfs_register(ctypes.byref(self._vfs), 0)
+
+    def unregister(self) -> None:
+        self._lib.sqlite3_vfs_unregister(ctypes.byref(self._vfs))
+
+    def _x_open(self, _vfs, name, pfile, flags, out_flags) -> int:
+        if not name or not flags & _ENCRYPTED_FILE_TYPES:
+            # Geçici dosya alttaki VFS'in yapısıyla açılır; Python maliyeti olmaz
+            return self._inner.xOpen(self._inner_ptr, name, pfile, flags, out_flags)
+
+        file_struct = sqlite3_file.from_address(pfile)
+        inner = pfile + _INNER_OFFSET
+        rc = self._inner.xOpen(self._inner_ptr, name, inner, flags, out_flags)
+        if rc != SQLITE_OK:
+            file_struct.pMethods = None
+            return rc
+
+        methods = ctypes.cast(sqlite3_file.from_address(inner).pMethods,
+                              ctypes.POINTER(sqlite3_io_methods)).contents
+        handle = _EncryptedFile(inner, methods, self.cipher)
+        rc = handle.initialize(ctypes.string_at(name))
+        if rc != SQLITE_OK:
+            methods.xClose(inner)
+            file_struct.pMethods = None
+            return rc
+        with self._files_lock:
+            self._files[pfile] = handle
+        file_struct.pMethods = ctypes.addressof(self._io_methods)
+        return SQLITE_OK
+
+    # ----- Dosya işlemleri -----
+
+    def _file(self, pfile: int) -> _EncryptedFile:
+        return self._files[pfile]
+
+    def _build_io_methods(self) -> sqlite3_io_methods:
+        fields = dict(sqlite3_io_methods._fields_)
+
+        def method(field: str, fn, rc: int = SQLITE_IOERR):
+            return fields[field](_guarded(rc)(fn))
+
+        def delegate(field: str, rc: int = SQLITE_IOERR):
+            def call(pfile, *args):
+                handle = self._file(pfile)
+                return getattr(handle.methods, field)(handle.inner, *args)
+            call.__name__ = field
+            return method(field, call, rc)
+
+        def x_close(pfile):
+            with self._files_lock:
+                handle = self._files.pop(pfile)
+            return handle.methods.xClose(handle.inner)
+
+        def x_file_size(pfile, size_out):
+            size_out[0] = self._file(pfile).logical_size()
+            return SQLITE_OK
+
+        def x_file_control(pfile, op, arg):
+            if op == SQLITE_FCNTL_SIZE_HINT:
+                # İpucu mantıksal boyuttur; fiziksel dosyayı alttaki VFS büyütmemeli
+                return SQLITE_OK
+            handle = self._file(pfile)
+            return handle.methods.xFileControl(handle.inner, op, arg)
+
+        def x_device_characteristics(pfile):
+            handle = self._file(pfile)
+            caps = handle.methods.xDeviceCharacteristics(handle.inner)
+            # Kısmi yazma tüm birimi yeniden yazar; atomik/powersafe garantisi verilemez
+            return caps & ~(SQLITE_IOCAP_ATOMIC_MASK | SQLITE_IOCAP_POWERSAFE_OVERWRITE)
+
+        io = sqlite3_io_methods()
+        # 3. sürümün xFetch/xUnfetch (mmap) işlevleri şifreyi atlardı; 2. sürüm bildirilir
+        io.iVersion = 2
+        io.xClose = method("xClose", x_close)
+        io.xRead = method("xRead", lambda pfile, buf, amount, offset: self._file(pfile).read(buf, amount, offset))
+        io.xWrite = method(
+            "xWrite",
+            lambda pfile, buf, amount, offset: self._file(pfile).write(ctypes.string_at(buf, amount), offset),
+        )
+        io.xTruncate = method("xTruncate", lambda pfile, size: self._file(pfile).truncate(size))
+        io.xFileSize = method("xFileSize", x_file_size)
+        io.xFileControl = method("xFileControl", x_file_control, SQLITE_NOTFOUND)
+        io.xSectorSize = method("xSectorSize", lambda pfile: UNIT_SIZE, UNIT_SIZE)
+        io.xDeviceCharacteristics = method("xDeviceCharacteristics", x_device_characteristics, 0)
+        for field in ("xSync", "xLock", "xUnlock", "xCheckReservedLock", "xShmMap", "xShmLock", "xShmUnmap"):
+            setattr(io, field, delegate(field))
+        io.xShmBarrier = delegate("xShmBarrier", None)
+        return io
+
+
+def _library_candidates() -> Iterator[str]:
+    """``sqlite3`` modülünün bağlı olduğu SQLite kütüphanesi için aday yollar."""
+    try:
+        import _sqlite3
+        # Linux/macOS: modülün tanıtıcısı bağımlılıklarındaki sembolleri de bulur
+        if getattr(_sqlite3, "__file__", None):
+            yield _sqlite3.__file__
+    except ImportError:
+        pass
+    # Windows: python ile gelen sqlite3.dll süreçte zaten yüklüdür
+    yield "sqlite3"
+    found = ctypes.util.find_library("sqlite3")
+    if found:
+        yield found
+
+
+def _vfs_works(name: str) -> bool:
+    """Kaydedilen VFS ``sqlite3`` modülünden görünüyor ve çalışıyor mu?"""
+    probe_dir = tempfile.mkdtemp(prefix="takibi_vfs_")
+    probe = os.path.join(probe_dir, "probe.db")
+    try:
+        conn = sqlite3.connect(uri_for(probe, name), uri=True)
+        try:
+            conn.execute("CREATE TABLE t (x)")
+            conn.execute("INSERT INTO t VALUES ('deneme')")
+            conn.commit()
+            return conn.execute("SELECT x FROM t").fetchone()[0] == 'deneme'
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    finally:
+        for leftover in os.listdir(probe_dir):
+            os.remove(os.path.join(probe_dir, leftover))
+        os.rmdir(probe_dir)
+
+
+_REGISTERED: Dict[str, PageCipherVFS] = {}
+_REGISTER_LOCK = threading.Lock()
+
+
+def register_page_cipher_vfs(name: str, key: bytes) -> Optional[PageCipherVFS]:
+    """
+    ``name`` adlı şifreli VFS'i kaydet.
+
+    ``sqlite3`` modülünün kullandığı SQLite kütüphanesine ulaşılamazsa None
+    döner; çağıran dosya seviyesi şifrelemeye geri dönmelidir.
+    """
+    with _REGISTER_LOCK:
+        existing = _REGISTERED.get(name)
+        if existing is not None:
+            return existing
+        cipher = PageCipher(key)
+        for candidate in _library_candidates():
+            try:
+                vfs = PageCipherVFS(name, cipher, ctypes.CDLL(candidate))
+            except (OSError, AttributeError, RuntimeError):
+                continue
+            vfs.register()
+            if _vfs_works(name):
+                _REGISTERED[name] = vfs
+                return vfs
+            vfs.unregister()
+        logger.warning("Şifreli VFS kaydedilemedi: sqlite3 kütüphanesine erişilemiyor")
+        return None
+
+
+def uri_for(path: str, vfs_name: str) -> str:
+    """``path`` dosyasını ``vfs_name`` üzerinden açan SQLite URI'si."""
+    posix_path = os.path.abspath(path).replace(os.sep, '/')
+    if not posix_path.startswith('/'):
+        posix_path = '/' + posix_path  # Windows: file:/C:/...
+    return f"file:{quote(posix_path, safe='/:')}?vfs={vfs_name}"
+
+
+def is_page_encrypted(path: str) -> bool:
+    """Dosyanın bu VFS'in formatında olup olmadığını kontrol et."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(VFS_MARKER)) == VFS_MARKER
+    except OSError:
+        return False
+
+
+def iter_plaintext(path: str, vfs_name: str, block_size: int = 16 * UNIT_SIZE) -> Iterator[bytes]:
+    """
+    Sayfa şifreli dosyanın düz içeriğini ``block_size``'lık bloklar halinde üret.
+
+    Dosya SQLite'a uğramadan okunur; tutarlı bir görüntü için çağıran,
+    dosyanın bu sırada değişmediğini (ör. açık bir okuma işlemiyle)
+    garanti etmelidir.
+    """
+    if block_size % UNIT_SIZE:
+        raise ValueError("Blok boyutu birim boyutunun katı olmalı")
+    vfs = _REGISTERED.get(vfs_name)
+    if vfs is None:
+        raise RuntimeError(f"Şifreli VFS kayıtlı değil: {vfs_name}")
+    cipher = vfs.cipher
+
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+        if not header.startswith(VFS_MARKER):
+            raise ValueError("Dosya sayfa şifreli formatta değil")
+        if not hmac.compare_digest(header[_CHECK_OFFSET:_CHECK_OFFSET + 16], cipher.key_check):
+            raise ValueError("Sayfa şifreli dosya bu anahtarla açılamıyor")
+        salt = header[_SALT_OFFSET:_SALT_OFFSET + 8]
+        remaining = struct.unpack_from('<Q', header, _SIZE_OFFSET)[0]
+
+        index = 0
+        while remaining > 0:
+            wanted = min(block_size, -(-remaining // UNIT_SIZE) * UNIT_SIZE)
+            raw = f.read(wanted)
+            units = len(raw) // UNIT_SIZE
+            plain = b''.join(
+                cipher.decrypt(salt, index + i, raw[i * UNIT_SIZE:(i + 1) * UNIT_SIZE])
+                for i in range(units)
+            )
+            # Diskte karşılığı olmayan birimler sıfır okunur (VFS okumasıyla aynı)
+            plain += bytes(wanted - len(plain))
+            index += wanted // UNIT_SIZE
+            yield plain[:remaining]
+            remaining -= min(wanted, remaining)
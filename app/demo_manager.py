@@ -12,6 +12,11 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 import os
 
+try:  # pragma: no cover - runtime import guard
+    from app.db import connect_database_file
+except ModuleNotFoundError:  # pragma: no cover
+    from db import connect_database_file
+
 
 class DemoManager:
     """Demo modu yönetim sınıfı"""
@@ -37,8 +42,8 @@ class DemoManager:
         self._init_demo_table()
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Veritabanı bağlantısı al"""
-        conn = sqlite3.connect(self.db_path)
+        """Veritabanı bağlantısı al (sayfa şifreli dosyalar şifreli VFS ile açılır)"""
+        conn = connect_database_file(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -26,9 +26,14 @@ def resource_path(relative_path: str) -> str:
     return os.path.join(base_path, relative_path)
 
 try:  # pragma: no cover - runtime import guard
-    from app.db import initialize_database, auto_backup_on_startup, get_database_path, encrypt_database_on_shutdown
+    from app.db import initialize_database, get_database_path, encrypt_database_on_shutdown
 except ModuleNotFoundError:  # pragma: no cover
-    from db import initialize_database, auto_backup_on_startup, get_database_path, encrypt_database_on_shutdown
+    from db import initialize_database, get_database_path, encrypt_database_on_shutdown
+
+try:  # pragma: no cover - runtime import guard
+    from app.backup_scheduler import get_backup_scheduler, load_schedule_settings
+except ModuleNotFoundError:  # pragma: no cover
+    from backup_scheduler import get_backup_scheduler, load_schedule_settings
 
 try:  # pragma: no cover - runtime import guard
     from app.ui_main import MainWindow
@@ -222,16 +227,6 @@ def main():
     initialize_database()
     ensure_vekalet_dir_exists()
 
-    # Otomatik yedekleme (ayarlara göre)
-    settings = QSettings("MyCompany", "TakibiEsasi")
-    auto_backup_enabled = settings.value("backup/auto_backup", True, type=bool)
-    backup_keep_count = settings.value("backup/keep_count", 10, type=int)
-
-    if auto_backup_enabled:
-        backup_path = auto_backup_on_startup(keep_count=backup_keep_count)
-        if backup_path:
-            print(f"Otomatik yedekleme oluşturuldu: {backup_path}")
-
     app = QApplication(sys.argv)
     load_theme_from_settings_and_apply()
 
@@ -281,7 +276,13 @@ def main():
     window.showMaximized()
     print("Veritabanı oluşturuldu")
 
-    # Uygulama kapanırken veritabanını şifrele
+    # Otomatik yedekleme arka planda, pencere açıldıktan sonra (ayarlara göre)
+    scheduler = get_backup_scheduler()
+    scheduler.configure(**load_schedule_settings(QSettings("MyCompany", "TakibiEsasi")))
+    scheduler.start()
+
+    # Uygulama kapanırken süren yedeği bekle, ardından veritabanını şifrele
+    app.aboutToQuit.connect(scheduler.stop)
     app.aboutToQuit.connect(encrypt_database_on_shutdown)
 
     sys.exit(app.exec())
@@ -3,7 +3,6 @@ from typing import Any, Dict, Iterable, List, Optional, Set
 import csv
 import os
 import sqlite3
-import shutil
 import logging
 from pathlib import Path
 from datetime import datetime, date, timedelta
@@ -32,6 +31,9 @@ except ModuleNotFoundError:  # pragma: no cover
 try:  # pragma: no cover - runtime import guard
     from app.db import (
         get_connection,
+        connection_scope,
+        connect_database_file,
+        copy_database_file,
         DB_PATH,
         DEFAULT_ROLE_PERMISSIONS,
         PERMISSION_ACTIONS,
@@ -40,11 +42,32 @@ try:  # pragma: no cover - runtime import guard
 except ModuleNotFoundError:  # pragma: no cover
     from db import (
         get_connection,
+        connection_scope,
+        connect_database_file,
+        copy_database_file,
         DB_PATH,
         DEFAULT_ROLE_PERMISSIONS,
         PERMISSION_ACTIONS,
         timed_query,
     )
+try:  # pragma: no cover - runtime import guard
+    from app.case_query import (
+        CasePageKey,
+        case_page_key,
+        durusma_period_range,
+        query_case_page,
+        query_cases,
+    )
+    from app.search import build_match_query, case_id_filter, has_search_index, global_search
+except ModuleNotFoundError:  # pragma: no cover
+    from case_query import (
+        CasePageKey,
+        case_page_key,
+        durusma_period_range,
+        query_case_page,
+        query_cases,
+    )
+    from search import build_match_query, case_id_filter, has_search_index, global_search
 from openpyxl import Workbook
 from docx import Document
 from docx.oxml import OxmlElement
@@ -407,33 +430,23 @@ def add_dosya(data: Dict[str, Any]) -> int:
         conn.close()
 
 def list_dosyalar() -> List[sqlite3.Row]:
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM dosyalar")
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    with connection_scope() as conn:
+        return conn.execute("SELECT * FROM dosyalar").fetchall()
 
 
 def get_next_buro_takip_no() -> int:
     """Bir sonraki uygun büro takip numarasını döndürür."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT COALESCE(MAX(buro_takip_no), 0) + 1 FROM dosyalar")
-    value = cur.fetchone()[0]
-    conn.close()
+    with connection_scope() as conn:
+        value = conn.execute(
+            "SELECT COALESCE(MAX(buro_takip_no), 0) + 1 FROM dosyalar"
+        ).fetchone()[0]
     return int(value)
 
 
 def get_dosya(dosya_id: int) -> Optional[Dict[str, Any]]:
     """Belirtilen kimliğe sahip tek bir dosya kaydını döndürür."""
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM dosyalar WHERE id = ?", (dosya_id,))
-    row = cur.fetchone()
-    conn.close()
+    with connection_scope() as conn:
+        row = conn.execute("SELECT * FROM dosyalar WHERE id = ?", (dosya_id,)).fetchone()
     return dict(row) if row else None
 
 
@@ -818,7 +831,11 @@ def get_finans_master_list_bound_only(
     *,
     include_archived: bool = False,
 ) -> List[sqlite3.Row]:
-    """Return only finance records linked to dossier entries."""
+    """Return only finance records linked to dossier entries.
+
+    Totals, next due date and assignees come precomputed from
+    ``finans_summary``.
+    """
 
     owns_conn = False
     if conn is None:
@@ -829,48 +846,31 @@ def get_finans_master_list_bound_only(
         cur = conn.cursor()
         cur.execute(
             """
-            WITH next_due AS (
-                SELECT finans_id, MIN(vade_tarihi) AS next_due_date
-                FROM taksitler
-                WHERE durum != 'Ödendi'
-                GROUP BY finans_id
-            ),
-            overdue AS (
-                SELECT finans_id
-                FROM taksitler
-                WHERE durum != 'Ödendi' AND vade_tarihi < DATE('now')
-                GROUP BY finans_id
-            ),
-            assignments AS (
-                SELECT dosya_id, GROUP_CONCAT(user_id) AS user_ids
-                FROM dosya_atamalar
-                GROUP BY dosya_id
-            )
             SELECT
-                f.id AS finans_id,
-                f.dosya_id,
+                s.finans_id,
+                s.dosya_id,
                 f.sozlesme_ucreti,
                 f.sozlesme_ucreti_cents,
                 f.sozlesme_yuzdesi,
                 f.tahsil_hedef_cents,
-                f.tahsil_edilen_cents,
-                f.masraf_toplam_cents,
-                f.masraf_tahsil_cents,
+                s.tahsil_edilen_cents,
+                s.masraf_toplam_cents,
+                s.masraf_tahsil_cents,
+                s.toplam_ucret_cents,
+                s.kalan_bakiye_cents,
                 f.yuzde_is_sonu,
                 d.buro_takip_no,
                 d.dosya_esas_no,
                 d.muvekkil_adi,
                 d.is_archived,
-                next_due.next_due_date,
-                CASE WHEN overdue.finans_id IS NOT NULL THEN 1 ELSE 0 END AS has_overdue_installment,
-                assignments.user_ids AS assigned_user_ids
-            FROM finans f
-            JOIN dosyalar d ON d.id = f.dosya_id
-            LEFT JOIN next_due ON next_due.finans_id = f.id
-            LEFT JOIN overdue ON overdue.finans_id = f.id
-            LEFT JOIN assignments ON assignments.dosya_id = f.dosya_id
+                s.next_due_date,
+                CASE WHEN s.next_due_date < DATE('now') THEN 1 ELSE 0 END AS has_overdue_installment,
+                s.assigned_user_ids
+            FROM finans_summary s
+            JOIN finans f ON f.id = s.finans_id
+            JOIN dosyalar d ON d.id = s.dosya_id
             WHERE (? = 1 OR COALESCE(d.is_archived, 0) = 0)
-            ORDER BY f.id DESC
+            ORDER BY s.finans_id DESC
             """,
             (1 if include_archived else 0,),
         )
@@ -1060,150 +1060,52 @@ def fetch_dosyalar_by_color_hex(
     other_filters: Optional[Dict[str, Any]] = None,
     archived: bool = False,
     assigned_user_id: int | None = None,
+    ids: Optional[Iterable[int]] = None,
 ) -> List[Dict[str, Any]]:
-    """Renk koduna, arama parametrelerine ve arşiv durumuna göre kayıtları döndürür."""
+    """Renk koduna, arama parametrelerine ve arşiv durumuna göre kayıtları döndürür.
 
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+    ``ids`` verilirse yalnızca bu dosyalar döner (değişiklik akışı ile satır
+    bazlı yenileme için).
+    """
 
-    cur.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='dosya_durumlari'"
+    return query_cases(
+        hex6,
+        search_text=search_text,
+        open_only=open_only,
+        other_filters=other_filters,
+        archived=archived,
+        assigned_user_id=assigned_user_id,
+        ids=ids,
     )
-    has_history = cur.fetchone() is not None
 
-    params: Dict[str, Any] = {
-        "is_archived": 1 if archived else 0,
-    }
-    where_clauses: List[str] = ["d.is_archived = :is_archived"]
 
-    if assigned_user_id is not None:
-        params["assigned_user_id"] = int(assigned_user_id)
-        where_clauses.append(
-            "EXISTS (SELECT 1 FROM dosya_atamalar da WHERE da.dosya_id = d.id AND da.user_id = :assigned_user_id)"
-        )
-
-    if hex6:
-        params["hex6"] = hex6
-        where_clauses.append(
-            "(UPPER(REPLACE(sd1.color_hex,'#','')) = :hex6 "
-            "OR UPPER(REPLACE(sd2.color_hex,'#','')) = :hex6 "
-            "OR UPPER(REPLACE(sa.color_hex,'#','')) = :hex6)"
-        )
-
-    durusma_period = None
-    if other_filters:
-        durusma_period = other_filters.get("durusma_period")
-
-    if open_only and not archived:
-        where_clauses.append(
-            "NOT ("
-            "UPPER(COALESCE(NULLIF(d.dava_durumu,''),'')) = 'DOSYA KAPANDI' "
-            "OR UPPER(COALESCE(NULLIF(d.tekrar_dava_durumu_2,''),'')) = 'DOSYA KAPANDI'"
-            ")"
-        )
-
-    if durusma_period:
-        today = date.today()
-        start: Optional[date] = None
-        end: Optional[date] = None
-        if durusma_period == "bu_hafta":
-            start = today - timedelta(days=today.weekday())
-            end = start + timedelta(days=6)
-        elif durusma_period == "gelecek_hafta":
-            start = today + timedelta(days=7 - today.weekday())
-            end = start + timedelta(days=6)
-        elif durusma_period == "bu_ay":
-            start = today.replace(day=1)
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            end = today.replace(day=last_day)
-        if start and end:
-            where_clauses.append("d.durusma_tarihi BETWEEN :durusma_start AND :durusma_end")
-            params["durusma_start"] = start.isoformat()
-            params["durusma_end"] = end.isoformat()
-
-    if has_history:
-        base_query = """
-        WITH last_status AS (
-            SELECT dd.dosya_id,
-                   dd.durum AS aktif_durum,
-                   MAX(dd.created_at) AS max_ts
-            FROM dosya_durumlari dd
-            GROUP BY dd.dosya_id
-        )
-        SELECT d.*,
-               ls.aktif_durum AS aktif_durum,
-               sa.color_hex AS status_color,
-               sd1.owner AS dava_durumu_owner,
-               sd2.owner AS tekrar_dava_durumu_2_owner,
-               sd1.color_hex AS dava_durumu_color,
-               sd2.color_hex AS tekrar_dava_durumu_2_color
-        FROM dosyalar d
-        LEFT JOIN last_status ls ON ls.dosya_id = d.id
-        LEFT JOIN statuses sa ON TRIM(sa.ad) = TRIM(ls.aktif_durum)
-        LEFT JOIN statuses sd1 ON TRIM(sd1.ad) = TRIM(d.dava_durumu)
-        LEFT JOIN statuses sd2 ON TRIM(sd2.ad) = TRIM(d.tekrar_dava_durumu_2)
-        """
-    else:
-        base_query = """
-        SELECT d.*,
-               COALESCE(NULLIF(d.tekrar_dava_durumu_2,''), d.dava_durumu) AS aktif_durum,
-               sa.color_hex AS status_color,
-               sd1.owner AS dava_durumu_owner,
-               sd2.owner AS tekrar_dava_durumu_2_owner,
-               sd1.color_hex AS dava_durumu_color,
-               sd2.color_hex AS tekrar_dava_durumu_2_color
-        FROM dosyalar d
-        LEFT JOIN statuses sd1 ON TRIM(sd1.ad) = TRIM(d.dava_durumu)
-        LEFT JOIN statuses sd2 ON TRIM(sd2.ad) = TRIM(d.tekrar_dava_durumu_2)
-        LEFT JOIN statuses sa
-          ON TRIM(sa.ad) = TRIM(COALESCE(NULLIF(d.tekrar_dava_durumu_2,''), d.dava_durumu))
-        """
-
-    if where_clauses:
-        base_query += " WHERE " + " AND ".join(where_clauses)
-
-    base_query += " ORDER BY d.buro_takip_no"
+def fetch_dosyalar_page(
+    hex6: str | None,
+    search_text: str | None = None,
+    open_only: bool | None = None,
+    other_filters: Optional[Dict[str, Any]] = None,
+    archived: bool = False,
+    assigned_user_id: int | None = None,
+    *,
+    limit: int,
+    after: CasePageKey | None = None,
+) -> tuple[List[Dict[str, Any]], CasePageKey | None]:
+    """``fetch_dosyalar_by_color_hex`` ile aynı filtrelerle tek sayfa döndürür.
 
-    rows = timed_query(conn, base_query, params)
-    rows_prepared: list[sqlite3.Row] = list(rows)
-    rows = []
-    normalized_search = normalize_str(search_text) if search_text else None
-    for row in rows_prepared:
-        record = dict(row)
-        record["status_color"] = normalize_hex(record.get("status_color"))
-        record["dava_durumu_color"] = normalize_hex(record.get("dava_durumu_color"))
-        record["tekrar_dava_durumu_2_color"] = normalize_hex(
-            record.get("tekrar_dava_durumu_2_color")
-        )
-        record["dava_durumu_owner"] = resolve_owner_label(
-            record.get("dava_durumu_owner"), record.get("dava_durumu_color")
-        )
-        record["tekrar_dava_durumu_2_owner"] = resolve_owner_label(
-            record.get("tekrar_dava_durumu_2_owner"),
-            record.get("tekrar_dava_durumu_2_color"),
-        )
-        if normalized_search:
-            hay_fields = [
-                "dosya_esas_no",
-                "muvekkil_adi",
-                "karsi_taraf",
-                "dosya_konusu",
-                "mahkeme_adi",
-                "dava_durumu",
-                "aciklama",
-                "tekrar_dava_durumu_2",
-                "aciklama_2",
-            ]
-            haystack = " ".join(
-                normalize_str(str(record.get(field, ""))) for field in hay_fields
-            )
-            if normalized_search not in haystack:
-                continue
-        rows.append(record)
+    Kayıtlar ``buro_takip_no, id`` sırasındadır; dönen anahtar bir sonraki
+    sayfa için ``after`` olarak verilir, son sayfada ``None`` olur.
+    """
 
-    conn.close()
-    return rows
+    return query_case_page(
+        limit,
+        after=after,
+        hex6=hex6,
+        search_text=search_text,
+        open_only=open_only,
+        other_filters=other_filters,
+        archived=archived,
+        assigned_user_id=assigned_user_id,
+    )
 
 
 def get_all_dosyalar(
@@ -1235,7 +1137,12 @@ def search_dosyalar(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     params: List[Any] = []
 
     q = filters.get("query")
-    if q:
+    match_query = build_match_query(q) if q and has_search_index(conn) else None
+    if match_query:
+        clause, clause_params = case_id_filter(match_query, column="id")
+        conditions.append(clause)
+        params.extend(clause_params)
+    elif q:
         like = f"%{q.lower()}%"
         text_fields = [
             "dosya_esas_no",
@@ -1263,24 +1170,10 @@ def search_dosyalar(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         conditions.append("dava_durumu = ?")
         params.append(status)
 
-    period = filters.get("durusma_period")
-    if period:
-        today = date.today()
-        if period == "bu_hafta":
-            start = today - timedelta(days=today.weekday())
-            end = start + timedelta(days=6)
-        elif period == "gelecek_hafta":
-            start = today + timedelta(days=7 - today.weekday())
-            end = start + timedelta(days=6)
-        elif period == "bu_ay":
-            start = today.replace(day=1)
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            end = today.replace(day=last_day)
-        else:
-            start = end = None
-        if start and end:
-            conditions.append("durusma_tarihi BETWEEN ? AND ?")
-            params.extend([start.isoformat(), end.isoformat()])
+    period_range = durusma_period_range(filters.get("durusma_period"))
+    if period_range:
+        conditions.append("durusma_tarihi BETWEEN ? AND ?")
+        params.extend(day.isoformat() for day in period_range)
 
     if filters.get("only_open"):
         conditions.append("dava_durumu <> 'Kapandı'")
@@ -1296,25 +1189,16 @@ def search_dosyalar(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     return rows
 
 def add_status(ad: str, color_hex: str, owner: str) -> int:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO statuses (ad, color_hex, owner) VALUES (?, ?, ?)",
-        (ad, normalize_hex(color_hex) or color_hex, owner),
-    )
-    conn.commit()
-    rowid = cur.lastrowid
-    conn.close()
-    return rowid
+    with connection_scope() as conn:
+        cur = conn.execute(
+            "INSERT INTO statuses (ad, color_hex, owner) VALUES (?, ?, ?)",
+            (ad, normalize_hex(color_hex) or color_hex, owner),
+        )
+        return cur.lastrowid
 
 def get_statuses() -> List[Dict[str, Any]]:
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM statuses")
-    rows = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return rows
+    with connection_scope() as conn:
+        return [dict(row) for row in conn.execute("SELECT * FROM statuses")]
 
 
 # Geriye dönük uyumluluk için
@@ -1322,22 +1206,16 @@ list_statuses = get_statuses
 
 
 def update_status(status_id: int, ad: str, color_hex: str, owner: str) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "UPDATE statuses SET ad = ?, color_hex = ?, owner = ? WHERE id = ?",
-        (ad, normalize_hex(color_hex) or color_hex, owner, status_id),
-    )
-    conn.commit()
-    conn.close()
+    with connection_scope() as conn:
+        conn.execute(
+            "UPDATE statuses SET ad = ?, color_hex = ?, owner = ? WHERE id = ?",
+            (ad, normalize_hex(color_hex) or color_hex, owner, status_id),
+        )
 
 
 def delete_status(status_id: int) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM statuses WHERE id = ?", (status_id,))
-    conn.commit()
-    conn.close()
+    with connection_scope() as conn:
+        conn.execute("DELETE FROM statuses WHERE id = ?", (status_id,))
 
 
 def get_status_color(status_ad: str) -> Optional[str]:
@@ -1347,12 +1225,9 @@ def get_status_color(status_ad: str) -> Optional[str]:
     """
     if not status_ad:
         return None
-    conn = get_connection()
-    cur = conn.cursor()
     # Tüm statüleri al ve Python'da Türkçe karakter destekli karşılaştırma yap
-    cur.execute("SELECT ad, color_hex FROM statuses")
-    rows = cur.fetchall()
-    conn.close()
+    with connection_scope() as conn:
+        rows = conn.execute("SELECT ad, color_hex FROM statuses").fetchall()
 
     # Aranan statü adını normalize et
     search_normalized = turkish_casefold(status_ad.strip())
@@ -1367,27 +1242,21 @@ def get_status_color(status_ad: str) -> Optional[str]:
 
 def get_settings(key: str) -> Optional[str]:
     """Ayarlar tablosundan verilen anahtarın değerini döndürür."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT value FROM ayarlar WHERE key = ?", (key,))
-    row = cur.fetchone()
-    conn.close()
+    with connection_scope() as conn:
+        row = conn.execute("SELECT value FROM ayarlar WHERE key = ?", (key,)).fetchone()
     return row[0] if row else None
 
 
 def set_settings(key: str, value: str) -> None:
     """Ayar değerini ekler veya günceller."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO ayarlar (key, value) VALUES (?, ?)
-        ON CONFLICT(key) DO UPDATE SET value = excluded.value
-        """,
-        (key, value),
-    )
-    conn.commit()
-    conn.close()
+    with connection_scope() as conn:
+        conn.execute(
+            """
+            INSERT INTO ayarlar (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """,
+            (key, value),
+        )
 
 
 # Tekil adlarla uyumlu yardımcılar
@@ -1574,9 +1443,14 @@ def export_dosyalar_to_docx(path: str, rows: List[Dict[str, Any]]) -> None:
     doc.save(path)
 
 
-def backup_database(dest_path: str) -> None:
-    """Veritabanı dosyasını belirtilen yola kopyalar."""
-    shutil.copy2(DB_PATH, dest_path)
+def backup_database(dest_path: str, plaintext: bool = False) -> None:
+    """
+    Veritabanının tutarlı kopyasını belirtilen yola yazar.
+
+    Kopya canlı veritabanı gibi şifreli kalır; ``plaintext`` yalnızca
+    makineler arası aktarım paketi için kullanılır.
+    """
+    copy_database_file(dest_path, plaintext=plaintext)
 
 
 def validate_database_file(
@@ -1589,7 +1463,7 @@ def validate_database_file(
         return False, required
 
     try:
-        conn = sqlite3.connect(path)
+        conn = connect_database_file(path)
         cur = conn.cursor()
         cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
         tables = {row[0].lower() for row in cur.fetchall()}
@@ -1884,58 +1758,53 @@ def get_finans_by_id(finans_id: int) -> Dict[str, Any]:
 
 
 def list_finance_overview(include_archived: bool = False) -> List[Dict[str, Any]]:
-    """Tüm finans kayıtlarının özetini döndürür."""
+    """Tüm finans kayıtlarının özetini döndürür.
+
+    Toplam, bakiye, vade ve atama bilgileri ``finans_summary`` tablosundan
+    hazır okunur; satır başına yalnızca tip dönüşümleri yapılır.
+    """
 
     conn = get_connection()
     conn.row_factory = sqlite3.Row
     try:
         cur = conn.cursor()
-        cur.execute("INSERT OR IGNORE INTO finans (dosya_id) SELECT id FROM dosyalar")
-        conn.commit()
+        cur.execute(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM dosyalar d
+                LEFT JOIN finans f ON f.dosya_id = d.id
+                WHERE f.id IS NULL
+            )
+            """
+        )
+        if cur.fetchone()[0]:
+            cur.execute("INSERT OR IGNORE INTO finans (dosya_id) SELECT id FROM dosyalar")
+            conn.commit()
         rows = get_finans_master_list_bound_only(
             conn, include_archived=include_archived
         )
     finally:
         conn.close()
 
+    due_categories: Dict[Any, Optional[str]] = {}
     overview: List[Dict[str, Any]] = []
     for row in rows:
         record = dict(row)
-        finans_id = record.get("finans_id")
-        try:
-            record["finans_id"] = int(finans_id) if finans_id is not None else None
-        except (TypeError, ValueError):
-            record["finans_id"] = None
-
-        dosya_id = record.get("dosya_id")
-        if dosya_id is not None and dosya_id != "":
-            try:
-                record["dosya_id"] = int(dosya_id)
-            except (TypeError, ValueError):
-                record["dosya_id"] = None
-        else:
-            record["dosya_id"] = None
-
-        bn_value = record.get("buro_takip_no")
-        record["buro_takip_no"] = bn_value if bn_value not in (None, "") else ""
-        record["dosya_esas_no"] = record.get("dosya_esas_no")
-        record["muvekkil_adi"] = record.get("muvekkil_adi")
+        record["buro_takip_no"] = record.get("buro_takip_no") or ""
 
         raw_user_ids = record.get("assigned_user_ids")
-        if raw_user_ids:
-            record["assigned_user_ids"] = [
-                int(user_id)
-                for user_id in str(raw_user_ids).split(",")
-                if user_id
-            ]
-        else:
-            record["assigned_user_ids"] = []
+        record["assigned_user_ids"] = (
+            [int(user_id) for user_id in str(raw_user_ids).split(",") if user_id]
+            if raw_user_ids
+            else []
+        )
 
-        record["toplam_ucret_cents"] = calculate_finance_total(row)
-        record["kalan_bakiye_cents"] = calculate_finance_balance(row)
         record["has_overdue_installment"] = bool(record.get("has_overdue_installment"))
         record["yuzde_is_sonu"] = int(record.get("yuzde_is_sonu") or 0)
-        record["due_category"] = _categorize_due_date(record.get("next_due_date"))
+        next_due = record.get("next_due_date")
+        if next_due not in due_categories:
+            due_categories[next_due] = _categorize_due_date(next_due)
+        record["due_category"] = due_categories[next_due]
 
         fixed_value = record.get("sozlesme_ucreti")
         if fixed_value not in (None, ""):
@@ -1966,8 +1835,12 @@ def list_finance_overview(include_archived: bool = False) -> List[Dict[str, Any]
     return overview
 
 
+# SQLite'ın eski derlemelerindeki 999 parametre sınırının altında kalır
+_SUMMARY_ID_CHUNK = 900
+
+
 def summarize_finance_by_ids(finance_ids: Iterable[int]) -> Dict[str, int]:
-    """Verilen finans kayıtları için toplamları tek sorguda hesaplar."""
+    """Verilen finans kayıtları için toplamları ``finans_summary`` üzerinden toplar."""
 
     normalized: list[int] = []
     for finance_id in finance_ids:
@@ -1976,86 +1849,36 @@ def summarize_finance_by_ids(finance_ids: Iterable[int]) -> Dict[str, int]:
         except (TypeError, ValueError):
             continue
     normalized = sorted(set(normalized))
+    totals = {"contract": 0, "collected": 0, "expense": 0, "balance": 0}
     if not normalized:
-        return {"contract": 0, "collected": 0, "expense": 0, "balance": 0}
-
-    placeholders = ",".join(["?"] * len(normalized))
-    query = f"""
-        WITH base AS (
-            SELECT
-                f.id AS finans_id,
-                (
-                    COALESCE(
-                        CASE
-                            WHEN f.sozlesme_ucreti IS NOT NULL
-                                 AND TRIM(CAST(f.sozlesme_ucreti AS TEXT)) != ''
-                                THEN CAST(ROUND(f.sozlesme_ucreti * 100.0) AS INTEGER)
-                            WHEN f.sozlesme_ucreti_cents IS NOT NULL
-                                 AND TRIM(CAST(f.sozlesme_ucreti_cents AS TEXT)) != ''
-                                THEN CAST(f.sozlesme_ucreti_cents AS INTEGER)
-                            ELSE 0
-                        END,
-                        0
-                    )
-                    +
-                    CASE
-                        WHEN COALESCE(f.sozlesme_yuzdesi, 0) != 0
-                             AND COALESCE(f.tahsil_hedef_cents, 0) != 0
-                            THEN CAST(
-                                ROUND((f.tahsil_hedef_cents * f.sozlesme_yuzdesi) / 100.0)
-                                AS INTEGER
-                            )
-                        ELSE 0
-                    END
-                ) AS toplam_ucret_cents,
-                COALESCE(f.tahsil_edilen_cents, 0) AS tahsil_edilen_cents,
-                COALESCE(f.masraf_toplam_cents, 0) AS masraf_toplam_cents,
-                COALESCE(f.masraf_tahsil_cents, 0) AS masraf_tahsil_cents
-            FROM finans f
-            WHERE f.id IN ({placeholders})
-        )
-        SELECT
-            COALESCE(SUM(toplam_ucret_cents), 0) AS toplam_sozlesme_cents,
-            COALESCE(SUM(tahsil_edilen_cents), 0) AS toplam_tahsil_cents,
-            COALESCE(SUM(masraf_toplam_cents), 0) AS toplam_masraf_cents,
-            COALESCE(
-                SUM(
-                    toplam_ucret_cents - tahsil_edilen_cents
-                    + masraf_toplam_cents - masraf_tahsil_cents
-                ),
-                0
-            ) AS kalan_cents
-        FROM base
-    """
+        return totals
 
     conn = get_connection()
     try:
-        conn.row_factory = sqlite3.Row
         cur = conn.cursor()
-        cur.execute(query, normalized)
-        row = cur.fetchone()
+        for start in range(0, len(normalized), _SUMMARY_ID_CHUNK):
+            chunk = normalized[start : start + _SUMMARY_ID_CHUNK]
+            placeholders = ",".join(["?"] * len(chunk))
+            cur.execute(
+                f"""
+                SELECT
+                    COALESCE(SUM(toplam_ucret_cents), 0),
+                    COALESCE(SUM(tahsil_edilen_cents), 0),
+                    COALESCE(SUM(masraf_toplam_cents), 0),
+                    COALESCE(SUM(kalan_bakiye_cents), 0)
+                FROM finans_summary
+                WHERE finans_id IN ({placeholders})
+                """,
+                chunk,
+            )
+            row = cur.fetchone()
+            if not row:
+                continue
+            for key, value in zip(("contract", "collected", "expense", "balance"), row):
+                totals[key] += int(value or 0)
     finally:
         conn.close()
-
-    if not row:
-        return {"contract": 0, "collected": 0, "expense": 0, "balance": 0}
-
-    def _extract(value: Any) -> int:
-        try:
-            return int(value or 0)
-        except (TypeError, ValueError):
-            return 0
-
-    contract = _extract(row["toplam_sozlesme_cents"])
-    collected = _extract(row["toplam_tahsil_cents"])
-    expense = _extract(row["toplam_masraf_cents"])
-    balance = _extract(row["kalan_cents"])
-    return {
-        "contract": contract,
-        "collected": collected,
-        "expense": expense,
-        "balance": balance,
-    }
+    return totals
 
 
 def summarize_harici_finance_by_ids(finance_ids: Iterable[int]) -> Dict[str, int]:
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Genel arama API'si.
+
+``arama_fts`` FTS5 indeksi dosyalar, görevler, tebligatlar, arabuluculuk
+kayıtları ve dosya zaman çizelgesi için Türkçe katlanmış metni tutar (bkz.
+``db.setup_search_index``). Bu modül kullanıcı girdisini güvenli bir FTS5
+sorgusuna çevirir, dosya listesi için kimlik filtresi üretir ve tüm kayıt
+türlerinde sıralı (bm25) arama yapar.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+try:  # pragma: no cover - runtime import guard
+    from app.db import ARAMA_KAYNAKLARI, ARAMA_ROWID_CARPANI, get_connection
+    from app.utils import fold_search_text
+except ModuleNotFoundError:  # pragma: no cover
+    from db import ARAMA_KAYNAKLARI, ARAMA_ROWID_CARPANI, get_connection
+    from utils import fold_search_text
+
+
+# unicode61 tokenizer'ı harf ve rakam dışındaki her karakteri ayırıcı sayar
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Kaynak başına sonuç satırı için gösterilecek alanlar:
+# (başlık ifadesi, ayrıntı ifadesi, tarih ifadesi, dosya_id ifadesi)
+_SONUC_ALANLARI: Dict[str, tuple[str, str, str, str]] = {
+    "dosya": (
+        "COALESCE(buro_takip_no, '') || ' - ' || COALESCE(dosya_esas_no, '')",
+        "COALESCE(muvekkil_adi, '') || ' / ' || COALESCE(karsi_taraf, '')",
+        "durusma_tarihi",
+        "id",
+    ),
+    "gorev": ("konu", "atanan_kullanicilar", "tarih", "dosya_id"),
+    "tebligat": ("dosya_no", "kurum", "is_son_gunu", "NULL"),
+    "arabuluculuk": (
+        "COALESCE(davaci, '') || ' / ' || COALESCE(davali, '')",
+        "konu",
+        "toplanti_tarihi",
+        "NULL",
+    ),
+    "timeline": ("title", "body", "created_at", "dosya_id"),
+}
+
+KAYNAK_ETIKETLERI: Dict[str, str] = {
+    "dosya": "Dosya",
+    "gorev": "Görev",
+    "tebligat": "Tebligat",
+    "arabuluculuk": "Arabuluculuk",
+    "timeline": "Dosya Notu",
+}
+
+
+def build_match_query(text: str | None) -> str | None:
+    """Kullanıcı metnini FTS5 ``MATCH`` ifadesine çevirir.
+
+    Boşlukla ayrılmış her parça, son terimi önek olarak aranan bir ifade
+    (phrase) olur; parçalar AND ile birleşir. ``2024/15`` gibi girdiler
+    böylece "2024 15*" ifadesine dönüşür. Terimler tırnak içinde verildiği
+    için FTS5 sözdizimi karakterleri etkisizdir. Aranabilir terim yoksa
+    ``None`` döner.
+    """
+    if not text:
+        return None
+    phrases: List[str] = []
+    for chunk in fold_search_text(text).split():
+        tokens = _TOKEN_RE.findall(chunk)
+        if tokens:
+            phrases.append('"' + " ".join(tokens) + '"*')
+    return " ".join(phrases) or None
+
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='arama_fts'"
+    ).fetchone()
+    return row is not None
+
+
+def case_id_filter(match_query: str, column: str = "d.id") -> tuple[str, list[Any]]:
+    """Dosya listesi sorgusu için FTS tabanlı ``WHERE`` parçası döndürür."""
+    code = ARAMA_KAYNAKLARI["dosya"][1]
+    sql = (
+        f"{column} IN (SELECT rowid / {ARAMA_ROWID_CARPANI} FROM arama_fts "
+        f"WHERE arama_fts MATCH ? AND rowid % {ARAMA_ROWID_CARPANI} = {code})"
+    )
+    return sql, [match_query]
+
+
+def global_search(
+    text: str | None,
+    kaynaklar: Optional[Iterable[str]] = None,
+    limit: int = 50,
+    conn: sqlite3.Connection | None = None,
+) -> List[Dict[str, Any]]:
+    """Tüm kayıt türlerinde sıralı arama yapar.
+
+    Args:
+        text: Kullanıcının yazdığı arama metni
+        kaynaklar: Sınırlanacak kaynaklar (``dosya``, ``gorev``, ``tebligat``,
+            ``arabuluculuk``, ``timeline``); None ise hepsi
+        limit: En fazla sonuç sayısı
+
+    Returns:
+        En alakalıdan başlayarak ``kaynak``, ``etiket``, ``kayit_id``,
+        ``dosya_id``, ``baslik``, ``ayrinti``, ``tarih`` ve ``skor``
+        alanlarını içeren sözlükler
+    """
+    match_query = build_match_query(text)
+    if not match_query:
+        return []
+
+    selected = [k for k in (kaynaklar or ARAMA_KAYNAKLARI) if k in ARAMA_KAYNAKLARI]
+    if not selected:
+        return []
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        if not has_search_index(conn):
+            return []
+        params: List[Any] = [match_query]
+        sql = "SELECT rowid, kaynak, bm25(arama_fts) FROM arama_fts WHERE arama_fts MATCH ?"
+        if len(selected) < len(ARAMA_KAYNAKLARI):
+            sql += f" AND kaynak IN ({', '.join('?' * len(selected))})"
+            params.extend(selected)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(max(1, int(limit)))
+        hits = conn.execute(sql, params).fetchall()
+
+        # Görüntü alanlarını kaynak başına tek sorguyla topla
+        ids_by_kaynak: Dict[str, List[int]] = {}
+        for rowid, kaynak, _ in hits:
+            ids_by_kaynak.setdefault(kaynak, []).append(rowid // ARAMA_ROWID_CARPANI)
+        details: Dict[tuple[str, int], tuple] = {}
+        for kaynak, ids in ids_by_kaynak.items():
+            table = ARAMA_KAYNAKLARI[kaynak][0]
+            baslik, ayrinti, tarih, dosya_id = _SONUC_ALANLARI[kaynak]
+            rows = conn.execute(
+                f"SELECT id, {baslik}, {ayrinti}, {tarih}, {dosya_id} FROM {table} "
+                f"WHERE id IN ({', '.join('?' * len(ids))})",
+                ids,
+            ).fetchall()
+            for row in rows:
+                details[(kaynak, row[0])] = tuple(row[1:])
+
+        results: List[Dict[str, Any]] = []
+        for rowid, kaynak, score in hits:
+            kayit_id = rowid // ARAMA_ROWID_CARPANI
+            detail = details.get((kaynak, kayit_id))
+            if detail is None:
+                continue
+            baslik, ayrinti, tarih, dosya_id = detail
+            results.append(
+                {
+                    "kaynak": kaynak,
+                    "etiket": KAYNAK_ETIKETLERI.get(kaynak, kaynak),
+                    "kayit_id": kayit_id,
+                    "dosya_id": dosya_id,
+                    "baslik": baslik or "",
+                    "ayrinti": ayrinti or "",
+                    "tarih": tarih or "",
+                    "skor": -float(score),
+                }
+            )
+        return results
+    finally:
+        if own_conn:
+            conn.close()
@@ -12,7 +12,24 @@ from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
 import calendar
 
 # Veritabanı bağlantısı
-from db import get_connection, DB_PATH, timed_query
+from db import (
+    get_connection,
+    connection_scope,
+    connect_database_file,
+    copy_database_file,
+    DB_PATH,
+    timed_query,
+)
+
+# Dosya listesi sorgu motoru
+from case_query import (
+    CasePageKey,
+    case_page_key,
+    durusma_period_range,
+    query_case_page,
+    query_cases,
+)
+from search import build_match_query, case_id_filter, has_search_index, global_search
 
 # Yardımcı fonksiyonlar
 from utils import (
@@ -141,7 +158,12 @@ __all__ = [
     # Typing
     "Any", "Dict", "Iterable", "List", "Optional", "Set",
     # Database
-    "sqlite3", "get_connection", "DB_PATH", "timed_query",
+    "sqlite3", "get_connection", "connection_scope", "connect_database_file", "copy_database_file",
+    "DB_PATH",
+    "timed_query",
+    "query_cases", "query_case_page", "case_page_key", "CasePageKey",
+    "durusma_period_range",
+    "build_match_query", "case_id_filter", "has_search_index", "global_search",
     # Utils
     "logger", "datetime", "date", "timedelta", "Decimal", "ROUND_HALF_UP",
     "InvalidOperation", "calendar",
@@ -237,141 +237,52 @@ def fetch_dosyalar_by_color_hex(
     other_filters: Optional[Dict[str, Any]] = None,
     archived: bool = False,
     assigned_user_id: int | None = None,
+    ids: Optional[Iterable[int]] = None,
 ) -> List[Dict[str, Any]]:
-    """Renk koduna, arama parametrelerine ve arşiv durumuna göre kayıtları döndürür."""
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-
-    cur.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='dosya_durumlari'"
-    )
-    has_history = cur.fetchone() is not None
-
-    params: Dict[str, Any] = {"is_archived": 1 if archived else 0}
-    where_clauses: List[str] = ["d.is_archived = :is_archived"]
-
-    if assigned_user_id is not None:
-        params["assigned_user_id"] = int(assigned_user_id)
-        where_clauses.append(
-            "EXISTS (SELECT 1 FROM dosya_atamalar da WHERE da.dosya_id = d.id AND da.user_id = :assigned_user_id)"
-        )
-
-    if hex6:
-        params["hex6"] = hex6
-        where_clauses.append(
-            "(UPPER(REPLACE(sd1.color_hex,'#','')) = :hex6 "
-            "OR UPPER(REPLACE(sd2.color_hex,'#','')) = :hex6 "
-            "OR UPPER(REPLACE(sa.color_hex,'#','')) = :hex6)"
-        )
-
-    durusma_period = None
-    if other_filters:
-        durusma_period = other_filters.get("durusma_period")
-
-    if open_only and not archived:
-        where_clauses.append(
-            "NOT ("
-            "UPPER(COALESCE(NULLIF(d.dava_durumu,''),'')) = 'DOSYA KAPANDI' "
-            "OR UPPER(COALESCE(NULLIF(d.tekrar_dava_durumu_2,''),'')) = 'DOSYA KAPANDI'"
-            ")"
-        )
-
-    if durusma_period:
-        today = date.today()
-        start: Optional[date] = None
-        end: Optional[date] = None
-        if durusma_period == "bu_hafta":
-            start = today - timedelta(days=today.weekday())
-            end = start + timedelta(days=6)
-        elif durusma_period == "gelecek_hafta":
-            start = today + timedelta(days=7 - today.weekday())
-            end = start + timedelta(days=6)
-        elif durusma_period == "bu_ay":
-            start = today.replace(day=1)
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            end = today.replace(day=last_day)
-        if start and end:
-            where_clauses.append("d.durusma_tarihi BETWEEN :durusma_start AND :durusma_end")
-            params["durusma_start"] = start.isoformat()
-            params["durusma_end"] = end.isoformat()
-
-    if has_history:
-        base_query = """
-        WITH last_status AS (
-            SELECT dd.dosya_id,
-                   dd.durum AS aktif_durum,
-                   MAX(dd.created_at) AS max_ts
-            FROM dosya_durumlari dd
-            GROUP BY dd.dosya_id
-        )
-        SELECT d.*,
-               ls.aktif_durum AS aktif_durum,
-               sa.color_hex AS status_color,
-               sd1.owner AS dava_durumu_owner,
-               sd2.owner AS tekrar_dava_durumu_2_owner,
-               sd1.color_hex AS dava_durumu_color,
-               sd2.color_hex AS tekrar_dava_durumu_2_color
-        FROM dosyalar d
-        LEFT JOIN last_status ls ON ls.dosya_id = d.id
-        LEFT JOIN statuses sa ON sa.ad = ls.aktif_durum
-        LEFT JOIN statuses sd1 ON sd1.ad = d.dava_durumu
-        LEFT JOIN statuses sd2 ON sd2.ad = d.tekrar_dava_durumu_2
-        """
-    else:
-        base_query = """
-        SELECT d.*,
-               COALESCE(NULLIF(d.tekrar_dava_durumu_2,''), d.dava_durumu) AS aktif_durum,
-               sa.color_hex AS status_color,
-               sd1.owner AS dava_durumu_owner,
-               sd2.owner AS tekrar_dava_durumu_2_owner,
-               sd1.color_hex AS dava_durumu_color,
-               sd2.color_hex AS tekrar_dava_durumu_2_color
-        FROM dosyalar d
-        LEFT JOIN statuses sd1 ON sd1.ad = d.dava_durumu
-        LEFT JOIN statuses sd2 ON sd2.ad = d.tekrar_dava_durumu_2
-        LEFT JOIN statuses sa
-          ON sa.ad = COALESCE(NULLIF(d.tekrar_dava_durumu_2,''), d.dava_durumu)
-        """
+    """Renk koduna, arama parametrelerine ve arşiv durumuna göre kayıtları döndürür.
 
-    if where_clauses:
-        base_query += " WHERE " + " AND ".join(where_clauses)
+    ``ids`` verilirse yalnızca bu dosyalar döner (değişiklik akışı ile satır
+    bazlı yenileme için).
+    """
 
-    base_query += " ORDER BY d.buro_takip_no"
+    return query_cases(
+        hex6,
+        search_text=search_text,
+        open_only=open_only,
+        other_filters=other_filters,
+        archived=archived,
+        assigned_user_id=assigned_user_id,
+        ids=ids,
+    )
 
-    rows = timed_query(conn, base_query, params)
-    rows_prepared: list[sqlite3.Row] = list(rows)
-    result = []
-    normalized_search = normalize_str(search_text) if search_text else None
 
-    for row in rows_prepared:
-        record = dict(row)
-        record["status_color"] = normalize_hex(record.get("status_color"))
-        record["dava_durumu_color"] = normalize_hex(record.get("dava_durumu_color"))
-        record["tekrar_dava_durumu_2_color"] = normalize_hex(
-            record.get("tekrar_dava_durumu_2_color")
-        )
-        record["dava_durumu_owner"] = resolve_owner_label(
-            record.get("dava_durumu_owner"), record.get("dava_durumu_color")
-        )
-        record["tekrar_dava_durumu_2_owner"] = resolve_owner_label(
-            record.get("tekrar_dava_durumu_2_owner"),
-            record.get("tekrar_dava_durumu_2_color"),
-        )
-        if normalized_search:
-            hay_fields = [
-                "dosya_esas_no", "muvekkil_adi", "karsi_taraf", "dosya_konusu",
-                "mahkeme_adi", "dava_durumu", "aciklama", "tekrar_dava_durumu_2", "aciklama_2",
-            ]
-            haystack = " ".join(
-                normalize_str(str(record.get(field, ""))) for field in hay_fields
-            )
-            if normalized_search not in haystack:
-                continue
-        result.append(record)
-
-    conn.close()
-    return result
+def fetch_dosyalar_page(
+    hex6: str | None,
+    search_text: str | None = None,
+    open_only: bool | None = None,
+    other_filters: Optional[Dict[str, Any]] = None,
+    archived: bool = False,
+    assigned_user_id: int | None = None,
+    *,
+    limit: int,
+    after: CasePageKey | None = None,
+) -> tuple[List[Dict[str, Any]], CasePageKey | None]:
+    """``fetch_dosyalar_by_color_hex`` ile aynı filtrelerle tek sayfa döndürür.
+
+    Kayıtlar ``buro_takip_no, id`` sırasındadır; dönen anahtar bir sonraki
+    sayfa için ``after`` olarak verilir, son sayfada ``None`` olur.
+    """
+
+    return query_case_page(
+        limit,
+        after=after,
+        hex6=hex6,
+        search_text=search_text,
+        open_only=open_only,
+        other_filters=other_filters,
+        archived=archived,
+        assigned_user_id=assigned_user_id,
+    )
 
 
 def get_all_dosyalar(
@@ -402,7 +313,12 @@ def search_dosyalar(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     params: List[Any] = []
 
     q = filters.get("query")
-    if q:
+    match_query = build_match_query(q) if q and has_search_index(conn) else None
+    if match_query:
+        clause, clause_params = case_id_filter(match_query, column="id")
+        conditions.append(clause)
+        params.extend(clause_params)
+    elif q:
         like = f"%{q.lower()}%"
         text_fields = [
             "dosya_esas_no", "muvekkil_adi", "karsi_taraf", "dosya_konusu",
@@ -423,23 +339,10 @@ def search_dosyalar(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         conditions.append("dava_durumu = ?")
         params.append(status)
 
-    period = filters.get("durusma_period")
-    if period:
-        today = date.today()
-        start = end = None
-        if period == "bu_hafta":
-            start = today - timedelta(days=today.weekday())
-            end = start + timedelta(days=6)
-        elif period == "gelecek_hafta":
-            start = today + timedelta(days=7 - today.weekday())
-            end = start + timedelta(days=6)
-        elif period == "bu_ay":
-            start = today.replace(day=1)
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            end = today.replace(day=last_day)
-        if start and end:
-            conditions.append("durusma_tarihi BETWEEN ? AND ?")
-            params.extend([start.isoformat(), end.isoformat()])
+    period_range = durusma_period_range(filters.get("durusma_period"))
+    if period_range:
+        conditions.append("durusma_tarihi BETWEEN ? AND ?")
+        params.extend(day.isoformat() for day in period_range)
 
     if filters.get("only_open"):
         conditions.append("dava_durumu <> 'Kapandı'")
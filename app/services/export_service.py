@@ -4,7 +4,6 @@ Dışa aktarma ve yedekleme işlemleri.
 """
 
 import os
-import shutil
 from services.base import *
 
 try:
@@ -424,9 +423,14 @@ def export_dosyalar_to_docx(path: str, rows: List[Dict[str, Any]]) -> None:
     doc.save(path)
 
 
-def backup_database(dest_path: str) -> None:
-    """Veritabanı dosyasını belirtilen yola kopyalar."""
-    shutil.copy2(DB_PATH, dest_path)
+def backup_database(dest_path: str, plaintext: bool = False) -> None:
+    """
+    Veritabanının tutarlı kopyasını belirtilen yola yazar.
+
+    Kopya canlı veritabanı gibi şifreli kalır; ``plaintext`` yalnızca
+    makineler arası aktarım paketi için kullanılır.
+    """
+    copy_database_file(dest_path, plaintext=plaintext)
 
 
 def validate_database_file(
@@ -438,7 +442,7 @@ def validate_database_file(
         return False, required
 
     try:
-        conn = sqlite3.connect(path)
+        conn = connect_database_file(path)
         cur = conn.cursor()
         cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
         tables = {row[0].lower() for row in cur.fetchall()}
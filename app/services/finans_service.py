@@ -192,7 +192,7 @@ def get_finans_master_list_bound_only(
     *,
     include_archived: bool = False,
 ) -> List[sqlite3.Row]:
-    """Dosyaya bağlı finans kayıtlarını döndürür."""
+    """Dosyaya bağlı finans kayıtlarını ``finans_summary`` üzerinden döndürür."""
     owns_conn = False
     if conn is None:
         conn = get_connection()
@@ -202,48 +202,31 @@ def get_finans_master_list_bound_only(
         cur = conn.cursor()
         cur.execute(
             """
-            WITH next_due AS (
-                SELECT finans_id, MIN(vade_tarihi) AS next_due_date
-                FROM taksitler
-                WHERE durum != 'Ödendi'
-                GROUP BY finans_id
-            ),
-            overdue AS (
-                SELECT finans_id
-                FROM taksitler
-                WHERE durum != 'Ödendi' AND vade_tarihi < DATE('now')
-                GROUP BY finans_id
-            ),
-            assignments AS (
-                SELECT dosya_id, GROUP_CONCAT(user_id) AS user_ids
-                FROM dosya_atamalar
-                GROUP BY dosya_id
-            )
             SELECT
-                f.id AS finans_id,
-                f.dosya_id,
+                s.finans_id,
+                s.dosya_id,
                 f.sozlesme_ucreti,
                 f.sozlesme_ucreti_cents,
                 f.sozlesme_yuzdesi,
                 f.tahsil_hedef_cents,
-                f.tahsil_edilen_cents,
-                f.masraf_toplam_cents,
-                f.masraf_tahsil_cents,
+                s.tahsil_edilen_cents,
+                s.masraf_toplam_cents,
+                s.masraf_tahsil_cents,
+                s.toplam_ucret_cents,
+                s.kalan_bakiye_cents,
                 f.yuzde_is_sonu,
                 d.buro_takip_no,
                 d.dosya_esas_no,
                 d.muvekkil_adi,
                 d.is_archived,
-                next_due.next_due_date,
-                CASE WHEN overdue.finans_id IS NOT NULL THEN 1 ELSE 0 END AS has_overdue_installment,
-                assignments.user_ids AS assigned_user_ids
-            FROM finans f
-            JOIN dosyalar d ON d.id = f.dosya_id
-            LEFT JOIN next_due ON next_due.finans_id = f.id
-            LEFT JOIN overdue ON overdue.finans_id = f.id
-            LEFT JOIN assignments ON assignments.dosya_id = f.dosya_id
+                s.next_due_date,
+                CASE WHEN s.next_due_date < DATE('now') THEN 1 ELSE 0 END AS has_overdue_installment,
+                s.assigned_user_ids
+            FROM finans_summary s
+            JOIN finans f ON f.id = s.finans_id
+            JOIN dosyalar d ON d.id = s.dosya_id
             WHERE (? = 1 OR COALESCE(d.is_archived, 0) = 0)
-            ORDER BY f.id DESC
+            ORDER BY s.finans_id DESC
             """,
             (1 if include_archived else 0,),
         )
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""
+Takvim görevleri için toplu sorgu ve önbellek katmanı.
+
+``GorevlerTab._collect_tasks`` eskiden manuel görevleri ve dosya tarihlerinden
+türeyen görevleri iki ayrı sorguyla okuyor, ardından her dosya için
+``dosyalar`` tablosuna ayrı bir ``SELECT`` atıyordu (N+1). Bu modül:
+
+* manuel, tebligat, arabuluculuk (``gorevler``) ve dosya kaynaklı görevleri
+  tarih penceresi başına tek bir ``UNION ALL`` sorgusuyla okur; dosya
+  satırı açıklama alanlarını da taşıdığı için ek sorgu gerekmez,
+* ``TaskRangeCache`` ile yüklenen aralığı bellekte tutar; takvim
+  sayfalandıkça yalnızca eksik kalan dilim okunur, change_log imlecinde
+  ``gorevler``/``dosyalar`` değişikliği görülürse önbellek boşaltılır,
+* ``TaskMetaCache`` ile ``__META__`` JSON açıklamalarını satır sürümü
+  başına bir kez çözer.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import sqlite3
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:  # pragma: no cover - runtime import guard
+    from app.db import get_change_cursor, get_changes_since, get_connection
+except ModuleNotFoundError:  # pragma: no cover
+    from db import get_change_cursor, get_changes_since, get_connection
+
+
+TaskRow = Dict[str, Any]
+
+# Önbelleği geçersiz kılan change_log tabloları
+WATCHED_TABLES = frozenset({"gorevler", "dosyalar"})
+
+_ASSIGNEES_SQL = """
+    (SELECT GROUP_CONCAT(u.username, ', ')
+     FROM dosya_atamalar da
+     JOIN users u ON u.id = da.user_id
+     WHERE da.dosya_id = {alias}) AS dosya_atanan_kullanicilar
+"""
+
+# Her iki kolun sütunları aynı sırada: kaynak, kimlik, tarih(ler), metinler
+_WINDOW_SQL = f"""
+    SELECT
+        'manual' AS kaynak,
+        g.id AS id,
+        g.tarih AS tarih,
+        NULL AS durusma_tarihi,
+        NULL AS is_tarihi,
+        NULL AS is_tarihi_2,
+        g.konu AS konu,
+        g.aciklama AS aciklama,
+        NULL AS aciklama_2,
+        g.atanan_kullanicilar AS atanan_kullanicilar,
+        g.gorev_turu AS gorev_turu,
+        g.dosya_id AS dosya_id,
+        NULL AS dosya_esas_no,
+        NULL AS muvekkil_adi,
+        NULL AS dava_durumu,
+        NULL AS dava_durumu_2,
+        NULL AS dava_durumu_color,
+        NULL AS dava_durumu_2_color,
+        {_ASSIGNEES_SQL.format(alias="g.dosya_id")}
+    FROM gorevler g
+    WHERE g.tarih BETWEEN :start AND :end
+        AND (g.tamamlandi = 0 OR g.tamamlandi IS NULL)
+        AND (g.gorev_turu IS NULL OR g.gorev_turu NOT IN ('IS_TARIHI', 'IS_TARIHI_2', 'DURUSMA'))
+    UNION ALL
+    SELECT
+        'dosya',
+        d.id,
+        NULL,
+        d.durusma_tarihi,
+        d.is_tarihi,
+        d.is_tarihi_2,
+        NULL,
+        d.aciklama,
+        d.aciklama_2,
+        NULL,
+        NULL,
+        d.id,
+        d.dosya_esas_no,
+        d.muvekkil_adi,
+        d.dava_durumu,
+        d.tekrar_dava_durumu_2,
+        s1.color_hex,
+        s2.color_hex,
+        {_ASSIGNEES_SQL.format(alias="d.id")}
+    FROM dosyalar d
+    LEFT JOIN statuses s1 ON TRIM(s1.ad) = TRIM(d.dava_durumu)
+    LEFT JOIN statuses s2 ON TRIM(s2.ad) = TRIM(d.tekrar_dava_durumu_2)
+    WHERE (
+            d.durusma_tarihi BETWEEN :start AND :end
+            OR d.is_tarihi BETWEEN :start AND :end
+            OR d.is_tarihi_2 BETWEEN :start AND :end
+        )
+        AND d.is_archived = 0
+    ORDER BY kaynak DESC, tarih, id
+"""
+
+
+def task_date_key(task: TaskRow) -> str:
+    """Görevin ``YYYY-MM-DD`` tarih anahtarı (aralık karşılaştırması için)."""
+    return str(task.get("date") or "")[:10]
+
+
+def _case_tasks(row: sqlite3.Row) -> List[TaskRow]:
+    """Dosya satırından duruşma ve iş tarihi görevlerini üret.
+
+    ``get_case_tasks_between`` ile aynı kurallar; ek olarak dosyanın
+    açıklama alanları görev kaydına taşınır.
+    """
+    base = {
+        "dosya_id": row["dosya_id"],
+        "bn": row["dosya_esas_no"],
+        "muvekkil_adi": row["muvekkil_adi"],
+        "atanan_kullanicilar": row["dosya_atanan_kullanicilar"] or "",
+        "aciklama": row["aciklama"],
+        "aciklama_2": row["aciklama_2"],
+        "dava_durumu_2": row["dava_durumu_2"],
+    }
+    tasks: List[TaskRow] = []
+    # Duruşma tarihi - dava durumundan bağımsız
+    if row["durusma_tarihi"]:
+        tasks.append(
+            dict(
+                base,
+                task_id=f"{row['dosya_id']}-durusma",
+                type="DURUSMA",
+                date=row["durusma_tarihi"],
+                description="Duruşma",
+                dava_durumu=row["dava_durumu"],
+                dava_durumu_color=row["dava_durumu_color"],
+            )
+        )
+    # İş tarihi - sadece dava_durumu varsa
+    dava_durumu = (row["dava_durumu"] or "").strip()
+    if row["is_tarihi"] and dava_durumu:
+        tasks.append(
+            dict(
+                base,
+                task_id=f"{row['dosya_id']}-is1",
+                type="IS_TARIHI",
+                date=row["is_tarihi"],
+                description="İş Tarihi",
+                dava_durumu=dava_durumu,
+                dava_durumu_color=row["dava_durumu_color"],
+            )
+        )
+    # İş tarihi 2 - sadece dava_durumu_2 varsa
+    dava_durumu_2 = (row["dava_durumu_2"] or "").strip()
+    if row["is_tarihi_2"] and dava_durumu_2:
+        tasks.append(
+            dict(
+                base,
+                task_id=f"{row['dosya_id']}-is2",
+                type="IS_TARIHI_2",
+                date=row["is_tarihi_2"],
+                description="İş Tarihi 2",
+                dava_durumu=dava_durumu_2,
+                dava_durumu_color=row["dava_durumu_2_color"],
+            )
+        )
+    return tasks
+
+
+def query_task_window(
+    start: str, end: str, conn: sqlite3.Connection | None = None
+) -> List[TaskRow]:
+    """``[start, end]`` aralığındaki tüm takvim görevlerini tek sorguyla döndür.
+
+    Manuel görevler ``source="manual"`` ile ``gorevler`` sütunlarını
+    (``dosya_atanan_kullanicilar`` dahil), dosya görevleri ``source="auto"``
+    ile ``get_case_tasks_between`` alanlarını taşır. Yalnızca tarihi aralıkta
+    kalan görevler döner; sonuç tarihe göre sıralıdır.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        cur.execute(_WINDOW_SQL, {"start": start, "end": end})
+        rows = cur.fetchall()
+    finally:
+        if own_conn:
+            conn.close()
+
+    tasks: List[TaskRow] = []
+    for row in rows:
+        if row["kaynak"] == "manual":
+            tasks.append(
+                {
+                    "source": "manual",
+                    "id": row["id"],
+                    "date": row["tarih"],
+                    "tarih": row["tarih"],
+                    "konu": row["konu"],
+                    "aciklama": row["aciklama"],
+                    "atanan_kullanicilar": row["atanan_kullanicilar"],
+                    "gorev_turu": row["gorev_turu"],
+                    "dosya_id": row["dosya_id"],
+                    "dosya_atanan_kullanicilar": row["dosya_atanan_kullanicilar"],
+                }
+            )
+            continue
+        for task in _case_tasks(row):
+            if start <= task_date_key(task) <= end:
+                task["source"] = "auto"
+                tasks.append(task)
+    # Aynı gün içinde manuel görevler önce, kendi aralarında kimlik sırasıyla
+    tasks.sort(key=lambda task: (task_date_key(task), task["source"] != "manual"))
+    return tasks
+
+
+class TaskMetaCache:
+    """Manuel görev açıklamalarındaki ``__META__`` JSON'unun çözülmüş hali.
+
+    Anahtar (görev kimliği, satır sürümü) çiftidir; ``gorevler`` tablosunda
+    sürüm sütunu olmadığından sürüm olarak açıklama metninin kendisi
+    kullanılır: metin değişince kayıt yeniden çözülür.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self._entries: OrderedDict[Tuple[Any, str], Dict[str, Any]] = OrderedDict()
+        self._max_entries = max(1, int(max_entries))
+
+    def get(self, task_id: Any, raw: Optional[str]) -> Dict[str, Any]:
+        if not raw or not raw.startswith("__META__"):
+            return {}
+        key = (task_id, raw)
+        meta = self._entries.get(key)
+        if meta is not None:
+            self._entries.move_to_end(key)
+            return meta
+        try:
+            meta = json.loads(raw.replace("__META__", "", 1))
+        except json.JSONDecodeError:
+            meta = {}
+        if not isinstance(meta, dict):
+            meta = {}
+        self._entries[key] = meta
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return meta
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class TaskRangeCache:
+    """Takvim pencereleri için kayan, bellek içi görev önbelleği.
+
+    ``get(start, end)`` istenen aralık yüklü aralığın içindeyse veritabanına
+    gitmeden dilimi döndürür. Aralık yüklü bölgeyle örtüşüyor ya da ona
+    bitişikse yalnızca eksik dilim(ler) okunup eklenir; aksi halde pencere
+    baştan yüklenir. Toplam yayılım ``max_days``'i aşarsa önbellek istenen
+    aralığa kırpılır. Her çağrıda change_log imleci kontrol edilir.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, str], List[TaskRow]] = query_task_window,
+        *,
+        max_days: int = 6 * 366,
+    ) -> None:
+        self._loader = loader
+        self._max_days = max(1, int(max_days))
+        self._start: date | None = None
+        self._end: date | None = None
+        self._tasks: List[TaskRow] = []
+        self._keys: List[str] = []
+        self._cursor: int | None = None
+        self.loads = 0
+
+    @property
+    def loaded_range(self) -> tuple[date, date] | None:
+        if self._start is None or self._end is None:
+            return None
+        return self._start, self._end
+
+    def invalidate(self) -> None:
+        self._start = self._end = None
+        self._tasks = []
+        self._keys = []
+
+    def get(self, start: date, end: date) -> List[TaskRow]:
+        """``[start, end]`` aralığındaki görevler (tarih sıralı, paylaşılan sözlükler)."""
+        if end < start:
+            return []
+        self._check_changes()
+        if self._start is None or self._end is None or (
+            end < self._start - timedelta(days=1) or start > self._end + timedelta(days=1)
+        ):
+            self._replace(start, end)
+        else:
+            if start < self._start:
+                self._merge(self._load(start, self._start - timedelta(days=1)))
+                self._start = start
+            if end > self._end:
+                self._merge(self._load(self._end + timedelta(days=1), end))
+                self._end = end
+            if (self._end - self._start).days > self._max_days:
+                self._trim(start, end)
+        low = bisect.bisect_left(self._keys, start.isoformat())
+        high = bisect.bisect_right(self._keys, end.isoformat())
+        return self._tasks[low:high]
+
+    def _check_changes(self) -> None:
+        if self._cursor is None:
+            return
+        try:
+            feed = get_changes_since(self._cursor)
+        except sqlite3.Error:
+            self.invalidate()
+            self._cursor = None
+            return
+        if feed["overflow"] or feed["tables"] & WATCHED_TABLES:
+            self.invalidate()
+        self._cursor = feed["cursor"]
+
+    def _load(self, start: date, end: date) -> List[TaskRow]:
+        if self._cursor is None:
+            # Yüklemeden önce alınır: yükleme sırasındaki yazımlar da yakalanır
+            self._cursor = get_change_cursor()
+        self.loads += 1
+        return self._loader(start.isoformat(), end.isoformat())
+
+    def _replace(self, start: date, end: date) -> None:
+        self._tasks = self._load(start, end)
+        self._keys = [task_date_key(task) for task in self._tasks]
+        self._start, self._end = start, end
+
+    def _merge(self, tasks: List[TaskRow]) -> None:
+        if not tasks:
+            return
+        combined = self._tasks + tasks
+        combined.sort(key=lambda task: (task_date_key(task), task.get("source") != "manual"))
+        self._tasks = combined
+        self._keys = [task_date_key(task) for task in combined]
+
+    def _trim(self, start: date, end: date) -> None:
+        low = bisect.bisect_left(self._keys, start.isoformat())
+        high = bisect.bisect_right(self._keys, end.isoformat())
+        self._tasks = self._tasks[low:high]
+        self._keys = self._keys[low:high]
+        self._start, self._end = start, end
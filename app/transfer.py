@@ -23,6 +23,13 @@ from typing import Tuple, Optional, Dict, Any
 
 from PyQt6.QtCore import QSettings
 
+try:  # pragma: no cover - runtime import guard
+    from app.db import get_database_path, replace_database_file
+    from app.models import backup_database
+except ModuleNotFoundError:  # pragma: no cover
+    from db import get_database_path, replace_database_file
+    from models import backup_database
+
 logger = logging.getLogger(__name__)
 
 # Transfer dosyası uzantısı
@@ -35,8 +42,8 @@ def get_docs_dir() -> Path:
 
 
 def get_db_path() -> Path:
-    """Veritabanı dosya yolunu döndürür."""
-    return get_docs_dir() / "data.db"
+    """Veritabanı dosya yolunu döndürür (uygulamanın kullandığı canlı veritabanı)."""
+    return Path(get_database_path())
 
 
 def export_transfer_package(output_path: str) -> Tuple[bool, str]:
@@ -93,8 +100,9 @@ def export_transfer_package(output_path: str) -> Tuple[bool, str]:
                             shutil.copy2(db_path, temp_db)
                             logger.warning("Şifre çözme başarısız, olduğu gibi kopyalandı")
                     else:
-                        # Şifresiz - direkt kopyala
-                        shutil.copy2(db_path, temp_path / "data.db")
+                        # Sayfa şifreli veritabanı makineye bağlıdır; şifresiz,
+                        # tutarlı bir kopya alınır
+                        backup_database(str(temp_path / "data.db"), plaintext=True)
                 except ImportError:
                     # db_crypto modülü yok - direkt kopyala
                     shutil.copy2(db_path, temp_path / "data.db")
@@ -189,12 +197,12 @@ def import_transfer_package(package_path: str) -> Tuple[bool, str, Optional[str]
                 backup_name = f"pre_import_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
                 backup_dir = docs_dir / "yedekler"
                 backup_dir.mkdir(exist_ok=True)
-                shutil.copy2(db_path, backup_dir / backup_name)
+                backup_database(str(backup_dir / backup_name))
 
             # Veritabanını kopyala ve yeni makine için şifrele
             source_db = temp_path / "data.db"
             if source_db.exists():
-                shutil.copy2(source_db, db_path)
+                replace_database_file(str(source_db))
 
                 # Yeni makine için şifrele
                 try:
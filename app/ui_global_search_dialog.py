@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from PyQt6.QtCore import QSettings, Qt, QTimer
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QDialogButtonBox,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+try:  # pragma: no cover - runtime import guard
+    from app.models import global_search
+    from app.utils import iso_to_tr
+except ModuleNotFoundError:  # pragma: no cover
+    from models import global_search
+    from utils import iso_to_tr
+
+
+class GlobalSearchDialog(QDialog):
+    """Dosya, görev, tebligat, arabuluculuk ve dosya notlarında ortak arama.
+
+    Seçilen sonuç ``selected_result`` üzerinden okunur; yönlendirme
+    (dosyayı açma, ilgili sekmeye geçme) çağıran pencereye bırakılır.
+    """
+
+    RESULT_LIMIT = 100
+
+    def __init__(self, parent=None, initial_text: str = "") -> None:
+        super().__init__(parent)
+        self.selected_result: Optional[Dict[str, Any]] = None
+        self._results: List[Dict[str, Any]] = []
+
+        self.setWindowTitle("Genel Arama")
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(200)
+        self._search_timer.timeout.connect(self._run_search)
+
+        self._build_ui()
+        self._restore_dialog_size()
+
+        if initial_text:
+            self.search_input.setText(initial_text)
+            self._run_search()
+
+    def _restore_dialog_size(self) -> None:
+        """Kaydedilmiş pencere boyutunu yükle."""
+        settings = QSettings("TakibiEsasi", "TakibiEsasi")
+        size = settings.value("GlobalSearchDialog/size")
+        if size:
+            self.resize(size)
+        else:
+            self.resize(760, 480)
+
+    def closeEvent(self, event) -> None:
+        """Pencere boyutunu kaydet ve kapat."""
+        settings = QSettings("TakibiEsasi", "TakibiEsasi")
+        settings.setValue("GlobalSearchDialog/size", self.size())
+        super().closeEvent(event)
+
+    def _build_ui(self) -> None:
+        layout = QVBoxLayout(self)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(
+            "Dosya, görev, tebligat, arabuluculuk ve notlarda ara…"
+        )
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self._schedule_search)
+        self.search_input.returnPressed.connect(self._accept_current)
+        layout.addWidget(self.search_input)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Tür", "Başlık", "Ayrıntı", "Tarih"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.doubleClicked.connect(lambda _index: self._accept_current())
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.button_box = QDialogButtonBox()
+        self.button_box.addButton("Aç", QDialogButtonBox.ButtonRole.AcceptRole)
+        self.button_box.addButton("Kapat", QDialogButtonBox.ButtonRole.RejectRole)
+        self.button_box.accepted.connect(self._accept_current)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+
+    def _schedule_search(self) -> None:
+        self._search_timer.start()
+
+    def _run_search(self) -> None:
+        text = self.search_input.text().strip()
+        try:
+            self._results = global_search(text, limit=self.RESULT_LIMIT) if text else []
+        except Exception as exc:  # pragma: no cover - GUI safety
+            self._results = []
+            self.status_label.setText(f"Arama yapılamadı: {exc}")
+        else:
+            if not text:
+                self.status_label.setText("")
+            elif self._results:
+                self.status_label.setText(f"{len(self._results)} sonuç")
+            else:
+                self.status_label.setText("Sonuç bulunamadı")
+        self._populate()
+
+    def _populate(self) -> None:
+        self.table.setRowCount(len(self._results))
+        for row, result in enumerate(self._results):
+            values = [
+                result.get("etiket", ""),
+                str(result.get("baslik", "")),
+                str(result.get("ayrinti", "")).replace("\n", " "),
+                iso_to_tr(str(result.get("tarih") or "")[:10]),
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 0:
+                    item.setData(Qt.ItemDataRole.UserRole, row)
+                self.table.setItem(row, column, item)
+        if self._results:
+            self.table.selectRow(0)
+
+    def _accept_current(self) -> None:
+        row = self.table.currentRow()
+        if row < 0 or row >= len(self._results):
+            return
+        self.selected_result = self._results[row]
+        self.accept()
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from PyQt6.QtCore import (
+    QAbstractItemModel,
     QAbstractTableModel,
     Qt,
     QModelIndex,
@@ -87,21 +88,19 @@ import os
 import re
 import time
 import json
-import sqlite3
 from functools import partial
 from typing import Any, Callable, Iterable, List, Literal, Optional
 from collections import Counter
 
 try:  # pragma: no cover - runtime import guard
     from app.db import (
+        get_change_cursor,
         get_connection,
         is_case_closed,
         update_dosya_with_auto_timeline,
-        get_manual_tasks_between,
         insert_manual_task,
         update_manual_task,
         delete_manual_task,
-        get_case_tasks_between,
         get_all_manual_tasks,
         get_pending_tasks,
         get_completed_tasks,
@@ -109,14 +108,13 @@ try:  # pragma: no cover - runtime import guard
     )
 except ModuleNotFoundError:  # pragma: no cover
     from db import (
+        get_change_cursor,
         get_connection,
         is_case_closed,
         update_dosya_with_auto_timeline,
-        get_manual_tasks_between,
         insert_manual_task,
         update_manual_task,
         delete_manual_task,
-        get_case_tasks_between,
         get_all_manual_tasks,
         get_pending_tasks,
         get_completed_tasks,
@@ -125,8 +123,11 @@ except ModuleNotFoundError:  # pragma: no cover
 
 try:  # pragma: no cover - runtime import guard
     from app.models import (
+        CasePageKey,
+        case_page_key,
         log_action,
         fetch_dosyalar_by_color_hex,
+        fetch_dosyalar_page,
         set_archive_status,
         get_all_dosyalar,
         export_dosyalar_to_csv,
@@ -155,8 +156,11 @@ try:  # pragma: no cover - runtime import guard
     )
 except ModuleNotFoundError:  # pragma: no cover
     from models import (
+        CasePageKey,
+        case_page_key,
         log_action,
         fetch_dosyalar_by_color_hex,
+        fetch_dosyalar_page,
         set_archive_status,
         get_all_dosyalar,
         export_dosyalar_to_csv,
@@ -269,9 +273,24 @@ except ModuleNotFoundError:  # pragma: no cover
     from ui_vekalet_dialog import VekaletDialog
 
 try:  # pragma: no cover - runtime import guard
-    from app.workers import ChangeDetectorWorker
+    from app.ui_global_search_dialog import GlobalSearchDialog
 except ModuleNotFoundError:  # pragma: no cover
-    from workers import ChangeDetectorWorker
+    from ui_global_search_dialog import GlobalSearchDialog
+
+try:  # pragma: no cover - runtime import guard
+    from app.case_row_store import CaseRowStore
+except ModuleNotFoundError:  # pragma: no cover
+    from case_row_store import CaseRowStore
+
+try:  # pragma: no cover - runtime import guard
+    from app.task_aggregation import TaskMetaCache, TaskRangeCache
+except ModuleNotFoundError:  # pragma: no cover
+    from task_aggregation import TaskMetaCache, TaskRangeCache
+
+try:  # pragma: no cover - runtime import guard
+    from app.workers import CaseListLoadWorker, ChangeDetectorWorker
+except ModuleNotFoundError:  # pragma: no cover
+    from workers import CaseListLoadWorker, ChangeDetectorWorker
 
 try:  # pragma: no cover - runtime import guard
     from app.demo_manager import get_demo_manager
@@ -310,24 +329,26 @@ ALERT_CATEGORY_META: dict[str, dict[str, str]] = {
     "mediation": {"icon": "🤝", "accent": "#8e24aa", "label": "Arabul."},
 }
 
-PreparedDosyaRow = tuple[
-    dict[str, Any],
-    dict[int, dict[Any, object]],
-]
-
 _FONT_BOLD = QFont()
 _FONT_BOLD.setBold(True)
 _ARROW_TEXT = "→"
 _CENTER_ALIGNMENT = int(Qt.AlignmentFlag.AlignCenter)
+# Sabit ok sütununun rolleri: tüm satırlar aynı nesneleri paylaşır
+_SELECTION_CELL_ROLES = {
+    Qt.ItemDataRole.DisplayRole: _ARROW_TEXT,
+    Qt.ItemDataRole.TextAlignmentRole: _CENTER_ALIGNMENT,
+    Qt.ItemDataRole.FontRole: _FONT_BOLD,
+    Qt.ItemDataRole.UserRole: "",
+}
 _QCOLOR_CACHE: dict[str, QColor] = {}
 _QBRUSH_CACHE: dict[str, QBrush] = {}
 STATUS_BRUSHES: dict[str, QBrush | None] = {}
 STATUS_FG: dict[str, QColor] = {}
 DEFAULT_STATUS_FG = QColor("#000000")
 _STATUS_PALETTE_LOADED = False
+# Palet her değiştiğinde artar; modellerin durum kodu -> renk önbelleği için
+_STATUS_PALETTE_VERSION = 0
 _DATE_FIELDS = {"durusma_tarihi", "is_tarihi", "is_tarihi_2"}
-_STATUS_COLOR_FIELDS = {"dava_durumu", "tekrar_dava_durumu_2"}
-_STATUS_COLOR_META = "status_color_key"
 OPTIONAL_DATE_MIN = QDate(1900, 1, 1)
 OPTIONAL_DATE_MAX = QDate(7999, 12, 31)
 _JOB_DATE_BRUSHES = {
@@ -440,11 +461,12 @@ def _job_date_background(value: Any) -> QBrush | None:
 def load_status_palette(force: bool = False) -> None:
     """Populate shared status brush/foreground caches once."""
 
-    global _STATUS_PALETTE_LOADED
+    global _STATUS_PALETTE_LOADED, _STATUS_PALETTE_VERSION
     if _STATUS_PALETTE_LOADED and not force:
         return
     STATUS_BRUSHES.clear()
     STATUS_FG.clear()
+    _STATUS_PALETTE_VERSION += 1
     try:
         statuses = get_statuses()
     except Exception as exc:  # pragma: no cover - defensive logging
@@ -467,9 +489,11 @@ def load_status_palette(force: bool = False) -> None:
 
 
 def _apply_status_palette_entry(name: str, color_hex: str | None) -> None:
+    global _STATUS_PALETTE_VERSION
     normalized = _normalize_text_value(name)
     if not normalized:
         return
+    _STATUS_PALETTE_VERSION += 1
     brush = _cached_brush(color_hex)
     fg_hex = get_status_text_color(color_hex)
     fg_color = _cached_qcolor(fg_hex) or DEFAULT_STATUS_FG
@@ -751,6 +775,13 @@ def _install_copy_shortcut(view: QTableView) -> None:
     shortcut.activated.connect(_copy_selection)
 
 
+def _fetch_all_rows(model: QAbstractItemModel) -> None:
+    """Sayfalı (fetchMore) modellerde dışa aktarım öncesi tüm satırları oku."""
+    root = QModelIndex()
+    while model.canFetchMore(root):
+        model.fetchMore(root)
+
+
 class TableExportSelectionDialog(QDialog):
     """Tablo export için satır seçim dialogu.
 
@@ -778,6 +809,7 @@ class TableExportSelectionDialog(QDialog):
         if self._model is None:
             return
 
+        _fetch_all_rows(self._model)
         row_count = self._model.rowCount()
 
         layout = QVBoxLayout(self)
@@ -932,6 +964,7 @@ def export_table_to_excel_with_selection(
 
     # Eğer seçim yoksa tüm satırları al
     if selected_rows is None:
+        _fetch_all_rows(model)
         selected_rows = list(range(model.rowCount()))
 
     if not selected_rows:
@@ -1039,6 +1072,7 @@ def export_table_to_pdf_with_selection(
         return
 
     if selected_rows is None:
+        _fetch_all_rows(model)
         selected_rows = list(range(model.rowCount()))
 
     if not selected_rows:
@@ -1798,9 +1832,19 @@ class DosyaTableModel(QAbstractTableModel):
             "is_tarihi_2",
             "aciklama_2",
         ]
-        self.records: list[dict[str, Any]] = []
-        self._rows: list[dict[int, dict[Any, object]]] = []
+        # Satırlar sütun bazlı depoda; hücre rolleri data() içinde sütunlardan
+        # doğrudan üretilir, satır başına sözlük ya da rol önbelleği tutulmaz
+        self.records = CaseRowStore()
+        # Havuzlu durum kodu -> (arka plan, yazı rengi); paylaşılan QBrush/QColor
+        self._status_colors: dict[int, tuple[QBrush | None, QColor]] = {}
+        self._status_colors_version = _STATUS_PALETTE_VERSION
         self._attached_view: QAbstractItemView | None = None
+        self._sort_column: int | None = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        # Keyset sayfalama (canFetchMore/fetchMore); bkz. set_page_source
+        self._page_source: Callable[[CasePageKey], tuple[list[dict], CasePageKey | None]] | None = None
+        self._page_after: CasePageKey | None = None
+        self._keyset_ordered = False
 
     def attach_view(self, view: QAbstractItemView | None) -> None:
         self._attached_view = view
@@ -1809,16 +1853,10 @@ class DosyaTableModel(QAbstractTableModel):
         prepared = self.prepare_records(records)
         self.apply_prepared_records(prepared)
 
-    def prepare_records(self, records: list[dict[str, Any]]) -> list[PreparedDosyaRow]:
-        prepared: list[PreparedDosyaRow] = []
-        today = date.today()
-        for record in records:
-            record_copy = dict(record)
-            row_cache = self._build_row_cache(record_copy, today=today)
-            prepared.append((record_copy, row_cache))
-        return prepared
+    def prepare_records(self, records: list[dict[str, Any]]) -> CaseRowStore:
+        return CaseRowStore(records)
 
-    def apply_prepared_records(self, prepared: list[PreparedDosyaRow]) -> None:
+    def apply_prepared_records(self, prepared: CaseRowStore | list[dict[str, Any]]) -> None:
         view = self._attached_view
         table_view = view if isinstance(view, QTableView) else None
         sorting_was_enabled = table_view.isSortingEnabled() if table_view else False
@@ -1832,8 +1870,11 @@ class DosyaTableModel(QAbstractTableModel):
         if table_view is not None:
             table_view.setSortingEnabled(False)
         self.beginResetModel()
-        self.records = [record for record, _ in prepared]
-        self._rows = [cells for _, cells in prepared]
+        self.records = prepared if isinstance(prepared, CaseRowStore) else CaseRowStore(prepared)
+        self._status_colors.clear()
+        self._page_source = None
+        self._page_after = None
+        self._keyset_ordered = False
         self.endResetModel()
         if table_view is not None:
             table_view.setSortingEnabled(sorting_was_enabled)
@@ -1843,13 +1884,172 @@ class DosyaTableModel(QAbstractTableModel):
             except Exception:
                 pass
 
+    def append_prepared_records(self, prepared: CaseRowStore | list[dict[str, Any]]) -> None:
+        """Hazır satırları modelin sonuna ekle (partiler halinde yükleme için)."""
+        if not prepared:
+            return
+        first = len(self.records)
+        self.beginInsertRows(QModelIndex(), first, first + len(prepared) - 1)
+        self.records.extend(prepared)
+        self.endInsertRows()
+
+    def set_page_source(
+        self,
+        source: Callable[[CasePageKey], tuple[list[dict], CasePageKey | None]],
+        after: CasePageKey | None,
+    ) -> None:
+        """Kalan satırları ``fetchMore`` ile sayfa sayfa okuyacak kaynağı bağla.
+
+        Model şu an ``buro_takip_no, id`` sırasındaki ilk sayfayı içerir;
+        ``source(after)`` bir sonraki sayfayı ve yeni anahtarı döndürür.
+        """
+        self._keyset_ordered = True
+        self._page_after = after
+        self._page_source = source if after is not None else None
+
+    def canFetchMore(self, parent=QModelIndex()):  # type: ignore[override]
+        if parent.isValid():
+            return False
+        return self._page_source is not None and self._page_after is not None
+
+    def fetchMore(self, parent=QModelIndex()):  # type: ignore[override]
+        if not self.canFetchMore(parent):
+            return
+        records, next_after = self._page_source(self._page_after)
+        self._page_after = next_after
+        if next_after is None:
+            self._page_source = None
+        self.append_prepared_records(self.prepare_records(records))
+
+    def fetch_all(self) -> None:
+        """Sayfalı kaynakta kalan tüm satırları oku."""
+        while self.canFetchMore():
+            self.fetchMore()
+
+    def resort(self) -> None:
+        """Model kendi ``sort`` yöntemiyle sıralandıysa aynı sıralamayı yeniden uygula."""
+        if self._sort_column is not None:
+            self.sort(self._sort_column, self._sort_order)
+
+    def apply_row_delta(
+        self,
+        upserts: list[dict[str, Any]],
+        removed_ids: Iterable[int] = (),
+    ) -> None:
+        """Değişen satırları modeli sıfırlamadan yerinde uygula.
+
+        ``upserts`` içindeki kayıtlar ``id`` ile eşleşen satırı günceller
+        (``dataChanged``) ya da yeni satır olarak eklenir (``beginInsertRows``);
+        ``removed_ids`` satırları ``beginRemoveRows`` ile çıkarılır. Model
+        kendi ``sort`` yöntemiyle sıralıysa yeni satır sıralı konuma girer;
+        sayfalı modelde henüz okunmamış aralığa düşen yeni satırlar eklenmez,
+        ``fetchMore`` ile gelir.
+        """
+        upsert_map: dict[int, dict[str, Any]] = {}
+        for record in upserts:
+            try:
+                upsert_map[int(record["id"])] = record
+            except (KeyError, TypeError, ValueError):
+                continue
+        removed = {int(value) for value in removed_ids} - upsert_map.keys()
+        positions = self.records.index_by_id()
+
+        remove_rows = sorted(
+            (positions[dosya_id] for dosya_id in removed if dosya_id in positions),
+            reverse=True,
+        )
+        for row in remove_rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.records.pop(row)
+            self.endRemoveRows()
+        if remove_rows:
+            positions = self.records.index_by_id()
+
+        last_column = len(self.headers) - 1
+        inserts: list[dict[str, Any]] = []
+        for dosya_id, record in upsert_map.items():
+            row = positions.get(dosya_id)
+            if row is None:
+                if not self._beyond_loaded_page(record):
+                    inserts.append(record)
+                continue
+            self.records[row] = record
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+        for record in inserts:
+            row = self._insert_position(record)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.records.insert(row, record)
+            self.endInsertRows()
+
+    def _beyond_loaded_page(self, record: dict[str, Any]) -> bool:
+        if self._page_after is None:
+            return False
+        try:
+            return case_page_key(record) > self._page_after
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    def _insert_position(self, record: dict[str, Any]) -> int:
+        column = self._sort_column
+        if (column is None or column == self.COL_SELECTION) and self._keyset_ordered:
+            try:
+                key = case_page_key(record)
+                for row, other in enumerate(self._page_keys(self.records)):
+                    if key < other:
+                        return row
+            except (KeyError, TypeError, ValueError):
+                pass
+            return len(self.records)
+        if column is None:
+            return len(self.records)
+        key = self._column_sort_keys(column, CaseRowStore([record]))[0]
+        descending = self._sort_order == Qt.SortOrder.DescendingOrder
+        for row, other in enumerate(self._column_sort_keys(column)):
+            try:
+                if (other < key) if descending else (key < other):
+                    return row
+            except TypeError:
+                continue
+        return len(self.records)
+
+    @staticmethod
+    def _page_keys(store: CaseRowStore) -> list[CasePageKey]:
+        """Satırların ``case_page_key`` değerleri, sütunlardan okunarak."""
+        return [
+            (bn is not None, bn if bn is not None else 0, int(record_id))
+            for bn, record_id in zip(store.column("buro_takip_no"), store.column("id"))
+        ]
+
+    def _column_sort_keys(self, column: int, store: CaseRowStore | None = None) -> list[object]:
+        """Sütunun tüm satırlar için ``UserRole`` sıralama değerleri."""
+        store = self.records if store is None else store
+        key = self.keys[column]
+        if key == "buro_takip_no":
+            return [
+                value if type(value) is int else _int_sort_key(value)
+                for value in store.column(key)
+            ]
+        if key in _DATE_FIELDS:
+            return [
+                _date_sort_key(self._cell_date(store, row, key)) for row in range(len(store))
+            ]
+        return [self._cell_text(store, row, key).casefold() for row in range(len(store))]
+
     def record_at(self, row: int) -> dict | None:
+        """Satırın kayıt kopyası (değiştirmek modeli etkilemez)."""
         if 0 <= row < len(self.records):
             return self.records[row]
         return None
 
+    def row_view(self, row: int):
+        """Satırın kopyasız, salt okunur görünümü (filtreler için)."""
+        if 0 <= row < len(self.records):
+            return self.records.view(row)
+        return None
+
     def rowCount(self, parent=QModelIndex()):  # type: ignore[override]
-        return len(self._rows)
+        return len(self.records)
 
     def columnCount(self, parent=QModelIndex()):  # type: ignore[override]
         return len(self.headers)
@@ -1877,24 +2077,70 @@ class DosyaTableModel(QAbstractTableModel):
             print(f"[perf] DisplayRole hits: {display_hits}")
         if not index.isValid():
             return None
-        if not (0 <= index.row() < len(self._rows)):
+        row = index.row()
+        column = index.column()
+        store = self.records
+        if not (0 <= row < len(store)) or not (0 <= column < len(self.keys)):
             return None
-        row_cache = self._rows[index.row()]
-        cell = row_cache.get(index.column())
-        if not cell:
+        key = self.keys[column]
+        if key is None:
+            return _SELECTION_CELL_ROLES.get(role)
+        if role == Qt.ItemDataRole.DisplayRole:
+            if key in _DATE_FIELDS:
+                date_value = self._cell_date(store, row, key)
+                return date_value.strftime("%d.%m.%Y") if date_value else ""
+            return self._cell_text(store, row, key)
+        if role == Qt.ItemDataRole.UserRole:
+            if key == "buro_takip_no":
+                return _int_sort_key(store.value(row, key))
+            if key in _DATE_FIELDS:
+                return _date_sort_key(self._cell_date(store, row, key))
+            return self._cell_text(store, row, key).casefold()
+        if role == Qt.ItemDataRole.EditRole:
+            if key in _DATE_FIELDS:
+                return store.value(row, key) or ""
             return None
         if role == Qt.ItemDataRole.BackgroundRole:
-            bg_value = self._background_data(index, cell)
-            if bg_value is not None:
-                return bg_value
+            return self._background_data(row, column)
         if role == Qt.ItemDataRole.ForegroundRole:
-            fg_value = self._foreground_data(index, cell)
-            if fg_value is not None:
-                return fg_value
-        if role in cell:
-            return cell[role]
+            return self._foreground_data(row, column)
         return None
 
+    def _cell_text(self, store: CaseRowStore, row: int, key: str) -> str:
+        text_value = _normalize_text_value(store.value(row, key))
+        if key == "muvekkil_adi":
+            text_value = _with_role_abbreviation(text_value, store.value(row, "muvekkil_rolu"))
+        return text_value
+
+    @staticmethod
+    def _cell_date(store: CaseRowStore, row: int, key: str) -> date | None:
+        ordinal = store.ordinal(row, key)
+        if ordinal is None:
+            # Ordinal'e sığmayan (eski biçimli) tarihler metin olarak saklanır
+            return coerce_to_date(store.value(row, key))
+        return date.fromordinal(ordinal) if ordinal else None
+
+    def _status_roles(self, row: int, key: str) -> tuple[QBrush | None, QColor] | None:
+        """Durum hücresinin renkleri; aynı durum kodu aynı QBrush/QColor'ı paylaşır."""
+        store = self.records
+        code = store.code(row, key)
+        if code == 0:
+            return None
+        if self._status_colors_version != _STATUS_PALETTE_VERSION:
+            self._status_colors.clear()
+            self._status_colors_version = _STATUS_PALETTE_VERSION
+        if code is not None:
+            cached = self._status_colors.get(code)
+            if cached is not None:
+                return cached
+        status_label = _normalize_text_value(store.value(row, key))
+        if not status_label:
+            return None
+        entry = _ensure_status_palette_entry(status_label)
+        if code is not None and self._status_colors_version == _STATUS_PALETTE_VERSION:
+            self._status_colors[code] = entry
+        return entry
+
     def _field_to_column(self, field_name: str) -> int | None:
         """Alan adından sütun numarasını bul."""
         try:
@@ -1950,8 +2196,7 @@ class DosyaTableModel(QAbstractTableModel):
         except Exception as exc:
             self._show_update_error(f"Alan güncellenemedi:\n{exc}")
             return False
-        record[field] = iso_value
-        record["updated_at"] = payload["updated_at"]
+        changes: dict[str, Any] = dict(payload)
 
         # ADIM 1 & 2: Dava durumu değiştiğinde is_tarihi ve aciklama sıfırlandıysa tabloya yansıt
         extra_updated_columns: list[int] = []
@@ -1960,8 +2205,8 @@ class DosyaTableModel(QAbstractTableModel):
             new_dava = iso_value or ""
             # Boşa çekildi veya değişti → is_tarihi ve aciklama sıfırlandı
             if not new_dava or (old_dava and old_dava != new_dava):
-                record["is_tarihi"] = None
-                record["aciklama"] = None
+                changes["is_tarihi"] = None
+                changes["aciklama"] = None
                 is_tarihi_col = self._field_to_column("is_tarihi")
                 if is_tarihi_col is not None:
                     extra_updated_columns.append(is_tarihi_col)
@@ -1972,8 +2217,8 @@ class DosyaTableModel(QAbstractTableModel):
             old_dava2 = tracked_state.get("dava_durumu_2") or ""
             new_dava2 = iso_value or ""
             if not new_dava2 or (old_dava2 and old_dava2 != new_dava2):
-                record["is_tarihi_2"] = None
-                record["aciklama_2"] = None
+                changes["is_tarihi_2"] = None
+                changes["aciklama_2"] = None
                 is_tarihi_2_col = self._field_to_column("is_tarihi_2")
                 if is_tarihi_2_col is not None:
                     extra_updated_columns.append(is_tarihi_2_col)
@@ -1981,15 +2226,7 @@ class DosyaTableModel(QAbstractTableModel):
                 if aciklama_2_col is not None:
                     extra_updated_columns.append(aciklama_2_col)
 
-        cell = self._build_cell_roles(field, record, today=date.today())
-        self._rows[index.row()][index.column()] = cell
-
-        # Ekstra güncellenen sütunları da yenile
-        for col in extra_updated_columns:
-            extra_field = self.keys[col] if col < len(self.keys) else None
-            if extra_field:
-                extra_cell = self._build_cell_roles(extra_field, record, today=date.today())
-                self._rows[index.row()][col] = extra_cell
+        self.records.update(index.row(), changes)
 
         self.dataChanged.emit(
             index,
@@ -2032,117 +2269,55 @@ class DosyaTableModel(QAbstractTableModel):
         if not (0 <= column < len(self.keys)):
             return
         reverse = order == Qt.SortOrder.DescendingOrder
-        combined = list(zip(self.records, self._rows))
-        sort_role = Qt.ItemDataRole.UserRole
-        display_role = Qt.ItemDataRole.DisplayRole
-
-        def sort_key(item: tuple[dict[str, Any], dict[int, dict[Qt.ItemDataRole, object]]]):
-            cell = item[1].get(column) or {}
-            value = cell.get(sort_role)
-            if isinstance(value, (int, float)):
-                return value
-            if isinstance(value, str):
-                return value
-            return str(cell.get(display_role, ""))
-
+        self._sort_column = column
+        self._sort_order = order
+        if column == self.COL_SELECTION:
+            # Sabit değerli ok sütunu: mevcut (keyset) sıra korunur
+            return
+        keyset_compatible = column == self.COL_BN and not reverse
+        if not keyset_compatible:
+            # Kısmi sayfa yalnızca buro_takip_no sırasında anlamlıdır
+            self.fetch_all()
+            self._keyset_ordered = False
+
+        sort_keys = self._column_sort_keys(column)
+        order_rows = sorted(range(len(sort_keys)), key=sort_keys.__getitem__, reverse=reverse)
         self.layoutAboutToBeChanged.emit()
-        combined.sort(key=sort_key, reverse=reverse)
-        self.records = [record for record, _ in combined]
-        self._rows = [cells for _, cells in combined]
+        self.records.reorder(order_rows)
         self.layoutChanged.emit()
 
-    def _background_data(
-        self, index: QModelIndex, cell: dict[Any, object]
-    ) -> QBrush | None:
-        column = index.column()
-        record = self.record_at(index.row())
+    def _background_data(self, row: int, column: int) -> QBrush | None:
+        store = self.records
         # NOTE: restored duruşma/dava status coloring logic using get_durusma_color/get_status_color
-        if column == self.COL_DURUSMA_TARIHI and record:
-            bg_brush, _ = _durusma_color_roles(record.get("durusma_tarihi"))
+        if column == self.COL_DURUSMA_TARIHI:
+            bg_brush, _ = _durusma_color_roles(self._cell_date(store, row, "durusma_tarihi"))
             if bg_brush is not None:
                 return bg_brush
-        if record and column in (self.COL_IS_TARIHI, self.COL_IS_TARIHI_2):
-            key = self.keys[column]
-            brush = _job_date_background(record.get(key))
+        if column in (self.COL_IS_TARIHI, self.COL_IS_TARIHI_2):
+            brush = _job_date_background(self._cell_date(store, row, self.keys[column]))
             if brush is not None:
                 return brush
         if column in self._STATUS_COLUMNS:
-            status_key = cell.get(_STATUS_COLOR_META)
-            if status_key:
-                if status_key in STATUS_BRUSHES:
-                    return STATUS_BRUSHES.get(status_key)
-                brush, _ = _ensure_status_palette_entry(status_key)
-                return brush
+            colors = self._status_roles(row, self.keys[column])
+            if colors is not None:
+                return colors[0]
         return None
 
-    def _foreground_data(
-        self, index: QModelIndex, cell: dict[Any, object]
-    ) -> QColor | QBrush | None:
-        column = index.column()
-        record = self.record_at(index.row())
+    def _foreground_data(self, row: int, column: int) -> QColor | QBrush | None:
         if column in (self.COL_IS_TARIHI, self.COL_IS_TARIHI_2):
             return QBrush(Qt.GlobalColor.black)
-        if column == self.COL_DURUSMA_TARIHI and record:
-            _, fg_color = _durusma_color_roles(record.get("durusma_tarihi"))
+        if column == self.COL_DURUSMA_TARIHI:
+            _, fg_color = _durusma_color_roles(
+                self._cell_date(self.records, row, "durusma_tarihi")
+            )
             if fg_color is not None:
                 return fg_color
         if column in self._STATUS_COLUMNS:
-            status_key = cell.get(_STATUS_COLOR_META)
-            if status_key:
-                if status_key not in STATUS_FG:
-                    _, fg_color = _ensure_status_palette_entry(status_key)
-                    return fg_color
-                return STATUS_FG.get(status_key, DEFAULT_STATUS_FG)
+            colors = self._status_roles(row, self.keys[column])
+            if colors is not None:
+                return colors[1]
         return None
 
-    def _build_row_cache(
-        self, record: dict[str, Any], *, today: date | None = None
-    ) -> dict[int, dict[Any, object]]:
-        row_cache: dict[int, dict[Any, object]] = {}
-        for column, key in enumerate(self.keys):
-            cell = self._build_cell_roles(key, record, today=today)
-            if cell:
-                row_cache[column] = cell
-        return row_cache
-
-    def _build_cell_roles(
-        self, key: str | None, record: dict[str, Any], *, today: date | None = None
-    ) -> dict[Any, object]:
-        cell: dict[Any, object] = {}
-        if key is None:
-            cell[Qt.ItemDataRole.DisplayRole] = _ARROW_TEXT
-            cell[Qt.ItemDataRole.TextAlignmentRole] = _CENTER_ALIGNMENT
-            cell[Qt.ItemDataRole.FontRole] = _FONT_BOLD
-            cell[Qt.ItemDataRole.UserRole] = ""
-            return cell
-        raw_value = record.get(key)
-        if key == "buro_takip_no":
-            bn_text = _normalize_text_value(raw_value)
-            cell[Qt.ItemDataRole.DisplayRole] = bn_text
-            cell[Qt.ItemDataRole.UserRole] = _int_sort_key(raw_value)
-            # NOTE: ensure BN sorts numerically via UserRole
-            return cell
-        if key in _DATE_FIELDS:
-            date_value = coerce_to_date(raw_value)
-            cell[Qt.ItemDataRole.DisplayRole] = (
-                date_value.strftime("%d.%m.%Y") if date_value else ""
-            )
-            cell[Qt.ItemDataRole.UserRole] = _date_sort_key(date_value)
-            cell[Qt.ItemDataRole.EditRole] = raw_value or ""
-        else:
-            text_value = _normalize_text_value(raw_value)
-            if key == "muvekkil_adi":
-                text_value = _with_role_abbreviation(
-                    text_value, record.get("muvekkil_rolu")
-                )
-            cell[Qt.ItemDataRole.DisplayRole] = text_value
-            cell[Qt.ItemDataRole.UserRole] = text_value.casefold() if text_value else ""
-        if key in _STATUS_COLOR_FIELDS:
-            status_label = _normalize_text_value(record.get(key))
-            if status_label:
-                cell[_STATUS_COLOR_META] = status_label
-        return cell
-
     def _normalize_editor_value(self, value: Any) -> Optional[str]:
         if isinstance(value, QDate):
             if not value.isValid() or value == OPTIONAL_DATE_MIN:
@@ -2202,7 +2377,10 @@ class CustomTabProxyModel(QSortFilterProxyModel):
     ) -> bool:  # type: ignore[override]
         model = self.sourceModel()
         record = None
-        if model is not None and hasattr(model, "record_at"):
+        if isinstance(model, DosyaTableModel):
+            # Kayıt kopyası üretmeden sütun deposundan oku
+            record = model.row_view(source_row)
+        elif model is not None and hasattr(model, "record_at"):
             record = model.record_at(source_row)  # type: ignore[attr-defined]
         if self.allowed_ids is not None:
             record_id: Optional[int] = None
@@ -2251,6 +2429,8 @@ class DosyalarTab(QWidget):
     about_requested = pyqtSignal()
     row_double_clicked = pyqtSignal(QModelIndex)
     filters_changed = pyqtSignal()
+    # Arama metni değişti, gecikmeli filtreleme bekleniyor
+    search_pending = pyqtSignal()
     clear_filters_requested = pyqtSignal()
     refresh_requested = pyqtSignal()
 
@@ -2706,6 +2886,8 @@ class DosyalarTab(QWidget):
         if self._search_timer.isActive():
             self._search_timer.stop()
         self._search_timer.start()
+        if self.mode == "main":
+            self.search_pending.emit()
 
     def _emit_filters_changed(self) -> None:
         if self.mode == "main":
@@ -2762,20 +2944,26 @@ class DosyalarTab(QWidget):
         self.apply_model_rows(built)
         self.apply_proxy_sort_filter()
 
-    def build_model_rows(self, records: list[dict[str, Any]]) -> list[PreparedDosyaRow]:
+    def build_model_rows(self, records: list[dict[str, Any]]) -> CaseRowStore:
         return self.table_model.prepare_records(records)
 
-    def apply_model_rows(self, built_rows: list[PreparedDosyaRow]) -> None:
+    def apply_model_rows(self, built_rows: CaseRowStore) -> None:
         self.table_model.apply_prepared_records(built_rows)
 
     def apply_proxy_sort_filter(self) -> None:
+        if self.proxy is None:
+            return
+        self.sync_proxy_filters()
+        self.proxy.invalidate()
+
+    def sync_proxy_filters(self) -> None:
+        """Proxy filtre ayarlarını eşitle; dinamik proxy yeni satırları zaten sıralar."""
         if self.proxy is None:
             return
         if self.open_only_checkbox is not None:
             self.proxy.set_open_only(self.open_only_checkbox.isChecked())
         else:
             self.proxy.set_open_only(False)
-        self.proxy.invalidate()
 
     def collect_filters(self) -> dict[str, object | None]:
         hex6: str | None = None
@@ -3948,6 +4136,8 @@ class GorevlerTab(QWidget):
         self._all_tasks: list[dict[str, Any]] = []
         self._todo_tasks: list[dict[str, Any]] = []
         self._auto_assignees: dict[str, str] = {}
+        self._task_cache = TaskRangeCache()
+        self._task_meta = TaskMetaCache()
         self._use_selected_date_filter = True
         self._block_item_changed = False
         self._block_todo_item_changed = False
@@ -4273,7 +4463,14 @@ class GorevlerTab(QWidget):
 
     def _calendar_range(self) -> tuple[QDate, QDate]:
         today = QDate.currentDate()
-        return today.addYears(-2), today.addYears(2)
+        start, end = today.addYears(-2), today.addYears(2)
+        # Gösterilen ay bu pencerenin dışındaysa aralık o aya kayar (önbellek
+        # yalnızca eksik dilimi okur)
+        page_start = QDate(self.calendar.yearShown(), self.calendar.monthShown(), 1)
+        if page_start.isValid():
+            start = min(start, page_start.addDays(-7))
+            end = max(end, page_start.addMonths(1).addDays(6))
+        return start, end
 
     def _on_filter_changed(self, key: str) -> None:
         self._activate_filter(key)
@@ -4413,19 +4610,27 @@ class GorevlerTab(QWidget):
     def _on_calendar_double_clicked(self) -> None:
         self._add_task(for_date=self.calendar.selectedDate())
 
+    def invalidate_task_cache(self) -> None:
+        """Görev önbelleğini boşalt (change_log dışı değişiklikler için: durum renkleri, kullanıcılar)."""
+        self._task_cache.invalidate()
+        self._task_meta.clear()
+        if hasattr(self, "_user_id_cache"):
+            del self._user_id_cache
+
     def _collect_tasks(self, start: QDate, end: QDate) -> list[dict[str, Any]]:
-        start_str = start.toString("yyyy-MM-dd")
-        end_str = end.toString("yyyy-MM-dd")
         user_ids = self._user_id_lookup()
-        manual_rows = get_manual_tasks_between(start_str, end_str)
+        # Pencere tek sorguyla okunur; takvim sayfalanırken bellekten dilimlenir
+        window = self._task_cache.get(start.toPyDate(), end.toPyDate())
         manual_tasks: list[dict[str, Any]] = []
 
         def _clean(value: Any) -> str:
             return (value or "").strip()
 
-        for row in manual_rows:
+        for row in window:
+            if row.get("source") != "manual":
+                continue
             row_dict = dict(row)
-            meta = GorevDialog._parse_meta(row_dict.get("aciklama", ""))
+            meta = self._task_meta.get(row_dict.get("id"), row_dict.get("aciklama", ""))
             date_obj, date_str = self._safe_date(row_dict.get("tarih"))
             # Dosyaya atanan kullanıcıları tercih et, yoksa görevin kendi atamasını kullan
             atanan_label = _clean(
@@ -4480,30 +4685,12 @@ class GorevlerTab(QWidget):
             )
 
         case_tasks: list[dict[str, Any]] = []
-        conn = get_connection()
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        case_meta_cache: dict[int, dict[str, Any]] = {}
-
-        def _fetch_case_meta(dosya_id: Any) -> dict[str, Any]:
-            if not dosya_id:
-                return {}
-            if dosya_id not in case_meta_cache:
-                cur.execute(
-                    """
-                    SELECT dava_durumu, aciklama, tekrar_dava_durumu_2 AS dava_durumu_2, aciklama_2
-                    FROM dosyalar
-                    WHERE id = ?
-                    """,
-                    (dosya_id,),
-                )
-                row = cur.fetchone()
-                case_meta_cache[dosya_id] = dict(row) if row else {}
-            return case_meta_cache.get(dosya_id, {})
-
-        for task in get_case_tasks_between(start_str, end_str):
-            base = task | {"source": "auto"}
-            meta_fields = _fetch_case_meta(base.get("dosya_id"))
+        for task in window:
+            if task.get("source") != "auto":
+                continue
+            base = dict(task)
+            # Dosyanın durum/açıklama alanları toplu sorguda görevle birlikte gelir
+            meta_fields = base
             date_obj, date_str = self._safe_date(base.get("date"))
             key = base.get("task_id") or f"{base.get('dosya_id')}-{base.get('type')}"
             # Veritabanından gelen atamayı öncelikli kullan (dosya_atamalar'dan)
@@ -4598,7 +4785,6 @@ class GorevlerTab(QWidget):
                     "dava_durumu_color": base.get("dava_durumu_color"),  # Direkt renk
                 }
             )
-        conn.close()
         return manual_tasks + case_tasks
 
     def _add_task(self, *, for_date: QDate | None = None) -> None:
@@ -5394,6 +5580,15 @@ class GorevlerTab(QWidget):
 
 
 class MainWindow(QMainWindow):
+    # Bu sayıdan fazla dosya değiştiyse satır bazlı yerine tam yenileme yapılır
+    DOSYA_DELTA_LIMIT = 500
+    # Arka plan yükleyicisinin GUI'ye gönderdiği parti büyüklüğü
+    CASE_LOAD_BATCH_SIZE = 500
+    # Arşiv sekmesi keyset sayfa büyüklüğü; kalanı kaydırdıkça fetchMore ile gelir
+    ARCHIVE_PAGE_SIZE = 200
+
+    _case_load_requested = pyqtSignal(int, object)
+
     def __init__(self, current_user):
         super().__init__()
 
@@ -5527,6 +5722,7 @@ class MainWindow(QMainWindow):
         self._register_column_indices("Dosyalar", self.dosyalar_tab.table_model)
         self._register_column_indices("Arşiv", self.archive_table_model)
 
+        self._setup_case_list_loader()
         self.refresh_table()
 
         self.update_column_widths()
@@ -5538,12 +5734,17 @@ class MainWindow(QMainWindow):
     def _setup_auto_refresh(self) -> None:
         """Otomatik veri güncelleme sistemini başlat.
 
-        SQLite trigger + change_log sistemi kullanır.
-        Timestamp takibi yapmaz, sadece change_log tablosunu kontrol eder.
+        SQLite trigger + change_log sistemi kullanır. Pencere change_log
+        imlecini tutar; her yoklamada yalnızca imleçten sonraki satır
+        değişiklikleri okunur ve modellere yerinde uygulanır.
         """
         self._auto_refresh_enabled = True
-        self._auto_refresh_interval = 30000  # 30 saniye
+        self._auto_refresh_interval = 5000  # 5 saniye; yoklama indeksli ve ucuz
         self._auto_refresh_paused = False
+        try:
+            self._change_cursor = get_change_cursor()
+        except Exception:
+            self._change_cursor = 0
 
         # Worker ve thread referansları
         self._change_detector_thread: QThread | None = None
@@ -5568,7 +5769,7 @@ class MainWindow(QMainWindow):
                 self._change_detector_thread = None
                 self._change_detector_worker = None
 
-        self._change_detector_worker = ChangeDetectorWorker()
+        self._change_detector_worker = ChangeDetectorWorker(self._change_cursor)
         self._change_detector_thread = QThread(self)
         self._change_detector_worker.moveToThread(self._change_detector_thread)
         self._change_detector_thread.started.connect(self._change_detector_worker.run)
@@ -5590,10 +5791,29 @@ class MainWindow(QMainWindow):
         - dosyalar: bool - dosyalar tablosunda değişiklik var mı
         - gorevler: bool - gorevler tablosunda değişiklik var mı
         - finans: bool - finans tablosunda değişiklik var mı
+        - cursor: int - bir sonraki yoklamada kullanılacak change_log imleci
+        - rows: {tablo: {row_id: op}} - satır bazında değişiklikler
+        - overflow: bool - delta eksik, tam yenileme gerekli
         """
+        self._change_cursor = max(self._change_cursor, int(changes.get("cursor") or 0))
+        overflow = bool(changes.get("overflow"))
+        row_changes = changes.get("rows") or {}
+
         refreshed = []
         if changes.get("dosyalar"):
-            self.refresh_table()
+            applied = False
+            # Süren bir yükleme varken delta kaybolabilir; yeni kuşak başlatılır
+            if not overflow and not self._case_load_state.get("loading"):
+                try:
+                    applied = self._apply_dosya_changes(row_changes.get("dosyalar") or {})
+                except Exception as exc:  # pragma: no cover - GUI safety
+                    print(f"[auto-refresh] satır bazlı yenileme başarısız: {exc}")
+            if not applied:
+                self.refresh_table()
+            elif self.can_view_finance:
+                # Finans özeti dosya alanlarını da gösterir; görünür değilse
+                # sekmeye geçildiğinde yenilenir.
+                self._refresh_tab_when_visible(self.finance_tab, self.refresh_finance_table)
             refreshed.append("Dosyalar")
         if changes.get("gorevler"):
             self.gorevler_tab.refresh_tasks()
@@ -5605,6 +5825,75 @@ class MainWindow(QMainWindow):
         if refreshed:
             self.statusBar().showMessage(f"Güncellendi: {', '.join(refreshed)}", 3000)
 
+    def _apply_dosya_changes(self, row_ops: dict[int, str]) -> bool:
+        """Değişen dosyaları mevcut filtrelerle yeniden sorgulayıp modellere uygula.
+
+        Yalnızca değişen kimlikler okunur; filtreye artık uymayan ya da
+        silinen satırlar modelden çıkarılır. Delta çok büyükse ``False``
+        döner ve çağıran tam yenileme yapar.
+        """
+        if not row_ops or len(row_ops) > self.DOSYA_DELTA_LIMIT:
+            return False
+        tab = getattr(self, "dosyalar_tab", None)
+        if tab is None:
+            return False
+
+        filters = self._collect_filters()
+        cleaned_search, token_filters = parse_alert_tokens(filters["search_text"] or "")
+        changed_ids = [dosya_id for dosya_id, op in row_ops.items() if op != "D"]
+        query_kwargs = dict(
+            search_text=cleaned_search or None,
+            other_filters=filters["other_filters"],
+            assigned_user_id=filters["assigned_user_id"],
+            ids=changed_ids,
+        )
+        active_records = self._apply_post_query_filters(
+            self._query_files(
+                filters["hex6"],
+                open_only=filters["open_only"],
+                archived=False,
+                **query_kwargs,
+            ),
+            token_filters,
+        )
+        archived_records = self._apply_post_query_filters(
+            self._query_files(
+                filters["hex6"],
+                open_only=False,
+                archived=True,
+                **query_kwargs,
+            ),
+            token_filters,
+        )
+
+        all_ids = set(row_ops)
+        active_gone = all_ids - {record["id"] for record in active_records}
+        archived_gone = all_ids - {record["id"] for record in archived_records}
+        tab.table_model.apply_row_delta(active_records, active_gone)
+        for custom_tab in self.custom_tab_widgets:
+            custom_tab.table_model.apply_row_delta(active_records, active_gone)
+        self.archive_table_model.apply_row_delta(archived_records, archived_gone)
+        if self.custom_tab_widgets:
+            self.refresh_custom_tab_filters()
+        return True
+
+    def _refresh_tab_when_visible(
+        self, widget: QWidget | None, refresh: Callable[[], None]
+    ) -> None:
+        """Sekme görünürse hemen, değilse sekmeye geçildiğinde yenile."""
+        if widget is None:
+            return
+        if self.tab_widget.currentWidget() is widget:
+            self._stale_tabs.pop(widget, None)
+            refresh()
+        else:
+            self._stale_tabs[widget] = refresh
+
+    def _on_main_tab_changed(self, index: int) -> None:
+        refresh = self._stale_tabs.pop(self.tab_widget.widget(index), None)
+        if refresh is not None:
+            refresh()
+
     def pause_auto_refresh(self) -> None:
         """Otomatik güncellemeyi duraklat."""
         self._auto_refresh_paused = True
@@ -5710,6 +5999,8 @@ class MainWindow(QMainWindow):
             QKeySequence(QKeySequence.StandardKey.Find), self
         )
         self._shortcut_find.activated.connect(self._focus_active_search)
+        self._shortcut_global_search = QShortcut(QKeySequence("Ctrl+K"), self)
+        self._shortcut_global_search.activated.connect(self.open_global_search)
         self._shortcut_new = QShortcut(
             QKeySequence(QKeySequence.StandardKey.New), self
         )
@@ -5757,6 +6048,45 @@ class MainWindow(QMainWindow):
             self.finance_search_input.setFocus()
             self.finance_search_input.selectAll()
 
+    def open_global_search(self) -> None:
+        """Tüm kayıt türlerinde arama penceresini açar ve seçilen kayda gider."""
+        initial_text = ""
+        current_widget = self.tab_widget.currentWidget()
+        if isinstance(current_widget, DosyalarTab) and current_widget.search_input is not None:
+            initial_text = current_widget.search_input.text().strip()
+        dialog = GlobalSearchDialog(self, initial_text=initial_text)
+        if not dialog.exec() or not dialog.selected_result:
+            return
+        result = dialog.selected_result
+        kaynak = result.get("kaynak")
+        if kaynak == "gorev":
+            self.tab_widget.setCurrentIndex(self.gorevler_tab_index)
+        elif kaynak == "tebligat":
+            self.tab_widget.setCurrentIndex(self.tebligatlar_tab_index)
+        elif kaynak == "arabuluculuk":
+            self.tab_widget.setCurrentIndex(self.arabuluculuk_tab_index)
+        dosya_id = result.get("dosya_id")
+        if kaynak in ("dosya", "timeline") and dosya_id is not None:
+            self._edit_dosya_by_id(int(dosya_id))
+
+    def _edit_dosya_by_id(self, dosya_id: int) -> None:
+        try:
+            self.pause_auto_refresh()
+            dialog = EditDialog(self, dosya_id=dosya_id, current_user=self.current_user)
+            if dialog.exec():
+                self.refresh_table()
+                self.gorevler_tab.refresh_tasks()
+                if getattr(dialog, "was_hard_deleted", False):
+                    target_id = dialog.hard_deleted_id or dosya_id
+                    log_action(self.current_user["id"], "delete_dosya_hard", target_id)
+                    return
+                action = "archive_dosya" if dialog.was_archived else "update_dosya"
+                log_action(self.current_user["id"], action, dosya_id)
+                if dialog.was_archived:
+                    self.open_archive_tab()
+        finally:
+            self.resume_auto_refresh()
+
     def _shortcut_new_record(self) -> None:
         self.new_file()
 
@@ -5937,6 +6267,7 @@ class MainWindow(QMainWindow):
         tab.refresh_requested.connect(self._refresh_dosyalar_table)
         if include_filters:
             tab.filters_changed.connect(self.refresh_table)
+            tab.search_pending.connect(self._cancel_case_list_load)
 
     def _load_existing_custom_tabs(self) -> None:
         conn = get_connection()
@@ -5989,7 +6320,7 @@ class MainWindow(QMainWindow):
         if select:
             self.tab_widget.setCurrentIndex(index)
         if self.dosyalar_tab.table_model.records:
-            tab.set_records(list(self.dosyalar_tab.table_model.records))
+            tab.apply_model_rows(self.dosyalar_tab.table_model.records.copy())
         self.update_column_widths()
         return tab, index
 
@@ -6504,8 +6835,56 @@ class MainWindow(QMainWindow):
         finally:
             conn.close()
 
+    def _setup_case_list_loader(self) -> None:
+        """Dosya listesi için arka plan yükleme hattını kur.
+
+        Sorgu ve satır hazırlığı uzun ömürlü bir ``QThread`` üzerindeki
+        ``CaseListLoadWorker``'da yapılır; GUI yalnızca hazır partileri
+        modellere ekler. Her ``refresh_table`` çağrısı yeni bir kuşak başlatır
+        ve önceki kuşakları iptal eder.
+        """
+        self._case_load_generation = 0
+        self._case_load_state: dict[str, Any] = {}
+        self._stale_tabs: dict[QWidget, Callable[[], None]] = {}
+        self.tab_widget.currentChanged.connect(self._on_main_tab_changed)
+
+        self._case_loader_thread = QThread(self)
+        self._case_loader = CaseListLoadWorker(
+            self.dosyalar_tab.build_model_rows,
+            batch_size=self.CASE_LOAD_BATCH_SIZE,
+        )
+        self._case_loader.moveToThread(self._case_loader_thread)
+        self._case_load_requested.connect(self._case_loader.load)
+        self._case_loader.batchReady.connect(self._on_case_batch_ready)
+        self._case_loader.targetLoaded.connect(self._on_case_target_loaded)
+        self._case_loader.loadFinished.connect(self._on_case_load_finished)
+        self._case_loader.errorOccurred.connect(self._on_case_load_error)
+        self._case_loader_thread.finished.connect(self._case_loader.deleteLater)
+        self._case_loader_thread.start()
+
+    def _shutdown_case_list_loader(self) -> None:
+        thread = getattr(self, "_case_loader_thread", None)
+        if thread is None:
+            return
+        self._cancel_case_list_load()
+        thread.quit()
+        thread.wait(2000)
+        self._case_loader_thread = None
+
+    def _cancel_case_list_load(self) -> None:
+        """Süren yüklemeyi iptal et (arama kutusuna yazılırken çağrılır)."""
+        loader = getattr(self, "_case_loader", None)
+        if loader is None:
+            return
+        loader.cancel_before(self._case_load_generation + 1)
+        self._case_load_state["loading"] = False
+
     def refresh_table(self):
-        """Verileri yeniden yükler."""
+        """Verileri arka planda yeniden yükler.
+
+        Sorgular ve satır hazırlığı yükleme iş parçacığında çalışır; sonuçlar
+        partiler halinde ``_on_case_batch_ready`` ile modellere uygulanır.
+        """
         # Açık editörleri kapat (commitData hatasını önlemek için)
         views = [self.dosyalar_tab.table_view, self.archive_table_view]
         if self.finance_table_view is not None:
@@ -6516,69 +6895,120 @@ class MainWindow(QMainWindow):
                 view.setCurrentIndex(current_idx)  # Editörü commit et
                 view.clearFocus()  # Editörü kapat
         filters = self._collect_filters()
-        hex6 = filters["hex6"]
         raw_search_text = filters["search_text"] or ""
         cleaned_search, token_filters = parse_alert_tokens(raw_search_text)
-        search_text = cleaned_search or None
-        open_only = filters["open_only"]
-        other_filters = filters["other_filters"]
-        assigned_user_id = filters["assigned_user_id"]
+        query = {
+            "hex6": filters["hex6"],
+            "search_text": cleaned_search or None,
+            "other_filters": filters["other_filters"],
+            "assigned_user_id": filters["assigned_user_id"],
+        }
+
+        self._case_load_generation += 1
+        generation = self._case_load_generation
+        self._case_loader.cancel_before(generation)
+        self._case_load_state = {
+            "generation": generation,
+            "loading": True,
+            "started": _now(),
+            "applied": set(),
+        }
+        request = {
+            "active": dict(query, open_only=filters["open_only"], archived=False),
+            "archived": dict(
+                query, open_only=False, archived=True, page_size=self.ARCHIVE_PAGE_SIZE
+            ),
+            "post_filter": lambda records: self._apply_post_query_filters(
+                records, token_filters
+            ),
+        }
+        self._case_load_state["request"] = request
+        self._case_load_requested.emit(generation, request)
+
+    def _on_case_batch_ready(self, generation: int, target: str, batch: CaseRowStore) -> None:
+        state = self._case_load_state
+        if generation != state.get("generation") or not state.get("loading"):
+            return
+        first_batch = target not in state["applied"]
+        if target == "active":
+            if first_batch:
+                self._apply_model(batch)
+                print("[perf] dosyalar.FIRST_BATCH", _ms(state["started"], _now()), f"rows={len(batch)}")
+            else:
+                self.dosyalar_tab.table_model.append_prepared_records(batch)
+        elif first_batch:
+            self.archive_table_model.apply_prepared_records(batch)
+        else:
+            self.archive_table_model.append_prepared_records(batch)
+        state["applied"].add(target)
+
+    def _on_case_target_loaded(
+        self, generation: int, target: str, total: int, next_after: object
+    ) -> None:
+        state = self._case_load_state
+        if generation != state.get("generation") or not state.get("loading"):
+            return
+        if target == "archived":
+            request = state["request"]
+            self.archive_table_model.set_page_source(
+                self._case_page_source(request["archived"], request["post_filter"]),
+                next_after,
+            )
+            self.archive_table_model.resort()
+            return
         t0 = _now()
-        active_records = self._query_files(
-            hex6,
-            search_text=search_text,
-            open_only=open_only,
-            other_filters=other_filters,
-            assigned_user_id=assigned_user_id,
-            archived=False,
-        )
-        t1 = _now()
-        active_records = self._apply_post_query_filters(active_records, token_filters)
-        records_for_custom = list(active_records)
-        t_build_start = _now()
-        built_rows = self._build_model_rows(active_records)
-        t2 = _now()
-        self._apply_model(built_rows)
-        t3 = _now()
         self._setup_header_if_needed()
-        t4 = _now()
-        self._apply_proxy_sort_filter()
-        t5 = _now()
+        # Partiler dinamik proxy'ye sıralı eklendi; tam invalidate gerekmez
+        self.dosyalar_tab.sync_proxy_filters()
         self._final_view_adjustments()
-        t6 = _now()
-        row_count = len(active_records)
-        print("[perf] dosyalar.DB         ", _ms(t0, t1), f"rows={row_count}")
-        print("[perf] dosyalar.BUILD_ROWS ", _ms(t_build_start, t2))
-        print("[perf] dosyalar.APPLY_MODEL", _ms(t2, t3))
-        print("[perf] dosyalar.HEADER     ", _ms(t3, t4))
-        print("[perf] dosyalar.PROXY_SORT ", _ms(t4, t5))
-        print("[perf] dosyalar.VIEW_FINAL ", _ms(t5, t6))
-        print("[perf] dosyalar.TOTAL      ", _ms(t0, t6))
-
         if self.custom_tab_widgets:
+            # Her sekme kendi depo kopyasını alır (setData satırı yerinde günceller)
+            rows = self.dosyalar_tab.table_model.records
             for tab in self.custom_tab_widgets:
-                tab.set_records(list(records_for_custom))
+                tab.apply_model_rows(rows.copy())
+                tab.sync_proxy_filters()
             self.refresh_custom_tab_filters()
+        print("[perf] dosyalar.PROXY_SYNC ", _ms(t0, _now()))
+        print("[perf] dosyalar.TOTAL      ", _ms(state["started"], _now()), f"rows={total}")
 
-        archived_records = self._query_files(
-            hex6,
-            search_text=search_text,
-            open_only=False,
-            other_filters=other_filters,
-            assigned_user_id=assigned_user_id,
-            archived=True,
-        )
-        archived_records = self._apply_post_query_filters(
-            archived_records, token_filters
-        )
-        self.archive_table_model.set_records(archived_records)
+    def _case_page_source(
+        self,
+        params: dict[str, Any],
+        post_filter: Callable[[list[dict]], list[dict]],
+    ) -> Callable[[CasePageKey], tuple[list[dict], CasePageKey | None]]:
+        """Arşiv modelinin ``fetchMore`` için kullanacağı sayfa okuyucusu."""
+        query = {key: value for key, value in params.items() if key != "page_size"}
+        page_size = params["page_size"]
+
+        def fetch_page(after: CasePageKey) -> tuple[list[dict], CasePageKey | None]:
+            records, next_after = fetch_dosyalar_page(
+                **query, limit=page_size, after=after
+            )
+            return post_filter(records), next_after
+
+        return fetch_page
+
+    def _on_case_load_finished(self, generation: int) -> None:
+        state = self._case_load_state
+        if generation != state.get("generation") or not state.get("loading"):
+            return
+        state["loading"] = False
         self.update_column_widths()
         if self.can_view_finance:
-            self.refresh_finance_table()
+            self._refresh_tab_when_visible(self.finance_tab, self.refresh_finance_table)
         if getattr(self, "tebligatlar_tab", None) is not None:
-            self.tebligatlar_tab.load_tebligatlar()
+            self._refresh_tab_when_visible(
+                self.tebligatlar_tab, self.tebligatlar_tab.load_tebligatlar
+            )
         print("[perf] summary ready")
 
+    def _on_case_load_error(self, generation: int, message: str) -> None:
+        if generation != self._case_load_state.get("generation"):
+            return
+        self._case_load_state["loading"] = False
+        print(f"[refresh] dosya listesi yüklenemedi: {message}")
+        self.statusBar().showMessage(f"Dosyalar yüklenemedi: {message}", 5000)
+
     def _refresh_dosyalar_table(self) -> None:
         """Dosyalar tablosunu yenileme butonu için wrapper."""
         self.refresh_table()
@@ -6592,6 +7022,7 @@ class MainWindow(QMainWindow):
         other_filters: dict[str, object] | None,
         assigned_user_id: int | None,
         archived: bool,
+        ids: Iterable[int] | None = None,
     ) -> list[dict]:
         rows = fetch_dosyalar_by_color_hex(
             hex6,
@@ -6600,6 +7031,7 @@ class MainWindow(QMainWindow):
             other_filters=other_filters,
             assigned_user_id=assigned_user_id,
             archived=archived,
+            ids=ids,
         )
         # if False:
         #     rows = rows[:500]  # GEÇİCİ: LIMIT 500 testi
@@ -6619,14 +7051,14 @@ class MainWindow(QMainWindow):
             hearing_token,
         )
 
-    def _build_model_rows(self, records: list[dict[str, Any]]) -> list[PreparedDosyaRow]:
+    def _build_model_rows(self, records: list[dict[str, Any]]) -> CaseRowStore:
         tab = getattr(self, "dosyalar_tab", None)
         if tab is None:
             temp_model = DosyaTableModel()
             return temp_model.prepare_records(records)
         return tab.build_model_rows(records)
 
-    def _apply_model(self, built_rows: list[PreparedDosyaRow]) -> None:
+    def _apply_model(self, built_rows: CaseRowStore) -> None:
         tab = getattr(self, "dosyalar_tab", None)
         if tab is None:
             return
@@ -6645,15 +7077,6 @@ class MainWindow(QMainWindow):
         # header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self._dosyalar_header_configured = True
 
-    def _apply_proxy_sort_filter(self) -> None:
-        tab = getattr(self, "dosyalar_tab", None)
-        if tab is None:
-            return
-        tab.apply_proxy_sort_filter()
-        # if False:  # Proxy sort kapama testi
-        #     if tab.table_view is not None:
-        #         tab.table_view.setSortingEnabled(False)
-
     def _final_view_adjustments(self) -> None:
         tab = getattr(self, "dosyalar_tab", None)
         if tab is None or tab.table_view is None:
@@ -7450,22 +7873,7 @@ class MainWindow(QMainWindow):
         dosya_id = record.get("id")
         if dosya_id is None:
             return
-        try:
-            self.pause_auto_refresh()
-            dialog = EditDialog(self, dosya_id=dosya_id, current_user=self.current_user)
-            if dialog.exec():
-                self.refresh_table()
-                self.gorevler_tab.refresh_tasks()
-                if getattr(dialog, "was_hard_deleted", False):
-                    target_id = dialog.hard_deleted_id or dosya_id
-                    log_action(self.current_user["id"], "delete_dosya_hard", target_id)
-                    return
-                action = "archive_dosya" if dialog.was_archived else "update_dosya"
-                log_action(self.current_user["id"], action, dosya_id)
-                if dialog.was_archived:
-                    self.open_archive_tab()
-        finally:
-            self.resume_auto_refresh()
+        self._edit_dosya_by_id(dosya_id)
 
     def edit_file(self):
         try:
@@ -7521,8 +7929,7 @@ class MainWindow(QMainWindow):
     def export_data(self):
         _, model, is_archive = self._current_view_and_model()
         filters = self._collect_filters()
-        current_records = list(model.records)
-        if not current_records:
+        if not len(model.records):
             QMessageBox.information(
                 self,
                 "Bilgi",
@@ -7545,7 +7952,9 @@ class MainWindow(QMainWindow):
             return
 
         if response == QMessageBox.StandardButton.Yes:
-            rows = current_records
+            # Arşiv modeli sayfalıdır; yalnızca yüklenen sayfalar değil tüm liste aktarılır
+            model.fetch_all()
+            rows = list(model.records)
         else:
             assigned_filter: int | None = None
             assigned_candidate = filters.get("assigned_user_id")
@@ -7731,6 +8140,7 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):  # type: ignore[override]
         try:
+            self._shutdown_case_list_loader()
             self._save_dosyalar_header_state()
             self.save_finance_column_widths()
         finally:
@@ -7751,6 +8161,8 @@ class MainWindow(QMainWindow):
         )
         if dialog.exec():
             self._refresh_permissions()
+            # Durum renkleri ve kullanıcılar change_log'a yazılmaz
+            self.gorevler_tab.invalidate_task_cache()
             EditDialog.load_status_names()
             self.populate_status_filter()
             self.populate_user_filter()
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import os
-import shutil
 import sqlite3
 from datetime import datetime
 from typing import Any, Dict
@@ -26,18 +25,19 @@ from PyQt6.QtWidgets import (
     QSpinBox,
     QTextBrowser,
     QInputDialog,
+    QProgressBar,
 )
 from PyQt6.QtGui import QColor
 try:  # pragma: no cover - runtime import guard
     from app.db import (
         DB_PATH,
         initialize_database,
+        connect_database_file,
+        replace_database_file,
         list_backups,
-        create_backup,
         create_portable_backup,
         restore_backup,
         restore_portable_backup,
-        cleanup_old_backups,
         get_backup_dir,
         check_disk_space,
         validate_backup_file,
@@ -52,12 +52,12 @@ except ModuleNotFoundError:  # pragma: no cover
     from db import (
         DB_PATH,
         initialize_database,
+        connect_database_file,
+        replace_database_file,
         list_backups,
-        create_backup,
         create_portable_backup,
         restore_backup,
         restore_portable_backup,
-        cleanup_old_backups,
         get_backup_dir,
         check_disk_space,
         validate_backup_file,
@@ -145,6 +145,27 @@ try:  # pragma: no cover - runtime import guard
 except ModuleNotFoundError:  # pragma: no cover
     from ui_transfer_dialog import TransferDialog
 
+try:  # pragma: no cover - runtime import guard
+    from app.backup_scheduler import (
+        STATE_FAILED,
+        STATE_FINISHED,
+        STATE_PROGRESS,
+        STATE_STARTED,
+        get_backup_scheduler,
+        load_schedule_settings,
+    )
+    from app.workers import BackupEventBridge
+except ModuleNotFoundError:  # pragma: no cover
+    from backup_scheduler import (
+        STATE_FAILED,
+        STATE_FINISHED,
+        STATE_PROGRESS,
+        STATE_STARTED,
+        get_backup_scheduler,
+        load_schedule_settings,
+    )
+    from workers import BackupEventBridge
+
 
 PERMISSION_FIELDS: list[tuple[str, str]] = [
     ("view_all_cases", "Tüm dosyaları görebilir mi?"),
@@ -374,20 +395,44 @@ class SettingsDialog(QDialog):
         backup_settings_group = QGroupBox("Otomatik Yedekleme Ayarları")
         backup_form = QFormLayout(backup_settings_group)
 
-        self.auto_backup_check = QCheckBox("Uygulama açılışında otomatik yedekle")
-        backup_settings = QSettings("MyCompany", "TakibiEsasi")
-        self.auto_backup_check.setChecked(
-            backup_settings.value("backup/auto_backup", True, type=bool)
-        )
+        self.auto_backup_check = QCheckBox("Açılışta ve belirli aralıklarla otomatik yedekle")
+        backup_schedule = load_schedule_settings(QSettings("MyCompany", "TakibiEsasi"))
+        backup_policy = backup_schedule["policy"]
+        self.auto_backup_check.setChecked(backup_schedule["auto_backup"])
         backup_form.addRow(self.auto_backup_check)
 
+        self.backup_interval_spin = QSpinBox()
+        self.backup_interval_spin.setRange(0, 24)
+        self.backup_interval_spin.setValue(backup_schedule["interval_hours"])
+        self.backup_interval_spin.setSuffix(" saat")
+        self.backup_interval_spin.setSpecialValueText("Yalnızca açılışta")
+        backup_form.addRow("Yedekleme aralığı:", self.backup_interval_spin)
+
         self.backup_keep_spin = QSpinBox()
         self.backup_keep_spin.setRange(1, 100)
-        self.backup_keep_spin.setValue(
-            backup_settings.value("backup/keep_count", 10, type=int)
-        )
+        self.backup_keep_spin.setValue(backup_policy.keep_count)
         self.backup_keep_spin.setSuffix(" adet")
-        backup_form.addRow("Maksimum yedek sayısı:", self.backup_keep_spin)
+        backup_form.addRow("Son yedeklerden tutulacak:", self.backup_keep_spin)
+
+        # Zamana göre saklama: her saatin/günün/haftanın en yeni yedeği
+        retention_row = QHBoxLayout()
+        self.backup_hourly_spin = QSpinBox()
+        self.backup_hourly_spin.setRange(0, 168)
+        self.backup_hourly_spin.setValue(backup_policy.hourly)
+        self.backup_hourly_spin.setSuffix(" saatlik")
+        self.backup_daily_spin = QSpinBox()
+        self.backup_daily_spin.setRange(0, 90)
+        self.backup_daily_spin.setValue(backup_policy.daily)
+        self.backup_daily_spin.setSuffix(" günlük")
+        self.backup_weekly_spin = QSpinBox()
+        self.backup_weekly_spin.setRange(0, 52)
+        self.backup_weekly_spin.setValue(backup_policy.weekly)
+        self.backup_weekly_spin.setSuffix(" haftalık")
+        for spin in (self.backup_hourly_spin, self.backup_daily_spin, self.backup_weekly_spin):
+            spin.setToolTip("Yedeği olan her dilimin en yeni yedeği tutulur (0: kapalı)")
+            retention_row.addWidget(spin)
+        retention_row.addStretch()
+        backup_form.addRow("Ayrıca tutulacak:", retention_row)
 
         backup_dir_layout = QHBoxLayout()
         self.backup_dir_label = QLabel(get_backup_dir())
@@ -421,14 +466,25 @@ class SettingsDialog(QDialog):
         backup_btn_row.addStretch()
         backup_action_layout.addLayout(backup_btn_row)
 
+        # Arka plan işinin ilerlemesi (zamanlayıcıdan gelir)
+        self.backup_progress_label = QLabel()
+        self.backup_progress_label.setStyleSheet("color: #666; font-size: 11px;")
+        self.backup_progress_bar = QProgressBar()
+        self.backup_progress_bar.setRange(0, 1000)
+        self.backup_progress_bar.setTextVisible(False)
+        self.backup_progress_label.hide()
+        self.backup_progress_bar.hide()
+        backup_action_layout.addWidget(self.backup_progress_label)
+        backup_action_layout.addWidget(self.backup_progress_bar)
+
         b_layout.addWidget(backup_action_group)
 
         # Yedek Listesi
         backup_list_group = QGroupBox("Mevcut Yedekler")
         backup_list_layout = QVBoxLayout(backup_list_group)
 
-        self.backup_table = QTableWidget(0, 4)
-        self.backup_table.setHorizontalHeaderLabels(["Tarih", "Boyut", "Dosya Sayısı", "Dosya"])
+        self.backup_table = QTableWidget(0, 5)
+        self.backup_table.setHorizontalHeaderLabels(["Tarih", "Boyut", "Dosya Sayısı", "Doğrulama", "Dosya"])
         self.backup_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.backup_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.backup_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
@@ -436,6 +492,7 @@ class SettingsDialog(QDialog):
         self.backup_table.setColumnWidth(0, 130)
         self.backup_table.setColumnWidth(1, 80)
         self.backup_table.setColumnWidth(2, 80)
+        self.backup_table.setColumnWidth(3, 90)
         backup_list_layout.addWidget(self.backup_table)
 
         backup_list_btn_layout = QHBoxLayout()
@@ -708,6 +765,18 @@ class SettingsDialog(QDialog):
         if self.status_del_btn is not None:
             self.status_del_btn.clicked.connect(self.remove_status_row)
 
+        # Yedekleme işleri arka plandaki zamanlayıcıda çalışır
+        self._backup_callbacks: dict[int, Any] = {}
+        # Geri yükleme sürerken pencere kapatılamaz; sonuç bu pencerede gösterilir
+        self._restore_running = False
+        self._backup_scheduler = get_backup_scheduler()
+        if not self._backup_scheduler.is_running:
+            self._backup_scheduler.configure(**backup_schedule)
+            self._backup_scheduler.start()
+        self._backup_bridge = BackupEventBridge(self)
+        self._backup_bridge.eventReceived.connect(self._on_backup_event)
+        self._backup_scheduler.add_listener(self._backup_bridge)
+
         self._init_theme_selection()
         self._update_backup_status()
         self.load_backup_list()
@@ -761,7 +830,12 @@ class SettingsDialog(QDialog):
         # Yedekleme ayarlarını kaydet
         backup_settings = QSettings("MyCompany", "TakibiEsasi")
         backup_settings.setValue("backup/auto_backup", self.auto_backup_check.isChecked())
+        backup_settings.setValue("backup/interval_hours", self.backup_interval_spin.value())
         backup_settings.setValue("backup/keep_count", self.backup_keep_spin.value())
+        backup_settings.setValue("backup/hourly", self.backup_hourly_spin.value())
+        backup_settings.setValue("backup/daily", self.backup_daily_spin.value())
+        backup_settings.setValue("backup/weekly", self.backup_weekly_spin.value())
+        self._backup_scheduler.configure(**load_schedule_settings(backup_settings))
 
         if self.status_table is not None and self.can_edit_statuses:
             seen_ids: set[int] = set()
@@ -881,17 +955,24 @@ class SettingsDialog(QDialog):
             size_item = QTableWidgetItem(backup["size_display"])
             self.backup_table.setItem(row, 1, size_item)
 
-            # Dosya sayısı bilgisini al
-            info = get_backup_info(backup["filepath"])
-            if info:
-                count_text = f"{info.get('dava_count', '?')} dosya"
-            else:
-                count_text = "?"
-            count_item = QTableWidgetItem(count_text)
+            # Dosya sayısı ve doğrulama sonucu katalogdan gelir
+            count_item = QTableWidgetItem(f"{backup['dava_count']} dosya")
             self.backup_table.setItem(row, 2, count_item)
 
+            validation = backup["validation"]
+            if validation is None:
+                validation_item = QTableWidgetItem("Bekliyor")
+                validation_item.setToolTip("Yedek arka planda denetlenecek")
+            else:
+                checked_at = datetime.fromisoformat(validation["checked_at"]).strftime("%d.%m.%Y %H:%M")
+                validation_item = QTableWidgetItem("✓ Geçerli" if validation["ok"] else "⚠ Geçersiz")
+                validation_item.setToolTip(f"{validation['message']}\n{checked_at}")
+                if not validation["ok"]:
+                    validation_item.setForeground(QColor("#c62828"))
+            self.backup_table.setItem(row, 3, validation_item)
+
             file_item = QTableWidgetItem(backup["filename"])
-            self.backup_table.setItem(row, 3, file_item)
+            self.backup_table.setItem(row, 4, file_item)
 
         self._update_backup_status()
 
@@ -904,6 +985,39 @@ class SettingsDialog(QDialog):
         self.backup_delete_btn.setEnabled(enabled)
         self.backup_verify_btn.setEnabled(enabled)
 
+    def _track_backup_job(self, future, on_done) -> None:
+        """Zamanlayıcıya gönderilen işi izler; ``on_done(event)`` iş bitince çağrılır."""
+        if future.cancelled():
+            QMessageBox.warning(self, "Uyarı", "Yedekleme servisi kapanıyor, işlem başlatılamadı.")
+            return
+        self._set_backup_buttons_enabled(False)
+        self._backup_callbacks[future.job_id] = on_done
+
+    def _on_backup_event(self, event) -> None:
+        """Zamanlayıcıdan gelen olayı ilerleme çubuğuna ve iş sonucuna yansıtır."""
+        if event.state == STATE_STARTED:
+            self.backup_progress_label.setText(f"{event.label}...")
+            self.backup_progress_bar.setRange(0, 0)  # İlk ilerlemeye kadar belirsiz
+            self.backup_progress_label.show()
+            self.backup_progress_bar.show()
+            return
+        if event.state == STATE_PROGRESS:
+            if event.total:
+                self.backup_progress_bar.setRange(0, 1000)
+                self.backup_progress_bar.setValue(event.done * 1000 // event.total)
+            return
+
+        self.backup_progress_label.hide()
+        self.backup_progress_bar.hide()
+        on_done = self._backup_callbacks.pop(event.job_id, None)
+        if on_done is None:
+            # Otomatik yedek veya katalog denetimi: listeyi güncel tut
+            if event.state == STATE_FINISHED:
+                self.load_backup_list()
+            return
+        self._set_backup_buttons_enabled(True)
+        on_done(event)
+
     def backup_now(self) -> None:
         """Şimdi yedekle butonuna tıklandığında."""
         # Disk alanı kontrolü
@@ -916,37 +1030,19 @@ class SettingsDialog(QDialog):
             )
             return
 
-        self._set_backup_buttons_enabled(False)
-        try:
-            backup_path = create_backup()
-            if backup_path:
-                # Oluşturulan yedeği doğrula
-                is_valid, validation_msg = validate_backup_file(backup_path)
-                if not is_valid:
-                    os.remove(backup_path)
-                    QMessageBox.critical(
-                        self,
-                        "Hata",
-                        f"Yedekleme oluşturuldu ancak doğrulama başarısız:\n{validation_msg}\n\n"
-                        "Yedek dosyası silindi."
-                    )
-                    return
+        # Yedek alınır, doğrulanır ve saklama politikası uygulanır
+        self._track_backup_job(self._backup_scheduler.backup_now(), self._on_backup_created)
 
-                # Eski yedekleri temizle
-                keep_count = self.backup_keep_spin.value()
-                cleanup_old_backups(keep_count)
-                self.load_backup_list()
-                QMessageBox.information(
-                    self,
-                    "Başarılı",
-                    f"Yedekleme oluşturuldu ve doğrulandı:\n{os.path.basename(backup_path)}",
-                )
-            else:
-                QMessageBox.warning(self, "Uyarı", "Yedekleme oluşturulamadı.")
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Yedekleme hatası:\n{e}")
-        finally:
-            self._set_backup_buttons_enabled(True)
+    def _on_backup_created(self, event) -> None:
+        if event.state == STATE_FAILED:
+            QMessageBox.critical(self, "Hata", f"Yedekleme hatası:\n{event.error}")
+            return
+        self.load_backup_list()
+        QMessageBox.information(
+            self,
+            "Başarılı",
+            f"Yedekleme oluşturuldu ve doğrulandı:\n{os.path.basename(event.result)}",
+        )
 
     def backup_custom(self) -> None:
         """Farklı konuma taşınabilir (parola korumalı) yedek al."""
@@ -1002,23 +1098,30 @@ class SettingsDialog(QDialog):
             folder, f"TakibiEsasi_Yedek_{datetime.now().strftime('%Y-%m-%d_%H%M')}.teb"
         )
 
-        self._set_backup_buttons_enabled(False)
-        try:
-            success, msg = create_portable_backup(dest, password, hint)
-            if success:
-                QMessageBox.information(
-                    self,
-                    "Başarılı",
-                    f"Taşınabilir yedek oluşturuldu:\n{dest}\n\n"
-                    "Bu yedeği flash bellek veya buluta\n"
-                    "güvenle kaydedebilirsiniz.",
-                )
-            else:
-                QMessageBox.warning(self, "Uyarı", f"Yedekleme hatası:\n{msg}")
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", str(e))
-        finally:
-            self._set_backup_buttons_enabled(True)
+        self._track_backup_job(
+            self._backup_scheduler.submit(
+                "portable",
+                "Taşınabilir yedek oluşturuluyor",
+                lambda progress: create_portable_backup(dest, password, hint, progress),
+            ),
+            lambda event: self._on_portable_backup_created(event, dest),
+        )
+
+    def _on_portable_backup_created(self, event, dest: str) -> None:
+        if event.state == STATE_FAILED:
+            QMessageBox.critical(self, "Hata", event.error)
+            return
+        success, msg = event.result
+        if success:
+            QMessageBox.information(
+                self,
+                "Başarılı",
+                f"Taşınabilir yedek oluşturuldu:\n{dest}\n\n"
+                "Bu yedeği flash bellek veya buluta\n"
+                "güvenle kaydedebilirsiniz.",
+            )
+        else:
+            QMessageBox.warning(self, "Uyarı", f"Yedekleme hatası:\n{msg}")
 
     def restore_selected_backup(self) -> None:
         """Seçili yedeği geri yükle."""
@@ -1028,10 +1131,24 @@ class SettingsDialog(QDialog):
             return
 
         filepath = self.backup_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-        filename = self.backup_table.item(row, 3).text()
+        filename = self.backup_table.item(row, 4).text()
+
+        # Önce yedek dosyasını doğrula (bütünlük kontrolü arka planda)
+        self._track_backup_job(
+            self._backup_scheduler.submit(
+                "verify",
+                "Yedek doğrulanıyor",
+                lambda progress: (validate_backup_file(filepath), get_backup_info(filepath)),
+            ),
+            lambda event: self._confirm_restore(event, filepath, filename),
+        )
 
-        # Önce yedek dosyasını doğrula
-        is_valid, validation_msg = validate_backup_file(filepath)
+    def _confirm_restore(self, event, filepath: str, filename: str) -> None:
+        """Doğrulanan yedeğin geri yüklenmesi için kullanıcı onayı alır."""
+        if event.state == STATE_FAILED:
+            QMessageBox.critical(self, "Hata", f"Doğrulama hatası:\n{event.error}")
+            return
+        (is_valid, validation_msg), info = event.result
         if not is_valid:
             QMessageBox.critical(
                 self,
@@ -1041,7 +1158,6 @@ class SettingsDialog(QDialog):
             return
 
         # Yedek bilgilerini göster
-        info = get_backup_info(filepath)
         info_text = ""
         if info:
             info_text = (
@@ -1077,26 +1193,48 @@ class SettingsDialog(QDialog):
             QMessageBox.information(self, "İptal", "Geri yükleme iptal edildi.")
             return
 
-        self._set_backup_buttons_enabled(False)
-        try:
-            success, message = restore_backup(filepath)
-            if success:
-                QMessageBox.information(
-                    self,
-                    "Başarılı",
-                    f"{message}\n\n"
-                    "Değişikliklerin uygulanması için uygulamayı yeniden başlatın.",
-                )
-                self.load_backup_list()
-            elif message == "PAROLA_GEREKLI":
-                # Parola korumalı yedek - parola sor
-                self._restore_with_password(filepath)
+        self._start_restore(filepath)
+
+    def _start_restore(self, filepath: str, password: str | None = None) -> None:
+        """Geri yükleme işini zamanlayıcıya gönderir."""
+        if password is None:
+            job = lambda progress: restore_backup(filepath, progress)  # noqa: E731
+        else:
+            job = lambda progress: restore_portable_backup(filepath, password, progress)  # noqa: E731
+        future = self._backup_scheduler.submit("restore", "Geri yükleniyor", job)
+        self._track_backup_job(future, lambda event: self._on_restore_finished(event, filepath))
+        if not future.cancelled():
+            self._set_restore_running(True)
+
+    def _set_restore_running(self, running: bool) -> None:
+        """Geri yükleme süresince ana pencerenin otomatik yenilemesini duraklatır."""
+        self._restore_running = running
+        main_window = self.main_window
+        if main_window is not None and hasattr(main_window, "pause_auto_refresh"):
+            if running:
+                main_window.pause_auto_refresh()
             else:
-                QMessageBox.warning(self, "Uyarı", f"Geri yükleme başarısız:\n{message}")
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Geri yükleme hatası:\n{e}")
-        finally:
-            self._set_backup_buttons_enabled(True)
+                main_window.resume_auto_refresh()
+
+    def _on_restore_finished(self, event, filepath: str) -> None:
+        self._set_restore_running(False)
+        if event.state == STATE_FAILED:
+            QMessageBox.critical(self, "Hata", f"Geri yükleme hatası:\n{event.error}")
+            return
+        success, message = event.result
+        if success:
+            QMessageBox.information(
+                self,
+                "Başarılı",
+                f"{message}\n\n"
+                "Değişikliklerin uygulanması için uygulamayı yeniden başlatın.",
+            )
+            self.load_backup_list()
+        elif message == "PAROLA_GEREKLI":
+            # Parola korumalı yedek - parola sor
+            self._restore_with_password(filepath)
+        else:
+            QMessageBox.warning(self, "Uyarı", f"Geri yükleme başarısız:\n{message}")
 
     def _restore_with_password(self, filepath: str) -> None:
         """Parola korumalı yedeği geri yükle."""
@@ -1113,20 +1251,7 @@ class SettingsDialog(QDialog):
         if not ok or not password:
             return
 
-        try:
-            success, message = restore_portable_backup(filepath, password)
-            if success:
-                QMessageBox.information(
-                    self,
-                    "Başarılı",
-                    f"{message}\n\n"
-                    "Değişikliklerin uygulanması için uygulamayı yeniden başlatın.",
-                )
-                self.load_backup_list()
-            else:
-                QMessageBox.warning(self, "Uyarı", f"Geri yükleme başarısız:\n{message}")
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Geri yükleme hatası:\n{e}")
+        self._start_restore(filepath, password)
 
     def restore_from_file(self) -> None:
         """Harici dosyadan (flash bellek vb.) yedek geri yükle."""
@@ -1170,26 +1295,10 @@ class SettingsDialog(QDialog):
             QMessageBox.information(self, "İptal", "Geri yükleme iptal edildi.")
             return
 
-        self._set_backup_buttons_enabled(False)
-        try:
-            if backup_type == 'password':
-                self._restore_with_password(filepath)
-            else:
-                success, message = restore_backup(filepath)
-                if success:
-                    QMessageBox.information(
-                        self,
-                        "Başarılı",
-                        f"{message}\n\n"
-                        "Değişikliklerin uygulanması için uygulamayı yeniden başlatın.",
-                    )
-                    self.load_backup_list()
-                else:
-                    QMessageBox.warning(self, "Uyarı", f"Geri yükleme başarısız:\n{message}")
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Geri yükleme hatası:\n{e}")
-        finally:
-            self._set_backup_buttons_enabled(True)
+        if backup_type == 'password':
+            self._restore_with_password(filepath)
+        else:
+            self._start_restore(filepath)
 
     def delete_selected_backup(self) -> None:
         """Seçili yedeği sil."""
@@ -1211,7 +1320,7 @@ class SettingsDialog(QDialog):
             return
 
         filepath = self.backup_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-        filename = self.backup_table.item(row, 3).text()
+        filename = self.backup_table.item(row, 4).text()
 
         reply = QMessageBox.question(
             self,
@@ -1231,48 +1340,55 @@ class SettingsDialog(QDialog):
             QMessageBox.critical(self, "Hata", f"Silme hatası:\n{message}")
 
     def verify_all_backups(self) -> None:
-        """Tüm yedeklerin bütünlüğünü kontrol eder."""
+        """Tüm yedeklerin bütünlüğünü arka planda kontrol eder."""
         backups = list_backups()
         if not backups:
             QMessageBox.information(self, "Bilgi", "Doğrulanacak yedek bulunamadı.")
             return
 
-        self._set_backup_buttons_enabled(False)
-        try:
-            valid_count = 0
-            invalid_count = 0
-            invalid_files = []
-
-            for backup in backups:
+        def verify(progress) -> list[tuple[str, bool, str]]:
+            results = []
+            for index, backup in enumerate(backups):
+                progress(index, len(backups))
                 is_valid, msg = validate_backup_file(backup["filepath"])
-                if is_valid:
-                    valid_count += 1
-                else:
-                    invalid_count += 1
-                    invalid_files.append(f"{backup['filename']}: {msg}")
-
-            if invalid_count == 0:
-                QMessageBox.information(
-                    self,
-                    "Doğrulama Tamamlandı",
-                    f"Tüm yedekler geçerli.\n\n"
-                    f"Doğrulanan yedek sayısı: {valid_count}",
-                )
-            else:
-                invalid_list = "\n".join(invalid_files[:5])  # İlk 5 hatayı göster
-                if len(invalid_files) > 5:
-                    invalid_list += f"\n... ve {len(invalid_files) - 5} daha"
-
-                QMessageBox.warning(
-                    self,
-                    "Doğrulama Tamamlandı",
-                    f"Bazı yedekler geçersiz!\n\n"
-                    f"Geçerli: {valid_count}\n"
-                    f"Geçersiz: {invalid_count}\n\n"
-                    f"Geçersiz dosyalar:\n{invalid_list}",
-                )
-        finally:
-            self._set_backup_buttons_enabled(True)
+                results.append((backup["filename"], is_valid, msg))
+            progress(len(backups), len(backups))
+            return results
+
+        self._track_backup_job(
+            self._backup_scheduler.submit("verify", "Yedekler doğrulanıyor", verify),
+            self._on_backups_verified,
+        )
+
+    def _on_backups_verified(self, event) -> None:
+        if event.state == STATE_FAILED:
+            QMessageBox.critical(self, "Hata", f"Doğrulama hatası:\n{event.error}")
+            return
+        self.load_backup_list()  # Sonuçlar kataloğa yazıldı
+        valid_count = sum(1 for _, is_valid, _ in event.result if is_valid)
+        invalid_files = [f"{name}: {msg}" for name, is_valid, msg in event.result if not is_valid]
+        invalid_count = len(invalid_files)
+
+        if invalid_count == 0:
+            QMessageBox.information(
+                self,
+                "Doğrulama Tamamlandı",
+                f"Tüm yedekler geçerli.\n\n"
+                f"Doğrulanan yedek sayısı: {valid_count}",
+            )
+        else:
+            invalid_list = "\n".join(invalid_files[:5])  # İlk 5 hatayı göster
+            if len(invalid_files) > 5:
+                invalid_list += f"\n... ve {len(invalid_files) - 5} daha"
+
+            QMessageBox.warning(
+                self,
+                "Doğrulama Tamamlandı",
+                f"Bazı yedekler geçersiz!\n\n"
+                f"Geçerli: {valid_count}\n"
+                f"Geçersiz: {invalid_count}\n\n"
+                f"Geçersiz dosyalar:\n{invalid_list}",
+            )
 
     def load_database(self) -> None:
         file_path, _ = QFileDialog.getOpenFileName(
@@ -1322,7 +1438,7 @@ class SettingsDialog(QDialog):
 
         try:
             if os.path.exists(DB_PATH):
-                shutil.copyfile(DB_PATH, backup_path)
+                backup_database(backup_path)
         except Exception as exc:
             QMessageBox.critical(
                 self,
@@ -1332,12 +1448,12 @@ class SettingsDialog(QDialog):
             return
 
         try:
-            shutil.copyfile(file_path, DB_PATH)
+            replace_database_file(file_path)
             initialize_database()
         except Exception as exc:
             try:
                 if os.path.exists(backup_path):
-                    shutil.copyfile(backup_path, DB_PATH)
+                    replace_database_file(backup_path)
             except Exception:  # pragma: no cover - best effort
                 pass
             QMessageBox.critical(
@@ -1349,7 +1465,7 @@ class SettingsDialog(QDialog):
 
         restart_required = False
         try:
-            conn = sqlite3.connect(DB_PATH)
+            conn = connect_database_file()
             conn.close()
         except sqlite3.Error:
             restart_required = True
@@ -1573,16 +1689,42 @@ class SettingsDialog(QDialog):
         except Exception:  # pragma: no cover - GUI safety
             pass
 
+    def _detach_backup_scheduler(self) -> None:
+        # Süren iş zamanlayıcıda tamamlanır; sonucu artık bu pencereye gelmez
+        self._backup_scheduler.remove_listener(self._backup_bridge)
+        self._backup_callbacks.clear()
+
+    def _restore_blocks_close(self) -> bool:
+        """Geri yükleme sürüyorsa kullanıcıyı uyarır ve True döndürür."""
+        if not self._restore_running:
+            return False
+        QMessageBox.information(
+            self,
+            "Geri Yükleme Sürüyor",
+            "Geri yükleme tamamlanana kadar bu pencere kapatılamaz.",
+        )
+        return True
+
     def closeEvent(self, event):  # noqa: D401 - Qt override
+        if self._restore_blocks_close():
+            event.ignore()
+            return
         self._save_geometry()
+        self._detach_backup_scheduler()
         super().closeEvent(event)
 
     def accept(self):  # noqa: D401 - Qt override
+        if self._restore_blocks_close():
+            return
         self._save_geometry()
+        self._detach_backup_scheduler()
         super().accept()
 
     def reject(self):  # noqa: D401 - Qt override
+        if self._restore_blocks_close():
+            return
         self._save_geometry()
+        self._detach_backup_scheduler()
         super().reject()
 
     # --- Kullanıcı yönetimi yardımcıları ---
@@ -52,20 +52,28 @@ logger = logging.getLogger(__name__)
 class DownloadThread(QThread):
     """Arka planda indirme yapan thread."""
 
-    progress = pyqtSignal(int, int, int)  # percent, downloaded, total
+    progress = pyqtSignal(int, int, int, float, float)  # percent, downloaded, total, bayt/sn, kalan sn (-1: bilinmiyor)
     finished = pyqtSignal(bool, str)  # success, file_path or error
 
-    def __init__(self, download_url: str):
+    def __init__(self, download_url: str, sha256: str = None, size: int = None):
         super().__init__()
         self.download_url = download_url
+        self.sha256 = sha256
+        self.size = size
 
     def run(self):
-        def progress_callback(percent, downloaded, total):
-            self.progress.emit(percent, downloaded, total)
+        def progress_callback(progress):
+            eta = progress.eta_seconds if progress.eta_seconds is not None else -1.0
+            self.progress.emit(
+                progress.percent, progress.downloaded, progress.total,
+                progress.bytes_per_second, eta,
+            )
 
         success, file_path, error = download_update(
             self.download_url,
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            sha256=self.sha256,
+            size=self.size,
         )
 
         if success:
@@ -229,17 +237,27 @@ class UpdateDialog(QDialog):
         self.progress_label.setVisible(True)
 
         # İndirme thread'ini başlat
-        self.download_thread = DownloadThread(self.update_info.download_url)
+        self.download_thread = DownloadThread(
+            self.update_info.download_url,
+            sha256=self.update_info.sha256,
+            size=self.update_info.size,
+        )
         self.download_thread.progress.connect(self._on_progress)
         self.download_thread.finished.connect(self._on_download_finished)
         self.download_thread.start()
 
-    def _on_progress(self, percent: int, downloaded: int, total: int):
+    def _on_progress(self, percent: int, downloaded: int, total: int, speed: float, eta: float):
         """İndirme ilerlemesi."""
         self.progress_bar.setValue(percent)
         downloaded_mb = downloaded / (1024 * 1024)
         total_mb = total / (1024 * 1024)
-        self.progress_label.setText(f"{downloaded_mb:.1f} MB / {total_mb:.1f} MB")
+        text = f"{downloaded_mb:.1f} MB / {total_mb:.1f} MB"
+        if speed > 0:
+            text += f" • {speed / (1024 * 1024):.1f} MB/sn"
+        if eta >= 0:
+            minutes, seconds = divmod(int(eta), 60)
+            text += f" • {minutes} dk {seconds} sn kaldı" if minutes else f" • {seconds} sn kaldı"
+        self.progress_label.setText(text)
 
     def _on_download_finished(self, success: bool, result: str):
         """İndirme tamamlandığında."""
@@ -6,13 +6,18 @@ Bu modül, uygulama güncellemelerini kontrol eder ve
 kullanıcıya güncelleme seçenekleri sunar.
 """
 
+import hashlib
 import json
 import logging
 import os
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import webbrowser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Tuple
 from dataclasses import dataclass
@@ -27,6 +32,18 @@ APP_VERSION = "1.0.0"
 # API URL
 API_BASE_URL = "https://api.takibiesasi.com"
 
+# Kesilen indirme bu kadar kez kaldığı yerden sürdürülür
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Bu boyuttan büyük dosyalar DOWNLOAD_SEGMENTS parçaya bölünüp paralel indirilir
+DOWNLOAD_SEGMENTS = 4
+PARALLEL_MIN_SIZE = 8 * 1024 * 1024
+PARALLEL_MIN_SEGMENT = 1024 * 1024
+# İlerleme bildirimi ve yarım indirme durumunun kaydedilme aralıkları (saniye)
+PROGRESS_INTERVAL = 0.25
+STATE_SAVE_INTERVAL = 1.0
+SPEED_WINDOW = 5.0
+
 
 @dataclass
 class UpdateInfo:
@@ -37,6 +54,8 @@ class UpdateInfo:
     download_url: Optional[str]
     release_notes: Optional[str]
     is_critical: bool
+    sha256: Optional[str] = None
+    size: Optional[int] = None
 
 
 def get_current_version() -> str:
@@ -83,7 +102,9 @@ def check_for_updates() -> Tuple[bool, Optional[UpdateInfo], Optional[str]]:
                 latest_version=data.get("latest_version", current_version),
                 download_url=data.get("download_url"),
                 release_notes=data.get("release_notes"),
-                is_critical=data.get("is_critical", False)
+                is_critical=data.get("is_critical", False),
+                sha256=data.get("sha256"),
+                size=data.get("size")
             )
             return True, update_info, None
         else:
@@ -98,13 +119,268 @@ def check_for_updates() -> Tuple[bool, Optional[UpdateInfo], Optional[str]]:
         return False, None, str(e)
 
 
-def download_update(download_url: str, progress_callback=None) -> Tuple[bool, Optional[str], Optional[str]]:
+@dataclass
+class DownloadProgress:
+    """İndirme ilerlemesi; hız son birkaç saniyenin ortalamasıdır."""
+    downloaded: int
+    total: int
+    bytes_per_second: float
+    eta_seconds: Optional[float]
+
+    @property
+    def percent(self) -> int:
+        return int(self.downloaded * 100 / self.total) if self.total else 0
+
+
+class _DownloadError(Exception):
+    """Kullanıcıya gösterilecek indirme hatası."""
+
+
+class _RestartDownload(Exception):
+    """Sunucudaki dosya değişti; yarım indirme baştan alınmalı."""
+
+
+class _ProgressMeter:
+    """Parçaların indirdiği baytları toplar, hızı ve kalan süreyi hesaplar."""
+
+    def __init__(self, total: int, downloaded: int, callback=None):
+        self.total = total
+        self.downloaded = downloaded
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._samples = deque([(time.monotonic(), downloaded)])
+        self._last_report = 0.0
+
+    def add(self, count: int) -> None:
+        with self._lock:
+            self.downloaded += count
+            now = time.monotonic()
+            if now - self._last_report < PROGRESS_INTERVAL and self.downloaded < self.total:
+                return
+            self._last_report = now
+            self._samples.append((now, self.downloaded))
+            while len(self._samples) > 2 and now - self._samples[0][0] > SPEED_WINDOW:
+                self._samples.popleft()
+            progress = self.snapshot()
+        if self._callback:
+            self._callback(progress)
+
+    def snapshot(self) -> DownloadProgress:
+        (first_time, first_bytes), (last_time, last_bytes) = self._samples[0], self._samples[-1]
+        elapsed = last_time - first_time
+        speed = (last_bytes - first_bytes) / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.downloaded
+        eta = remaining / speed if speed > 0 else None
+        return DownloadProgress(self.downloaded, self.total, speed, eta)
+
+
+def _file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _raise_for_status(status_code: int) -> None:
+    if status_code == 404:
+        raise _DownloadError("Güncelleme dosyası sunucuda bulunamadı (404)")
+    elif status_code == 403:
+        raise _DownloadError("Güncelleme dosyasına erişim reddedildi (403)")
+    elif status_code >= 400:
+        raise _DownloadError(f"Sunucu hatası: HTTP {status_code}")
+
+
+def _probe(download_url: str) -> Tuple[int, Optional[str], bool]:
+    """Dosyanın (boyut, ETag, Range destekleniyor_mu) bilgisini HEAD ile alır."""
+    response = requests.head(download_url, allow_redirects=True, timeout=30)
+    if response.status_code == 405:
+        return 0, None, False
+    _raise_for_status(response.status_code)
+    size = int(response.headers.get("content-length", 0))
+    etag = response.headers.get("ETag")
+    accepts_ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+    return size, etag, accepts_ranges
+
+
+class _PartialDownload:
+    """
+    ``.part`` dosyası ve yanındaki ``.part.json`` durum kaydı.
+
+    Durum kaydı ETag'i, toplam boyutu ve her parçanın ``[başlangıç, bitiş,
+    sıradaki_bayt]`` bilgisini tutar; indirme kesilirse her parça kaldığı
+    yerden sürdürülür.
+    """
+
+    def __init__(self, part_path: str):
+        self.part_path = part_path
+        self.state_path = part_path + ".json"
+        self.etag = None
+        self.size = 0
+        self.segments = []
+        self._lock = threading.Lock()
+        self._saved_at = 0.0
+
+    def load(self, etag: str, size: int) -> bool:
+        """Aynı dosyaya ait yarım indirme varsa durumunu yükler."""
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            if (state.get("etag") != etag or state.get("size") != size
+                    or os.path.getsize(self.part_path) != size):
+                return False
+        except (OSError, ValueError):
+            return False
+        self.etag, self.size = etag, size
+        self.segments = [list(segment) for segment in state["segments"]]
+        return True
+
+    def create(self, etag: str, size: int, segment_count: int) -> None:
+        """Dosyayı tam boyutta ayırır ve ``segment_count`` parçaya böler."""
+        self.etag, self.size = etag, size
+        segment_count = max(1, min(segment_count, size // PARALLEL_MIN_SEGMENT or 1))
+        step = -(-size // segment_count)
+        self.segments = [
+            [start, min(start + step, size) - 1, start]
+            for start in range(0, size, step)
+        ]
+        with open(self.part_path, "wb") as f:
+            f.truncate(size)
+        self.save(force=True)
+
+    @property
+    def downloaded(self) -> int:
+        return sum(offset - start for start, _, offset in self.segments)
+
+    def advance(self, segment: list, count: int, stream=None) -> None:
+        """
+        Parçanın ilerlemesine ``count`` bayt ekler.
+
+        ``stream`` verilirse baytlar önce diske aktarılır; durum kaydı hiçbir
+        zaman ``.part`` dosyasına henüz yazılmamış bir aralığı indirilmiş
+        saymaz.
+        """
+        if stream is not None:
+            stream.flush()
+            os.fsync(stream.fileno())
+        with self._lock:
+            segment[2] += count
+        self.save()
+
+    def save(self, force: bool = False) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._saved_at < STATE_SAVE_INTERVAL:
+                return
+            self._saved_at = now
+            state = {"etag": self.etag, "size": self.size, "segments": self.segments}
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+
+    def discard(self) -> None:
+        for path in (self.part_path, self.state_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _fetch_segment(download_url: str, partial: _PartialDownload, segment: list,
+                   meter: _ProgressMeter) -> None:
+    """Bir parçanın kalanını indirir; bağlantı koparsa kaldığı yerden yeniden dener."""
+    for attempt in range(DOWNLOAD_RETRIES + 1):
+        start, end, offset = segment
+        if offset > end:
+            return
+        headers = {"Range": f"bytes={offset}-{end}", "If-Range": partial.etag}
+        try:
+            with requests.get(download_url, stream=True, timeout=60, headers=headers) as response:
+                if response.status_code == 200:
+                    raise _RestartDownload()
+                _raise_for_status(response.status_code)
+                with open(partial.part_path, "r+b") as f:
+                    f.seek(offset)
+                    unsynced, synced_at = 0, time.monotonic()
+                    try:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            chunk = chunk[:end + 1 - offset - unsynced]
+                            if not chunk:
+                                break
+                            f.write(chunk)
+                            unsynced += len(chunk)
+                            meter.add(len(chunk))
+                            if time.monotonic() - synced_at >= STATE_SAVE_INTERVAL:
+                                partial.advance(segment, unsynced, f)
+                                offset, unsynced, synced_at = segment[2], 0, time.monotonic()
+                    finally:
+                        # Kesilse de yazılan baytlar diske aktarılıp kaydedilir
+                        if unsynced:
+                            partial.advance(segment, unsynced, f)
+            if segment[2] > end:
+                return
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+            logger.warning(f"İndirme kesildi, sürdürülecek ({attempt + 1}/{DOWNLOAD_RETRIES}): {e}")
+    raise _DownloadError("İndirme yarıda kesildi")
+
+
+def _fetch_ranged(download_url: str, partial: _PartialDownload, meter: _ProgressMeter) -> None:
+    pending = [segment for segment in partial.segments if segment[2] <= segment[1]]
+    if not pending:
+        # Önceki çalışma doğrulamadan önce kesilmiş; dosya zaten tamam
+        return
+    if len(pending) == 1:
+        _fetch_segment(download_url, partial, pending[0], meter)
+        return
+    with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="update-download") as executor:
+        futures = [executor.submit(_fetch_segment, download_url, partial, segment, meter)
+                   for segment in pending]
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            partial.save(force=True)
+
+
+def _fetch_whole(download_url: str, part_path: str, progress_callback=None) -> None:
+    """Range desteklemeyen sunucudan dosyayı tek parça indirir."""
+    with requests.get(download_url, stream=True, timeout=300) as response:
+        _raise_for_status(response.status_code)
+        total_size = int(response.headers.get("content-length", 0))
+        if total_size == 0:
+            raise _DownloadError("Dosya boyutu alınamadı - bağlantı sorunu olabilir")
+        meter = _ProgressMeter(total_size, 0, progress_callback)
+        with open(part_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    meter.add(len(chunk))
+    if os.path.getsize(part_path) < total_size:
+        raise _DownloadError("İndirme yarıda kesildi")
+
+
+def download_update(download_url: str, progress_callback=None, sha256: Optional[str] = None,
+                    size: Optional[int] = None,
+                    segments: int = DOWNLOAD_SEGMENTS) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Güncellemeyi indirir.
 
+    Dosya önce ``.part`` uzantısıyla yazılır. Sunucu Range destekliyorsa
+    büyük dosyalar ``segments`` parçaya bölünüp paralel indirilir; bağlantı
+    koparsa (veya önceki bir indirme yarım kaldıysa) her parça kaldığı
+    yerden sürdürülür. Sunucunun bildirdiği SHA-256 verilmişse tamamlanan
+    dosya onunla doğrulanır.
+
     Args:
         download_url: İndirme URL'i
-        progress_callback: İlerleme callback'i (percent, downloaded, total)
+        progress_callback: İlerleme callback'i, ``DownloadProgress`` alır
+        sha256: Beklenen SHA-256 özeti (onaltılık)
+        size: Beklenen dosya boyutu (bayt)
+        segments: Paralel indirilecek en fazla parça sayısı
 
     Returns:
         (başarılı_mı, dosya_yolu, hata_mesajı)
@@ -112,54 +388,61 @@ def download_update(download_url: str, progress_callback=None) -> Tuple[bool, Op
     if not download_url:
         return False, None, "İndirme bağlantısı bulunamadı"
 
-    try:
-        logger.info(f"İndirme başlıyor: {download_url}")
-
-        # Geçici dizine indir
-        temp_dir = tempfile.gettempdir()
-        filename = download_url.split("/")[-1]
-
-        # Dosya adı boşsa veya geçersizse
-        if not filename or '.' not in filename:
-            filename = "TakibiEsasi_Setup.exe"
+    # Geçici dizine indir
+    temp_dir = tempfile.gettempdir()
+    filename = download_url.split("/")[-1]
 
-        file_path = os.path.join(temp_dir, filename)
+    # Dosya adı boşsa veya geçersizse
+    if not filename or '.' not in filename:
+        filename = "TakibiEsasi_Setup.exe"
 
-        response = requests.get(download_url, stream=True, timeout=300)
+    file_path = os.path.join(temp_dir, filename)
+    partial = _PartialDownload(file_path + ".part")
 
-        # HTTP hata kodlarını kontrol et
-        if response.status_code == 404:
-            return False, None, "Güncelleme dosyası sunucuda bulunamadı (404)"
-        elif response.status_code == 403:
-            return False, None, "Güncelleme dosyasına erişim reddedildi (403)"
-        elif response.status_code >= 400:
-            return False, None, f"Sunucu hatası: HTTP {response.status_code}"
-
-        response.raise_for_status()
-
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
+    try:
+        logger.info(f"İndirme başlıyor: {download_url}")
 
-        if total_size == 0:
-            return False, None, "Dosya boyutu alınamadı - bağlantı sorunu olabilir"
+        for _ in range(2):
+            total_size, etag, accepts_ranges = _probe(download_url)
+            if not (accepts_ranges and etag and total_size):
+                partial.discard()
+                _fetch_whole(download_url, partial.part_path, progress_callback)
+                break
+            if partial.load(etag, total_size):
+                logger.info(f"Yarım indirme sürdürülüyor: {partial.downloaded} / {total_size} bayt")
+            else:
+                partial.create(etag, total_size, segments if total_size >= PARALLEL_MIN_SIZE else 1)
+            meter = _ProgressMeter(total_size, partial.downloaded, progress_callback)
+            try:
+                _fetch_ranged(download_url, partial, meter)
+                break
+            except _RestartDownload:
+                logger.info("Sunucudaki dosya değişti, indirme baştan alınıyor")
+                partial.discard()
+        else:
+            return False, None, "İndirme sürdürülemedi"
 
-        with open(file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if progress_callback and total_size > 0:
-                        percent = int((downloaded / total_size) * 100)
-                        progress_callback(percent, downloaded, total_size)
+        part_path = partial.part_path
+        actual_size = os.path.getsize(part_path)
+        if size and actual_size != size:
+            partial.discard()
+            return False, None, "İndirilen dosyanın boyutu beklenenden farklı"
+        if sha256 and _file_sha256(part_path) != sha256.lower():
+            partial.discard()
+            return False, None, "İndirilen dosya doğrulanamadı (SHA-256 uyuşmuyor)"
 
         # Dosya boyutunu doğrula
-        if os.path.getsize(file_path) < 1024:  # 1KB'den küçükse sorun var
-            os.remove(file_path)
+        if actual_size < 1024:  # 1KB'den küçükse sorun var
+            partial.discard()
             return False, None, "İndirilen dosya çok küçük - bozuk olabilir"
 
+        os.replace(part_path, file_path)
+        partial.discard()
         logger.info(f"İndirme tamamlandı: {file_path}")
         return True, file_path, None
 
+    except _DownloadError as e:
+        return False, None, str(e)
     except requests.exceptions.ConnectionError:
         logger.error("Bağlantı hatası")
         return False, None, "Sunucuya bağlanılamadı. İnternet bağlantınızı kontrol edin."
@@ -171,6 +454,8 @@ def download_update(download_url: str, progress_callback=None) -> Tuple[bool, Op
         return False, None, f"İndirme hatası: {str(e)}"
     except Exception as e:
         logger.error(f"Beklenmeyen hata: {e}")
+        # Bozuk bir yarım indirme sonraki denemeleri de aynı hataya düşürmesin
+        partial.discard()
         return False, None, f"Beklenmeyen hata: {str(e)}"
 
 
@@ -349,6 +349,49 @@ def turkish_casefold(text: str) -> str:
     return result.casefold()
 
 
+# Veritabanında saklanan arama metinleri için katlama tablosu. SQLite'ın
+# yerleşik LOWER() fonksiyonu yalnızca ASCII harfleri küçültür; Türkçe büyük
+# harfler önce REPLACE ile eşlenir. ``fold_search_text`` ve
+# ``fold_search_sql`` aynı sonucu üretmek zorundadır.
+_SEARCH_FOLD_PAIRS: tuple[tuple[str, str], ...] = (
+    ("İ", "i"),
+    ("ı", "i"),
+    ("Ç", "ç"),
+    ("Ğ", "ğ"),
+    ("Ö", "ö"),
+    ("Ş", "ş"),
+    ("Ü", "ü"),
+    ("Â", "â"),
+    ("Î", "î"),
+    ("Û", "û"),
+)
+
+_SEARCH_FOLD_TABLE = str.maketrans(
+    {
+        **{chr(code): chr(code + 32) for code in range(ord("A"), ord("Z") + 1)},
+        **dict(_SEARCH_FOLD_PAIRS),
+    }
+)
+
+
+def fold_search_text(value: Any) -> str:
+    """Arama metnini ``turkish_casefold`` ile uyumlu, SQL tarafıyla aynı şekilde katlar.
+
+    İ/I/ı harfleri 'i' olur, diğer Türkçe büyük harfler küçültülür.
+    """
+    if value in (None, ""):
+        return ""
+    return str(value).translate(_SEARCH_FOLD_TABLE)
+
+
+def fold_search_sql(expression: str) -> str:
+    """``fold_search_text`` ile aynı katlamayı yapan SQL ifadesini döndürür."""
+    folded = expression
+    for source, target in _SEARCH_FOLD_PAIRS:
+        folded = f"REPLACE({folded}, '{source}', '{target}')"
+    return f"LOWER({folded})"
+
+
 class TurkishFilterProxyModel(QSortFilterProxyModel):
     """Türkçe karakter destekli filtreleme için QSortFilterProxyModel.
 
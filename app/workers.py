@@ -2,14 +2,14 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 
 try:  # pragma: no cover - runtime import guard
-    from app.models import get_attachments
+    from app.models import fetch_dosyalar_by_color_hex, fetch_dosyalar_page, get_attachments
 except ModuleNotFoundError:  # pragma: no cover
-    from models import get_attachments
+    from models import fetch_dosyalar_by_color_hex, fetch_dosyalar_page, get_attachments
 
 try:  # pragma: no cover - runtime import guard
     from app.utils import get_attachments_dir
@@ -22,9 +22,9 @@ except ModuleNotFoundError:  # pragma: no cover
     from attachments import file_exists, file_info, guess_mime
 
 try:  # pragma: no cover - runtime import guard
-    from app.db import get_pending_changes
+    from app.db import CHANGE_LOG_PRUNE_SLACK, get_changes_since, prune_change_log
 except ModuleNotFoundError:  # pragma: no cover
-    from db import get_pending_changes
+    from db import CHANGE_LOG_PRUNE_SLACK, get_changes_since, prune_change_log
 
 
 def _format_size(value: int) -> str:
@@ -122,31 +122,48 @@ class AttachmentScanWorker(QObject):
 class ChangeDetectorWorker(QObject):
     """Veritabanı değişikliklerini arka planda tespit eden worker.
 
-    SQLite trigger'ları tarafından doldurulan change_log tablosunu
-    kontrol eder. Timestamp karşılaştırması yapmaz, sadece log'a bakar.
+    SQLite trigger'ları tarafından doldurulan change_log tablosunu verilen
+    imleçten itibaren okur. Okuma log'u silmez; her pencere kendi imlecini
+    tutar. Log uygulama açıkken büyümesin diye, imlecin geride bıraktığı
+    kayıtlar birikince saklama sınırına kadar budanır.
     """
 
     changesDetected = pyqtSignal(dict)
     errorOccurred = pyqtSignal(str)
     finished = pyqtSignal()
 
-    def __init__(self) -> None:
+    def __init__(self, cursor: int = 0) -> None:
         super().__init__()
         self._cancelled = False
+        self._cursor = cursor
 
     @pyqtSlot()
     def run(self) -> None:
-        """Change log'u kontrol et ve değişiklikleri bildir."""
+        """Change log'u kontrol et ve değişiklikleri bildir.
+
+        Yayılan sözlük ``dosyalar``/``gorevler``/``finans`` bayraklarının yanında
+        ``cursor`` (yeni imleç), ``rows`` ({tablo: {row_id: op}}) ve
+        ``overflow`` (delta eksik, tam yenileme gerekli) anahtarlarını içerir.
+        """
         try:
             if self._cancelled:
                 self.finished.emit()
                 return
 
-            # Tek bir fonksiyon çağrısı ile tüm değişiklikleri al ve log'u temizle
-            changes = get_pending_changes()
-
-            if changes["dosyalar"] or changes["gorevler"] or changes["finans"]:
-                self.changesDetected.emit(changes)
+            feed = get_changes_since(self._cursor)
+            tables = feed["tables"]
+            if tables:
+                self.changesDetected.emit(
+                    {
+                        "dosyalar": "dosyalar" in tables,
+                        "gorevler": "gorevler" in tables,
+                        "finans": "finans" in tables,
+                        "cursor": feed["cursor"],
+                        "rows": feed["rows"],
+                        "overflow": feed["overflow"],
+                    }
+                )
+            prune_change_log(before=self._cursor, slack=CHANGE_LOG_PRUNE_SLACK)
 
         except Exception as exc:  # pragma: no cover
             self.errorOccurred.emit(str(exc))
@@ -157,3 +174,102 @@ class ChangeDetectorWorker(QObject):
     def cancel(self) -> None:
         """Worker'ı iptal et."""
         self._cancelled = True
+
+
+class CaseListLoadWorker(QObject):
+    """Dosya listesini arka planda sorgulayıp hazır satır partileri üreten worker.
+
+    Pencere ömrü boyunca tek bir ``QThread`` üzerinde yaşar; havuzdaki
+    veritabanı bağlantısı böylece sıcak kalır. ``load`` her çağrıda bir
+    yükleme kuşağını (generation) işler: önce aktif, sonra arşiv dosyaları
+    sorgulanır ve ``prepare_rows`` ile hazırlanan satırlar ``batch_size``
+    büyüklüğünde partiler halinde yayılır. ``page_size`` verilen hedeflerde
+    yalnızca ilk keyset sayfası okunur; sonraki sayfanın anahtarı
+    ``targetLoaded`` ile bildirilir. GUI iş parçacığı ``cancel_before``
+    ile eski kuşakları iptal eder; worker her parti arasında bunu kontrol
+    eder ve bayat sonuç yaymaz.
+    """
+
+    TARGETS = ("active", "archived")
+
+    batchReady = pyqtSignal(int, str, object)  # kuşak, hedef, hazır satırlar
+    targetLoaded = pyqtSignal(int, str, int, object)  # kuşak, hedef, satır, sonraki sayfa
+    loadFinished = pyqtSignal(int)
+    errorOccurred = pyqtSignal(int, str)
+
+    def __init__(
+        self,
+        prepare_rows: Callable[[List[Dict[str, Any]]], Any],
+        *,
+        batch_size: int = 500,
+    ) -> None:
+        super().__init__()
+        self._prepare_rows = prepare_rows
+        self._batch_size = max(1, int(batch_size))
+        self._cancel_below = 0
+
+    def cancel_before(self, generation: int) -> None:
+        """``generation`` öncesindeki tüm kuşakları iptal et.
+
+        GUI iş parçacığından doğrudan çağrılır; tek bir tamsayı ataması
+        olduğundan kilit gerekmez.
+        """
+        if generation > self._cancel_below:
+            self._cancel_below = generation
+
+    def is_stale(self, generation: int) -> bool:
+        return generation < self._cancel_below
+
+    @pyqtSlot(int, object)
+    def load(self, generation: int, request: Dict[str, Any]) -> None:
+        """Bir yükleme isteğini işle.
+
+        ``request`` her hedef için ``fetch_dosyalar_by_color_hex`` anahtar
+        kelime argümanlarını (``active``/``archived``) ve isteğe bağlı
+        ``post_filter`` çağrılabilirini içerir.
+        """
+        if self.is_stale(generation):
+            return
+        post_filter = request.get("post_filter")
+        try:
+            for target in self.TARGETS:
+                params = request.get(target)
+                if params is None:
+                    continue
+                params = dict(params)
+                page_size = params.pop("page_size", None)
+                if page_size:
+                    records, next_after = fetch_dosyalar_page(**params, limit=page_size)
+                else:
+                    records, next_after = fetch_dosyalar_by_color_hex(**params), None
+                if post_filter is not None:
+                    records = post_filter(records)
+                if self.is_stale(generation):
+                    return
+                if not records:
+                    # Boş sonuç da modelin temizlenmesi için bildirilir
+                    self.batchReady.emit(generation, target, self._prepare_rows([]))
+                for start in range(0, len(records), self._batch_size):
+                    if self.is_stale(generation):
+                        return
+                    batch = self._prepare_rows(records[start : start + self._batch_size])
+                    self.batchReady.emit(generation, target, batch)
+                self.targetLoaded.emit(generation, target, len(records), next_after)
+        except Exception as exc:  # pragma: no cover - veritabanı güvenliği
+            self.errorOccurred.emit(generation, str(exc))
+            return
+        self.loadFinished.emit(generation)
+
+
+class BackupEventBridge(QObject):
+    """Yedekleme zamanlayıcısının olaylarını GUI iş parçacığına taşır.
+
+    ``BackupScheduler`` dinleyicileri işçi iş parçacığında çağırır; köprü
+    dinleyici olarak eklenir ve olayı sinyalle yayar. Alıcı GUI iş
+    parçacığında yaşadığından sinyal kuyruklu bağlantıyla iletilir.
+    """
+
+    eventReceived = pyqtSignal(object)  # backup_scheduler.BackupEvent
+
+    def __call__(self, event: Any) -> None:
+        self.eventReceived.emit(event)
@@ -0,0 +1,58 @@
+-- ============================================
+-- TakibiEsasi - Veritabanı Migration
+-- Log tablolarını aylık bölümlere ayırma (isteğe bağlı)
+-- ============================================
+--
+-- activity_log ve email_logs tablolarını created_at üzerinden aylık RANGE
+-- partition'lı tablolara çevirir. Sunucu (LogMaintenance) bölümlü tabloları
+-- tanır: önümüzdeki aylar için bölüm açar ve LOG_RETENTION_DAYS dolan
+-- bölümleri DELETE yerine DROP TABLE ile siler.
+--
+-- Çalıştırmadan önce sunucuyu durdurun; tablo boyutuna göre uzun sürebilir:
+--   psql -d takibiesasi_db -f database/migrations/002_partition_log_tables.sql
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION pg_temp.partition_log_table(tbl TEXT) RETURNS VOID AS $$
+DECLARE
+    old_tbl TEXT := tbl || '_unpartitioned';
+    first_month DATE;
+    month DATE;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid
+               WHERE c.relname = tbl) THEN
+        RAISE NOTICE '% zaten bölümlü', tbl;
+        RETURN;
+    END IF;
+
+    EXECUTE format('UPDATE %I SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL', tbl);
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', tbl, old_tbl);
+    -- Sütunlar ve id dizisi (SERIAL varsayılanı) aynen taşınır
+    EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)', tbl, old_tbl);
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN created_at SET NOT NULL', tbl);
+    EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, created_at)', tbl);
+    EXECUTE format('ALTER SEQUENCE IF EXISTS %I OWNED BY %I.id', tbl || '_id_seq', tbl);
+
+    EXECUTE format('SELECT COALESCE(DATE_TRUNC(''month'', MIN(created_at)), DATE_TRUNC(''month'', CURRENT_DATE))::date FROM %I', old_tbl)
+        INTO first_month;
+    month := first_month;
+    WHILE month <= (DATE_TRUNC('month', CURRENT_DATE) + INTERVAL '2 months')::date LOOP
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                       tbl || '_' || TO_CHAR(month, 'YYYYMM'), tbl, month, (month + INTERVAL '1 month')::date);
+        month := (month + INTERVAL '1 month')::date;
+    END LOOP;
+
+    EXECUTE format('INSERT INTO %I SELECT * FROM %I', tbl, old_tbl);
+    EXECUTE format('DROP TABLE %I', old_tbl);
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT pg_temp.partition_log_table('activity_log');
+SELECT pg_temp.partition_log_table('email_logs');
+
+-- Keyset sayfalama indeksleri (üst tabloda tanımlanınca tüm bölümlere uygulanır)
+CREATE INDEX IF NOT EXISTS idx_activity_log_created_id ON activity_log(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_activity_log_type_created ON activity_log(activity_type, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_email_logs_created_id ON email_logs(created_at, id);
+
+COMMIT;
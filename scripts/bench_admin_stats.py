@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Admin dashboard istatistik sorgularının eski ve yeni hâlini karşılaştıran benchmark betiği.
+
+Yerel bir PostgreSQL üzerinde çalışır; tablolar sunucunun ``init_db`` fonksiyonu
+ile oluşturulur. ``--seed`` ölçüm verisini (varsayılan 1M activity_log satırı,
+200k sipariş, 50k kullanıcı ve lisans) ekler::
+
+    DB_NAME=takibiesasi_bench python scripts/bench_admin_stats.py --seed
+
+Bağlantı bilgileri sunucunun ``DB_*`` ortam değişkenlerinden okunur.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+
+SERVER_DIR = Path(__file__).resolve().parents[1] / "server"
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+import main as server  # noqa: E402
+
+
+# Dashboard'un önceki sürümündeki ardışık sorgular
+LEGACY_QUERIES = [
+    "SELECT COUNT(*) FROM licenses",
+    "SELECT COUNT(*) FROM licenses WHERE is_active = TRUE AND machine_id IS NOT NULL",
+    "SELECT COUNT(*) FROM licenses WHERE source = 'purchase'",
+    "SELECT COUNT(*) FROM licenses WHERE source = 'manual' OR source IS NULL",
+    "SELECT COUNT(*) FROM users",
+    "SELECT COUNT(*) FROM users WHERE email_verified = TRUE",
+    "SELECT COUNT(*) FROM users WHERE DATE(created_at) = CURRENT_DATE",
+    "SELECT COUNT(*) FROM users WHERE created_at >= CURRENT_DATE - INTERVAL '7 days'",
+    "SELECT COUNT(*) FROM orders WHERE payment_status = 'completed'",
+    "SELECT COUNT(*) FROM orders WHERE payment_status = 'pending'",
+    "SELECT COALESCE(SUM(total_price_cents), 0) FROM orders WHERE payment_status = 'completed'",
+    "SELECT COALESCE(SUM(total_price_cents), 0) FROM orders"
+    " WHERE payment_status = 'completed' AND paid_at >= DATE_TRUNC('month', CURRENT_DATE)",
+    "SELECT COALESCE(SUM(total_price_cents), 0) FROM orders"
+    " WHERE payment_status = 'completed' AND paid_at >= CURRENT_DATE - INTERVAL '7 days'",
+    "SELECT COALESCE(SUM(total_price_cents), 0) FROM orders"
+    " WHERE payment_status = 'completed' AND DATE(paid_at) = CURRENT_DATE",
+    "SELECT COALESCE(AVG(total_price_cents), 0) FROM orders WHERE payment_status = 'completed'",
+    "SELECT TO_CHAR(DATE_TRUNC('month', paid_at), 'YYYY-MM'), SUM(total_price_cents) / 100, COUNT(*)"
+    " FROM orders WHERE payment_status = 'completed' AND paid_at >= CURRENT_DATE - INTERVAL '12 months'"
+    " GROUP BY DATE_TRUNC('month', paid_at)",
+    "SELECT TO_CHAR(DATE(paid_at), 'YYYY-MM-DD'), SUM(total_price_cents) / 100, COUNT(*)"
+    " FROM orders WHERE payment_status = 'completed' AND paid_at >= CURRENT_DATE - INTERVAL '30 days'"
+    " GROUP BY DATE(paid_at)",
+    "SELECT product_name, COUNT(*), SUM(total_price_cents) / 100 FROM orders"
+    " WHERE payment_status = 'completed' GROUP BY product_name ORDER BY COUNT(*) DESC LIMIT 10",
+    "SELECT * FROM activity_log ORDER BY created_at DESC LIMIT 20",
+]
+
+RECENT_ACTIVITY_QUERY = "SELECT * FROM activity_log ORDER BY created_at DESC LIMIT 20"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", action="store_true", help="Ölçüm verisini veritabanına ekle")
+    parser.add_argument("--activity-rows", type=int, default=1_000_000)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20, help="Her ölçümün tekrar sayısı")
+    return parser.parse_args()
+
+
+def seed(conn, args: argparse.Namespace) -> None:
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO users (email, password_hash, email_verified, created_at)
+            SELECT 'bench-' || g || '@example.com', 'x', g % 3 = 0,
+                   NOW() - (g % 400) * INTERVAL '1 day'
+            FROM generate_series(1, %s) g
+            ON CONFLICT (email) DO NOTHING
+        """, (args.users,))
+        cur.execute("""
+            INSERT INTO licenses (license_key, machine_id, is_active, source, activated_at, created_at)
+            SELECT 'BENCH-' || LPAD(g::TEXT, 14, '0'), CASE WHEN g % 2 = 0 THEN 'm' || g END,
+                   g % 5 <> 0, CASE WHEN g % 4 = 0 THEN 'purchase' ELSE 'manual' END,
+                   NOW() - (g % 400) * INTERVAL '1 day', NOW() - (g % 400) * INTERVAL '1 day'
+            FROM generate_series(1, %s) g
+            ON CONFLICT (license_key) DO NOTHING
+        """, (args.users,))
+        cur.execute("""
+            INSERT INTO orders (order_number, product_name, total_price_cents, payment_status,
+                                paid_at, created_at)
+            SELECT 'BENCH-' || g, 'Plan ' || (g % 4),
+                   10000 + g % 50000,
+                   (ARRAY['completed', 'pending', 'cancelled'])[1 + g % 3],
+                   CASE WHEN g % 3 = 0 THEN NOW() - (g % 500) * INTERVAL '1 day' END,
+                   NOW() - (g % 500) * INTERVAL '1 day'
+            FROM generate_series(1, %s) g
+            ON CONFLICT (order_number) DO NOTHING
+        """, (args.orders,))
+        cur.execute("""
+            INSERT INTO activity_log (activity_type, description, created_at)
+            SELECT 'bench', 'bench ' || g, NOW() - (g % 525600) * INTERVAL '1 minute'
+            FROM generate_series(1, %s) g
+        """, (args.activity_rows,))
+        cur.execute("ANALYZE users; ANALYZE licenses; ANALYZE orders; ANALYZE activity_log")
+    conn.commit()
+
+
+def measure(label: str, fn, repeat: int) -> None:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(f"{label:<34} {statistics.median(timings):10.2f} {timings[-1]:10.2f}")
+
+
+def main() -> int:
+    args = parse_args()
+    server.init_db()
+    conn = server.db_pool.acquire()
+    try:
+        if args.seed:
+            seed(conn, args)
+
+        def legacy() -> None:
+            with conn.cursor() as cur:
+                for query in LEGACY_QUERIES:
+                    cur.execute(query)
+                    cur.fetchall()
+
+        def grouped() -> None:
+            server.admin_stats_cache.invalidate(*server.ADMIN_STAT_GROUPS)
+            server.admin_stats_cache.get(conn, "licenses", "users", "orders")
+            with conn.cursor() as cur:
+                cur.execute(RECENT_ACTIVITY_QUERY)
+                cur.fetchall()
+
+        def cached() -> None:
+            server.admin_stats_cache.get(conn, "licenses", "users", "orders")
+            with conn.cursor() as cur:
+                cur.execute(RECENT_ACTIVITY_QUERY)
+                cur.fetchall()
+
+        print(f"{'ölçüm':<34} {'p50 ms':>10} {'maks ms':>10}")
+        measure("eski: ardışık sorgular", legacy, args.repeat)
+        measure("yeni: gruplu sorgular (soğuk)", grouped, args.repeat)
+        measure("yeni: önbellekten", cached, args.repeat)
+        conn.rollback()
+    finally:
+        conn.close()
+        server.db_pool.closeall()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
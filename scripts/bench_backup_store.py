@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tam kopya yedek ile artımlı anlık görüntü yedeğini karşılaştıran benchmark betiği.
+
+Geçici bir dizinde ``--size`` MB'lık bir veritabanı oluşturulur, ardından
+sırayla ölçülür:
+
+* tam kopya yedek (``sqlite3.backup`` + dosya şifreleme, eski davranış),
+* ilk anlık görüntü (tüm parçalar yazılır),
+* değişmemiş veritabanının anlık görüntüsü,
+* birkaç satır eklendikten sonraki anlık görüntü.
+
+Her adım için süre ve diske yeni yazılan bayt raporlanır::
+
+    python scripts/bench_backup_store.py --size 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import backup_store, db  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=500, help="Veritabanı boyutu (MB)")
+    parser.add_argument("--dir", default=tempfile.gettempdir(), help="Ölçüm dizini")
+    return parser.parse_args()
+
+
+def fill_database(size: int) -> None:
+    row = os.urandom(600).hex()  # ~1.2 KB, sıkıştırılabilir ama tekrar etmeyen metin
+    with db.connection_scope() as conn:
+        batch = 10_000
+        while os.path.getsize(db.DB_PATH) < size:
+            conn.executemany(
+                "INSERT INTO dosyalar (muvekkil_adi, dosya_konusu) VALUES (?, ?)",
+                ((f"Müvekkil {index}", row[index % 97:] + str(index)) for index in range(batch)),
+            )
+            conn.commit()
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def measure(label: str, fn) -> str | None:
+    started = time.perf_counter()
+    path = fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    if path and path.endswith(backup_store.SNAPSHOT_SUFFIX):
+        written = backup_store.read_manifest(path)["new_bytes"]
+    else:
+        written = os.path.getsize(path) if path else 0
+    print(f"{label:<34} {elapsed:10.1f} {written / MB:12.1f}")
+    return path
+
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory(dir=args.dir) as temp_dir:
+        db.DOCS_DIR = temp_dir
+        db.DB_PATH = os.path.join(temp_dir, "data.db")
+        db.BACKUP_DIR = os.path.join(temp_dir, "yedekler")
+        db.initialize_database()
+        fill_database(args.size * MB)
+        print(f"Veritabanı: {os.path.getsize(db.DB_PATH) / MB:.1f} MB")
+        print(f"{'Adım':<34} {'Süre (ms)':>10} {'Yazılan (MB)':>12}")
+
+        measure("tam kopya (eski)", lambda: db.create_backup(os.path.join(temp_dir, "tam.db")))
+        measure("ilk anlık görüntü", db.create_snapshot_backup)
+        measure("değişmemiş veritabanı", db.create_snapshot_backup)
+        with db.connection_scope() as conn:
+            conn.executemany(
+                "INSERT INTO dosyalar (muvekkil_adi) VALUES (?)", ((f"Yeni {i}",) for i in range(20))
+            )
+        measure("20 satır sonrası", db.create_snapshot_backup)
+        store = db.get_snapshot_store()
+        print(f"Parça deposu: {store.disk_usage() / MB:.1f} MB")
+        db.close_all_connections()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Dosya listesi sorgusunu büyük veri setinde ölçen benchmark betiği.
+
+Geçici bir veritabanına ``--cases`` adet dosya yazılır ve tipik liste
+filtreleri (renk, metin arama, açık dosyalar, duruşma dönemi, atanan
+kullanıcı) ``fetch_dosyalar_by_color_hex`` üzerinden ölçülür. Hedef, filtreli
+sorguların 50k dosyada 50 ms altında kalmasıdır.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import db  # noqa: E402
+
+TARGET_MS = 50.0
+
+FIRST_NAMES = [
+    "Ayşe", "İsmail", "Işıl", "Şahin", "Ümit", "Gülşen", "Çağrı", "Özgür",
+    "Irmak", "Ali", "Zeynep", "Mehmet", "Elif", "Mustafa", "Fatma", "Hüseyin",
+    "Emine", "İbrahim", "Hatice", "Osman", "Şule", "Cem", "Ebru", "Kadir",
+]
+LAST_NAMES = [
+    "Yılmaz", "Öztürk", "Çelik", "Kaya", "Doğan", "Arslan", "Koç", "Aydın",
+    "Şimşek", "Demir", "Şahin", "Yıldız", "Yıldırım", "Özdemir", "Aktaş",
+    "Erdoğan", "Kılıç", "Aslan", "Çetin", "Kara", "Kurt", "Özkan", "Polat",
+    "Korkmaz", "Güneş", "Işık", "Tekin", "Uçar", "Bulut", "Ünal",
+]
+SUBJECTS = [
+    "Alacak", "Kira Tespiti", "Tapu İptali ve Tescil", "İşçilik Alacağı",
+    "Boşanma", "İtirazın İptali", "Tazminat", "Ortaklığın Giderilmesi",
+]
+CITIES = [
+    "İstanbul", "Ankara", "İzmir", "Bursa", "Isparta", "Antalya", "Konya",
+    "Kayseri", "Eskişehir", "Iğdır", "Şanlıurfa", "Çanakkale", "Muğla",
+]
+COURT_TYPES = ["Asliye Hukuk", "İş Mahkemesi", "Sulh Hukuk", "Asliye Ticaret", "Aile Mahkemesi"]
+
+
+def _person(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _court(rng: random.Random) -> str:
+    return f"{rng.choice(CITIES)} {rng.randint(1, 20)}. {rng.choice(COURT_TYPES)}"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=50_000, help="Dosya sayısı")
+    parser.add_argument("--iterations", type=int, default=20, help="Ölçüm tekrar sayısı")
+    parser.add_argument("--seed", type=int, default=1, help="Rastgele tohum")
+    return parser.parse_args()
+
+
+def seed_cases(count: int, rng: random.Random) -> None:
+    statuses = [name for name, _, _ in db.DEFAULT_STATUSES]
+    today = date.today()
+    conn = db.get_connection()
+    try:
+        conn.execute(
+            "INSERT OR IGNORE INTO users (username, role, active) VALUES ('bench', 'avukat', 1)"
+        )
+        user_id = conn.execute("SELECT id FROM users WHERE username = 'bench'").fetchone()[0]
+        rows = []
+        for index in range(1, count + 1):
+            durum = rng.choice(statuses)
+            durum_2 = rng.choice(statuses) if rng.random() < 0.3 else None
+            rows.append(
+                (
+                    index,
+                    f"{2015 + index % 10}/{index}",
+                    _person(rng),
+                    _person(rng),
+                    rng.choice(SUBJECTS),
+                    _court(rng),
+                    (today + timedelta(days=rng.randint(-200, 200))).isoformat(),
+                    durum,
+                    f"Not {index}",
+                    durum_2,
+                    1 if rng.random() < 0.2 else 0,
+                )
+            )
+        conn.executemany(
+            """
+            INSERT INTO dosyalar (
+                buro_takip_no, dosya_esas_no, muvekkil_adi, karsi_taraf,
+                dosya_konusu, mahkeme_adi, durusma_tarihi, dava_durumu,
+                aciklama, tekrar_dava_durumu_2, is_archived
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO dosya_atamalar (dosya_id, user_id) VALUES (?, ?)",
+            [(dosya_id, user_id) for dosya_id in range(1, count + 1, 7)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _measure(label: str, func, iterations: int) -> float:
+    samples: list[float] = []
+    result_count = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result_count = len(func())
+        samples.append((time.perf_counter() - started) * 1000)
+    median = statistics.median(samples)
+    print(f"{label:<36} {result_count:>7} satır | p50 {median:8.2f} ms | max {max(samples):8.2f} ms")
+    return median
+
+
+def main() -> int:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db.DB_PATH = str(Path(temp_dir) / "data.db")
+        db.initialize_database()
+
+        started = time.perf_counter()
+        seed_cases(args.cases, rng)
+        print(f"{args.cases} dosya yazıldı ({time.perf_counter() - started:.1f} s, trigger'lar dahil)")
+
+        from app.models import fetch_dosyalar_by_color_hex
+        from app.search import global_search
+
+        conn = db.get_connection()
+        user_id = conn.execute("SELECT id FROM users WHERE username = 'bench'").fetchone()[0]
+        conn.close()
+
+        # Liste ekranındaki tipik, seçici filtreler: hedef bunlar için geçerli
+        scenarios = [
+            ("renk (kırmızı)", lambda: fetch_dosyalar_by_color_hex("FF0000")),
+            ("müvekkil ('şahin yıldız')", lambda: fetch_dosyalar_by_color_hex(None, "ŞAHİN YILDIZ")),
+            ("mahkeme ('ISPARTA 3. İŞ')", lambda: fetch_dosyalar_by_color_hex(None, "ısparta 3. iş")),
+            ("esas no ('2019/4')", lambda: fetch_dosyalar_by_color_hex(None, "2019/4")),
+            (
+                "renk + arama + açık",
+                lambda: fetch_dosyalar_by_color_hex("FFD700", "yılmaz", open_only=True),
+            ),
+            (
+                "duruşma bu hafta",
+                lambda: fetch_dosyalar_by_color_hex(None, other_filters={"durusma_period": "bu_hafta"}),
+            ),
+            (
+                "atanan kullanıcı + renk",
+                lambda: fetch_dosyalar_by_color_hex("FF8C00", assigned_user_id=user_id),
+            ),
+            ("arşiv + arama", lambda: fetch_dosyalar_by_color_hex(None, "tapu", archived=True)),
+            ("genel arama (ilk 50, sıralı)", lambda: global_search("şahin yıl", limit=50)),
+        ]
+
+        print()
+        failures = 0
+        for label, func in scenarios:
+            if _measure(label, func, args.iterations) > TARGET_MS:
+                failures += 1
+
+        # Geniş sonuçlarda süre satırların Python'a aktarılmasıyla sınırlıdır
+        print()
+        _measure("geniş arama ('şahin')", lambda: fetch_dosyalar_by_color_hex(None, "şahin"), 5)
+        _measure("filtresiz tüm aktif dosyalar", lambda: fetch_dosyalar_by_color_hex(None), 5)
+        db.close_all_connections()
+
+    print()
+    if failures:
+        print(f"{failures} senaryo {TARGET_MS:.0f} ms hedefini aştı")
+        return 1
+    print(f"Tüm filtreli senaryolar {TARGET_MS:.0f} ms altında")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Dosya listesi satırlarının bellek kullanımını ölçen benchmark betiği.
+
+``query_cases`` çıktısıyla aynı biçimde sentetik kayıtlar üretilir ve model
+tarafında satır başına tutulan yapı ``tracemalloc`` ile ölçülür:
+
+* ``dict`` kopyaları: eski modelin her satır için tuttuğu kayıt kopyası
+  (metin değerleriyle birlikte),
+* ``CaseRowStore``: sütun bazlı depo (ordinal tarihler, havuzlu durumlar).
+
+Varsayılan olarak 10k/50k/100k dosya için çalışır; ayrıca kopyalama, depo
+kurma ve bir metin sütununa göre sıralama süreleri raporlanır.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app.case_row_store import CaseRowStore  # noqa: E402
+
+STATUSES = [
+    ("DERDEST", "#FFD700", "SARI"),
+    ("KARAR ÇIKTI", "#FF8C00", "TURUNCU"),
+    ("İSTİNAF", "#1E90FF", "MAVİ"),
+    ("TEMYİZ", "#8A2BE2", "MOR"),
+    ("DOSYA KAPANDI", "#FF0000", "KIRMIZI"),
+]
+FIRST_NAMES = ["Ayşe", "İsmail", "Işıl", "Şahin", "Ümit", "Gülşen", "Çağrı", "Özgür"]
+LAST_NAMES = ["Yılmaz", "Öztürk", "Çelik", "Kaya", "Doğan", "Arslan", "Koç", "Aydın"]
+SUBJECTS = ["Alacak", "Kira Tespiti", "Tapu İptali ve Tescil", "İşçilik Alacağı", "Boşanma"]
+CITIES = ["İstanbul", "Ankara", "İzmir", "Bursa", "Isparta", "Antalya", "Konya"]
+COURT_TYPES = ["Asliye Hukuk", "İş Mahkemesi", "Sulh Hukuk", "Asliye Ticaret"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--cases",
+        type=int,
+        nargs="+",
+        default=[10_000, 50_000, 100_000],
+        help="Ölçülecek dosya sayıları",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Rastgele tohum")
+    return parser.parse_args()
+
+
+def _maybe_date(rng: random.Random, today: date, probability: float) -> str | None:
+    if rng.random() >= probability:
+        return None
+    return (today + timedelta(days=rng.randint(-200, 200))).isoformat()
+
+
+def make_records(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """``query_cases`` çıktısı biçiminde kayıtlar (``d.*`` + durum ekleri)."""
+    today = date.today()
+    stamp = datetime(2024, 1, 1, 9, 0, 0)
+    records: List[Dict[str, Any]] = []
+    for index in range(1, count + 1):
+        durum, color, owner = rng.choice(STATUSES)
+        second = rng.choice(STATUSES) if rng.random() < 0.3 else (None, None, None)
+        created = (stamp + timedelta(minutes=index)).strftime("%Y-%m-%d %H:%M:%S")
+        records.append(
+            {
+                "id": index,
+                "buro_takip_no": index,
+                "dosya_esas_no": f"{2015 + index % 10}/{index}",
+                "muvekkil_adi": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "muvekkil_rolu": rng.choice(["Davacı", "Davalı", None]),
+                "karsi_taraf": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "dosya_konusu": rng.choice(SUBJECTS),
+                "mahkeme_adi": (
+                    f"{rng.choice(CITIES)} {rng.randint(1, 20)}. {rng.choice(COURT_TYPES)}"
+                ),
+                "dava_acilis_tarihi": _maybe_date(rng, today, 0.5),
+                "durusma_tarihi": _maybe_date(rng, today, 0.8),
+                "dava_durumu": durum,
+                "is_tarihi": _maybe_date(rng, today, 0.4),
+                "aciklama": f"Not {index}" if rng.random() < 0.6 else None,
+                "tekrar_dava_durumu_2": second[0],
+                "is_tarihi_2": _maybe_date(rng, today, 0.1),
+                "aciklama_2": None,
+                "is_archived": 0,
+                "created_at": created,
+                "updated_at": created,
+                "aktif_durum": second[0] or durum,
+                "status_color": second[1] or color,
+                "dava_durumu_color": color,
+                "tekrar_dava_durumu_2_color": second[1],
+                "dava_durumu_owner": owner,
+                "tekrar_dava_durumu_2_owner": second[2],
+            }
+        )
+    return records
+
+
+def _measure(build: Callable[[], Any]) -> tuple[int, Any]:
+    """``build`` sonucunun tuttuğu bellek (bayt)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def _elapsed_ms(func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def _fmt_mb(size: int) -> str:
+    return f"{size / (1024 * 1024):7.1f} MB"
+
+
+def main() -> int:
+    args = parse_args()
+    print(f"{'dosya':>8} | {'dict kopyaları':>24} | {'CaseRowStore':>24} | {'oran':>5} | süreler")
+    for count in args.cases:
+        # Sorgu sonucu hazırlıktan sonra bırakılır: yalnızca modelde kalan ölçülür
+        dict_size, rows = _measure(
+            lambda: [dict(record) for record in make_records(count, random.Random(args.seed))]
+        )
+        store_size, store = _measure(
+            lambda: CaseRowStore(make_records(count, random.Random(args.seed)))
+        )
+
+        records = make_records(count, random.Random(args.seed))
+        dict_ms = _elapsed_ms(lambda: [dict(record) for record in records])
+        store_ms = _elapsed_ms(lambda: CaseRowStore(records))
+        keys = [str(value or "").casefold() for value in store.column("muvekkil_adi")]
+        sort_ms = _elapsed_ms(
+            lambda: store.reorder(sorted(range(len(keys)), key=keys.__getitem__))
+        )
+        assert store[0] in rows
+
+        print(
+            f"{count:>8} | {_fmt_mb(dict_size)} {dict_size / count:6.0f} B/satır "
+            f"| {_fmt_mb(store_size)} {store_size / count:6.0f} B/satır "
+            f"| {dict_size / max(store_size, 1):4.1f}x "
+            f"| kopya {dict_ms:5.0f} ms, depo {store_ms:5.0f} ms, sıralama {sort_ms:5.0f} ms"
+        )
+        rows = store = records = None
+    print()
+    print("Bellek, sorgu kayıtları bırakıldıktan sonra modelde kalan yapıdır")
+    print("(satır sözlükleri ya da sütunlar ve tuttukları değerler).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
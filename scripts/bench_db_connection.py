@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Bağlantı başına gecikmeyi havuzlu ve havuzsuz ölçen benchmark betiği.
+
+"Önce" senaryosu eski ``get_connection`` davranışını taklit eder: her çağrıda
+anahtar yeniden türetilir (SQLCipher kurulumlarında olduğu gibi), yeni
+bağlantı açılır, PRAGMA'lar uygulanır ve bağlantı gerçekten kapatılır.
+"Sonra" senaryosu havuzdan sıcak bağlantı alıp iade eder.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import db  # noqa: E402
+from app import db_crypto  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200, help="Ölçüm tekrar sayısı")
+    parser.add_argument(
+        "--key-iterations",
+        type=int,
+        default=5,
+        help="Anahtar türetme ölçüm tekrarı (makine ID sorgusu yavaştır)",
+    )
+    return parser.parse_args()
+
+
+def _summary(samples: list[float]) -> str:
+    samples_ms = sorted(value * 1000 for value in samples)
+    p99 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.99))]
+    return (
+        f"ortalama {statistics.mean(samples_ms):8.3f} ms | "
+        f"p50 {statistics.median(samples_ms):8.3f} ms | p99 {p99:8.3f} ms"
+    )
+
+
+def _measure(label: str, func, iterations: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    print(f"{label:<34} {_summary(samples)}")
+    return samples
+
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db.DB_PATH = str(Path(temp_dir) / "data.db")
+        db.initialize_database()
+        db.close_all_connections()
+
+        print(f"Veritabanı: {db.DB_PATH}")
+        print(f"Şifreleme: {db.is_encryption_available()[0]}")
+        print()
+
+        def uncached_key() -> None:
+            db_crypto.clear_key_cache()
+            db_crypto.derive_db_key()
+
+        key_before = _measure("anahtar türetme (önbelleksiz)", uncached_key, args.key_iterations)
+        key_after = _measure("anahtar türetme (önbellekli)", db_crypto.derive_db_key, args.iterations)
+
+        def unpooled() -> None:
+            db_crypto.clear_key_cache()
+            db_crypto.derive_db_key()
+            conn = db._open_connection()
+            conn.execute("SELECT 1").fetchone()
+            conn.close_physical()
+
+        def pooled() -> None:
+            conn = db.get_connection()
+            conn.execute("SELECT 1").fetchone()
+            conn.close()
+
+        before = _measure("get_connection (eski davranış)", unpooled, args.key_iterations)
+        db_crypto.clear_key_cache()
+        db.get_connection().close()
+        after = _measure("get_connection (havuzlu)", pooled, args.iterations)
+
+        db.close_all_connections()
+
+    print()
+    print(f"Anahtar türetme hızlanması: {statistics.mean(key_before) / statistics.mean(key_after):,.0f}x")
+    print(f"Bağlantı başına hızlanma:    {statistics.mean(before) / statistics.mean(after):,.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
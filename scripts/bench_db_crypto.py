@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Veritabanı/yedek şifrelemesinin eski (tek Fernet token'ı) ve akışlı hâlini karşılaştıran benchmark betiği.
+
+Her boyut için rastgele içerikli bir dosya üretilir; eski format dosyanın
+tamamını belleğe okuyup tek token olarak şifreler, yeni format
+``db_crypto`` içindeki parça parça AES-GCM akışını kullanır. Süre, MB/sn
+ve ``tracemalloc`` ile en yüksek Python bellek kullanımı raporlanır::
+
+    python scripts/bench_db_crypto.py --sizes 100 1024
+
+Boyutlar MB cinsindendir; dosyalar ``--dir`` altında (varsayılan geçici
+dizin) oluşturulur ve ölçümden sonra silinir.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from cryptography.fernet import Fernet  # noqa: E402
+
+from app import db_crypto  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1024], help="Dosya boyutları (MB)")
+    parser.add_argument("--dir", default=tempfile.gettempdir(), help="Ölçüm dosyalarının dizini")
+    return parser.parse_args()
+
+
+def legacy_encrypt(path: str, key: bytes) -> None:
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(db_crypto.ENC_MARKER_V1)
+        f.write(Fernet(key).encrypt(data))
+
+
+def legacy_decrypt(path: str, key: bytes) -> None:
+    with open(path, "rb") as f:
+        f.read(len(db_crypto.ENC_MARKER_V1))
+        data = Fernet(key).decrypt(f.read())
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def measure(label: str, fn, size: int) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:9.2f} {size / MB / elapsed:9.1f} {peak / MB:12.1f}")
+
+
+def write_random(path: str, size: int) -> None:
+    with open(path, "wb") as f:
+        for _ in range(size // MB):
+            f.write(os.urandom(MB))
+
+
+def main() -> int:
+    args = parse_args()
+    key = Fernet.generate_key()
+    path = os.path.join(args.dir, "bench_db_crypto.db")
+
+    print(f"{'ölçüm':<28} {'sn':>9} {'MB/sn':>9} {'tepe bellek MB':>12}")
+    try:
+        for size_mb in args.sizes:
+            size = size_mb * MB
+            write_random(path, size)
+            measure(f"eski şifreleme {size_mb} MB", lambda: legacy_encrypt(path, key), size)
+            measure(f"eski çözme {size_mb} MB", lambda: legacy_decrypt(path, key), size)
+            measure(f"akışlı şifreleme {size_mb} MB", lambda: db_crypto.encrypt_file(path, key), size)
+            print(f"{'  dosya boyutu':<28} {os.path.getsize(path) / MB:9.1f} MB")
+            measure(f"akışlı çözme {size_mb} MB", lambda: db_crypto.decrypt_file(path, key), size)
+    finally:
+        for leftover in (path, path + ".tmp"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
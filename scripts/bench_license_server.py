@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Lisans sunucusunun /api/verify ve /api/demo/heartbeat uçlarına yük bindiren benchmark betiği.
+
+Sunucu yerel bir PostgreSQL ile ayrıca çalıştırılır (``uvicorn main:app``).
+"Önce"/"sonra" karşılaştırması için eski sürüm bir portta, yeni sürüm başka
+bir portta başlatılır ve ``--url`` birden fazla kez verilir::
+
+    git worktree add /tmp/eski <eski-commit>
+    (cd /tmp/eski/server && uvicorn main:app --port 8001) &
+    (cd server && uvicorn main:app --port 8002) &
+    python scripts/bench_license_server.py --url http://127.0.0.1:8001 \\
+        --url http://127.0.0.1:8002 --seed
+
+``--seed`` sunucunun ``DB_*`` ortam değişkenleriyle veritabanına bağlanıp
+ölçümde kullanılan lisans kaydını oluşturur.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+BENCH_LICENSE_KEY = "BENCH-0000-0000-0000"
+BENCH_MACHINE_ID = "bench-machine"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--url",
+        action="append",
+        required=True,
+        help="Sunucu adresi; karşılaştırma için birden fazla verilebilir",
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Uç başına istek sayısı")
+    parser.add_argument("--concurrency", type=int, default=32, help="Eşzamanlı istemci sayısı")
+    parser.add_argument("--machines", type=int, default=200, help="Heartbeat gönderen farklı makine sayısı")
+    parser.add_argument("--seed", action="store_true", help="Ölçüm lisansını veritabanına ekle")
+    return parser.parse_args()
+
+
+def seed_license() -> None:
+    import psycopg2
+
+    conn = psycopg2.connect(
+        host=os.environ.get("DB_HOST", "localhost"),
+        database=os.environ.get("DB_NAME", "takibiesasi_db"),
+        user=os.environ.get("DB_USER", "takibiesasi_user"),
+        password=os.environ.get("DB_PASSWORD", ""),
+    )
+    try:
+        with conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO licenses (license_key, machine_id, user_name, is_active, activated_at)
+                VALUES (%s, %s, 'bench', TRUE, CURRENT_TIMESTAMP)
+                ON CONFLICT (license_key) DO UPDATE
+                   SET machine_id = EXCLUDED.machine_id, is_active = TRUE
+                """,
+                (BENCH_LICENSE_KEY, BENCH_MACHINE_ID),
+            )
+    finally:
+        conn.close()
+
+
+class _Client(threading.local):
+    """İş parçacığı başına keep-alive HTTP bağlantısı."""
+
+    conn: http.client.HTTPConnection | None = None
+
+
+def run_load(base_url: str, path: str, payloads: list[dict], concurrency: int) -> dict:
+    parsed = urlparse(base_url)
+    local = _Client()
+
+    def send(payload: dict) -> tuple[float, int]:
+        body = json.dumps(payload)
+        started = time.perf_counter()
+        for attempt in range(2):
+            if local.conn is None:
+                local.conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+            try:
+                local.conn.request("POST", path, body, {"Content-Type": "application/json"})
+                response = local.conn.getresponse()
+                response.read()
+                return time.perf_counter() - started, response.status
+            except (http.client.HTTPException, OSError):
+                local.conn.close()
+                local.conn = None
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, payloads))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for latency, _ in results)
+    errors = sum(1 for _, status in results if status >= 500)
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "rps": len(results) / elapsed,
+        "errors": errors,
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    if args.seed:
+        seed_license()
+
+    verify_payloads = [
+        {"license_key": BENCH_LICENSE_KEY, "machine_id": BENCH_MACHINE_ID}
+    ] * args.requests
+    heartbeat_payloads = [
+        {"machine_id": f"bench-demo-{index % args.machines}", "usage_minutes": 1}
+        for index in range(args.requests)
+    ]
+
+    print(f"{args.requests} istek/uç, {args.concurrency} eşzamanlı istemci")
+    print(f"{'sunucu':<28} {'uç':<22} {'p50 ms':>9} {'p99 ms':>9} {'istek/sn':>10} {'5xx':>5}")
+    for base_url in args.url:
+        for path, payloads in (
+            ("/api/verify", verify_payloads),
+            ("/api/demo/heartbeat", heartbeat_payloads),
+        ):
+            stats = run_load(base_url, path, payloads, args.concurrency)
+            print(
+                f"{base_url:<28} {path:<22} {stats['p50']:9.2f} {stats['p99']:9.2f} "
+                f"{stats['rps']:10.1f} {stats['errors']:5d}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
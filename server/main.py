@@ -6,7 +6,8 @@ FastAPI backend for license management and admin panel
 
 from fastapi import FastAPI, HTTPException, Header, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import Optional, List
@@ -14,19 +15,33 @@ from datetime import datetime, timedelta
 import psycopg2
 import psycopg2.extras
 import secrets
+import base64
 import hashlib
+import csv
+import io
+import itertools
 import json
+import logging
 import os
 import jwt
 import bcrypt
 import re
 import uuid
 import smtplib
+import email.utils
+import mimetypes
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+import abc
 import threading
+import collections
+import queue
+import contextvars
+import time
+import anyio.to_thread
 
 app = FastAPI(title="TakibiEsasi API", version="1.0.0")
+logger = logging.getLogger("takibiesasi.server")
 
 # CORS
 app.add_middleware(
@@ -57,8 +72,9 @@ RELEASES_HISTORY_FILE = "/var/www/takibiesasi/releases/history.json"
 
 # Email Configuration
 EMAIL_CONFIG = {
-    "smtp_server": "smtp.gmail.com",
-    "smtp_port": 587,
+    "smtp_server": os.environ.get("SMTP_SERVER", "smtp.gmail.com"),
+    "smtp_port": int(os.environ.get("SMTP_PORT", "587")),
+    "starttls": os.environ.get("SMTP_STARTTLS", "1") != "0",
     "email": os.environ.get("SMTP_EMAIL", "destek@takibiesasi.com"),
     "password": os.environ.get("SMTP_PASSWORD", ""),
     "from_name": "TakibiEsasi"
@@ -70,8 +86,179 @@ os.makedirs(os.path.dirname(RELEASES_FILE), exist_ok=True)
 
 # ============ DATABASE ============
 
+# Aynı anda veritabanı kullanan istek sayısı. FastAPI'nin senkron handler
+# threadpool'u da bu sayıyla sınırlanır; havuz, handler içinden çağrılan
+# log_activity/log_email'in ikinci bağlantısı beklemesin diye iki katını tutar.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "16"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+# Bu süreden uzun boşta kalan bağlantı verilmeden önce SELECT 1 ile yoklanır
+DB_POOL_PING_AFTER = float(os.environ.get("DB_POOL_PING_AFTER", "30"))
+
+
+class PoolTimeout(Exception):
+    """No pooled connection became free within DB_POOL_TIMEOUT."""
+
+
+class PooledConnection:
+    """A psycopg2 connection leased from the pool.
+
+    Attribute access is forwarded to the real connection. ``close()`` rolls
+    back any open transaction and returns the connection to the pool.
+    """
+
+    __slots__ = ("_pool", "_conn")
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        conn = self._conn
+        if conn is None:
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return getattr(conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Bounded, blocking psycopg2 connection pool.
+
+    ``psycopg2.pool`` raises when exhausted; this one waits on a semaphore
+    instead. Connections are opened on demand and handed out LIFO so the
+    warm ones get reused.
+    """
+
+    def __init__(self, maxconn: int, timeout: float = DB_POOL_TIMEOUT):
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self._idle = []  # (bağlantı, son kullanım zamanı)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    def acquire(self) -> PooledConnection:
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout("Veritabanı bağlantı havuzu dolu")
+        try:
+            conn = self._take_idle()
+            if conn is None:
+                conn = psycopg2.connect(**DB_CONFIG)
+        except BaseException:
+            self._slots.release()
+            raise
+        leases = _request_leases.get()
+        lease = PooledConnection(self, conn)
+        if leases is not None:
+            leases.append(lease)
+        return lease
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                conn, last_used = self._idle.pop()
+            if conn.closed:
+                continue
+            if time.monotonic() - last_used < DB_POOL_PING_AFTER:
+                return conn
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+                return conn
+            except psycopg2.Error:
+                self._discard(conn)
+
+    def release(self, conn) -> None:
+        try:
+            if not conn.closed:
+                status = conn.get_transaction_status()
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    self._discard(conn)
+                    return
+                if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if conn.autocommit:
+                    conn.autocommit = False
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+        except psycopg2.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _discard(conn) -> None:
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def closeall(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+
+# İstek süresince alınan bağlantılar; handler HTTPException ile close()
+# çağırmadan çıkarsa istek sonunda havuza iade edilir.
+_request_leases: contextvars.ContextVar = contextvars.ContextVar(
+    "request_leases", default=None
+)
+
+db_pool = ConnectionPool(maxconn=DB_POOL_SIZE * 2)
+
+
 def get_db():
-    return psycopg2.connect(**DB_CONFIG)
+    """Lease a pooled connection; ``close()`` returns it to the pool."""
+    return db_pool.acquire()
+
+
+class ReleaseRequestConnections:
+    """Return connections a request leaked once its response (streaming included) is done."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        leases = []
+        token = _request_leases.set(leases)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_leases.reset(token)
+            leaked = [lease for lease in leases if lease._conn is not None]
+            if leaked:
+                await run_in_threadpool(lambda: [lease.close() for lease in leaked])
+
+
+app.add_middleware(ReleaseRequestConnections)
+
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    return JSONResponse(status_code=503, content={"detail": "Sunucu meşgul, lütfen tekrar deneyin"})
 
 def init_db():
     """Initialize database tables"""
@@ -239,7 +426,7 @@ def init_db():
             kvkk_accepted BOOLEAN DEFAULT FALSE,
             marketing_accepted BOOLEAN DEFAULT FALSE,
             last_login_at TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
@@ -325,7 +512,7 @@ def init_db():
             ip_address VARCHAR(50),
             user_agent TEXT,
             metadata JSONB,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
         )
     """)
 
@@ -355,7 +542,7 @@ def init_db():
             status VARCHAR(20) DEFAULT 'sent',
             error_message TEXT,
             metadata JSONB,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
         )
     """)
 
@@ -379,6 +566,77 @@ def init_db():
         except Exception as e:
             conn.rollback()  # Rollback failed transaction and continue
 
+    ensure_keyset_columns(conn)
+
+    # Admin istatistiklerinin aralık filtreleri ve "son kayıtlar" listeleri için
+    index_statements = [
+        "CREATE INDEX IF NOT EXISTS idx_licenses_activated ON licenses(activated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_licenses_created ON licenses(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_users_created_id ON users(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_created ON orders(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_completed_paid ON orders(paid_at) WHERE payment_status = 'completed'",
+        # Keyset sayfalama (created_at, id) ve tür/durum filtreleri için
+        "CREATE INDEX IF NOT EXISTS idx_activity_log_created_id ON activity_log(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_activity_log_type_created ON activity_log(activity_type, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_email_logs_created_id ON email_logs(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_email_logs_template_created ON email_logs(template_key, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_email_logs_status_created ON email_logs(status, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_demo_registrations_registered ON demo_registrations(registered_at)",
+    ]
+
+    for stmt in index_statements:
+        try:
+            cur.execute(stmt)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+
+    # Heartbeat partileri machine_id üzerinde ON CONFLICT kullanır. Eski
+    # kayıtlarda aynı makineye ait birden fazla satır varsa önce kullanım
+    # toplamları ve kullanıcı bağlantısı ilk satırda birleştirilir.
+    try:
+        cur.execute("SELECT to_regclass('idx_demo_sessions_machine_unique') IS NULL")
+        if cur.fetchone()[0]:
+            cur.execute("""
+                SELECT machine_id, MIN(id), ARRAY_AGG(id ORDER BY id)
+                  FROM demo_sessions GROUP BY machine_id HAVING COUNT(*) > 1
+            """)
+            duplicates = cur.fetchall()
+            cur.execute("""
+                UPDATE demo_sessions ds
+                   SET total_usage_minutes = dup.total_usage_minutes,
+                       launch_count = dup.launch_count,
+                       user_id = COALESCE(ds.user_id, dup.user_id)
+                  FROM (SELECT machine_id, MIN(id) AS keep_id,
+                               SUM(total_usage_minutes) AS total_usage_minutes,
+                               SUM(launch_count) AS launch_count,
+                               (ARRAY_AGG(user_id ORDER BY id DESC)
+                                    FILTER (WHERE user_id IS NOT NULL))[1] AS user_id
+                          FROM demo_sessions GROUP BY machine_id HAVING COUNT(*) > 1) dup
+                 WHERE ds.id = dup.keep_id
+            """)
+            cur.execute("""
+                DELETE FROM demo_sessions a USING demo_sessions b
+                 WHERE a.machine_id = b.machine_id AND a.id > b.id
+            """)
+            cur.execute(
+                "CREATE UNIQUE INDEX idx_demo_sessions_machine_unique ON demo_sessions(machine_id)"
+            )
+        else:
+            duplicates = []
+        conn.commit()
+        for machine_id, keep_id, ids in duplicates:
+            logger.warning(
+                "demo_sessions: merged duplicate rows %s of machine %s into row %s and deleted them",
+                ids[1:], machine_id, keep_id,
+            )
+    except Exception:
+        conn.rollback()
+        demo_heartbeats.use_upsert = False
+        logger.exception(
+            "demo_sessions(machine_id) unique index is missing; demo heartbeats are written row by row"
+        )
+
     # Create generate_order_number function
     try:
         cur.execute("""
@@ -402,8 +660,23 @@ def init_db():
 # Initialize on startup
 @app.on_event("startup")
 async def startup():
-    init_db()
-    init_default_email_templates()
+    anyio.to_thread.current_default_thread_limiter().total_tokens = DB_POOL_SIZE
+    await run_in_threadpool(init_db)
+    await run_in_threadpool(init_default_email_templates)
+    last_check_flusher.start()
+    demo_heartbeats.start()
+    email_log_writer.start()
+    email_dispatcher.start()
+    log_maintenance.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await run_in_threadpool(last_check_flusher.stop)
+    await run_in_threadpool(demo_heartbeats.stop)
+    await run_in_threadpool(email_dispatcher.stop)
+    await run_in_threadpool(email_log_writer.stop)
+    await run_in_threadpool(log_maintenance.stop, False)
+    db_pool.closeall()
 
 # ============ MODELS ============
 
@@ -687,94 +960,1256 @@ def verify_offline_token(token: str, machine_id: str) -> dict:
         return {"valid": False, "error": str(e), "license_key": None}
 
 
+# ============ LICENSE VERIFY CACHE ============
+
+# Lisans durumu bu süre boyunca bellekten okunur. Admin uçları (toggle,
+# transfer, reset) kendi işçisinde kaydı anında düşürür; birden fazla
+# uvicorn işçisi varsa diğerleri en geç bu süre sonunda güncellenir.
+LICENSE_CACHE_TTL = float(os.environ.get("LICENSE_CACHE_TTL", "30"))
+# last_check güncellemeleri bu aralıkla tek UPDATE olarak yazılır
+LAST_CHECK_FLUSH_INTERVAL = float(os.environ.get("LAST_CHECK_FLUSH_INTERVAL", "5"))
+# Bu süreden yeni verilmiş offline token yeniden imzalanmadan döndürülür
+OFFLINE_TOKEN_REFRESH_AFTER = timedelta(hours=int(os.environ.get("OFFLINE_TOKEN_REFRESH_HOURS", "24")))
+
+
+class LicenseStateCache:
+    """In-process TTL cache of the license fields /api/verify needs.
+
+    Also keeps the last offline token issued per (license, machine) so
+    repeated verifies return it until it is OFFLINE_TOKEN_REFRESH_AFTER old.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._states = {}  # license_key -> (son geçerlilik, durum)
+        self._tokens = {}  # (license_key, machine_id) -> (verilme zamanı, token)
+
+    def get(self, license_key: str):
+        with self._lock:
+            entry = self._states.get(license_key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def put(self, license_key: str, state: dict) -> None:
+        with self._lock:
+            self._states[license_key] = (time.monotonic() + self.ttl, state)
+
+    def invalidate(self, license_key: str) -> None:
+        with self._lock:
+            self._states.pop(license_key, None)
+            for key in [key for key in self._tokens if key[0] == license_key]:
+                del self._tokens[key]
+
+    def offline_token(self, license_key: str, machine_id: str) -> dict:
+        key = (license_key, machine_id)
+        now = datetime.utcnow()
+        with self._lock:
+            cached = self._tokens.get(key)
+        if cached is not None and now - cached[0] < OFFLINE_TOKEN_REFRESH_AFTER:
+            token_data = dict(cached[1])
+            expires_at = datetime.fromisoformat(token_data["expires_at"])
+            # Kalan gün yukarı yuvarlanır; yeni token 30 gün olarak bildirilir
+            token_data["days_valid"] = max(-((now - expires_at) // timedelta(days=1)), 0)
+            return token_data
+        token_data = generate_offline_token(license_key, machine_id)
+        with self._lock:
+            self._tokens[key] = (now, token_data)
+        return token_data
+
+
+class PeriodicFlusher(abc.ABC):
+    """Background thread that calls ``flush()`` every ``interval`` seconds.
+
+    ``stop()`` joins the thread and, unless told otherwise, flushes once
+    more so nothing buffered is lost on shutdown.
+    """
+
+    thread_name = "flusher"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    @abc.abstractmethod
+    def flush(self) -> int:
+        """Write out whatever is buffered; returns the number of items written."""
+
+
+class LastCheckFlusher(PeriodicFlusher):
+    """Collects license keys seen by /api/verify and stamps ``last_check`` in batches."""
+
+    thread_name = "last-check-flusher"
+
+    def __init__(self, interval: float):
+        super().__init__(interval)
+        self._pending = set()
+
+    def record(self, license_key: str) -> None:
+        with self._lock:
+            self._pending.add(license_key)
+
+    def flush(self) -> int:
+        with self._lock:
+            keys, self._pending = self._pending, set()
+        if not keys:
+            return 0
+        try:
+            conn = get_db()
+            try:
+                cur = conn.cursor()
+                cur.execute(
+                    "UPDATE licenses SET last_check = CURRENT_TIMESTAMP WHERE license_key = ANY(%s)",
+                    (sorted(keys),),
+                )
+                conn.commit()
+                cur.close()
+            finally:
+                conn.close()
+        except Exception as e:
+            # Bir sonraki turda tekrar denenir
+            with self._lock:
+                self._pending |= keys
+            print(f"last_check flush error: {e}")
+            return 0
+        return len(keys)
+
+
+license_cache = LicenseStateCache(LICENSE_CACHE_TTL)
+last_check_flusher = LastCheckFlusher(LAST_CHECK_FLUSH_INTERVAL)
+
+
+# ============ DEMO HEARTBEAT BUFFER ============
+
+# Heartbeat'ler makine başına bellekte toplanır ve bu aralıkla tek
+# INSERT ... ON CONFLICT partisi olarak yazılır
+DEMO_HEARTBEAT_FLUSH_INTERVAL = float(os.environ.get("DEMO_HEARTBEAT_FLUSH_INTERVAL", "5"))
+# Oturum durumu (status, demo_end_date) bu süre boyunca bellekten okunur
+DEMO_STATE_TTL = float(os.environ.get("DEMO_STATE_TTL", "300"))
+DEMO_LENGTH_DAYS = 14
+
+
+def _demo_days_remaining(demo_end_date) -> int:
+    return max(0, (demo_end_date - datetime.utcnow()).days) if demo_end_date else 0
+
+
+class DemoHeartbeatBuffer(PeriodicFlusher):
+    """Aggregates /api/demo/heartbeat calls per machine and upserts them in batches.
+
+    Responses are answered from a cached copy of each session's status and
+    end date; usage not yet written is overlaid by ``snapshot()`` so status
+    reads see the same totals the heartbeats reported.
+    """
+
+    thread_name = "demo-heartbeat-flusher"
+
+    def __init__(self, interval: float, state_ttl: float):
+        super().__init__(interval)
+        self.state_ttl = state_ttl
+        # init_db, machine_id üzerinde benzersiz indeks kuramazsa kapatır
+        self.use_upsert = True
+        self._flush_lock = threading.Lock()
+        self._states = {}     # machine_id -> (son geçerlilik, {"status", "demo_end_date"})
+        self._pending = {}    # machine_id -> birikmiş heartbeat
+        self._in_flight = {}  # yazılmakta olan parti; okumalar bunu da görür
+
+    def _load_state(self, machine_id: str):
+        with self._lock:
+            entry = self._states.get(machine_id)
+            # Yazılmamış heartbeat'i olan makinenin durumu süresi dolsa da tutulur
+            if entry is not None and (
+                entry[0] >= time.monotonic()
+                or machine_id in self._pending
+                or machine_id in self._in_flight
+            ):
+                return entry[1]
+
+        conn = get_db()
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT status, demo_end_date FROM demo_sessions WHERE machine_id = %s",
+                (machine_id,),
+            )
+            row = cur.fetchone()
+            cur.close()
+        finally:
+            conn.close()
+
+        with self._lock:
+            if row is None:
+                self._states.pop(machine_id, None)
+                return None
+            state = {"status": row[0], "demo_end_date": row[1]}
+            self._states[machine_id] = (time.monotonic() + self.state_ttl, state)
+            return state
+
+    def record(self, req: DemoHeartbeatRequest) -> dict:
+        state = self._load_state(req.machine_id)
+        with self._lock:
+            cached = self._states.get(req.machine_id)
+            if cached is not None:
+                state = cached[1]
+            started = state is None
+            if started:
+                state = {
+                    "status": "active",
+                    "demo_end_date": datetime.utcnow() + timedelta(days=DEMO_LENGTH_DAYS),
+                }
+                self._states[req.machine_id] = (time.monotonic() + self.state_ttl, state)
+
+            pending = self._pending.get(req.machine_id)
+            if pending is None:
+                pending = self._pending[req.machine_id] = {
+                    "usage_minutes": 0,
+                    "launch_count": 0,
+                    "machine_name": None,
+                    "os_info": None,
+                    "demo_end_date": state["demo_end_date"],
+                    "expire": False,
+                }
+            pending["usage_minutes"] += req.usage_minutes
+            pending["launch_count"] += 1
+            pending["machine_name"] = req.machine_name or pending["machine_name"]
+            pending["os_info"] = req.os_info or pending["os_info"]
+
+            if started:
+                return {"success": True, "status": "active", "days_remaining": DEMO_LENGTH_DAYS,
+                        "message": "Demo başlatıldı"}
+
+            days_remaining = _demo_days_remaining(state["demo_end_date"])
+            if days_remaining <= 0 and state["status"] == "active":
+                state["status"] = "expired"
+                pending["expire"] = True
+
+            return {"success": True, "status": state["status"], "days_remaining": days_remaining}
+
+    def snapshot(self, machine_id: str):
+        """Usage buffered for ``machine_id`` that is not yet in demo_sessions, or None."""
+        with self._lock:
+            entries = [
+                batch[machine_id] for batch in (self._in_flight, self._pending) if machine_id in batch
+            ]
+            if not entries:
+                return None
+            return {
+                "usage_minutes": sum(entry["usage_minutes"] for entry in entries),
+                "launch_count": sum(entry["launch_count"] for entry in entries),
+                "demo_end_date": entries[0]["demo_end_date"],
+                "expire": any(entry["expire"] for entry in entries),
+            }
+
+    def invalidate(self, machine_id: str) -> None:
+        with self._lock:
+            self._states.pop(machine_id, None)
+            for batch in (self._in_flight, self._pending):
+                if machine_id in batch:
+                    batch[machine_id]["expire"] = False
+
+    def _requeue(self, batch: dict) -> None:
+        for machine_id, entry in batch.items():
+            pending = self._pending.get(machine_id)
+            if pending is None:
+                self._pending[machine_id] = entry
+                continue
+            pending["usage_minutes"] += entry["usage_minutes"]
+            pending["launch_count"] += entry["launch_count"]
+            pending["machine_name"] = pending["machine_name"] or entry["machine_name"]
+            pending["os_info"] = pending["os_info"] or entry["os_info"]
+            pending["expire"] = pending["expire"] or entry["expire"]
+
+    @staticmethod
+    def _write_rows(cur, rows: list) -> None:
+        """Row-by-row fallback used when ``ON CONFLICT (machine_id)`` has no unique index."""
+        for machine_id, machine_name, os_info, demo_end_date, usage_minutes, launch_count, status in rows:
+            cur.execute("""
+                UPDATE demo_sessions
+                   SET last_heartbeat = CURRENT_TIMESTAMP,
+                       total_usage_minutes = total_usage_minutes + %s,
+                       launch_count = launch_count + %s,
+                       machine_name = COALESCE(%s, machine_name),
+                       os_info = COALESCE(%s, os_info),
+                       status = CASE WHEN %s = 'expired' AND status = 'active' THEN 'expired' ELSE status END
+                 WHERE machine_id = %s
+            """, (usage_minutes, launch_count, machine_name, os_info, status, machine_id))
+            if cur.rowcount == 0:
+                cur.execute("""
+                    INSERT INTO demo_sessions
+                        (machine_id, machine_name, os_info, demo_start_date, demo_end_date,
+                         last_heartbeat, total_usage_minutes, launch_count, status)
+                    VALUES (%s, %s, %s, CURRENT_TIMESTAMP, %s, CURRENT_TIMESTAMP, %s, %s, %s)
+                """, (machine_id, machine_name, os_info, demo_end_date, usage_minutes, launch_count, status))
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._in_flight = batch
+            if not batch:
+                return 0
+
+            rows = [
+                (machine_id, entry["machine_name"], entry["os_info"], entry["demo_end_date"],
+                 entry["usage_minutes"], entry["launch_count"],
+                 "expired" if entry["expire"] else "active")
+                for machine_id, entry in sorted(batch.items())
+            ]
+            try:
+                conn = get_db()
+                try:
+                    cur = conn.cursor()
+                    if self.use_upsert:
+                        # Yeni makine: ilk heartbeat dahil launch_count = heartbeat sayısı
+                        psycopg2.extras.execute_values(cur, """
+                            INSERT INTO demo_sessions AS ds
+                                (machine_id, machine_name, os_info, demo_start_date, demo_end_date,
+                                 last_heartbeat, total_usage_minutes, launch_count, status)
+                            VALUES %s
+                            ON CONFLICT (machine_id) DO UPDATE SET
+                                last_heartbeat = EXCLUDED.last_heartbeat,
+                                total_usage_minutes = ds.total_usage_minutes + EXCLUDED.total_usage_minutes,
+                                launch_count = ds.launch_count + EXCLUDED.launch_count,
+                                machine_name = COALESCE(EXCLUDED.machine_name, ds.machine_name),
+                                os_info = COALESCE(EXCLUDED.os_info, ds.os_info),
+                                status = CASE WHEN EXCLUDED.status = 'expired' AND ds.status = 'active'
+                                              THEN 'expired' ELSE ds.status END
+                        """, rows,
+                            template="(%s, %s, %s, CURRENT_TIMESTAMP, %s, CURRENT_TIMESTAMP, %s, %s, %s)",
+                            page_size=len(rows))
+                    else:
+                        self._write_rows(cur, rows)
+                    conn.commit()
+                    cur.close()
+                finally:
+                    conn.close()
+            except Exception as e:
+                # Bir sonraki turda tekrar denenir
+                with self._lock:
+                    self._in_flight = {}
+                    self._requeue(batch)
+                print(f"demo heartbeat flush error: {e}")
+                return 0
+
+            with self._lock:
+                self._in_flight = {}
+            return len(rows)
+
+
+demo_heartbeats = DemoHeartbeatBuffer(DEMO_HEARTBEAT_FLUSH_INTERVAL, DEMO_STATE_TTL)
+
+
+# ============ ADMIN STATS ============
+
+# Dashboard sayıları bu süre boyunca bellekten okunur; sipariş, lisans,
+# kullanıcı ve demo kaydı yazan uçlar ilgili grubu anında düşürür
+ADMIN_STATS_TTL = float(os.environ.get("ADMIN_STATS_TTL", "15"))
+
+
+def _license_stats(cur) -> dict:
+    cur.execute("""
+        SELECT COUNT(*) AS total_licenses,
+               COUNT(*) FILTER (WHERE is_active = TRUE AND machine_id IS NOT NULL) AS active_licenses,
+               COUNT(*) FILTER (WHERE source = 'purchase') AS purchased_licenses,
+               COUNT(*) FILTER (WHERE source = 'manual' OR source IS NULL) AS manual_licenses,
+               COUNT(*) FILTER (WHERE activated_at >= CURRENT_DATE
+                                  AND activated_at < CURRENT_DATE + INTERVAL '1 day') AS today_activations
+        FROM licenses
+    """)
+    return dict(cur.fetchone())
+
+
+def _user_stats(cur) -> dict:
+    cur.execute("""
+        SELECT COUNT(*) AS total_users,
+               COUNT(*) FILTER (WHERE email_verified = TRUE) AS verified_users,
+               COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE
+                                  AND created_at < CURRENT_DATE + INTERVAL '1 day') AS today_registrations,
+               COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '7 days') AS week_registrations
+        FROM users
+    """)
+    return dict(cur.fetchone())
+
+
+def _order_stats(cur) -> dict:
+    cur.execute("""
+        SELECT COUNT(*) AS total_orders,
+               COUNT(*) FILTER (WHERE payment_status = 'completed') AS completed_orders,
+               COUNT(*) FILTER (WHERE payment_status = 'pending') AS pending_orders,
+               COUNT(DISTINCT user_id) FILTER (WHERE payment_status = 'completed') AS users_with_orders,
+               COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE
+                                  AND created_at < CURRENT_DATE + INTERVAL '1 day') AS today_orders,
+               COALESCE(SUM(total_price_cents) FILTER (WHERE payment_status = 'completed'), 0) AS total_revenue_cents,
+               COALESCE(AVG(total_price_cents) FILTER (WHERE payment_status = 'completed'), 0) AS avg_order_cents,
+               COALESCE(SUM(total_price_cents) FILTER (
+                   WHERE payment_status = 'completed' AND paid_at >= DATE_TRUNC('month', CURRENT_DATE)
+               ), 0) AS month_revenue_cents,
+               COALESCE(SUM(total_price_cents) FILTER (
+                   WHERE payment_status = 'completed' AND paid_at >= CURRENT_DATE - INTERVAL '7 days'
+               ), 0) AS week_revenue_cents,
+               COALESCE(SUM(total_price_cents) FILTER (
+                   WHERE payment_status = 'completed' AND paid_at >= CURRENT_DATE
+                     AND paid_at < CURRENT_DATE + INTERVAL '1 day'
+               ), 0) AS today_revenue_cents
+        FROM orders
+    """)
+    stats = dict(cur.fetchone())
+
+    # Seriler yalnızca tamamlanmış siparişlerin kısmi indeksini okur
+    cur.execute("""
+        SELECT
+            TO_CHAR(DATE_TRUNC('month', paid_at), 'YYYY-MM') as month,
+            COALESCE(SUM(total_price_cents), 0) / 100 as revenue,
+            COUNT(*) as order_count
+        FROM orders
+        WHERE payment_status = 'completed'
+            AND paid_at >= CURRENT_DATE - INTERVAL '12 months'
+        GROUP BY DATE_TRUNC('month', paid_at)
+        ORDER BY month
+    """)
+    stats['monthly_revenue'] = [{"month": r['month'], "revenue": float(r['revenue']),
+                                  "orders": r['order_count']} for r in cur.fetchall()]
+
+    cur.execute("""
+        SELECT
+            TO_CHAR(DATE(paid_at), 'YYYY-MM-DD') as date,
+            COALESCE(SUM(total_price_cents), 0) / 100 as revenue,
+            COUNT(*) as order_count
+        FROM orders
+        WHERE payment_status = 'completed'
+            AND paid_at >= CURRENT_DATE - INTERVAL '30 days'
+        GROUP BY DATE(paid_at)
+        ORDER BY date
+    """)
+    stats['daily_revenue'] = [{"date": r['date'], "revenue": float(r['revenue']),
+                                "orders": r['order_count']} for r in cur.fetchall()]
+
+    cur.execute("""
+        SELECT
+            product_name,
+            COUNT(*) as count,
+            COALESCE(SUM(total_price_cents), 0) / 100 as total_revenue
+        FROM orders
+        WHERE payment_status = 'completed'
+        GROUP BY product_name
+        ORDER BY count DESC
+        LIMIT 10
+    """)
+    stats['top_products'] = [{"name": r['product_name'], "count": r['count'],
+                               "revenue": float(r['total_revenue'])} for r in cur.fetchall()]
+    return stats
+
+
+def _demo_registration_stats(cur) -> dict:
+    cur.execute("""
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE registered_at >= CURRENT_DATE
+                                  AND registered_at < CURRENT_DATE + INTERVAL '1 day') AS today,
+               COUNT(*) FILTER (WHERE registered_at >= CURRENT_DATE - INTERVAL '7 days') AS this_week,
+               COUNT(*) FILTER (WHERE converted_to_license = TRUE) AS converted
+        FROM demo_registrations
+    """)
+    return dict(cur.fetchone())
+
+
+def _activity_type_stats(cur) -> dict:
+    cur.execute("""
+        SELECT activity_type, COUNT(*) as count
+        FROM activity_log
+        GROUP BY activity_type
+        ORDER BY count DESC
+    """)
+    return {"activity_type_counts": {r['activity_type']: r['count'] for r in cur.fetchall()}}
+
+
+ADMIN_STAT_GROUPS = {
+    "licenses": _license_stats,
+    "users": _user_stats,
+    "orders": _order_stats,
+    "demo_registrations": _demo_registration_stats,
+    "activity_types": _activity_type_stats,
+}
+
+
+class AdminStatsCache:
+    """Short-lived cache of the admin dashboard aggregates, one entry per table group."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}  # grup -> (son geçerlilik, sayılar)
+
+    def get(self, conn, *groups: str) -> dict:
+        """Merged figures of ``groups``, querying only the groups that are stale."""
+        stats = {}
+        cur = None
+        try:
+            for group in groups:
+                with self._lock:
+                    entry = self._entries.get(group)
+                if entry is None or entry[0] < time.monotonic():
+                    if cur is None:
+                        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+                    entry = (time.monotonic() + self.ttl, ADMIN_STAT_GROUPS[group](cur))
+                    with self._lock:
+                        self._entries[group] = entry
+                stats.update(entry[1])
+        finally:
+            if cur is not None:
+                cur.close()
+        return stats
+
+    def invalidate(self, *groups: str) -> None:
+        with self._lock:
+            for group in groups:
+                self._entries.pop(group, None)
+
+
+admin_stats_cache = AdminStatsCache(ADMIN_STATS_TTL)
+
+
+# ============ ADMIN PAGINATION ============
+
+ADMIN_PAGE_LIMIT_MAX = 500
+# keyset_page ile sayfalanan tablolar; created_at init_db'de NOT NULL yapılır
+KEYSET_PAGED_TABLES = ("users", "activity_log", "email_logs")
+# NOT NULL geçişi uygulanamayan tablolar; keyset_page bunlarda NULL tarihleri ayrıca sayfalar
+_keyset_nullable_tables = set()
+
+
+def ensure_keyset_columns(conn) -> None:
+    """Make ``created_at`` NOT NULL on the keyset-paged tables.
+
+    A ``(created_at, id) < (...)`` comparison never matches NULL dates, so
+    such rows would silently drop out of every page. Missing dates are set
+    to the oldest date in the table, which lists them on the last pages.
+    Tables the migration fails on are logged and paged with the slower
+    NULL-aware ordering instead.
+    """
+    cur = conn.cursor()
+    try:
+        for table in KEYSET_PAGED_TABLES:
+            try:
+                cur.execute(
+                    """
+                    SELECT is_nullable = 'YES' FROM information_schema.columns
+                     WHERE table_schema = current_schema() AND table_name = %s
+                       AND column_name = 'created_at'
+                    """,
+                    (table,),
+                )
+                row = cur.fetchone()
+                if row and row[0]:
+                    cur.execute(f"""
+                        UPDATE {table}
+                           SET created_at = COALESCE((SELECT MIN(created_at) FROM {table}), CURRENT_TIMESTAMP)
+                         WHERE created_at IS NULL
+                    """)
+                    cur.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL")
+                conn.commit()
+                _keyset_nullable_tables.discard(table)
+            except Exception:
+                conn.rollback()
+                _keyset_nullable_tables.add(table)
+                logger.exception(
+                    "%s.created_at could not be made NOT NULL; its admin pages use NULLS LAST ordering", table
+                )
+    finally:
+        cur.close()
+
+
+def encode_page_cursor(created_at, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at is not None else None, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_page_cursor(token: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, row_id = json.loads(raw)
+        return (datetime.fromisoformat(created_at) if created_at is not None else None), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Geçersiz sayfa imleci")
+
+
+def parse_page_bound(name: str, value: str) -> datetime:
+    """Parse a ``since``/``until`` filter; malformed values are a 400, not a DataError."""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Geçersiz tarih: {name}")
+
+
+def keyset_page(cur, select_sql: str, alias: str, filters: dict = None, since: str = None,
+                until: str = None, cursor: str = None, limit: int = 50, table: str = None) -> tuple:
+    """Run ``select_sql`` newest first, one (created_at, id) keyset page at a time.
+
+    ``select_sql`` is a SELECT without WHERE/ORDER BY whose main table is
+    ``table``, aliased as ``alias``; ``filters`` are equality filters on
+    that table (None values are skipped). ``created_at`` is expected to be
+    NOT NULL (see ``ensure_keyset_columns``): a row-value comparison never
+    matches NULLs. If the migration did not apply to ``table``, rows are
+    ordered NULLS LAST and NULL dates are paged by id after the dated rows.
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last
+    page.
+    """
+    limit = max(1, min(limit, ADMIN_PAGE_LIMIT_MAX))
+    clauses, params = [], []
+    for column, value in (filters or {}).items():
+        if value is not None:
+            clauses.append(f"{alias}.{column} = %s")
+            params.append(value)
+    if since:
+        clauses.append(f"{alias}.created_at >= %s")
+        params.append(parse_page_bound("since", since))
+    if until:
+        clauses.append(f"{alias}.created_at < %s")
+        params.append(parse_page_bound("until", until))
+    nullable = table in _keyset_nullable_tables
+    if cursor:
+        created_at, row_id = decode_page_cursor(cursor)
+        if not nullable:
+            clauses.append(f"({alias}.created_at, {alias}.id) < (%s, %s)")
+            params.extend((created_at, row_id))
+        elif created_at is None:
+            # Tarihli kayıtlar bitti; NULL tarihliler id sırasıyla devam eder
+            clauses.append(f"{alias}.created_at IS NULL AND {alias}.id < %s")
+            params.append(row_id)
+        else:
+            clauses.append(
+                f"({alias}.created_at < %s OR ({alias}.created_at = %s AND {alias}.id < %s)"
+                f" OR {alias}.created_at IS NULL)"
+            )
+            params.extend((created_at, created_at, row_id))
+
+    where_sql = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    nulls_sql = " NULLS LAST" if nullable else ""
+    cur.execute(
+        f"{select_sql}{where_sql} ORDER BY {alias}.created_at DESC{nulls_sql}, {alias}.id DESC LIMIT %s",
+        params + [limit + 1],
+    )
+    rows = cur.fetchall()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_page_cursor(rows[-1]['created_at'], rows[-1]['id'])
+
+
+# ============ LOG RETENTION ============
+
+# 0 ise loglar süresiz saklanır
+LOG_RETENTION_DAYS = int(os.environ.get("LOG_RETENTION_DAYS", "0"))
+LOG_MAINTENANCE_INTERVAL = float(os.environ.get("LOG_MAINTENANCE_INTERVAL", "3600"))
+# Bölümlü tablolarda bu kadar ay ilerisi için bölüm hazır tutulur
+LOG_PARTITION_MONTHS_AHEAD = 2
+LOG_DELETE_BATCH = 10000
+LOG_TABLES = ("activity_log", "email_logs")
+
+
+def _add_months(month_start, months: int):
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return month_start.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+class LogMaintenance(PeriodicFlusher):
+    """Keeps the log tables bounded.
+
+    Tables converted by ``002_partition_log_tables.sql`` get monthly
+    partitions created ahead of time and expired months dropped; plain
+    tables have expired rows deleted in batches.
+    """
+
+    thread_name = "log-maintenance"
+
+    def flush(self) -> int:
+        removed = 0
+        for table in LOG_TABLES:
+            try:
+                removed += self._maintain(table)
+            except Exception as e:
+                print(f"{table} maintenance error: {e}")
+        return removed
+
+    def _maintain(self, table: str) -> int:
+        conn = get_db()
+        cur = conn.cursor()
+        try:
+            cur.execute("""
+                SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p
+                               JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s)
+            """, (table,))
+            if cur.fetchone()[0]:
+                removed = self._maintain_partitions(cur, table)
+            else:
+                removed = self._delete_expired(cur, table)
+            conn.commit()
+            return removed
+        finally:
+            cur.close()
+            conn.close()
+
+    def _maintain_partitions(self, cur, table: str) -> int:
+        this_month = datetime.utcnow().date().replace(day=1)
+        for offset in range(LOG_PARTITION_MONTHS_AHEAD + 1):
+            start = _add_months(this_month, offset)
+            cur.execute(
+                f"CREATE TABLE IF NOT EXISTS {table}_{start:%Y%m} PARTITION OF {table} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                (start, _add_months(start, 1)),
+            )
+        if LOG_RETENTION_DAYS <= 0:
+            return 0
+
+        cutoff = datetime.utcnow().date() - timedelta(days=LOG_RETENTION_DAYS)
+        cur.execute("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = %s
+        """, (table,))
+        dropped = 0
+        for (partition,) in cur.fetchall():
+            suffix = partition[len(table) + 1:]
+            if not (partition.startswith(f"{table}_") and suffix.isdigit() and len(suffix) == 6):
+                continue
+            month_start = datetime.strptime(suffix, "%Y%m").date()
+            # Bölümün tamamı saklama süresinin dışındaysa
+            if _add_months(month_start, 1) <= cutoff:
+                cur.execute(f"DROP TABLE {partition}")
+                dropped += 1
+        return dropped
+
+    def _delete_expired(self, cur, table: str) -> int:
+        if LOG_RETENTION_DAYS <= 0:
+            return 0
+        removed = 0
+        while True:
+            cur.execute(f"""
+                DELETE FROM {table} WHERE id IN (
+                    SELECT id FROM {table}
+                    WHERE created_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 day'
+                    LIMIT %s
+                )
+            """, (LOG_RETENTION_DAYS, LOG_DELETE_BATCH))
+            removed += cur.rowcount
+            cur.connection.commit()
+            if cur.rowcount < LOG_DELETE_BATCH:
+                return removed
+
+
+log_maintenance = LogMaintenance(LOG_MAINTENANCE_INTERVAL)
+
+
+# ============ RELEASES ============
+
+DEFAULT_RELEASE = {
+    "version": "1.0.0",
+    "download_url": "",
+    "release_notes": "İlk sürüm",
+    "is_critical": False,
+    "min_version": "1.0.0"
+}
+
+# Kurulum dosyaları için tarayıcı/proxy önbellek süresi (saniye)
+DOWNLOAD_CACHE_MAX_AGE = int(os.environ.get("DOWNLOAD_CACHE_MAX_AGE", "3600"))
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+
+def _write_json_atomic(path: str, data) -> None:
+    """Write ``data`` to a temp file and rename it over ``path``."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ReleaseManifest:
+    """latest.json and history.json parsed once and served from memory.
+
+    Each read only stats latest.json, so a publish from another worker
+    process is picked up on its next request; publishes in this process
+    replace the cached copy directly.
+    """
+
+    def __init__(self, latest_path: str, history_path: str):
+        self.latest_path = latest_path
+        self.history_path = history_path
+        self._lock = threading.Lock()
+        self._mtime_ns = None
+        self._current = None
+        self._history = None
+        self._etag = None
+        self._last_modified = None
+
+    def _refresh(self) -> None:
+        try:
+            mtime_ns = os.stat(self.latest_path).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        if self._current is not None and mtime_ns == self._mtime_ns:
+            return
+        try:
+            with open(self.latest_path, 'r') as f:
+                current = json.load(f)
+        except (OSError, ValueError):
+            current = dict(DEFAULT_RELEASE, release_date=datetime.now().strftime("%Y-%m-%d"))
+        try:
+            with open(self.history_path, 'r') as f:
+                history = json.load(f)
+        except (OSError, ValueError):
+            history = []
+        self._set(current, history, mtime_ns)
+
+    def _set(self, current: dict, history: list, mtime_ns: int) -> None:
+        body = json.dumps(current, sort_keys=True).encode()
+        self._current = current
+        self._history = history
+        self._mtime_ns = mtime_ns
+        self._etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        self._last_modified = email.utils.formatdate(mtime_ns / 1e9 if mtime_ns else time.time(), usegmt=True)
+
+    def current(self) -> dict:
+        """The current release; callers must not mutate it."""
+        with self._lock:
+            self._refresh()
+            return self._current
+
+    def history(self) -> list:
+        with self._lock:
+            self._refresh()
+            return list(self._history)
+
+    def validators(self) -> tuple:
+        """(current release, ETag, Last-Modified) taken together."""
+        with self._lock:
+            self._refresh()
+            return self._current, self._etag, self._last_modified
+
+    def publish(self, release_data: dict) -> None:
+        """Make ``release_data`` current and prepend it to the history."""
+        with self._lock:
+            self._refresh()
+            history = [release_data] + self._history
+            _write_json_atomic(self.history_path, history)
+            _write_json_atomic(self.latest_path, release_data)
+            self._set(release_data, history, os.stat(self.latest_path).st_mtime_ns)
+
+    def set_current(self, version: str) -> bool:
+        with self._lock:
+            self._refresh()
+            for release in self._history:
+                if release['version'] == version:
+                    _write_json_atomic(self.latest_path, release)
+                    self._set(release, self._history, os.stat(self.latest_path).st_mtime_ns)
+                    return True
+            return False
+
+
+class DownloadChecksums:
+    """SHA-256 of files in DOWNLOAD_DIR, keyed on size and mtime so replaced files rehash."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._digests = {}  # dosya yolu -> (boyut, mtime_ns, sha256)
+
+    def remember(self, path: str, sha256: str) -> None:
+        st = os.stat(path)
+        with self._lock:
+            self._digests[path] = (st.st_size, st.st_mtime_ns, sha256)
+
+    def get(self, path: str, st: os.stat_result = None) -> str:
+        st = st or os.stat(path)
+        with self._lock:
+            cached = self._digests.get(path)
+        if cached and cached[:2] == (st.st_size, st.st_mtime_ns):
+            return cached[2]
+        sha256 = _file_sha256(path)
+        with self._lock:
+            self._digests[path] = (st.st_size, st.st_mtime_ns, sha256)
+        return sha256
+
+
+release_manifest = ReleaseManifest(RELEASES_FILE, RELEASES_HISTORY_FILE)
+download_checksums = DownloadChecksums()
+
+
 def get_current_release():
     """Get current release info"""
-    try:
-        with open(RELEASES_FILE, 'r') as f:
-            return json.load(f)
-    except:
-        return {
-            "version": "1.0.0",
-            "download_url": "",
-            "release_notes": "İlk sürüm",
-            "release_date": datetime.now().strftime("%Y-%m-%d"),
-            "is_critical": False,
-            "min_version": "1.0.0"
-        }
+    return release_manifest.current()
 
 def get_releases_history():
     """Get all releases history"""
-    try:
-        with open(RELEASES_HISTORY_FILE, 'r') as f:
-            return json.load(f)
-    except:
-        return []
+    return release_manifest.history()
 
 def save_release(release_data):
     """Save release to latest.json and history"""
-    # Save as current
-    with open(RELEASES_FILE, 'w') as f:
-        json.dump(release_data, f, indent=2)
+    release_manifest.publish(release_data)
 
-    # Add to history
-    history = get_releases_history()
-    history.insert(0, release_data)
-    with open(RELEASES_HISTORY_FILE, 'w') as f:
-        json.dump(history, f, indent=2)
 
-# ============ EMAIL SYSTEM ============
+def _download_path(download_url: str) -> Optional[str]:
+    """Local path of a release download URL when the file lives in DOWNLOAD_DIR."""
+    filename = os.path.basename(download_url.split('?', 1)[0]) if download_url else ''
+    path = os.path.join(DOWNLOAD_DIR, filename)
+    return path if filename and os.path.isfile(path) else None
 
-def log_email(template_key: str, recipient: str, subject: str, status: str = "sent", error: str = None, metadata: dict = None):
-    """Log email to database"""
+
+def _not_modified(request: Request, etag: str, last_modified: str) -> bool:
+    """Whether the request's conditional headers match the given validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+            return email.utils.parsedate_to_datetime(last_modified) <= since
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _parse_byte_range(header: str, size: int) -> Optional[tuple]:
+    """(start, end) of a single ``bytes=`` range, or None when it cannot be satisfied.
+
+    Multi-range requests are answered with the first range only.
+    """
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or not ranges:
+        return None
+    first, _, last = ranges.split(",")[0].strip().partition("-")
     try:
-        conn = get_db()
-        cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO email_logs (template_key, recipient_email, subject, status, error_message, metadata)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (template_key, recipient, subject, status, error, json.dumps(metadata) if metadata else None))
-        conn.commit()
-        cur.close()
-        conn.close()
-    except Exception as e:
-        print(f"Email log error: {e}")
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            length = int(last)
+            if length <= 0:
+                return None
+            start, end = max(size - length, 0), size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        return None
+    return start, end
 
-def send_email_async(to_email: str, subject: str, html_content: str, template_key: str = None, metadata: dict = None):
-    """Send email asynchronously in background thread"""
-    def _send():
+
+def _iter_file_range(path: str, start: int, end: int):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+# ============ EMAIL SYSTEM ============
+
+# Giden e-postalar sınırlı bir kuyruktan sabit sayıda işçiyle gönderilir;
+# her işçi oturum açmış SMTP bağlantısını boşta kalana kadar yeniden kullanır
+EMAIL_WORKERS = int(os.environ.get("EMAIL_WORKERS", "2"))
+EMAIL_QUEUE_SIZE = int(os.environ.get("EMAIL_QUEUE_SIZE", "1000"))
+# Kuyruk doluysa gönderen bu kadar bekler, sonra e-posta 'failed' loglanır
+EMAIL_ENQUEUE_TIMEOUT = float(os.environ.get("EMAIL_ENQUEUE_TIMEOUT", "5"))
+EMAIL_MAX_ATTEMPTS = int(os.environ.get("EMAIL_MAX_ATTEMPTS", "3"))
+# Geçici hatalarda bekleme: backoff, 2*backoff, ...
+EMAIL_RETRY_BACKOFF = float(os.environ.get("EMAIL_RETRY_BACKOFF", "2"))
+EMAIL_SMTP_IDLE_TIMEOUT = float(os.environ.get("EMAIL_SMTP_IDLE_TIMEOUT", "60"))
+EMAIL_LOG_FLUSH_INTERVAL = float(os.environ.get("EMAIL_LOG_FLUSH_INTERVAL", "2"))
+
+
+class EmailLogWriter(PeriodicFlusher):
+    """Buffers email_logs rows and inserts them in one batch per interval."""
+
+    thread_name = "email-log-writer"
+
+    def __init__(self, interval: float):
+        super().__init__(interval)
+        self._pending = []
+
+    def record(self, template_key: str, recipient: str, subject: str, status: str = "sent",
+               error: str = None, metadata: dict = None) -> None:
+        row = (template_key, recipient, subject, status, error, json.dumps(metadata) if metadata else None)
+        with self._lock:
+            self._pending.append(row)
+
+    def flush(self) -> int:
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
         try:
-            success = send_email(to_email, subject, html_content)
-            log_email(template_key, to_email, subject, "sent" if success else "failed", None, metadata)
+            conn = get_db()
+            try:
+                cur = conn.cursor()
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO email_logs (template_key, recipient_email, subject, status, error_message, metadata)
+                    VALUES %s
+                """, rows)
+                conn.commit()
+                cur.close()
+            finally:
+                conn.close()
         except Exception as e:
-            log_email(template_key, to_email, subject, "failed", str(e), metadata)
-            print(f"Email sending failed: {e}")
+            # Bir sonraki turda tekrar denenir
+            with self._lock:
+                self._pending[:0] = rows
+            print(f"Email log error: {e}")
+            return 0
+        return len(rows)
 
-    thread = threading.Thread(target=_send)
-    thread.start()
 
-def send_email(to_email: str, subject: str, html_content: str, text_content: str = None):
-    """Send email via SMTP"""
+def _build_email_message(to_email: str, subject: str, html_content: str, text_content: str = None) -> str:
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = f"{EMAIL_CONFIG['from_name']} <{EMAIL_CONFIG['email']}>"
+    msg['To'] = to_email
+
+    # Plain text version
+    if text_content:
+        msg.attach(MIMEText(text_content, 'plain', 'utf-8'))
+
+    # HTML version
+    msg.attach(MIMEText(html_content, 'html', 'utf-8'))
+    return msg.as_string()
+
+
+def _open_smtp_session() -> smtplib.SMTP:
+    server = smtplib.SMTP(EMAIL_CONFIG['smtp_server'], EMAIL_CONFIG['smtp_port'], timeout=30)
+    try:
+        if EMAIL_CONFIG['starttls']:
+            server.starttls()
+        if EMAIL_CONFIG['password']:
+            server.login(EMAIL_CONFIG['email'], EMAIL_CONFIG['password'])
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def _close_smtp_session(server) -> None:
     try:
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = f"{EMAIL_CONFIG['from_name']} <{EMAIL_CONFIG['email']}>"
-        msg['To'] = to_email
-
-        # Plain text version
-        if text_content:
-            part1 = MIMEText(text_content, 'plain', 'utf-8')
-            msg.attach(part1)
-
-        # HTML version
-        part2 = MIMEText(html_content, 'html', 'utf-8')
-        msg.attach(part2)
-
-        # Connect and send
-        server = smtplib.SMTP(EMAIL_CONFIG['smtp_server'], EMAIL_CONFIG['smtp_port'])
-        server.starttls()
-        server.login(EMAIL_CONFIG['email'], EMAIL_CONFIG['password'])
-        server.sendmail(EMAIL_CONFIG['email'], to_email, msg.as_string())
         server.quit()
+    except Exception:
+        server.close()
+
+
+def _is_permanent_smtp_error(error: Exception) -> bool:
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class EmailDispatcher:
+    """Bounded outbound email queue served by a fixed pool of SMTP workers.
+
+    Workers keep their authenticated session open between messages, retry
+    transient failures with exponential backoff and hand results to an
+    :class:`EmailLogWriter`. ``metrics()`` feeds the admin email stats.
+    """
+
+    def __init__(self, log_writer: EmailLogWriter, workers: int = EMAIL_WORKERS,
+                 queue_size: int = EMAIL_QUEUE_SIZE, max_attempts: int = EMAIL_MAX_ATTEMPTS,
+                 backoff: float = EMAIL_RETRY_BACKOFF, idle_timeout: float = EMAIL_SMTP_IDLE_TIMEOUT):
+        self.log_writer = log_writer
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        self._started_at = None
+        self._counters = {"sent": 0, "failed": 0, "retried": 0, "dropped": 0, "sessions_opened": 0}
+        self._send_seconds = 0.0
+        self._recent = collections.deque()  # son 60 sn içindeki gönderim zamanları
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            self._started_at = time.monotonic()
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"email-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 30) -> None:
+        """Deliver what is already queued, then stop the workers."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        self._stop.set()
+
+    def submit(self, to_email: str, subject: str, html_content: str, template_key: str = None,
+               metadata: dict = None) -> bool:
+        self.start()
+        job = {"to": to_email, "subject": subject, "html": html_content,
+               "template_key": template_key, "metadata": metadata}
+        try:
+            self._queue.put(job, timeout=EMAIL_ENQUEUE_TIMEOUT)
+        except queue.Full:
+            self._count("dropped")
+            self.log_writer.record(template_key, to_email, subject, "failed", "E-posta kuyruğu dolu", metadata)
+            return False
+        return True
+
+    def _count(self, name: str, seconds: float = None) -> None:
+        with self._lock:
+            self._counters[name] += 1
+            if seconds is not None:
+                now = time.monotonic()
+                self._send_seconds += seconds
+                self._recent.append(now)
+                while self._recent and self._recent[0] < now - 60:
+                    self._recent.popleft()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            while self._recent and self._recent[0] < now - 60:
+                self._recent.popleft()
+            counters = dict(self._counters)
+            sent = counters["sent"]
+            return {
+                **counters,
+                "queued": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "workers": len(self._threads),
+                "sent_last_minute": len(self._recent),
+                "avg_send_ms": round(self._send_seconds / sent * 1000, 1) if sent else 0,
+                "uptime_seconds": round(now - self._started_at) if self._started_at else 0,
+            }
+
+    def _run(self) -> None:
+        session = None
+        last_used = 0.0
+        try:
+            while True:
+                try:
+                    job = self._queue.get(timeout=self.idle_timeout)
+                except queue.Empty:
+                    if session is not None:
+                        _close_smtp_session(session)
+                        session = None
+                    continue
+                if job is None:
+                    return
+                if session is not None and time.monotonic() - last_used >= self.idle_timeout:
+                    _close_smtp_session(session)
+                    session = None
+                session = self._deliver(session, job)
+                last_used = time.monotonic()
+        finally:
+            if session is not None:
+                _close_smtp_session(session)
+
+    def _deliver(self, session, job: dict):
+        message = _build_email_message(job["to"], job["subject"], job["html"])
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            started = time.monotonic()
+            try:
+                session = self._send(session, job["to"], message)
+            except Exception as e:
+                error = e
+                if session is not None:
+                    _close_smtp_session(session)
+                    session = None
+                if _is_permanent_smtp_error(e) or attempt == self.max_attempts:
+                    break
+                self._count("retried")
+                if self._stop.wait(self.backoff * 2 ** (attempt - 1)):
+                    break
+                continue
+            self._count("sent", time.monotonic() - started)
+            self.log_writer.record(job["template_key"], job["to"], job["subject"], "sent", None, job["metadata"])
+            return session
+
+        self._count("failed")
+        self.log_writer.record(job["template_key"], job["to"], job["subject"], "failed", str(error), job["metadata"])
+        print(f"Email sending failed: {error}")
+        return session
+
+    def _send(self, session, to_email: str, message: str):
+        # Sunucunun kapattığı boştaki oturum bir kez sessizce yenilenir
+        for reconnect in (False, True):
+            if session is None:
+                session = _open_smtp_session()
+                self._count("sessions_opened")
+            try:
+                session.sendmail(EMAIL_CONFIG['email'], to_email, message)
+                return session
+            except smtplib.SMTPServerDisconnected:
+                session.close()
+                session = None
+                if reconnect:
+                    raise
+        return session
+
+
+email_log_writer = EmailLogWriter(EMAIL_LOG_FLUSH_INTERVAL)
+email_dispatcher = EmailDispatcher(email_log_writer)
+
+
+def log_email(template_key: str, recipient: str, subject: str, status: str = "sent", error: str = None, metadata: dict = None):
+    """Queue an email_logs row for the next batch insert"""
+    email_log_writer.record(template_key, recipient, subject, status, error, metadata)
+
+def send_email_async(to_email: str, subject: str, html_content: str, template_key: str = None, metadata: dict = None):
+    """Queue email for the background SMTP workers"""
+    return email_dispatcher.submit(to_email, subject, html_content, template_key, metadata)
+
+def send_email(to_email: str, subject: str, html_content: str, text_content: str = None):
+    """Send email via SMTP on a one-off connection"""
+    try:
+        server = _open_smtp_session()
+        try:
+            server.sendmail(EMAIL_CONFIG['email'], to_email,
+                            _build_email_message(to_email, subject, html_content, text_content))
+        finally:
+            _close_smtp_session(server)
 
         print(f"Email sent to {to_email}: {subject}")
         return True
@@ -782,19 +2217,6 @@ def send_email(to_email: str, subject: str, html_content: str, text_content: str
         print(f"Email error: {e}")
         return False
 
-def get_db_template(template_key: str) -> dict:
-    """Get email template from database"""
-    try:
-        conn = get_db()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-        cur.execute("SELECT * FROM email_templates WHERE template_key = %s AND is_active = TRUE", (template_key,))
-        template = cur.fetchone()
-        cur.close()
-        conn.close()
-        return dict(template) if template else None
-    except:
-        return None
-
 def init_default_email_templates():
     """Initialize default email templates if not exist"""
     conn = get_db()
@@ -950,6 +2372,7 @@ def init_default_email_templates():
     conn.commit()
     cur.close()
     conn.close()
+    email_template_cache.invalidate()
 
 # Email Templates
 def get_email_template(content: str, title: str = "TakibiEsasi") -> str:
@@ -997,21 +2420,102 @@ def get_email_template(content: str, title: str = "TakibiEsasi") -> str:
     </html>
     """
 
-def render_template(template_key: str, variables: dict) -> tuple:
-    """Render email template with variables, returns (subject, html_content)"""
-    template = get_db_template(template_key)
-    if not template:
-        return None, None
+# Şablon içeriğini saran HTML'in öncesi ve sonrası bir kez hesaplanır
+_EMAIL_WRAPPER_PREFIX, _EMAIL_WRAPPER_SUFFIX = get_email_template("\0").split("\0")
+_PLACEHOLDER_RE = re.compile(r"\{\{([^{}]+)\}\}")
+EMAIL_TEMPLATE_CACHE_TTL = float(os.environ.get("EMAIL_TEMPLATE_CACHE_TTL", "300"))
+
+
+class CompiledEmailTemplate:
+    """Subject and wrapped body split once into literal text and ``{{name}}`` slots."""
+
+    __slots__ = ("updated_at", "_subject", "_html")
+
+    def __init__(self, subject: str, html_content: str, updated_at=None):
+        self.updated_at = updated_at
+        self._subject = _PLACEHOLDER_RE.split(subject)
+        html = _PLACEHOLDER_RE.split(html_content)
+        html[0] = _EMAIL_WRAPPER_PREFIX + html[0]
+        html[-1] = html[-1] + _EMAIL_WRAPPER_SUFFIX
+        self._html = html
+
+    @staticmethod
+    def _fill(parts: list, variables: dict) -> str:
+        # Tek indeksler değişken adları; verilmeyenler olduğu gibi kalır
+        filled = parts[:]
+        for index in range(1, len(parts), 2):
+            name = parts[index]
+            filled[index] = str(variables[name]) if name in variables else f"{{{{{name}}}}}"
+        return "".join(filled)
+
+    def render(self, variables: dict) -> tuple:
+        return self._fill(self._subject, variables), self._fill(self._html, variables)
+
+
+class EmailTemplateCache:
+    """Active email templates compiled in memory, refreshed every ``ttl`` seconds.
+
+    A refresh loads every template in one query and recompiles only the
+    ones whose ``updated_at`` changed; admin edits invalidate immediately.
+    """
 
-    subject = template['subject']
-    content = template['html_content']
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._templates = {}  # template_key -> CompiledEmailTemplate (yalnızca aktifler)
+        self._expires_at = 0.0
+
+    def get(self, template_key: str):
+        with self._lock:
+            if self._expires_at >= time.monotonic():
+                return self._templates.get(template_key)
+        self.refresh()
+        with self._lock:
+            return self._templates.get(template_key)
+
+    def refresh(self) -> None:
+        conn = get_db()
+        try:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            cur.execute("""
+                SELECT template_key, subject, html_content, updated_at
+                FROM email_templates WHERE is_active = TRUE
+            """)
+            rows = cur.fetchall()
+            cur.close()
+        finally:
+            conn.close()
+
+        with self._lock:
+            templates = {}
+            for row in rows:
+                cached = self._templates.get(row['template_key'])
+                if cached is not None and cached.updated_at is not None and cached.updated_at == row['updated_at']:
+                    templates[row['template_key']] = cached
+                else:
+                    templates[row['template_key']] = CompiledEmailTemplate(
+                        row['subject'], row['html_content'], row['updated_at'])
+            self._templates = templates
+            self._expires_at = time.monotonic() + self.ttl
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._expires_at = 0.0
+
+
+email_template_cache = EmailTemplateCache(EMAIL_TEMPLATE_CACHE_TTL)
 
-    # Replace variables
-    for key, value in variables.items():
-        subject = subject.replace(f"{{{{{key}}}}}", str(value))
-        content = content.replace(f"{{{{{key}}}}}", str(value))
 
-    return subject, get_email_template(content)
+def render_template(template_key: str, variables: dict) -> tuple:
+    """Render email template with variables, returns (subject, html_content)"""
+    try:
+        template = email_template_cache.get(template_key)
+    except Exception as e:
+        print(f"Email template error: {e}")
+        return None, None
+    if template is None:
+        return None, None
+    return template.render(variables)
 
 def send_welcome_email(email: str, full_name: str):
     """Send welcome email to new user"""
@@ -1129,11 +2633,11 @@ def generate_token() -> str:
 # ============ PUBLIC API ============
 
 @app.get("/")
-async def root():
+def root():
     return {"status": "ok", "service": "TakibiEsasi License API"}
 
 @app.post("/api/activate")
-async def activate_license(req: ActivateRequest):
+def activate_license(req: ActivateRequest):
     """Activate a license with machine ID"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -1166,6 +2670,8 @@ async def activate_license(req: ActivateRequest):
     conn.commit()
     cur.close()
     conn.close()
+    license_cache.invalidate(req.license_key)
+    admin_stats_cache.invalidate("licenses")
 
     # Log activity
     log_activity(
@@ -1184,7 +2690,7 @@ async def activate_license(req: ActivateRequest):
         )
 
     # Offline token oluştur (30 gün geçerli)
-    token_data = generate_offline_token(req.license_key, req.machine_id)
+    token_data = license_cache.offline_token(req.license_key, req.machine_id)
 
     return {
         "success": True,
@@ -1195,37 +2701,34 @@ async def activate_license(req: ActivateRequest):
     }
 
 @app.post("/api/verify")
-async def verify_license(req: VerifyRequest):
+def verify_license(req: VerifyRequest):
     """Verify an active license"""
-    conn = get_db()
-    cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-
-    cur.execute("SELECT * FROM licenses WHERE license_key = %s", (req.license_key,))
-    license = cur.fetchone()
-
-    if not license:
+    license = license_cache.get(req.license_key)
+    if license is None:
+        conn = get_db()
+        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        cur.execute(
+            "SELECT is_active, machine_id FROM licenses WHERE license_key = %s",
+            (req.license_key,),
+        )
+        license = cur.fetchone()
         cur.close()
         conn.close()
-        return {"valid": False, "error": "Geçersiz lisans"}
+        if not license:
+            return {"valid": False, "error": "Geçersiz lisans"}
+        license_cache.put(req.license_key, dict(license))
 
     if not license['is_active']:
-        cur.close()
-        conn.close()
         return {"valid": False, "error": "Lisans devre dışı"}
 
     if license['machine_id'] != req.machine_id:
-        cur.close()
-        conn.close()
         return {"valid": False, "error": "Makine ID eşleşmiyor"}
 
-    # Update last check
-    cur.execute("UPDATE licenses SET last_check = CURRENT_TIMESTAMP WHERE license_key = %s", (req.license_key,))
-    conn.commit()
-    cur.close()
-    conn.close()
+    # last_check arka planda toplu güncellenir
+    last_check_flusher.record(req.license_key)
 
-    # Yeni offline token oluştur (token yenileme - 30 gün daha)
-    token_data = generate_offline_token(req.license_key, req.machine_id)
+    # Offline token yenileme (30 gün); yeni verilmiş token tekrar imzalanmaz
+    token_data = license_cache.offline_token(req.license_key, req.machine_id)
 
     return {
         "valid": True,
@@ -1235,7 +2738,7 @@ async def verify_license(req: VerifyRequest):
     }
 
 @app.post("/api/transfer")
-async def transfer_license(req: TransferRequest):
+def transfer_license(req: TransferRequest):
     """Transfer license to a new machine"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -1274,11 +2777,12 @@ async def transfer_license(req: TransferRequest):
     remaining = 2 - (license['transfer_count'] + 1)
     cur.close()
     conn.close()
+    license_cache.invalidate(req.license_key)
 
     return {"success": True, "remaining_transfers": remaining}
 
 @app.post("/api/check-update")
-async def check_update(req: UpdateCheckRequest):
+def check_update(req: UpdateCheckRequest):
     """Check for updates"""
     release = get_current_release()
 
@@ -1307,18 +2811,69 @@ async def check_update(req: UpdateCheckRequest):
         "latest_version": release['version'],
         "download_url": release.get('download_url', ''),
         "release_notes": release.get('release_notes', ''),
-        "is_critical": release.get('is_critical', False)
+        "is_critical": release.get('is_critical', False),
+        "sha256": release.get('sha256'),
+        "size": release.get('size')
     }
 
 @app.get("/api/releases/latest")
-async def get_latest_release():
+def get_latest_release(request: Request):
     """Get latest release info (public)"""
-    return get_current_release()
+    release, etag, last_modified = release_manifest.validators()
+    headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": "no-cache"}
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(release, headers=headers)
+
+@app.api_route("/download/{filename}", methods=["GET", "HEAD"])
+def download_file(filename: str, request: Request):
+    """Serve an installer with ETag/Last-Modified validators and byte ranges for resuming"""
+    path = os.path.join(DOWNLOAD_DIR, filename)
+    if os.path.basename(filename) != filename or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Dosya bulunamadı")
+
+    st = os.stat(path)
+    sha256 = download_checksums.get(path, st)
+    etag = f'"{sha256}"'
+    last_modified = email.utils.formatdate(st.st_mtime, usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": f"public, max-age={DOWNLOAD_CACHE_MAX_AGE}",
+        "X-Checksum-SHA256": sha256,
+    }
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    start, end, status_code = 0, st.st_size - 1, 200
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # If-Range tutmuyorsa dosya değişmiştir; kısmi yerine tamamı gönderilir
+    if range_header and (if_range is None or if_range in (etag, last_modified)):
+        byte_range = _parse_byte_range(range_header, st.st_size)
+        if byte_range is None:
+            headers["Content-Range"] = f"bytes */{st.st_size}"
+            return Response(status_code=416, headers=headers)
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+    if request.method == "HEAD":
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        _iter_file_range(path, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
 
 # ============ ADMIN API ============
 
 @app.post("/api/admin/login")
-async def admin_login(req: AdminLoginRequest):
+def admin_login(req: AdminLoginRequest):
     """Admin login"""
     if req.username == ADMIN_USERNAME and req.password == ADMIN_PASSWORD:
         token = jwt.encode(
@@ -1330,25 +2885,14 @@ async def admin_login(req: AdminLoginRequest):
     return {"success": False, "error": "Geçersiz kullanıcı adı veya şifre"}
 
 @app.get("/api/admin/stats")
-async def admin_stats(authorization: str = Header(None)):
+def admin_stats(authorization: str = Header(None)):
     """Get dashboard statistics"""
     verify_admin_token(authorization)
 
     conn = get_db()
+    stats = admin_stats_cache.get(conn, "licenses")
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
-    # Total licenses
-    cur.execute("SELECT COUNT(*) as count FROM licenses")
-    total = cur.fetchone()['count']
-
-    # Active licenses
-    cur.execute("SELECT COUNT(*) as count FROM licenses WHERE is_active = TRUE AND machine_id IS NOT NULL")
-    active = cur.fetchone()['count']
-
-    # Today activations
-    cur.execute("SELECT COUNT(*) as count FROM licenses WHERE DATE(activated_at) = CURRENT_DATE")
-    today = cur.fetchone()['count']
-
     # Recent activations
     cur.execute("""
         SELECT license_key, machine_id, activated_at, is_active
@@ -1364,15 +2908,15 @@ async def admin_stats(authorization: str = Header(None)):
     release = get_current_release()
 
     return {
-        "total_licenses": total,
-        "active_licenses": active,
-        "today_activations": today,
+        "total_licenses": stats['total_licenses'],
+        "active_licenses": stats['active_licenses'],
+        "today_activations": stats['today_activations'],
         "current_version": release['version'],
         "recent_activations": recent
     }
 
 @app.get("/api/admin/licenses")
-async def admin_licenses(authorization: str = Header(None)):
+def admin_licenses(authorization: str = Header(None)):
     """Get all licenses"""
     verify_admin_token(authorization)
 
@@ -1389,25 +2933,27 @@ async def admin_licenses(authorization: str = Header(None)):
 
 
 @app.get("/api/admin/users")
-async def admin_list_users(authorization: str = Header(None)):
-    """List all users (admin only)"""
+def admin_list_users(limit: int = 100, role: str = None, cursor: str = None,
+                     authorization: str = Header(None)):
+    """List users, newest first; pass ``next_cursor`` back as ``cursor`` (admin only)"""
     verify_admin_token(authorization)
 
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
     try:
-        # Get users
-        cur.execute("""
-            SELECT id, email, full_name, phone, company_name,
-                   email_verified, role, created_at, last_login_at
-            FROM users
-            ORDER BY created_at DESC
-            LIMIT 100
-        """)
+        rows, next_cursor = keyset_page(
+            cur,
+            """
+            SELECT u.id, u.email, u.full_name, u.phone, u.company_name,
+                   u.email_verified, u.role, u.created_at, u.last_login_at
+            FROM users u
+            """,
+            "u", filters={"role": role}, cursor=cursor, limit=limit, table="users",
+        )
 
         users = []
-        for row in cur.fetchall():
+        for row in rows:
             users.append({
                 "id": row['id'],
                 "email": row['email'],
@@ -1420,27 +2966,17 @@ async def admin_list_users(authorization: str = Header(None)):
                 "last_login_at": row['last_login_at'].isoformat() if row['last_login_at'] else None
             })
 
-        # Get stats
-        cur.execute("SELECT COUNT(*) FROM users")
-        total = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM users WHERE email_verified = TRUE")
-        verified = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM users WHERE DATE(created_at) = CURRENT_DATE")
-        today = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(DISTINCT user_id) FROM orders WHERE payment_status = 'completed'")
-        with_orders = cur.fetchone()[0]
+        stats = admin_stats_cache.get(conn, "users", "orders")
 
         return {
             "success": True,
             "users": users,
+            "next_cursor": next_cursor,
             "stats": {
-                "total": total,
-                "verified": verified,
-                "today": today,
-                "with_orders": with_orders
+                "total": stats['total_users'],
+                "verified": stats['verified_users'],
+                "today": stats['today_registrations'],
+                "with_orders": stats['users_with_orders']
             }
         }
 
@@ -1450,7 +2986,7 @@ async def admin_list_users(authorization: str = Header(None)):
 
 
 @app.post("/api/admin/license/create")
-async def admin_create_license(req: CreateLicenseRequest, authorization: str = Header(None)):
+def admin_create_license(req: CreateLicenseRequest, authorization: str = Header(None)):
     """Create a new license"""
     verify_admin_token(authorization)
 
@@ -1467,6 +3003,7 @@ async def admin_create_license(req: CreateLicenseRequest, authorization: str = H
     conn.commit()
     cur.close()
     conn.close()
+    admin_stats_cache.invalidate("licenses")
 
     # Log admin license creation
     log_activity(
@@ -1479,7 +3016,7 @@ async def admin_create_license(req: CreateLicenseRequest, authorization: str = H
     return {"success": True, "license_key": license_key}
 
 @app.post("/api/admin/license/toggle")
-async def admin_toggle_license(req: LicenseActionRequest, authorization: str = Header(None)):
+def admin_toggle_license(req: LicenseActionRequest, authorization: str = Header(None)):
     """Toggle license active status"""
     verify_admin_token(authorization)
 
@@ -1496,6 +3033,8 @@ async def admin_toggle_license(req: LicenseActionRequest, authorization: str = H
     conn.commit()
     cur.close()
     conn.close()
+    license_cache.invalidate(req.license_key)
+    admin_stats_cache.invalidate("licenses")
 
     # Log toggle action
     log_activity(
@@ -1508,7 +3047,7 @@ async def admin_toggle_license(req: LicenseActionRequest, authorization: str = H
     return {"success": True}
 
 @app.post("/api/admin/license/reset-transfer")
-async def admin_reset_transfer(req: LicenseActionRequest, authorization: str = Header(None)):
+def admin_reset_transfer(req: LicenseActionRequest, authorization: str = Header(None)):
     """Reset transfer count"""
     verify_admin_token(authorization)
 
@@ -1520,11 +3059,13 @@ async def admin_reset_transfer(req: LicenseActionRequest, authorization: str = H
     conn.commit()
     cur.close()
     conn.close()
+    license_cache.invalidate(req.license_key)
+    admin_stats_cache.invalidate("licenses")
 
     return {"success": True}
 
 @app.post("/api/admin/license/set-transfer")
-async def admin_set_transfer(req: SetTransferRequest, authorization: str = Header(None)):
+def admin_set_transfer(req: SetTransferRequest, authorization: str = Header(None)):
     """Set transfer count to a specific value"""
     verify_admin_token(authorization)
 
@@ -1543,7 +3084,7 @@ async def admin_set_transfer(req: SetTransferRequest, authorization: str = Heade
     return {"success": True}
 
 @app.post("/api/admin/license/set-username")
-async def admin_set_username(req: SetUserNameRequest, authorization: str = Header(None)):
+def admin_set_username(req: SetUserNameRequest, authorization: str = Header(None)):
     """Set user name for a license"""
     verify_admin_token(authorization)
 
@@ -1559,7 +3100,7 @@ async def admin_set_username(req: SetUserNameRequest, authorization: str = Heade
     return {"success": True}
 
 @app.get("/api/admin/releases")
-async def admin_releases(authorization: str = Header(None)):
+def admin_releases(authorization: str = Header(None)):
     """Get all releases"""
     verify_admin_token(authorization)
 
@@ -1569,7 +3110,7 @@ async def admin_releases(authorization: str = Header(None)):
     }
 
 @app.post("/api/admin/release/publish")
-async def admin_publish_release(req: ReleaseRequest, authorization: str = Header(None)):
+def admin_publish_release(req: ReleaseRequest, authorization: str = Header(None)):
     """Publish a new release"""
     verify_admin_token(authorization)
 
@@ -1581,27 +3122,28 @@ async def admin_publish_release(req: ReleaseRequest, authorization: str = Header
         "is_critical": req.is_critical,
         "min_version": req.min_version or req.version
     }
+    # Sağlama toplamı yayında bir kez hesaplanır; istemci indirmeyi bununla doğrular
+    path = _download_path(req.download_url)
+    if path:
+        release_data["sha256"] = download_checksums.get(path)
+        release_data["size"] = os.path.getsize(path)
 
     save_release(release_data)
 
     return {"success": True}
 
 @app.post("/api/admin/release/set-current")
-async def admin_set_current_release(req: SetCurrentReleaseRequest, authorization: str = Header(None)):
+def admin_set_current_release(req: SetCurrentReleaseRequest, authorization: str = Header(None)):
     """Set a release as current"""
     verify_admin_token(authorization)
 
-    history = get_releases_history()
-    for release in history:
-        if release['version'] == req.version:
-            with open(RELEASES_FILE, 'w') as f:
-                json.dump(release, f, indent=2)
-            return {"success": True}
+    if release_manifest.set_current(req.version):
+        return {"success": True}
 
     return {"success": False, "error": "Sürüm bulunamadı"}
 
 @app.get("/api/admin/files")
-async def admin_files(authorization: str = Header(None)):
+def admin_files(authorization: str = Header(None)):
     """List uploaded files"""
     verify_admin_token(authorization)
 
@@ -1634,11 +3176,12 @@ async def admin_upload(file: UploadFile = File(...), authorization: str = Header
     with open(filepath, 'wb') as f:
         content = await file.read()
         f.write(content)
+    download_checksums.remember(filepath, hashlib.sha256(content).hexdigest())
 
     return {"success": True, "filename": file.filename}
 
 @app.post("/api/admin/file/delete")
-async def admin_delete_file(req: DeleteFileRequest, authorization: str = Header(None)):
+def admin_delete_file(req: DeleteFileRequest, authorization: str = Header(None)):
     """Delete a file"""
     verify_admin_token(authorization)
 
@@ -1653,7 +3196,7 @@ async def admin_delete_file(req: DeleteFileRequest, authorization: str = Header(
 # ============ SITE SETTINGS API ============
 
 @app.get("/api/site/settings")
-async def get_site_settings():
+def get_site_settings():
     """Get all site settings (public)"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -1669,7 +3212,7 @@ async def get_site_settings():
     return settings
 
 @app.post("/api/admin/settings/update")
-async def admin_update_setting(req: SiteSettingRequest, authorization: str = Header(None)):
+def admin_update_setting(req: SiteSettingRequest, authorization: str = Header(None)):
     """Update a site setting"""
     verify_admin_token(authorization)
 
@@ -1692,7 +3235,7 @@ async def admin_update_setting(req: SiteSettingRequest, authorization: str = Hea
 # ============ PRICING API ============
 
 @app.get("/api/site/pricing")
-async def get_pricing():
+def get_pricing():
     """Get active pricing plans (public)"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -1706,7 +3249,7 @@ async def get_pricing():
     return plans
 
 @app.get("/api/admin/pricing")
-async def admin_get_pricing(authorization: str = Header(None)):
+def admin_get_pricing(authorization: str = Header(None)):
     """Get all pricing plans"""
     verify_admin_token(authorization)
 
@@ -1722,7 +3265,7 @@ async def admin_get_pricing(authorization: str = Header(None)):
     return plans
 
 @app.post("/api/admin/pricing/create")
-async def admin_create_pricing(req: PricingPlanRequest, authorization: str = Header(None)):
+def admin_create_pricing(req: PricingPlanRequest, authorization: str = Header(None)):
     """Create a pricing plan"""
     verify_admin_token(authorization)
 
@@ -1741,7 +3284,7 @@ async def admin_create_pricing(req: PricingPlanRequest, authorization: str = Hea
     return {"success": True}
 
 @app.post("/api/admin/pricing/update/{plan_id}")
-async def admin_update_pricing(plan_id: int, req: PricingPlanRequest, authorization: str = Header(None)):
+def admin_update_pricing(plan_id: int, req: PricingPlanRequest, authorization: str = Header(None)):
     """Update a pricing plan"""
     verify_admin_token(authorization)
 
@@ -1761,7 +3304,7 @@ async def admin_update_pricing(plan_id: int, req: PricingPlanRequest, authorizat
     return {"success": True}
 
 @app.delete("/api/admin/pricing/{plan_id}")
-async def admin_delete_pricing(plan_id: int, authorization: str = Header(None)):
+def admin_delete_pricing(plan_id: int, authorization: str = Header(None)):
     """Delete a pricing plan"""
     verify_admin_token(authorization)
 
@@ -1779,7 +3322,7 @@ async def admin_delete_pricing(plan_id: int, authorization: str = Header(None)):
 # ============ TESTIMONIALS API ============
 
 @app.get("/api/site/testimonials")
-async def get_testimonials():
+def get_testimonials():
     """Get active testimonials (public)"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -1793,7 +3336,7 @@ async def get_testimonials():
     return testimonials
 
 @app.get("/api/admin/testimonials")
-async def admin_get_testimonials(authorization: str = Header(None)):
+def admin_get_testimonials(authorization: str = Header(None)):
     """Get all testimonials"""
     verify_admin_token(authorization)
 
@@ -1809,7 +3352,7 @@ async def admin_get_testimonials(authorization: str = Header(None)):
     return testimonials
 
 @app.post("/api/admin/testimonials/create")
-async def admin_create_testimonial(req: TestimonialRequest, authorization: str = Header(None)):
+def admin_create_testimonial(req: TestimonialRequest, authorization: str = Header(None)):
     """Create a testimonial"""
     verify_admin_token(authorization)
 
@@ -1828,7 +3371,7 @@ async def admin_create_testimonial(req: TestimonialRequest, authorization: str =
     return {"success": True}
 
 @app.delete("/api/admin/testimonials/{testimonial_id}")
-async def admin_delete_testimonial(testimonial_id: int, authorization: str = Header(None)):
+def admin_delete_testimonial(testimonial_id: int, authorization: str = Header(None)):
     """Delete a testimonial"""
     verify_admin_token(authorization)
 
@@ -1846,7 +3389,7 @@ async def admin_delete_testimonial(testimonial_id: int, authorization: str = Hea
 # ============ FAQ API ============
 
 @app.get("/api/site/faq")
-async def get_faq():
+def get_faq():
     """Get active FAQ items (public)"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -1860,7 +3403,7 @@ async def get_faq():
     return items
 
 @app.get("/api/admin/faq")
-async def admin_get_faq(authorization: str = Header(None)):
+def admin_get_faq(authorization: str = Header(None)):
     """Get all FAQ items"""
     verify_admin_token(authorization)
 
@@ -1876,7 +3419,7 @@ async def admin_get_faq(authorization: str = Header(None)):
     return items
 
 @app.post("/api/admin/faq/create")
-async def admin_create_faq(req: FAQRequest, authorization: str = Header(None)):
+def admin_create_faq(req: FAQRequest, authorization: str = Header(None)):
     """Create a FAQ item"""
     verify_admin_token(authorization)
 
@@ -1895,7 +3438,7 @@ async def admin_create_faq(req: FAQRequest, authorization: str = Header(None)):
     return {"success": True}
 
 @app.delete("/api/admin/faq/{faq_id}")
-async def admin_delete_faq(faq_id: int, authorization: str = Header(None)):
+def admin_delete_faq(faq_id: int, authorization: str = Header(None)):
     """Delete a FAQ item"""
     verify_admin_token(authorization)
 
@@ -1913,7 +3456,7 @@ async def admin_delete_faq(faq_id: int, authorization: str = Header(None)):
 # ============ ANNOUNCEMENTS API ============
 
 @app.get("/api/site/announcements")
-async def get_announcements():
+def get_announcements():
     """Get active announcements (public)"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -1927,7 +3470,7 @@ async def get_announcements():
     return items
 
 @app.get("/api/admin/announcements")
-async def admin_get_announcements(authorization: str = Header(None)):
+def admin_get_announcements(authorization: str = Header(None)):
     """Get all announcements"""
     verify_admin_token(authorization)
 
@@ -1943,7 +3486,7 @@ async def admin_get_announcements(authorization: str = Header(None)):
     return items
 
 @app.post("/api/admin/announcements/create")
-async def admin_create_announcement(req: AnnouncementRequest, authorization: str = Header(None)):
+def admin_create_announcement(req: AnnouncementRequest, authorization: str = Header(None)):
     """Create an announcement"""
     verify_admin_token(authorization)
 
@@ -1962,7 +3505,7 @@ async def admin_create_announcement(req: AnnouncementRequest, authorization: str
     return {"success": True}
 
 @app.delete("/api/admin/announcements/{announcement_id}")
-async def admin_delete_announcement(announcement_id: int, authorization: str = Header(None)):
+def admin_delete_announcement(announcement_id: int, authorization: str = Header(None)):
     """Delete an announcement"""
     verify_admin_token(authorization)
 
@@ -1980,7 +3523,7 @@ async def admin_delete_announcement(announcement_id: int, authorization: str = H
 # ============ CONTACT MESSAGES API ============
 
 @app.post("/api/contact")
-async def submit_contact(req: ContactMessageRequest):
+def submit_contact(req: ContactMessageRequest):
     """Submit a contact message (public)"""
     conn = get_db()
     cur = conn.cursor()
@@ -2002,7 +3545,7 @@ class NotifyRequest(BaseModel):
 
 
 @app.post("/api/notify/buro")
-async def notify_buro(req: NotifyRequest):
+def notify_buro(req: NotifyRequest):
     """Subscribe to Büro Yönetim Sistemi notification list"""
     conn = get_db()
     cur = conn.cursor()
@@ -2035,7 +3578,7 @@ async def notify_buro(req: NotifyRequest):
 
 
 @app.get("/api/admin/messages")
-async def admin_get_messages(authorization: str = Header(None)):
+def admin_get_messages(authorization: str = Header(None)):
     """Get all contact messages"""
     verify_admin_token(authorization)
 
@@ -2051,7 +3594,7 @@ async def admin_get_messages(authorization: str = Header(None)):
     return messages
 
 @app.post("/api/admin/messages/read")
-async def admin_mark_message_read(message_id: int, authorization: str = Header(None)):
+def admin_mark_message_read(message_id: int, authorization: str = Header(None)):
     """Mark a message as read"""
     verify_admin_token(authorization)
 
@@ -2067,7 +3610,7 @@ async def admin_mark_message_read(message_id: int, authorization: str = Header(N
     return {"success": True}
 
 @app.delete("/api/admin/messages/{message_id}")
-async def admin_delete_message(message_id: int, authorization: str = Header(None)):
+def admin_delete_message(message_id: int, authorization: str = Header(None)):
     """Delete a message"""
     verify_admin_token(authorization)
 
@@ -2085,7 +3628,7 @@ async def admin_delete_message(message_id: int, authorization: str = Header(None
 # ============ FEATURES API ============
 
 @app.get("/api/site/features")
-async def get_features():
+def get_features():
     """Get active features (public)"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -2099,7 +3642,7 @@ async def get_features():
     return items
 
 @app.get("/api/admin/features")
-async def admin_get_features(authorization: str = Header(None)):
+def admin_get_features(authorization: str = Header(None)):
     """Get all features"""
     verify_admin_token(authorization)
 
@@ -2115,7 +3658,7 @@ async def admin_get_features(authorization: str = Header(None)):
     return items
 
 @app.post("/api/admin/features/create")
-async def admin_create_feature(req: FeatureRequest, authorization: str = Header(None)):
+def admin_create_feature(req: FeatureRequest, authorization: str = Header(None)):
     """Create a feature"""
     verify_admin_token(authorization)
 
@@ -2134,7 +3677,7 @@ async def admin_create_feature(req: FeatureRequest, authorization: str = Header(
     return {"success": True}
 
 @app.post("/api/admin/features/update/{feature_id}")
-async def admin_update_feature(feature_id: int, req: FeatureRequest, authorization: str = Header(None)):
+def admin_update_feature(feature_id: int, req: FeatureRequest, authorization: str = Header(None)):
     """Update a feature"""
     verify_admin_token(authorization)
 
@@ -2154,7 +3697,7 @@ async def admin_update_feature(feature_id: int, req: FeatureRequest, authorizati
     return {"success": True}
 
 @app.delete("/api/admin/features/{feature_id}")
-async def admin_delete_feature(feature_id: int, authorization: str = Header(None)):
+def admin_delete_feature(feature_id: int, authorization: str = Header(None)):
     """Delete a feature"""
     verify_admin_token(authorization)
 
@@ -2172,7 +3715,7 @@ async def admin_delete_feature(feature_id: int, authorization: str = Header(None
 # ============ SCREENSHOTS API ============
 
 @app.get("/api/site/screenshots")
-async def get_screenshots():
+def get_screenshots():
     """Get active screenshots (public)"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -2186,7 +3729,7 @@ async def get_screenshots():
     return items
 
 @app.get("/api/admin/screenshots")
-async def admin_get_screenshots(authorization: str = Header(None)):
+def admin_get_screenshots(authorization: str = Header(None)):
     """Get all screenshots"""
     verify_admin_token(authorization)
 
@@ -2202,7 +3745,7 @@ async def admin_get_screenshots(authorization: str = Header(None)):
     return items
 
 @app.post("/api/admin/screenshots/create")
-async def admin_create_screenshot(req: ScreenshotRequest, authorization: str = Header(None)):
+def admin_create_screenshot(req: ScreenshotRequest, authorization: str = Header(None)):
     """Create a screenshot"""
     verify_admin_token(authorization)
 
@@ -2221,7 +3764,7 @@ async def admin_create_screenshot(req: ScreenshotRequest, authorization: str = H
     return {"success": True}
 
 @app.post("/api/admin/screenshots/update/{screenshot_id}")
-async def admin_update_screenshot(screenshot_id: int, req: ScreenshotRequest, authorization: str = Header(None)):
+def admin_update_screenshot(screenshot_id: int, req: ScreenshotRequest, authorization: str = Header(None)):
     """Update a screenshot"""
     verify_admin_token(authorization)
 
@@ -2241,7 +3784,7 @@ async def admin_update_screenshot(screenshot_id: int, req: ScreenshotRequest, au
     return {"success": True}
 
 @app.delete("/api/admin/screenshots/{screenshot_id}")
-async def admin_delete_screenshot(screenshot_id: int, authorization: str = Header(None)):
+def admin_delete_screenshot(screenshot_id: int, authorization: str = Header(None)):
     """Delete a screenshot"""
     verify_admin_token(authorization)
 
@@ -2259,7 +3802,7 @@ async def admin_delete_screenshot(screenshot_id: int, authorization: str = Heade
 # ============ BULK SETTINGS API ============
 
 @app.post("/api/admin/settings/bulk")
-async def admin_bulk_settings(req: BulkSettingsRequest, authorization: str = Header(None)):
+def admin_bulk_settings(req: BulkSettingsRequest, authorization: str = Header(None)):
     """Update multiple settings at once"""
     verify_admin_token(authorization)
 
@@ -2281,7 +3824,7 @@ async def admin_bulk_settings(req: BulkSettingsRequest, authorization: str = Hea
     return {"success": True}
 
 @app.get("/api/admin/settings")
-async def admin_get_settings(authorization: str = Header(None)):
+def admin_get_settings(authorization: str = Header(None)):
     """Get all site settings (admin)"""
     verify_admin_token(authorization)
 
@@ -2304,7 +3847,7 @@ MEDIA_DIR = "/var/www/takibiesasi/media"
 os.makedirs(MEDIA_DIR, exist_ok=True)
 
 @app.get("/api/admin/media")
-async def admin_get_media(authorization: str = Header(None)):
+def admin_get_media(authorization: str = Header(None)):
     """Get all uploaded media"""
     verify_admin_token(authorization)
 
@@ -2340,19 +3883,23 @@ async def admin_upload_media(file: UploadFile = File(...), authorization: str =
         f.write(content)
 
     # Save to database
-    conn = get_db()
-    cur = conn.cursor()
+    def _insert_media():
+        conn = get_db()
+        cur = conn.cursor()
 
-    cur.execute("""
-        INSERT INTO media (filename, original_name, file_path, file_size, mime_type)
-        VALUES (%s, %s, %s, %s, %s)
-        RETURNING id
-    """, (unique_name, file.filename, filepath, len(content), file.content_type))
+        cur.execute("""
+            INSERT INTO media (filename, original_name, file_path, file_size, mime_type)
+            VALUES (%s, %s, %s, %s, %s)
+            RETURNING id
+        """, (unique_name, file.filename, filepath, len(content), file.content_type))
 
-    media_id = cur.fetchone()[0]
-    conn.commit()
-    cur.close()
-    conn.close()
+        media_id = cur.fetchone()[0]
+        conn.commit()
+        cur.close()
+        conn.close()
+        return media_id
+
+    media_id = await run_in_threadpool(_insert_media)
 
     return {
         "success": True,
@@ -2362,7 +3909,7 @@ async def admin_upload_media(file: UploadFile = File(...), authorization: str =
     }
 
 @app.delete("/api/admin/media/{media_id}")
-async def admin_delete_media(media_id: int, authorization: str = Header(None)):
+def admin_delete_media(media_id: int, authorization: str = Header(None)):
     """Delete a media file"""
     verify_admin_token(authorization)
 
@@ -2390,7 +3937,7 @@ async def admin_delete_media(media_id: int, authorization: str = Header(None)):
 # ============ ADMIN PANEL ============
 
 @app.get("/admin", response_class=HTMLResponse)
-async def admin_panel():
+def admin_panel():
     """Serve admin panel"""
     html_path = "/var/www/takibiesasi/admin.html"
     if os.path.exists(html_path):
@@ -2399,7 +3946,7 @@ async def admin_panel():
     return "<h1>Admin panel not found</h1>"
 
 @app.get("/favicon.svg")
-async def favicon():
+def favicon():
     """Serve favicon"""
     favicon_path = "/var/www/takibiesasi/favicon.svg"
     if os.path.exists(favicon_path):
@@ -2407,7 +3954,7 @@ async def favicon():
     raise HTTPException(status_code=404, detail="Favicon not found")
 
 @app.get("/favicon.ico")
-async def favicon_ico():
+def favicon_ico():
     """Serve favicon.ico (redirect to svg)"""
     favicon_path = "/var/www/takibiesasi/favicon.svg"
     if os.path.exists(favicon_path):
@@ -2417,7 +3964,7 @@ async def favicon_ico():
 # ============ PUBLIC PAGES ============
 
 @app.get("/demo", response_class=HTMLResponse)
-async def demo_page():
+def demo_page():
     """Serve demo registration page"""
     html_path = "/var/www/takibiesasi/demo.html"
     if os.path.exists(html_path):
@@ -2426,7 +3973,7 @@ async def demo_page():
     return "<h1>Demo page not found</h1>"
 
 @app.get("/gizlilik", response_class=HTMLResponse)
-async def privacy_page():
+def privacy_page():
     """Serve privacy policy page"""
     html_path = "/var/www/takibiesasi/gizlilik.html"
     if os.path.exists(html_path):
@@ -2435,7 +3982,7 @@ async def privacy_page():
     return "<h1>Privacy page not found</h1>"
 
 @app.get("/kvkk", response_class=HTMLResponse)
-async def kvkk_page():
+def kvkk_page():
     """Serve KVKK (Turkish data protection) page"""
     html_path = "/var/www/takibiesasi/kvkk.html"
     if os.path.exists(html_path):
@@ -2444,7 +3991,7 @@ async def kvkk_page():
     return "<h1>KVKK page not found</h1>"
 
 @app.get("/kullanim-sartlari", response_class=HTMLResponse)
-async def terms_page():
+def terms_page():
     """Serve terms of use page"""
     html_path = "/var/www/takibiesasi/kullanim-sartlari.html"
     if os.path.exists(html_path):
@@ -2453,7 +4000,7 @@ async def terms_page():
     return "<h1>Terms page not found</h1>"
 
 @app.get("/indir", response_class=HTMLResponse)
-async def download_page():
+def download_page():
     """Serve download page"""
     html_path = "/var/www/takibiesasi/download.html"
     if os.path.exists(html_path):
@@ -2462,7 +4009,7 @@ async def download_page():
     return "<h1>Download page not found</h1>"
 
 @app.get("/yardim", response_class=HTMLResponse)
-async def help_page():
+def help_page():
     """Serve help center page"""
     html_path = "/var/www/takibiesasi/yardim.html"
     if os.path.exists(html_path):
@@ -2471,7 +4018,7 @@ async def help_page():
     return "<h1>Help page not found</h1>"
 
 @app.get("/changelog", response_class=HTMLResponse)
-async def changelog_page():
+def changelog_page():
     """Serve changelog page"""
     html_path = "/var/www/takibiesasi/changelog.html"
     if os.path.exists(html_path):
@@ -2482,7 +4029,7 @@ async def changelog_page():
 # ============ USER AUTH PAGES ============
 
 @app.get("/giris", response_class=HTMLResponse)
-async def login_page():
+def login_page():
     """Serve user login page"""
     html_path = "/var/www/takibiesasi/giris.html"
     if os.path.exists(html_path):
@@ -2491,7 +4038,7 @@ async def login_page():
     return "<h1>Login page not found</h1>"
 
 @app.get("/kayit", response_class=HTMLResponse)
-async def register_page():
+def register_page():
     """Serve user registration page"""
     html_path = "/var/www/takibiesasi/kayit.html"
     if os.path.exists(html_path):
@@ -2500,7 +4047,7 @@ async def register_page():
     return "<h1>Registration page not found</h1>"
 
 @app.get("/hesabim", response_class=HTMLResponse)
-async def account_page():
+def account_page():
     """Serve user account/dashboard page"""
     html_path = "/var/www/takibiesasi/hesabim.html"
     if os.path.exists(html_path):
@@ -2509,7 +4056,7 @@ async def account_page():
     return "<h1>Account page not found</h1>"
 
 @app.get("/satin-al", response_class=HTMLResponse)
-async def purchase_page():
+def purchase_page():
     """Serve purchase/pricing page"""
     html_path = "/var/www/takibiesasi/satin-al.html"
     if os.path.exists(html_path):
@@ -2518,7 +4065,7 @@ async def purchase_page():
     return "<h1>Purchase page not found</h1>"
 
 @app.get("/sifremi-unuttum", response_class=HTMLResponse)
-async def forgot_password_page():
+def forgot_password_page():
     """Serve forgot password page"""
     html_path = "/var/www/takibiesasi/sifremi-unuttum.html"
     if os.path.exists(html_path):
@@ -2527,7 +4074,7 @@ async def forgot_password_page():
     return "<h1>Forgot password page not found</h1>"
 
 @app.get("/reset-password", response_class=HTMLResponse)
-async def reset_password_page():
+def reset_password_page():
     """Serve reset password page"""
     html_path = "/var/www/takibiesasi/reset-password.html"
     if os.path.exists(html_path):
@@ -2541,7 +4088,7 @@ class DemoRegisterRequest(BaseModel):
     email: str
 
 @app.post("/api/demo/register")
-async def register_demo(req: DemoRegisterRequest, request: Request):
+def register_demo(req: DemoRegisterRequest, request: Request):
     """Register email for demo and return download link"""
     import re
 
@@ -2570,6 +4117,7 @@ async def register_demo(req: DemoRegisterRequest, request: Request):
 
         result = cur.fetchone()
         conn.commit()
+        admin_stats_cache.invalidate("demo_registrations")
 
         # Send demo welcome email
         send_demo_welcome_email(req.email.lower().strip())
@@ -2590,54 +4138,31 @@ async def register_demo(req: DemoRegisterRequest, request: Request):
         conn.close()
 
 @app.get("/api/demo/stats")
-async def demo_stats(authorization: str = Header(None)):
+def demo_stats(authorization: str = Header(None)):
     """Get demo registration stats (admin only)"""
     verify_admin_token(authorization)
 
     conn = get_db()
-    cur = conn.cursor()
 
     try:
-        # Total registrations
-        cur.execute("SELECT COUNT(*) FROM demo_registrations")
-        total = cur.fetchone()[0]
-
-        # Today's registrations
-        cur.execute("""
-            SELECT COUNT(*) FROM demo_registrations
-            WHERE DATE(registered_at) = CURRENT_DATE
-        """)
-        today = cur.fetchone()[0]
-
-        # This week
-        cur.execute("""
-            SELECT COUNT(*) FROM demo_registrations
-            WHERE registered_at >= CURRENT_DATE - INTERVAL '7 days'
-        """)
-        this_week = cur.fetchone()[0]
-
-        # Converted to license
-        cur.execute("""
-            SELECT COUNT(*) FROM demo_registrations
-            WHERE converted_to_license = TRUE
-        """)
-        converted = cur.fetchone()[0]
+        stats = admin_stats_cache.get(conn, "demo_registrations")
+        total = stats['total']
+        converted = stats['converted']
 
         return {
             "total": total,
-            "today": today,
-            "this_week": this_week,
+            "today": stats['today'],
+            "this_week": stats['this_week'],
             "converted": converted,
             "conversion_rate": round((converted / total * 100), 1) if total > 0 else 0
         }
 
     finally:
-        cur.close()
         conn.close()
 
 
 @app.get("/api/demo/status")
-async def get_demo_status(authorization: str = Header(None)):
+def get_demo_status(authorization: str = Header(None)):
     """Get demo status for logged-in user"""
     user_id = verify_user_token(authorization)
 
@@ -2685,7 +4210,7 @@ async def get_demo_status(authorization: str = Header(None)):
 
 
 @app.post("/api/admin/demo/check-expiring")
-async def check_expiring_demos(authorization: str = Header(None)):
+def check_expiring_demos(authorization: str = Header(None)):
     """Check for expiring demos and send reminder emails (cron job endpoint)"""
     verify_admin_token(authorization)
 
@@ -2754,7 +4279,7 @@ async def check_expiring_demos(authorization: str = Header(None)):
 
 
 @app.get("/api/licenses/my")
-async def get_my_licenses(authorization: str = Header(None)):
+def get_my_licenses(authorization: str = Header(None)):
     """Get logged-in user's licenses"""
     user_id = verify_user_token(authorization)
 
@@ -2810,7 +4335,7 @@ async def get_my_licenses(authorization: str = Header(None)):
 
 
 @app.get("/api/downloads/my")
-async def get_my_downloads(authorization: str = Header(None)):
+def get_my_downloads(authorization: str = Header(None)):
     """Get logged-in user's download history"""
     user_id = verify_user_token(authorization)
 
@@ -2844,7 +4369,7 @@ async def get_my_downloads(authorization: str = Header(None)):
 
 
 @app.get("/api/orders/my")
-async def get_my_orders_simple(authorization: str = Header(None)):
+def get_my_orders_simple(authorization: str = Header(None)):
     """Get logged-in user's orders (simple endpoint)"""
     user_id = verify_user_token(authorization)
 
@@ -2883,7 +4408,7 @@ async def get_my_orders_simple(authorization: str = Header(None)):
 
 
 @app.get("/api/admin/demo-registrations")
-async def list_demo_registrations(authorization: str = Header(None)):
+def list_demo_registrations(authorization: str = Header(None)):
     """List all demo registrations (admin only)"""
     verify_admin_token(authorization)
 
@@ -2920,7 +4445,7 @@ async def list_demo_registrations(authorization: str = Header(None)):
 
 
 @app.post("/api/admin/demo-registrations/{reg_id}/convert")
-async def mark_demo_converted(reg_id: int, authorization: str = Header(None)):
+def mark_demo_converted(reg_id: int, authorization: str = Header(None)):
     """Mark a demo registration as converted to license and create a license"""
     verify_admin_token(authorization)
 
@@ -2961,6 +4486,7 @@ async def mark_demo_converted(reg_id: int, authorization: str = Header(None)):
         """, (reg_id,))
 
         conn.commit()
+        admin_stats_cache.invalidate("licenses", "demo_registrations")
 
         # Log activity
         log_activity(
@@ -2986,7 +4512,7 @@ async def mark_demo_converted(reg_id: int, authorization: str = Header(None)):
 
 
 @app.delete("/api/admin/demo-registrations/{reg_id}")
-async def delete_demo_registration(reg_id: int, authorization: str = Header(None)):
+def delete_demo_registration(reg_id: int, authorization: str = Header(None)):
     """Delete a demo registration"""
     verify_admin_token(authorization)
 
@@ -2996,6 +4522,7 @@ async def delete_demo_registration(reg_id: int, authorization: str = Header(None
     try:
         cur.execute("DELETE FROM demo_registrations WHERE id = %s", (reg_id,))
         conn.commit()
+        admin_stats_cache.invalidate("demo_registrations")
 
         return {"success": True, "message": "Demo kaydı silindi"}
 
@@ -3007,7 +4534,7 @@ async def delete_demo_registration(reg_id: int, authorization: str = Header(None
 # ============ USER AUTH API ============
 
 @app.post("/api/auth/register")
-async def user_register(req: UserRegisterRequest, request: Request):
+def user_register(req: UserRegisterRequest, request: Request):
     """Register new user"""
     # Validate email
     if not validate_email(req.email):
@@ -3063,6 +4590,7 @@ async def user_register(req: UserRegisterRequest, request: Request):
 
         user = cur.fetchone()
         conn.commit()
+        admin_stats_cache.invalidate("users")
 
         # Log registration
         log_activity(
@@ -3096,7 +4624,7 @@ async def user_register(req: UserRegisterRequest, request: Request):
 
 
 @app.post("/api/auth/login")
-async def user_login(req: UserLoginRequest, request: Request):
+def user_login(req: UserLoginRequest, request: Request):
     """User login"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -3152,7 +4680,7 @@ async def user_login(req: UserLoginRequest, request: Request):
 
 
 @app.post("/api/auth/logout")
-async def user_logout(authorization: str = Header(None)):
+def user_logout(authorization: str = Header(None)):
     """User logout - invalidate session"""
     try:
         payload = verify_user_token(authorization)
@@ -3164,7 +4692,7 @@ async def user_logout(authorization: str = Header(None)):
 
 
 @app.post("/api/auth/verify-email")
-async def verify_email(req: VerifyEmailRequest):
+def verify_email(req: VerifyEmailRequest):
     """Verify user email with token"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -3190,6 +4718,7 @@ async def verify_email(req: VerifyEmailRequest):
             WHERE id = %s
         """, (user['id'],))
         conn.commit()
+        admin_stats_cache.invalidate("users")
 
         return {"success": True, "message": "E-posta adresiniz doğrulandı!"}
 
@@ -3199,7 +4728,7 @@ async def verify_email(req: VerifyEmailRequest):
 
 
 @app.post("/api/auth/forgot-password")
-async def forgot_password(req: ForgotPasswordRequest):
+def forgot_password(req: ForgotPasswordRequest):
     """Request password reset"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -3237,7 +4766,7 @@ async def forgot_password(req: ForgotPasswordRequest):
 
 
 @app.post("/api/auth/reset-password")
-async def reset_password(req: ResetPasswordRequest):
+def reset_password(req: ResetPasswordRequest):
     """Reset password with token"""
     # Validate new password
     is_valid, error_msg = validate_password(req.new_password)
@@ -3282,7 +4811,7 @@ async def reset_password(req: ResetPasswordRequest):
 
 
 @app.get("/api/user/profile")
-async def get_user_profile(authorization: str = Header(None)):
+def get_user_profile(authorization: str = Header(None)):
     """Get current user profile"""
     user_id = verify_user_token(authorization)
 
@@ -3323,7 +4852,7 @@ async def get_user_profile(authorization: str = Header(None)):
 
 
 @app.put("/api/user/profile")
-async def update_user_profile(req: UserProfileUpdateRequest, authorization: str = Header(None)):
+def update_user_profile(req: UserProfileUpdateRequest, authorization: str = Header(None)):
     """Update user profile"""
     user_id = verify_user_token(authorization)
 
@@ -3379,7 +4908,7 @@ async def update_user_profile(req: UserProfileUpdateRequest, authorization: str
 
 
 @app.post("/api/user/change-password")
-async def change_password(req: PasswordChangeRequest, authorization: str = Header(None)):
+def change_password(req: PasswordChangeRequest, authorization: str = Header(None)):
     """Change user password"""
     user_id = verify_user_token(authorization)
 
@@ -3421,7 +4950,7 @@ async def change_password(req: PasswordChangeRequest, authorization: str = Heade
 
 
 @app.post("/api/auth/resend-verification")
-async def resend_verification(req: ForgotPasswordRequest):
+def resend_verification(req: ForgotPasswordRequest):
     """Resend email verification"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -3463,7 +4992,7 @@ async def resend_verification(req: ForgotPasswordRequest):
 # ============ USER PROFILE & DATA ENDPOINTS ============
 
 @app.get("/api/auth/profile")
-async def get_user_profile(authorization: str = Header(None)):
+def get_user_profile(authorization: str = Header(None)):
     """Get logged-in user's profile"""
     user_id = verify_user_token(authorization)
 
@@ -3503,7 +5032,7 @@ async def get_user_profile(authorization: str = Header(None)):
 
 
 @app.get("/api/demo/status")
-async def get_user_demo_status(authorization: str = Header(None)):
+def get_user_demo_status(authorization: str = Header(None)):
     """Get demo status for logged-in user"""
     user_id = verify_user_token(authorization)
 
@@ -3567,7 +5096,7 @@ async def get_user_demo_status(authorization: str = Header(None)):
 
 
 @app.get("/api/downloads/my")
-async def get_user_downloads(authorization: str = Header(None)):
+def get_user_downloads(authorization: str = Header(None)):
     """Get logged-in user's download history"""
     user_id = verify_user_token(authorization)
 
@@ -3600,7 +5129,7 @@ async def get_user_downloads(authorization: str = Header(None)):
 
 
 @app.get("/api/orders/my")
-async def get_user_orders(authorization: str = Header(None)):
+def get_user_orders(authorization: str = Header(None)):
     """Get logged-in user's orders"""
     user_id = verify_user_token(authorization)
 
@@ -3638,7 +5167,7 @@ async def get_user_orders(authorization: str = Header(None)):
 
 
 @app.get("/api/licenses/my")
-async def get_user_licenses(authorization: str = Header(None)):
+def get_user_licenses(authorization: str = Header(None)):
     """Get logged-in user's licenses"""
     user_id = verify_user_token(authorization)
 
@@ -3694,7 +5223,7 @@ async def get_user_licenses(authorization: str = Header(None)):
 # ============ ADMIN USER MANAGEMENT ============
 
 @app.get("/api/admin/users")
-async def admin_get_users(authorization: str = Header(None)):
+def admin_get_users(authorization: str = Header(None)):
     """Get all users (admin only)"""
     verify_admin_token(authorization)
 
@@ -3732,7 +5261,7 @@ async def admin_get_users(authorization: str = Header(None)):
 
 
 @app.post("/api/admin/users/{user_id}/toggle")
-async def admin_toggle_user(user_id: int, authorization: str = Header(None)):
+def admin_toggle_user(user_id: int, authorization: str = Header(None)):
     """Toggle user active status (admin only)"""
     verify_admin_token(authorization)
 
@@ -3782,7 +5311,7 @@ PRODUCT_PRICES = {
 }
 
 @app.post("/api/orders/create")
-async def create_order(req: CreateOrderRequest, authorization: str = Header(None)):
+def create_order(req: CreateOrderRequest, authorization: str = Header(None)):
     """Create a new order"""
     user_id = verify_user_token(authorization)
 
@@ -3847,6 +5376,7 @@ async def create_order(req: CreateOrderRequest, authorization: str = Header(None
 
         order = cur.fetchone()
         conn.commit()
+        admin_stats_cache.invalidate("orders")
 
         return {
             "success": True,
@@ -3873,7 +5403,7 @@ async def create_order(req: CreateOrderRequest, authorization: str = Header(None
 
 
 @app.get("/api/orders/my-orders")
-async def get_my_orders(authorization: str = Header(None)):
+def get_my_orders(authorization: str = Header(None)):
     """Get current user's orders"""
     user_id = verify_user_token(authorization)
 
@@ -3911,7 +5441,7 @@ async def get_my_orders(authorization: str = Header(None)):
 
 
 @app.get("/api/orders/{order_id}")
-async def get_order_detail(order_id: int, authorization: str = Header(None)):
+def get_order_detail(order_id: int, authorization: str = Header(None)):
     """Get order details"""
     user_id = verify_user_token(authorization)
 
@@ -3957,7 +5487,7 @@ async def get_order_detail(order_id: int, authorization: str = Header(None)):
 
 
 @app.post("/api/orders/{order_id}/pay")
-async def mock_payment(order_id: int, req: MockPaymentRequest, authorization: str = Header(None)):
+def mock_payment(order_id: int, req: MockPaymentRequest, authorization: str = Header(None)):
     """Process mock payment for an order"""
     user_id = verify_user_token(authorization)
 
@@ -4038,6 +5568,7 @@ async def mock_payment(order_id: int, req: MockPaymentRequest, authorization: st
 
         new_license = cur.fetchone()
         conn.commit()
+        admin_stats_cache.invalidate("orders", "licenses")
 
         # Log payment activity
         log_activity(
@@ -4090,7 +5621,7 @@ async def mock_payment(order_id: int, req: MockPaymentRequest, authorization: st
 
 
 @app.post("/api/orders/{order_id}/cancel")
-async def cancel_order(order_id: int, authorization: str = Header(None)):
+def cancel_order(order_id: int, authorization: str = Header(None)):
     """Cancel a pending order"""
     user_id = verify_user_token(authorization)
 
@@ -4113,6 +5644,7 @@ async def cancel_order(order_id: int, authorization: str = Header(None)):
             return {"success": False, "error": "Sipariş bulunamadı veya iptal edilemez"}
 
         conn.commit()
+        admin_stats_cache.invalidate("orders")
         return {"success": True, "message": "Sipariş iptal edildi"}
 
     finally:
@@ -4123,7 +5655,7 @@ async def cancel_order(order_id: int, authorization: str = Header(None)):
 # ============ ADMIN ORDER MANAGEMENT ============
 
 @app.get("/api/admin/orders")
-async def admin_get_orders(authorization: str = Header(None)):
+def admin_get_orders(authorization: str = Header(None)):
     """Get all orders (admin only)"""
     verify_admin_token(authorization)
 
@@ -4161,61 +5693,33 @@ async def admin_get_orders(authorization: str = Header(None)):
 
 
 @app.get("/api/admin/orders/stats")
-async def admin_order_stats(authorization: str = Header(None)):
+def admin_order_stats(authorization: str = Header(None)):
     """Get order statistics (admin only)"""
     verify_admin_token(authorization)
 
     conn = get_db()
-    cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
     try:
-        # Total orders
-        cur.execute("SELECT COUNT(*) as count FROM orders")
-        total_orders = cur.fetchone()['count']
-
-        # Completed orders
-        cur.execute("SELECT COUNT(*) as count FROM orders WHERE payment_status = 'completed'")
-        completed_orders = cur.fetchone()['count']
-
-        # Total revenue
-        cur.execute("SELECT COALESCE(SUM(total_price_cents), 0) as total FROM orders WHERE payment_status = 'completed'")
-        total_revenue = cur.fetchone()['total'] / 100
-
-        # Today's orders
-        cur.execute("SELECT COUNT(*) as count FROM orders WHERE DATE(created_at) = CURRENT_DATE")
-        today_orders = cur.fetchone()['count']
-
-        # Today's revenue
-        cur.execute("""
-            SELECT COALESCE(SUM(total_price_cents), 0) as total
-            FROM orders
-            WHERE DATE(paid_at) = CURRENT_DATE AND payment_status = 'completed'
-        """)
-        today_revenue = cur.fetchone()['total'] / 100
-
-        # Pending orders
-        cur.execute("SELECT COUNT(*) as count FROM orders WHERE payment_status = 'pending'")
-        pending_orders = cur.fetchone()['count']
+        stats = admin_stats_cache.get(conn, "orders")
 
         return {
             "success": True,
             "stats": {
-                "total_orders": total_orders,
-                "completed_orders": completed_orders,
-                "pending_orders": pending_orders,
-                "total_revenue": total_revenue,
-                "today_orders": today_orders,
-                "today_revenue": today_revenue
+                "total_orders": stats['total_orders'],
+                "completed_orders": stats['completed_orders'],
+                "pending_orders": stats['pending_orders'],
+                "total_revenue": stats['total_revenue_cents'] / 100,
+                "today_orders": stats['today_orders'],
+                "today_revenue": stats['today_revenue_cents'] / 100
             }
         }
 
     finally:
-        cur.close()
         conn.close()
 
 
 @app.get("/api/admin/orders/{order_id}")
-async def admin_get_order_detail(order_id: int, authorization: str = Header(None)):
+def admin_get_order_detail(order_id: int, authorization: str = Header(None)):
     """Get order details (admin only)"""
     verify_admin_token(authorization)
 
@@ -4246,7 +5750,7 @@ async def admin_get_order_detail(order_id: int, authorization: str = Header(None
 
 
 @app.post("/api/admin/orders/{order_id}/status")
-async def admin_update_order_status(order_id: int, req: OrderStatusUpdateRequest, authorization: str = Header(None)):
+def admin_update_order_status(order_id: int, req: OrderStatusUpdateRequest, authorization: str = Header(None)):
     """Update order status (admin only)"""
     verify_admin_token(authorization)
 
@@ -4282,6 +5786,7 @@ async def admin_update_order_status(order_id: int, req: OrderStatusUpdateRequest
             return {"success": False, "error": "Sipariş bulunamadı"}
 
         conn.commit()
+        admin_stats_cache.invalidate("orders")
         return {"success": True, "message": f"Sipariş durumu '{req.status}' olarak güncellendi"}
 
     finally:
@@ -4292,7 +5797,7 @@ async def admin_update_order_status(order_id: int, req: OrderStatusUpdateRequest
 # ============ INVOICE API ============
 
 @app.post("/api/invoices/create")
-async def create_invoice(req: CreateInvoiceRequest, authorization: str = Header(None)):
+def create_invoice(req: CreateInvoiceRequest, authorization: str = Header(None)):
     """Create invoice for a completed order (admin only)"""
     verify_admin_token(authorization)
 
@@ -4349,7 +5854,7 @@ async def create_invoice(req: CreateInvoiceRequest, authorization: str = Header(
 
 
 @app.get("/api/invoices/my-invoices")
-async def get_my_invoices(authorization: str = Header(None)):
+def get_my_invoices(authorization: str = Header(None)):
     """Get current user's invoices"""
     user_id = verify_user_token(authorization)
 
@@ -4374,7 +5879,7 @@ async def get_my_invoices(authorization: str = Header(None)):
 
 
 @app.get("/api/admin/invoices")
-async def admin_get_invoices(authorization: str = Header(None)):
+def admin_get_invoices(authorization: str = Header(None)):
     """Get all invoices (admin only)"""
     verify_admin_token(authorization)
 
@@ -4402,7 +5907,7 @@ async def admin_get_invoices(authorization: str = Header(None)):
 # ============ DOWNLOAD TRACKING API ============
 
 @app.post("/api/downloads/track")
-async def track_download(req: DownloadTrackRequest, request: Request, authorization: str = Header(None)):
+def track_download(req: DownloadTrackRequest, request: Request, authorization: str = Header(None)):
     """Track a download"""
     user_id = verify_user_token(authorization)
 
@@ -4429,7 +5934,7 @@ async def track_download(req: DownloadTrackRequest, request: Request, authorizat
 
 
 @app.get("/api/admin/downloads/stats")
-async def admin_download_stats(authorization: str = Header(None)):
+def admin_download_stats(authorization: str = Header(None)):
     """Get download statistics (admin only)"""
     verify_admin_token(authorization)
 
@@ -4456,48 +5961,13 @@ async def admin_download_stats(authorization: str = Header(None)):
 # ============ DEMO HEARTBEAT API ============
 
 @app.post("/api/demo/heartbeat")
-async def demo_heartbeat(req: DemoHeartbeatRequest, request: Request):
+def demo_heartbeat(req: DemoHeartbeatRequest, request: Request):
     """Record demo usage heartbeat"""
-    conn = get_db()
-    cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-
-    try:
-        cur.execute("SELECT id, status, demo_end_date FROM demo_sessions WHERE machine_id = %s", (req.machine_id,))
-        session = cur.fetchone()
-
-        if not session:
-            demo_end = datetime.utcnow() + timedelta(days=14)
-            cur.execute("""
-                INSERT INTO demo_sessions (machine_id, machine_name, os_info, demo_start_date, demo_end_date, last_heartbeat, total_usage_minutes)
-                VALUES (%s, %s, %s, CURRENT_TIMESTAMP, %s, CURRENT_TIMESTAMP, %s) RETURNING id, demo_end_date, status
-            """, (req.machine_id, req.machine_name, req.os_info, demo_end, req.usage_minutes))
-            conn.commit()
-            return {"success": True, "status": "active", "days_remaining": 14, "message": "Demo başlatıldı"}
-
-        cur.execute("""
-            UPDATE demo_sessions SET last_heartbeat = CURRENT_TIMESTAMP, total_usage_minutes = total_usage_minutes + %s,
-            launch_count = launch_count + 1, machine_name = COALESCE(%s, machine_name), os_info = COALESCE(%s, os_info)
-            WHERE id = %s
-        """, (req.usage_minutes, req.machine_name, req.os_info, session['id']))
-        conn.commit()
-
-        days_remaining = max(0, (session['demo_end_date'] - datetime.utcnow()).days) if session['demo_end_date'] else 0
-        status = session['status']
-
-        if days_remaining <= 0 and status == 'active':
-            cur.execute("UPDATE demo_sessions SET status = 'expired' WHERE id = %s", (session['id'],))
-            conn.commit()
-            status = 'expired'
-
-        return {"success": True, "status": status, "days_remaining": days_remaining}
-
-    finally:
-        cur.close()
-        conn.close()
+    return demo_heartbeats.record(req)
 
 
 @app.get("/api/demo/status/{machine_id}")
-async def get_demo_status(machine_id: str):
+def get_demo_status(machine_id: str):
     """Get demo status for a machine"""
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -4505,14 +5975,29 @@ async def get_demo_status(machine_id: str):
     try:
         cur.execute("SELECT * FROM demo_sessions WHERE machine_id = %s", (machine_id,))
         session = cur.fetchone()
+        buffered = demo_heartbeats.snapshot(machine_id)
 
-        if not session:
+        if not session and not buffered:
             return {"success": True, "status": "no_demo", "can_start": True}
 
-        days_remaining = max(0, (session['demo_end_date'] - datetime.utcnow()).days) if session['demo_end_date'] else 0
+        if session:
+            status = session['status']
+            demo_end_date = session['demo_end_date']
+            total_usage_minutes = session['total_usage_minutes']
+            launch_count = session['launch_count']
+        else:
+            status, demo_end_date, total_usage_minutes, launch_count = 'active', buffered['demo_end_date'], 0, 0
+
+        if buffered:
+            total_usage_minutes = (total_usage_minutes or 0) + buffered['usage_minutes']
+            launch_count = (launch_count or 0) + buffered['launch_count']
+            if buffered['expire'] and status == 'active':
+                status = 'expired'
 
-        return {"success": True, "status": session['status'], "days_remaining": days_remaining,
-                "total_usage_minutes": session['total_usage_minutes'], "launch_count": session['launch_count']}
+        days_remaining = _demo_days_remaining(demo_end_date)
+
+        return {"success": True, "status": status, "days_remaining": days_remaining,
+                "total_usage_minutes": total_usage_minutes, "launch_count": launch_count}
 
     finally:
         cur.close()
@@ -4520,9 +6005,10 @@ async def get_demo_status(machine_id: str):
 
 
 @app.get("/api/admin/demo-sessions")
-async def admin_get_demo_sessions(authorization: str = Header(None)):
+def admin_get_demo_sessions(authorization: str = Header(None)):
     """Get all demo sessions (admin only)"""
     verify_admin_token(authorization)
+    demo_heartbeats.flush()
 
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -4548,7 +6034,7 @@ async def admin_get_demo_sessions(authorization: str = Header(None)):
 
 
 @app.post("/api/admin/demo-sessions/{demo_id}/extend")
-async def admin_extend_demo(demo_id: int, req: DemoExtendRequest, authorization: str = Header(None)):
+def admin_extend_demo(demo_id: int, req: DemoExtendRequest, authorization: str = Header(None)):
     """Extend a demo session (admin only)"""
     verify_admin_token(authorization)
 
@@ -4558,13 +6044,15 @@ async def admin_extend_demo(demo_id: int, req: DemoExtendRequest, authorization:
     try:
         cur.execute("""
             UPDATE demo_sessions SET demo_end_date = demo_end_date + INTERVAL '%s days', status = 'extended',
-            extension_count = extension_count + 1, updated_at = CURRENT_TIMESTAMP WHERE id = %s RETURNING id
+            extension_count = extension_count + 1, updated_at = CURRENT_TIMESTAMP WHERE id = %s RETURNING machine_id
         """, (req.days, demo_id))
 
-        if not cur.fetchone():
+        row = cur.fetchone()
+        if not row:
             return {"success": False, "error": "Demo oturumu bulunamadı"}
 
         conn.commit()
+        demo_heartbeats.invalidate(row[0])
         return {"success": True, "message": f"Demo {req.days} gün uzatıldı"}
 
     finally:
@@ -4575,7 +6063,7 @@ async def admin_extend_demo(demo_id: int, req: DemoExtendRequest, authorization:
 # ============ ENHANCED ADMIN DASHBOARD ============
 
 @app.get("/api/admin/dashboard")
-async def admin_dashboard(authorization: str = Header(None)):
+def admin_dashboard(authorization: str = Header(None)):
     """Comprehensive admin dashboard with all statistics"""
     verify_admin_token(authorization)
 
@@ -4583,112 +6071,17 @@ async def admin_dashboard(authorization: str = Header(None)):
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
     try:
-        stats = {}
-
-        # === LICENSE STATS ===
-        cur.execute("SELECT COUNT(*) FROM licenses")
-        stats['total_licenses'] = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM licenses WHERE is_active = TRUE AND machine_id IS NOT NULL")
-        stats['active_licenses'] = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM licenses WHERE source = 'purchase'")
-        stats['purchased_licenses'] = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM licenses WHERE source = 'manual' OR source IS NULL")
-        stats['manual_licenses'] = cur.fetchone()[0]
-
-        # === USER STATS ===
-        cur.execute("SELECT COUNT(*) FROM users")
-        stats['total_users'] = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM users WHERE email_verified = TRUE")
-        stats['verified_users'] = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM users WHERE DATE(created_at) = CURRENT_DATE")
-        stats['today_registrations'] = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM users WHERE created_at >= CURRENT_DATE - INTERVAL '7 days'")
-        stats['week_registrations'] = cur.fetchone()[0]
-
-        # === ORDER/REVENUE STATS ===
-        cur.execute("SELECT COUNT(*) FROM orders WHERE payment_status = 'completed'")
-        stats['completed_orders'] = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM orders WHERE payment_status = 'pending'")
-        stats['pending_orders'] = cur.fetchone()[0]
-
-        cur.execute("SELECT COALESCE(SUM(total_price_cents), 0) FROM orders WHERE payment_status = 'completed'")
-        stats['total_revenue'] = cur.fetchone()[0] / 100
-
-        cur.execute("""
-            SELECT COALESCE(SUM(total_price_cents), 0) FROM orders
-            WHERE payment_status = 'completed' AND paid_at >= DATE_TRUNC('month', CURRENT_DATE)
-        """)
-        stats['month_revenue'] = cur.fetchone()[0] / 100
-
-        cur.execute("""
-            SELECT COALESCE(SUM(total_price_cents), 0) FROM orders
-            WHERE payment_status = 'completed' AND paid_at >= CURRENT_DATE - INTERVAL '7 days'
-        """)
-        stats['week_revenue'] = cur.fetchone()[0] / 100
-
-        cur.execute("""
-            SELECT COALESCE(SUM(total_price_cents), 0) FROM orders
-            WHERE payment_status = 'completed' AND DATE(paid_at) = CURRENT_DATE
-        """)
-        stats['today_revenue'] = cur.fetchone()[0] / 100
-
-        # Average order value
-        cur.execute("""
-            SELECT COALESCE(AVG(total_price_cents), 0) FROM orders WHERE payment_status = 'completed'
-        """)
-        stats['avg_order_value'] = cur.fetchone()[0] / 100
-
-        # === MONTHLY REVENUE (Last 12 months) ===
-        cur.execute("""
-            SELECT
-                TO_CHAR(DATE_TRUNC('month', paid_at), 'YYYY-MM') as month,
-                COALESCE(SUM(total_price_cents), 0) / 100 as revenue,
-                COUNT(*) as order_count
-            FROM orders
-            WHERE payment_status = 'completed'
-                AND paid_at >= CURRENT_DATE - INTERVAL '12 months'
-            GROUP BY DATE_TRUNC('month', paid_at)
-            ORDER BY month
-        """)
-        stats['monthly_revenue'] = [{"month": r['month'], "revenue": float(r['revenue']),
-                                      "orders": r['order_count']} for r in cur.fetchall()]
-
-        # === DAILY REVENUE (Last 30 days) ===
-        cur.execute("""
-            SELECT
-                TO_CHAR(DATE(paid_at), 'YYYY-MM-DD') as date,
-                COALESCE(SUM(total_price_cents), 0) / 100 as revenue,
-                COUNT(*) as order_count
-            FROM orders
-            WHERE payment_status = 'completed'
-                AND paid_at >= CURRENT_DATE - INTERVAL '30 days'
-            GROUP BY DATE(paid_at)
-            ORDER BY date
-        """)
-        stats['daily_revenue'] = [{"date": r['date'], "revenue": float(r['revenue']),
-                                    "orders": r['order_count']} for r in cur.fetchall()]
-
-        # === TOP SELLING PRODUCTS ===
-        cur.execute("""
-            SELECT
-                product_name,
-                COUNT(*) as count,
-                COALESCE(SUM(total_price_cents), 0) / 100 as total_revenue
-            FROM orders
-            WHERE payment_status = 'completed'
-            GROUP BY product_name
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        stats['top_products'] = [{"name": r['product_name'], "count": r['count'],
-                                   "revenue": float(r['total_revenue'])} for r in cur.fetchall()]
+        cached = admin_stats_cache.get(conn, "licenses", "users", "orders")
+        stats = {key: cached[key] for key in (
+            'total_licenses', 'active_licenses', 'purchased_licenses', 'manual_licenses',
+            'total_users', 'verified_users', 'today_registrations', 'week_registrations',
+            'completed_orders', 'pending_orders', 'monthly_revenue', 'daily_revenue', 'top_products',
+        )}
+        stats['total_revenue'] = cached['total_revenue_cents'] / 100
+        stats['month_revenue'] = cached['month_revenue_cents'] / 100
+        stats['week_revenue'] = cached['week_revenue_cents'] / 100
+        stats['today_revenue'] = cached['today_revenue_cents'] / 100
+        stats['avg_order_value'] = cached['avg_order_cents'] / 100
 
         # === RECENT ACTIVITY ===
         cur.execute("""
@@ -4739,7 +6132,7 @@ async def admin_dashboard(authorization: str = Header(None)):
 
 
 @app.get("/api/admin/users/{user_id}/detail")
-async def admin_user_detail(user_id: int, authorization: str = Header(None)):
+def admin_user_detail(user_id: int, authorization: str = Header(None)):
     """Get detailed user information including orders, licenses, and downloads"""
     verify_admin_token(authorization)
 
@@ -4881,7 +6274,7 @@ async def admin_user_detail(user_id: int, authorization: str = Header(None)):
 
 
 @app.get("/api/admin/sales/report")
-async def admin_sales_report(
+def admin_sales_report(
     start_date: str = None,
     end_date: str = None,
     authorization: str = Header(None)
@@ -4994,32 +6387,29 @@ async def admin_sales_report(
 
 
 @app.get("/api/admin/activity")
-async def admin_activity_log(
+def admin_activity_log(
     limit: int = 100,
     activity_type: str = None,
+    since: str = None,
+    until: str = None,
+    cursor: str = None,
     authorization: str = Header(None)
 ):
-    """Get activity log"""
+    """Get activity log, newest first; pass ``next_cursor`` back as ``cursor``"""
     verify_admin_token(authorization)
 
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
     try:
-        query = "SELECT * FROM activity_log"
-        params = []
-
-        if activity_type:
-            query += " WHERE activity_type = %s"
-            params.append(activity_type)
-
-        query += " ORDER BY created_at DESC LIMIT %s"
-        params.append(limit)
-
-        cur.execute(query, params)
+        rows, next_cursor = keyset_page(
+            cur, "SELECT * FROM activity_log a", "a",
+            filters={"activity_type": activity_type}, since=since, until=until,
+            cursor=cursor, limit=limit, table="activity_log",
+        )
 
         activities = []
-        for r in cur.fetchall():
+        for r in rows:
             activities.append({
                 "id": r['id'],
                 "type": r['activity_type'],
@@ -5032,20 +6422,14 @@ async def admin_activity_log(
                 "created_at": r['created_at'].isoformat() if r['created_at'] else None
             })
 
-        # Get activity type counts
-        cur.execute("""
-            SELECT activity_type, COUNT(*) as count
-            FROM activity_log
-            GROUP BY activity_type
-            ORDER BY count DESC
-        """)
-
-        type_counts = {r['activity_type']: r['count'] for r in cur.fetchall()}
+        # Tür sayıları tüm tabloyu taradığından önbellekten okunur
+        type_counts = admin_stats_cache.get(conn, "activity_types")['activity_type_counts']
 
         return {
             "success": True,
             "activities": activities,
-            "type_counts": type_counts
+            "type_counts": type_counts,
+            "next_cursor": next_cursor
         }
 
     finally:
@@ -5053,183 +6437,283 @@ async def admin_activity_log(
         conn.close()
 
 
-@app.get("/api/admin/export/orders")
-async def admin_export_orders(
-    format: str = "json",
-    start_date: str = None,
-    end_date: str = None,
-    authorization: str = Header(None)
-):
-    """Export orders as JSON or CSV"""
-    verify_admin_token(authorization)
+# ============ STREAMING EXPORTS ============
 
-    conn = get_db()
-    cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+# Sunucu taraflı cursor her turda bu kadar satır çeker
+EXPORT_ITERSIZE = int(os.environ.get("EXPORT_ITERSIZE", "2000"))
+# Akışa yazılan parça bu boyutu geçince gönderilir
+EXPORT_CHUNK_BYTES = 64 * 1024
+EXPORT_PAGE_LIMIT_MAX = 500
 
-    try:
-        query = """
-            SELECT o.id, o.order_number, o.product_name, o.quantity,
-                   o.total_price_cents / 100.0 as total,
-                   o.payment_status, o.payment_method, o.paid_at, o.created_at,
-                   u.email as user_email, u.full_name as user_name
-            FROM orders o
-            LEFT JOIN users u ON o.user_id = u.id
-            WHERE 1=1
-        """
-        params = []
+_ORDER_EXPORT_QUERY = """
+    SELECT o.id, o.order_number, o.product_name, o.quantity,
+           o.total_price_cents / 100.0 as total,
+           o.payment_status, o.payment_method, o.paid_at, o.created_at,
+           u.email as user_email, u.full_name as user_name
+    FROM orders o
+    LEFT JOIN users u ON o.user_id = u.id
+    WHERE 1=1
+"""
 
-        if start_date:
-            query += " AND DATE(o.created_at) >= %s"
-            params.append(start_date)
-        if end_date:
-            query += " AND DATE(o.created_at) <= %s"
-            params.append(end_date)
+_LICENSE_EXPORT_QUERY = """
+    SELECT l.id, l.license_key, l.customer_name, l.email, l.machine_id,
+           l.is_active, l.transfer_count, l.source,
+           l.purchase_price_cents / 100.0 as purchase_price,
+           l.activated_at, l.created_at,
+           u.full_name as user_name
+    FROM licenses l
+    LEFT JOIN users u ON l.user_id = u.id
+    WHERE 1=1
+"""
 
-        query += " ORDER BY o.created_at DESC"
+# Sipariş ve lisans sayıları ayrı alt sorgularla toplanır; iki tablonun
+# birlikte JOIN edilmesi harcamayı lisans sayısıyla çarpıyordu
+_USER_EXPORT_QUERY = """
+    SELECT u.id, u.email, u.full_name, u.phone, u.company_name,
+           u.email_verified, u.role, u.created_at, u.last_login_at,
+           (SELECT COUNT(*) FROM orders o WHERE o.user_id = u.id) as order_count,
+           (SELECT COALESCE(SUM(o.total_price_cents), 0) FROM orders o
+             WHERE o.user_id = u.id AND o.payment_status = 'completed') / 100.0 as total_spent,
+           (SELECT COUNT(*) FROM licenses l WHERE l.user_id = u.id) as license_count
+    FROM users u
+    WHERE 1=1
+"""
 
-        cur.execute(query, params)
-        rows = cur.fetchall()
 
-        if format == "csv":
-            import io
-            output = io.StringIO()
-            output.write("ID,Sipariş No,Ürün,Adet,Toplam,Durum,Ödeme Yöntemi,Ödeme Tarihi,Oluşturma Tarihi,E-posta,Ad Soyad\n")
-            for r in rows:
-                output.write(f"{r['id']},{r['order_number']},{r['product_name']},{r['quantity']},{r['total']},{r['payment_status']},{r['payment_method'] or ''},{r['paid_at'] or ''},{r['created_at']},{r['user_email'] or ''},{r['user_name'] or ''}\n")
+def _isoformat(value):
+    return value.isoformat() if value else None
 
-            return {"success": True, "format": "csv", "data": output.getvalue()}
 
-        # JSON format
-        orders = []
-        for r in rows:
-            orders.append({
-                "id": r['id'],
-                "order_number": r['order_number'],
-                "product": r['product_name'],
-                "quantity": r['quantity'],
-                "total": float(r['total']) if r['total'] else 0,
-                "status": r['payment_status'],
-                "payment_method": r['payment_method'],
-                "paid_at": r['paid_at'].isoformat() if r['paid_at'] else None,
-                "created_at": r['created_at'].isoformat() if r['created_at'] else None,
-                "user_email": r['user_email'],
-                "user_name": r['user_name']
-            })
+def _order_export_row(r) -> dict:
+    return {
+        "id": r['id'],
+        "order_number": r['order_number'],
+        "product": r['product_name'],
+        "quantity": r['quantity'],
+        "total": float(r['total']) if r['total'] else 0,
+        "status": r['payment_status'],
+        "payment_method": r['payment_method'],
+        "paid_at": _isoformat(r['paid_at']),
+        "created_at": _isoformat(r['created_at']),
+        "user_email": r['user_email'],
+        "user_name": r['user_name']
+    }
 
-        return {"success": True, "format": "json", "data": orders}
 
-    finally:
+def _license_export_row(r) -> dict:
+    return {
+        "id": r['id'],
+        "license_key": r['license_key'],
+        "customer_name": r['customer_name'],
+        "email": r['email'],
+        "machine_id": r['machine_id'],
+        "is_active": r['is_active'],
+        "transfer_count": r['transfer_count'],
+        "source": r['source'],
+        "purchase_price": float(r['purchase_price']) if r['purchase_price'] else None,
+        "activated_at": _isoformat(r['activated_at']),
+        "created_at": _isoformat(r['created_at'])
+    }
+
+
+def _user_export_row(r) -> dict:
+    return {
+        "id": r['id'],
+        "email": r['email'],
+        "full_name": r['full_name'],
+        "phone": r['phone'],
+        "company_name": r['company_name'],
+        "email_verified": r['email_verified'],
+        "role": r['role'],
+        "created_at": _isoformat(r['created_at']),
+        "last_login_at": _isoformat(r['last_login_at']),
+        "order_count": r['order_count'],
+        "total_spent": float(r['total_spent']),
+        "license_count": r['license_count']
+    }
+
+
+# name -> (sorgu, id sütunu, sıralama sütunu, CSV başlığı, CSV satırı, JSON satırı)
+_EXPORTS = {
+    "orders": (
+        _ORDER_EXPORT_QUERY, "o.id", "o.created_at",
+        ["ID", "Sipariş No", "Ürün", "Adet", "Toplam", "Durum", "Ödeme Yöntemi",
+         "Ödeme Tarihi", "Oluşturma Tarihi", "E-posta", "Ad Soyad"],
+        lambda r: [r['id'], r['order_number'], r['product_name'], r['quantity'], r['total'],
+                   r['payment_status'], r['payment_method'], r['paid_at'], r['created_at'],
+                   r['user_email'], r['user_name']],
+        _order_export_row,
+    ),
+    "licenses": (
+        _LICENSE_EXPORT_QUERY, "l.id", "l.created_at",
+        ["ID", "Lisans Key", "Müşteri", "E-posta", "Makine ID", "Aktif", "Transfer",
+         "Kaynak", "Fiyat", "Aktivasyon", "Oluşturma"],
+        lambda r: [r['id'], r['license_key'], r['customer_name'], r['email'], r['machine_id'],
+                   r['is_active'], r['transfer_count'], r['source'], r['purchase_price'],
+                   r['activated_at'], r['created_at']],
+        _license_export_row,
+    ),
+    "users": (
+        _USER_EXPORT_QUERY, "u.id", "u.created_at",
+        ["ID", "E-posta", "Ad Soyad", "Telefon", "Şirket", "Doğrulanmış", "Rol", "Kayıt",
+         "Son Giriş", "Sipariş", "Harcama", "Lisans"],
+        lambda r: [r['id'], r['email'], r['full_name'], r['phone'], r['company_name'],
+                   r['email_verified'], r['role'], r['created_at'], r['last_login_at'],
+                   r['order_count'], r['total_spent'], r['license_count']],
+        _user_export_row,
+    ),
+}
+
+
+def _order_date_filters(start_date: Optional[str], end_date: Optional[str]):
+    clauses, params = [], []
+    if start_date:
+        clauses.append(" AND o.created_at >= %s::date")
+        params.append(start_date)
+    if end_date:
+        clauses.append(" AND o.created_at < %s::date + 1")
+        params.append(end_date)
+    return "".join(clauses), params
+
+
+def _iter_export_rows(conn, query: str, params: list):
+    """Yield rows from a server-side cursor; closes ``conn`` when exhausted or abandoned."""
+    try:
+        cur = conn.cursor(name="admin_export", cursor_factory=psycopg2.extras.RealDictCursor)
+        cur.itersize = EXPORT_ITERSIZE
+        cur.execute(query, params)
+        for row in cur:
+            yield row
         cur.close()
+    finally:
         conn.close()
 
 
-@app.get("/api/admin/export/licenses")
-async def admin_export_licenses(format: str = "json", authorization: str = Header(None)):
-    """Export licenses as JSON or CSV"""
-    verify_admin_token(authorization)
+def _chunked(lines):
+    buffer = io.StringIO()
+    for line in lines:
+        buffer.write(line)
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _stream_export(name: str, format: str, where: str = "", params: Optional[list] = None):
+    query, _, order_column, csv_header, csv_row, json_row = _EXPORTS[name]
+    if format not in ("csv", "json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format csv, json veya ndjson olmalı")
 
     conn = get_db()
-    cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    rows = _iter_export_rows(conn, f"{query}{where} ORDER BY {order_column} DESC", params or [])
+    filename = f"{name}-{datetime.now().strftime('%Y%m%d')}"
+
+    if format == "csv":
+        def lines():
+            line = io.StringIO()
+            writer = csv.writer(line, lineterminator="\n")
+            for values in itertools.chain([csv_header], map(csv_row, rows)):
+                writer.writerow(values)
+                yield line.getvalue()
+                line.seek(0)
+                line.truncate()
+
+        return StreamingResponse(
+            _chunked(lines()),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'},
+        )
 
-    try:
-        cur.execute("""
-            SELECT l.id, l.license_key, l.customer_name, l.email, l.machine_id,
-                   l.is_active, l.transfer_count, l.source,
-                   l.purchase_price_cents / 100.0 as purchase_price,
-                   l.activated_at, l.created_at,
-                   u.full_name as user_name
-            FROM licenses l
-            LEFT JOIN users u ON l.user_id = u.id
-            ORDER BY l.created_at DESC
-        """)
-        rows = cur.fetchall()
+    # json / ndjson: satır başına bir JSON nesnesi
+    return StreamingResponse(
+        _chunked(json.dumps(json_row(r), ensure_ascii=False) + "\n" for r in rows),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson"'},
+    )
 
-        if format == "csv":
-            import io
-            output = io.StringIO()
-            output.write("ID,Lisans Key,Müşteri,E-posta,Makine ID,Aktif,Transfer,Kaynak,Fiyat,Aktivasyon,Oluşturma\n")
-            for r in rows:
-                output.write(f"{r['id']},{r['license_key']},{r['customer_name'] or ''},{r['email'] or ''},{r['machine_id'] or ''},{r['is_active']},{r['transfer_count']},{r['source'] or ''},{r['purchase_price'] or ''},{r['activated_at'] or ''},{r['created_at']}\n")
 
-            return {"success": True, "format": "csv", "data": output.getvalue()}
+def _export_page(name: str, after: Optional[int], limit: int, where: str = "",
+                 params: Optional[list] = None) -> dict:
+    """One keyset page (newest id first) of an export for the admin panel tables."""
+    query, id_column, _, _, _, json_row = _EXPORTS[name]
+    limit = max(1, min(limit, EXPORT_PAGE_LIMIT_MAX))
+    params = list(params or [])
+    if after is not None:
+        where += f" AND {id_column} < %s"
+        params.append(after)
+    params.append(limit)
 
-        licenses = []
-        for r in rows:
-            licenses.append({
-                "id": r['id'],
-                "license_key": r['license_key'],
-                "customer_name": r['customer_name'],
-                "email": r['email'],
-                "machine_id": r['machine_id'],
-                "is_active": r['is_active'],
-                "transfer_count": r['transfer_count'],
-                "source": r['source'],
-                "purchase_price": float(r['purchase_price']) if r['purchase_price'] else None,
-                "activated_at": r['activated_at'].isoformat() if r['activated_at'] else None,
-                "created_at": r['created_at'].isoformat() if r['created_at'] else None
-            })
+    conn = get_db()
+    cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
-        return {"success": True, "format": "json", "data": licenses}
+    try:
+        cur.execute(f"{query}{where} ORDER BY {id_column} DESC LIMIT %s", params)
+        data = [json_row(r) for r in cur.fetchall()]
+        next_cursor = data[-1]["id"] if len(data) == limit else None
+        return {"success": True, "data": data, "next_cursor": next_cursor}
 
     finally:
         cur.close()
         conn.close()
 
 
-@app.get("/api/admin/export/users")
-async def admin_export_users(format: str = "json", authorization: str = Header(None)):
-    """Export users as JSON or CSV"""
+@app.get("/api/admin/export/orders")
+def admin_export_orders(
+    format: str = "json",
+    start_date: str = None,
+    end_date: str = None,
+    authorization: str = Header(None)
+):
+    """Stream orders as CSV or NDJSON"""
     verify_admin_token(authorization)
+    where, params = _order_date_filters(start_date, end_date)
+    return _stream_export("orders", format, where, params)
 
-    conn = get_db()
-    cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
-    try:
-        cur.execute("""
-            SELECT u.id, u.email, u.full_name, u.phone, u.company_name,
-                   u.email_verified, u.role, u.created_at, u.last_login_at,
-                   COUNT(DISTINCT o.id) as order_count,
-                   COALESCE(SUM(CASE WHEN o.payment_status = 'completed' THEN o.total_price_cents ELSE 0 END), 0) / 100.0 as total_spent,
-                   COUNT(DISTINCT l.id) as license_count
-            FROM users u
-            LEFT JOIN orders o ON u.id = o.user_id
-            LEFT JOIN licenses l ON u.id = l.user_id
-            GROUP BY u.id
-            ORDER BY u.created_at DESC
-        """)
-        rows = cur.fetchall()
+@app.get("/api/admin/export/orders/page")
+def admin_export_orders_page(
+    after: Optional[int] = None,
+    limit: int = 50,
+    start_date: str = None,
+    end_date: str = None,
+    authorization: str = Header(None)
+):
+    """Keyset-paginated orders; pass ``next_cursor`` back as ``after``"""
+    verify_admin_token(authorization)
+    where, params = _order_date_filters(start_date, end_date)
+    return _export_page("orders", after, limit, where, params)
 
-        if format == "csv":
-            import io
-            output = io.StringIO()
-            output.write("ID,E-posta,Ad Soyad,Telefon,Şirket,Doğrulanmış,Rol,Kayıt,Son Giriş,Sipariş,Harcama,Lisans\n")
-            for r in rows:
-                output.write(f"{r['id']},{r['email']},{r['full_name'] or ''},{r['phone'] or ''},{r['company_name'] or ''},{r['email_verified']},{r['role']},{r['created_at']},{r['last_login_at'] or ''},{r['order_count']},{r['total_spent']},{r['license_count']}\n")
 
-            return {"success": True, "format": "csv", "data": output.getvalue()}
+@app.get("/api/admin/export/licenses")
+def admin_export_licenses(format: str = "json", authorization: str = Header(None)):
+    """Stream licenses as CSV or NDJSON"""
+    verify_admin_token(authorization)
+    return _stream_export("licenses", format)
 
-        users = []
-        for r in rows:
-            users.append({
-                "id": r['id'],
-                "email": r['email'],
-                "full_name": r['full_name'],
-                "phone": r['phone'],
-                "company_name": r['company_name'],
-                "email_verified": r['email_verified'],
-                "role": r['role'],
-                "created_at": r['created_at'].isoformat() if r['created_at'] else None,
-                "last_login_at": r['last_login_at'].isoformat() if r['last_login_at'] else None,
-                "order_count": r['order_count'],
-                "total_spent": float(r['total_spent']),
-                "license_count": r['license_count']
-            })
 
-        return {"success": True, "format": "json", "data": users}
+@app.get("/api/admin/export/licenses/page")
+def admin_export_licenses_page(after: Optional[int] = None, limit: int = 50,
+                               authorization: str = Header(None)):
+    """Keyset-paginated licenses; pass ``next_cursor`` back as ``after``"""
+    verify_admin_token(authorization)
+    return _export_page("licenses", after, limit)
 
-    finally:
-        cur.close()
-        conn.close()
+
+@app.get("/api/admin/export/users")
+def admin_export_users(format: str = "json", authorization: str = Header(None)):
+    """Stream users as CSV or NDJSON"""
+    verify_admin_token(authorization)
+    return _stream_export("users", format)
+
+
+@app.get("/api/admin/export/users/page")
+def admin_export_users_page(after: Optional[int] = None, limit: int = 50,
+                            authorization: str = Header(None)):
+    """Keyset-paginated users; pass ``next_cursor`` back as ``after``"""
+    verify_admin_token(authorization)
+    return _export_page("users", after, limit)
 
 
 # ============ EMAIL MANAGEMENT API ============
@@ -5240,7 +6724,7 @@ class EmailTemplateUpdateRequest(BaseModel):
     is_active: Optional[bool] = True
 
 @app.get("/api/admin/email/templates")
-async def admin_get_email_templates(authorization: str = Header(None)):
+def admin_get_email_templates(authorization: str = Header(None)):
     """Get all email templates"""
     verify_admin_token(authorization)
 
@@ -5278,7 +6762,7 @@ async def admin_get_email_templates(authorization: str = Header(None)):
 
 
 @app.get("/api/admin/email/templates/{template_key}")
-async def admin_get_email_template(template_key: str, authorization: str = Header(None)):
+def admin_get_email_template(template_key: str, authorization: str = Header(None)):
     """Get single email template"""
     verify_admin_token(authorization)
 
@@ -5312,7 +6796,7 @@ async def admin_get_email_template(template_key: str, authorization: str = Heade
 
 
 @app.put("/api/admin/email/templates/{template_key}")
-async def admin_update_email_template(template_key: str, req: EmailTemplateUpdateRequest, authorization: str = Header(None)):
+def admin_update_email_template(template_key: str, req: EmailTemplateUpdateRequest, authorization: str = Header(None)):
     """Update email template"""
     verify_admin_token(authorization)
 
@@ -5329,6 +6813,7 @@ async def admin_update_email_template(template_key: str, req: EmailTemplateUpdat
 
         result = cur.fetchone()
         conn.commit()
+        email_template_cache.invalidate()
 
         if not result:
             return {"success": False, "error": "Şablon bulunamadı"}
@@ -5341,7 +6826,7 @@ async def admin_update_email_template(template_key: str, req: EmailTemplateUpdat
 
 
 @app.post("/api/admin/email/templates/{template_key}/toggle")
-async def admin_toggle_email_template(template_key: str, authorization: str = Header(None)):
+def admin_toggle_email_template(template_key: str, authorization: str = Header(None)):
     """Toggle email template active status"""
     verify_admin_token(authorization)
 
@@ -5358,6 +6843,7 @@ async def admin_toggle_email_template(template_key: str, authorization: str = He
 
         result = cur.fetchone()
         conn.commit()
+        email_template_cache.invalidate()
 
         if not result:
             return {"success": False, "error": "Şablon bulunamadı"}
@@ -5370,7 +6856,7 @@ async def admin_toggle_email_template(template_key: str, authorization: str = He
 
 
 @app.post("/api/admin/email/preview")
-async def admin_preview_email(template_key: str, authorization: str = Header(None)):
+def admin_preview_email(template_key: str, authorization: str = Header(None)):
     """Preview email template with sample data"""
     verify_admin_token(authorization)
 
@@ -5394,7 +6880,7 @@ async def admin_preview_email(template_key: str, authorization: str = Header(Non
 
 
 @app.post("/api/admin/email/test")
-async def admin_send_test_email(template_key: str, test_email: str, authorization: str = Header(None)):
+def admin_send_test_email(template_key: str, test_email: str, authorization: str = Header(None)):
     """Send test email"""
     verify_admin_token(authorization)
 
@@ -5426,48 +6912,36 @@ async def admin_send_test_email(template_key: str, test_email: str, authorizatio
 
 
 @app.get("/api/admin/email/logs")
-async def admin_get_email_logs(
-    page: int = 1,
+def admin_get_email_logs(
     limit: int = 50,
     template_key: str = None,
     status: str = None,
+    since: str = None,
+    until: str = None,
+    cursor: str = None,
     authorization: str = Header(None)
 ):
-    """Get email logs with pagination"""
+    """Get email logs, newest first; pass ``next_cursor`` back as ``cursor``"""
     verify_admin_token(authorization)
 
     conn = get_db()
     cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
     try:
-        offset = (page - 1) * limit
-        where_clauses = []
-        params = []
-
-        if template_key:
-            where_clauses.append("e.template_key = %s")
-            params.append(template_key)
-
-        if status:
-            where_clauses.append("e.status = %s")
-            params.append(status)
-
-        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
-
-        cur.execute(f"SELECT COUNT(*) FROM email_logs e WHERE {where_sql}", params)
-        total = cur.fetchone()[0]
-
-        cur.execute(f"""
+        rows, next_cursor = keyset_page(
+            cur,
+            """
             SELECT e.*, t.template_name
             FROM email_logs e
             LEFT JOIN email_templates t ON e.template_key = t.template_key
-            WHERE {where_sql}
-            ORDER BY e.created_at DESC
-            LIMIT %s OFFSET %s
-        """, params + [limit, offset])
+            """,
+            "e",
+            filters={"template_key": template_key, "status": status},
+            since=since, until=until, cursor=cursor, limit=limit, table="email_logs",
+        )
 
         logs = []
-        for row in cur.fetchall():
+        for row in rows:
             logs.append({
                 "id": row['id'],
                 "template_key": row['template_key'],
@@ -5483,9 +6957,7 @@ async def admin_get_email_logs(
         return {
             "success": True,
             "logs": logs,
-            "total": total,
-            "page": page,
-            "pages": (total + limit - 1) // limit
+            "next_cursor": next_cursor
         }
 
     finally:
@@ -5494,7 +6966,7 @@ async def admin_get_email_logs(
 
 
 @app.get("/api/admin/email/stats")
-async def admin_get_email_stats(authorization: str = Header(None)):
+def admin_get_email_stats(authorization: str = Header(None)):
     """Get email statistics"""
     verify_admin_token(authorization)
 
@@ -5550,7 +7022,8 @@ async def admin_get_email_stats(authorization: str = Header(None)):
                 "total_failed": total_failed,
                 "today_sent": today_sent,
                 "by_template": by_template,
-                "daily": daily
+                "daily": daily,
+                "dispatch": email_dispatcher.metrics()
             }
         }
 
@@ -5561,10 +7034,6 @@ async def admin_get_email_stats(authorization: str = Header(None)):
 
 # ============ STATIC FILES ============
 
-# Mount download directory for static file serving
-if os.path.exists(DOWNLOAD_DIR):
-    app.mount("/download", StaticFiles(directory=DOWNLOAD_DIR), name="download")
-
 # Mount media directory for image serving
 if os.path.exists(MEDIA_DIR):
     app.mount("/media", StaticFiles(directory=MEDIA_DIR), name="media")
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Sunucu testlerinde psycopg2 bağlantısının yerine geçen SQLite düzeneği.
+
+Yalnızca sunucu kodunun kullandığı imleç/bağlantı yüzeyini taklit eder;
+sorgular ``%s`` yer tutucuları ``?`` yapılarak bellekteki SQLite'ta
+çalışır. PostgreSQL'e özgü sözdizimini (``ON CONFLICT``, ``FILTER``,
+``ANY``, satır değeri karşılaştırmaları, ``information_schema``)
+doğrulamaz; bunlar ``test_server_postgres.py``'de gerçek sunucuda denenir.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+class SqliteCursor:
+    """psycopg2 imlecinin sunucuda kullanılan kısmı.
+
+    SQLite'ta olmayan ``information_schema`` sorgusu sütunu NULL kabul eder
+    gösterir, ``ALTER TABLE`` ise çalıştırılmaz, yalnızca kaydedilir (ya da
+    bağlantının ``alter_error`` hatasını yükseltir).
+    """
+
+    def __init__(self, conn: "SqliteConnection") -> None:
+        self._conn = conn
+        self._result: list = []
+        self.rowcount = -1
+
+    def execute(self, sql: str, params=()) -> None:
+        statement = " ".join(sql.split())
+        self._conn.statements.append(statement)
+        if "information_schema" in statement:
+            self._result = [(True,)]
+        elif statement.startswith("ALTER TABLE"):
+            if self._conn.alter_error is not None:
+                raise self._conn.alter_error
+            self._conn.altered.append(statement.split()[2])
+            self._result = []
+        else:
+            cursor = self._conn.db.execute(sql.replace("%s", "?"), tuple(params))
+            self._result = cursor.fetchall()
+            self.rowcount = cursor.rowcount
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return list(self._result)
+
+    def close(self) -> None:
+        self._conn.open_cursors -= 1
+
+
+class SqliteConnection:
+    """Çalıştırılan sorguları, açık imleçleri ve commit'leri sayan bağlantı."""
+
+    def __init__(self) -> None:
+        self.db = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.statements: list[str] = []
+        self.altered: list[str] = []
+        self.alter_error: Exception | None = None
+        self.open_cursors = 0
+        self.commits = 0
+
+    def cursor(self, cursor_factory=None) -> SqliteCursor:
+        self.open_cursors += 1
+        return SqliteCursor(self)
+
+    def commit(self) -> None:
+        self.commits += 1
+        self.db.commit()
+
+    def rollback(self) -> None:
+        self.db.rollback()
+
+    def close(self) -> None:
+        pass
+
+    def executed(self, prefix: str) -> int:
+        """``prefix`` ile başlayan (boşlukları sadeleştirilmiş) sorgu sayısı."""
+        return sum(statement.startswith(prefix) for statement in self.statements)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Yönetim paneli keyset sayfalamasının (imleç, tarih filtreleri, NULL tarihler) doğrulamaları."""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = PROJECT_ROOT / "server"
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+try:
+    from fastapi import HTTPException
+    from fastapi.testclient import TestClient
+    import main as server
+except ImportError:  # pragma: no cover - sunucu bağımlılıkları kurulu değil
+    server = None
+
+from server_db import SqliteConnection
+
+
+@unittest.skipIf(server is None, "sunucu bağımlılıkları kurulu değil")
+class KeysetPaginationTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = SqliteConnection()
+        self.addCleanup(self.conn.db.close)
+        self.conn.db.execute(
+            "CREATE TABLE activity_log (id INTEGER PRIMARY KEY, activity_type TEXT, description TEXT,"
+            " user_id INTEGER, license_key TEXT, order_id INTEGER, ip_address TEXT, metadata TEXT,"
+            " created_at TIMESTAMP)"
+        )
+        for table in ("users", "email_logs"):
+            self.conn.db.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, created_at TIMESTAMP)")
+        start = datetime(2026, 5, 1, 9, 0)
+        # Aynı zamanlı kayıtlar id ile ayrılır; iki kayıt eski sürümden NULL tarihli
+        moments = [start, start, start + timedelta(hours=1), None, start - timedelta(days=3), None]
+        self.conn.db.executemany(
+            "INSERT INTO activity_log (activity_type, created_at) VALUES (?, ?)",
+            (("login", moment) for moment in moments),
+        )
+        self.conn.db.commit()
+        patcher = mock.patch.object(server, "_keyset_nullable_tables", set())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _page_through(self, limit: int = 2, **kwargs) -> list[int]:
+        ids, cursor = [], None
+        while True:
+            rows, cursor = server.keyset_page(
+                self.conn.cursor(), "SELECT * FROM activity_log a", "a",
+                cursor=cursor, limit=limit, table="activity_log", **kwargs
+            )
+            ids.extend(row["id"] for row in rows)
+            if cursor is None:
+                return ids
+
+    def test_cursor_round_trip(self) -> None:
+        moment = datetime(2026, 5, 1, 9, 30, 15, 123456)
+        token = server.encode_page_cursor(moment, 42)
+        self.assertEqual(server.decode_page_cursor(token), (moment, 42))
+        self.assertEqual(server.decode_page_cursor(server.encode_page_cursor(None, 7)), (None, 7))
+        for bad in ("", "bm90LWpzb24", token[:-3]):
+            with self.subTest(token=bad), self.assertRaises(HTTPException) as raised:
+                server.decode_page_cursor(bad)
+            self.assertEqual(raised.exception.status_code, 400)
+
+    def test_null_dates_are_backfilled_and_paged_last(self) -> None:
+        server.ensure_keyset_columns(self.conn)
+        self.assertEqual(self.conn.altered, list(server.KEYSET_PAGED_TABLES))
+        self.assertEqual(
+            self.conn.db.execute("SELECT COUNT(*) FROM activity_log WHERE created_at IS NULL").fetchone()[0], 0
+        )
+
+        # Tarihi olmayan kayıtlar en eski kayda eşitlenir: hiçbiri atlanmaz, en sonda listelenir
+        self.assertEqual(self._page_through(), [3, 2, 1, 6, 5, 4])
+        self.assertEqual(self._page_through(since="2026-05-01T00:00:00"), [3, 2, 1])
+        self.assertEqual(self._page_through(until="2026-05-01 09:00"), [6, 5, 4])
+
+    def test_failed_migration_pages_null_dates_last(self) -> None:
+        self.conn.alter_error = sqlite3.OperationalError("tablo kilitli")
+        with self.assertLogs(server.logger, "ERROR") as logs:
+            server.ensure_keyset_columns(self.conn)
+        self.assertEqual(len(logs.records), len(server.KEYSET_PAGED_TABLES))
+        self.assertIn("activity_log.created_at", logs.output[1])
+        # Doldurma geri alınır; NULL tarihli kayıtlar yine de hiçbir sayfadan düşmez
+        self.assertEqual(
+            self.conn.db.execute("SELECT COUNT(*) FROM activity_log WHERE created_at IS NULL").fetchone()[0], 2
+        )
+        for limit in (1, 2, 4):
+            with self.subTest(limit=limit):
+                self.assertEqual(self._page_through(limit), [3, 2, 1, 5, 6, 4])
+        self.assertEqual(self._page_through(since="2026-05-01T00:00:00"), [3, 2, 1])
+
+        # Geçiş sonradan başarılı olursa satır değeri karşılaştırmasına dönülür
+        self.conn.alter_error = None
+        server.ensure_keyset_columns(self.conn)
+        self.assertEqual(self._page_through(), [3, 2, 1, 6, 5, 4])
+
+    def test_malformed_date_filters_are_rejected(self) -> None:
+        server.ensure_keyset_columns(self.conn)
+        with mock.patch.multiple(
+            server,
+            get_db=lambda: self.conn,
+            verify_admin_token=lambda authorization: None,
+            admin_stats_cache=mock.Mock(get=lambda conn, group: {"activity_type_counts": {}}),
+        ):
+            client = TestClient(server.app)
+            first = client.get("/api/admin/activity", params={"limit": 4})
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual([a["id"] for a in first.json()["activities"]], [3, 2, 1, 6])
+            rest = client.get("/api/admin/activity", params={"limit": 4, "cursor": first.json()["next_cursor"]})
+            self.assertEqual([a["id"] for a in rest.json()["activities"]], [5, 4])
+            self.assertIsNone(rest.json()["next_cursor"])
+
+            for params in ({"since": "dün"}, {"until": "2026-13-01"}, {"cursor": "bozuk"}):
+                with self.subTest(params=params):
+                    self.assertEqual(client.get("/api/admin/activity", params=params).status_code, 400)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Yönetim paneli istatistik önbelleğinin (grup bazlı sorgu ve geçersiz kılma) doğrulamaları."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = PROJECT_ROOT / "server"
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+try:
+    from fastapi.testclient import TestClient
+    import main as server
+except ImportError:  # pragma: no cover - sunucu bağımlılıkları kurulu değil
+    server = None
+
+from server_db import SqliteConnection
+
+
+@unittest.skipIf(server is None, "sunucu bağımlılıkları kurulu değil")
+class AdminStatsCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = SqliteConnection()
+        self.addCleanup(self.conn.db.close)
+        self.conn.db.execute("CREATE TABLE activity_log (id INTEGER PRIMARY KEY, activity_type TEXT)")
+        self.conn.db.executemany(
+            "INSERT INTO activity_log (activity_type) VALUES (?)", [("login",), ("login",), ("payment",)]
+        )
+        self.conn.db.execute("CREATE TABLE licenses (license_key TEXT PRIMARY KEY, is_active INTEGER)")
+        self.conn.db.execute("INSERT INTO licenses VALUES ('ANAHTAR', 1)")
+
+        # Lisans grubunun PostgreSQL'e özgü sorgusu yerine sayaçlı bir karşılığı
+        self.license_queries = 0
+
+        def license_stats(cur) -> dict:
+            self.license_queries += 1
+            cur.execute("SELECT COUNT(*) FILTER (WHERE is_active) AS active_licenses FROM licenses")
+            return dict(cur.fetchone())
+
+        patcher = mock.patch.dict(server.ADMIN_STAT_GROUPS, licenses=license_stats)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = server.AdminStatsCache(ttl=60)
+
+    def test_only_stale_groups_are_queried(self) -> None:
+        stats = self.cache.get(self.conn, "licenses", "activity_types")
+        self.assertEqual(stats, {"active_licenses": 1, "activity_type_counts": {"login": 2, "payment": 1}})
+        self.assertEqual(self.conn.open_cursors, 0)
+
+        self.conn.db.execute("INSERT INTO activity_log (activity_type) VALUES ('login')")
+        self.conn.db.execute("UPDATE licenses SET is_active = 0")
+        with mock.patch.object(self.conn, "cursor", side_effect=AssertionError("sorgu çalıştı")):
+            self.assertEqual(self.cache.get(self.conn, "licenses", "activity_types"), stats)
+
+        # Yalnızca geçersiz kılınan grup yeniden sorgulanır
+        self.cache.invalidate("activity_types")
+        refreshed = self.cache.get(self.conn, "licenses", "activity_types")
+        self.assertEqual(refreshed["activity_type_counts"]["login"], 3)
+        self.assertEqual(refreshed["active_licenses"], 1)
+        self.assertEqual(self.license_queries, 1)
+
+        self.cache.ttl = 0
+        self.cache.invalidate("licenses")
+        self.cache.get(self.conn, "licenses")
+        self.assertEqual(self.cache.get(self.conn, "licenses"), {"active_licenses": 0})
+        self.assertEqual(self.license_queries, 3)
+
+    def test_license_writes_invalidate_the_dashboard_figures(self) -> None:
+        with mock.patch.multiple(
+            server,
+            get_db=lambda: self.conn,
+            admin_stats_cache=self.cache,
+            license_cache=server.LicenseStateCache(60),
+            log_activity=mock.Mock(),
+            verify_admin_token=lambda authorization: None,
+        ):
+            self.assertEqual(self.cache.get(self.conn, "licenses"), {"active_licenses": 1})
+            client = TestClient(server.app)
+            response = client.post("/api/admin/license/toggle", json={"license_key": "ANAHTAR"})
+            self.assertTrue(response.json()["success"])
+            self.assertEqual(self.cache.get(self.conn, "licenses"), {"active_licenses": 0})
+        self.assertEqual(self.license_queries, 2)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Uyarı çipleri taraması ve önbelleği için doğrulamalar."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import alerts, db
+from app.alerts import AlertsScanner
+
+
+TODAY = date(2024, 3, 4)
+
+
+class AlertsScannerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._orig_db_path = db.DB_PATH
+        self._orig_docs_dir = db.DOCS_DIR
+        temp_docs = Path(self._temp_dir.name)
+        db.DOCS_DIR = str(temp_docs)
+        os.makedirs(db.DOCS_DIR, exist_ok=True)
+        db.DB_PATH = str(temp_docs / "data.db")
+        db.initialize_database()
+
+        self._execute(
+            "INSERT INTO dosyalar (buro_takip_no, durusma_tarihi) VALUES (1, '2024-03-04 10:30')"
+        )
+        self._execute(
+            "INSERT INTO dosyalar (buro_takip_no, durusma_tarihi, is_archived) VALUES (2, '2024-03-04', 1)"
+        )
+        self._execute("INSERT INTO dosyalar (buro_takip_no, durusma_tarihi) VALUES (3, '2024-03-11')")
+        self._execute("INSERT INTO dosyalar (buro_takip_no, durusma_tarihi) VALUES (4, '2024-03-12')")
+        self._execute("INSERT INTO tebligatlar (dosya_no, is_son_gunu) VALUES ('T1', '2024-03-05')")
+        dosya_id = self._execute("INSERT INTO dosyalar (buro_takip_no) VALUES (5)")
+        finans_id = self._execute("INSERT INTO finans (dosya_id) VALUES (?)", (dosya_id,))
+        self._execute(
+            "INSERT INTO taksitler (finans_id, vade_tarihi) VALUES (?, '2024-03-06')", (finans_id,)
+        )
+        self._execute(
+            "INSERT INTO taksitler (finans_id, vade_tarihi, odeme_tarihi) VALUES (?, '2024-03-06', '2024-03-01')",
+            (finans_id,),
+        )
+
+    def tearDown(self) -> None:  # pragma: no cover - test cleanup
+        db.close_all_connections()
+        db.DB_PATH = self._orig_db_path
+        db.DOCS_DIR = self._orig_docs_dir
+        self._temp_dir.cleanup()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with db.connection_scope() as conn:
+            return conn.execute(sql, params).lastrowid
+
+    @staticmethod
+    def _counts(chips) -> dict[tuple[str, str], int]:
+        return {(chip.timeframe_key, chip.category_key): chip.count for chip in chips}
+
+    def test_counts_every_timeframe_and_category(self) -> None:
+        chips = AlertsScanner().scan(reference_date=TODAY)
+        self.assertEqual(
+            self._counts(chips),
+            {
+                ("today", "hearing"): 1,
+                ("tomorrow", "notice"): 1,
+                ("week", "payment"): 1,
+                ("week", "hearing"): 1,
+            },
+        )
+        self.assertEqual(
+            [(chip.timeframe_key, chip.category_key) for chip in chips],
+            [
+                ("today", "hearing"),
+                ("tomorrow", "notice"),
+                ("week", "hearing"),
+                ("week", "payment"),
+            ],
+        )
+
+    def test_result_is_cached_until_the_change_log_moves(self) -> None:
+        scanner = AlertsScanner()
+        scanner.scan(reference_date=TODAY)
+        with mock.patch.object(alerts, "get_connection", side_effect=AssertionError):
+            cached = scanner.scan(reference_date=TODAY)
+        self.assertEqual(self._counts(cached)[("tomorrow", "notice")], 1)
+
+        self._execute("INSERT INTO tebligatlar (dosya_no, is_son_gunu) VALUES ('T2', '2024-03-05')")
+        refreshed = scanner.scan(reference_date=TODAY)
+        self.assertEqual(self._counts(refreshed)[("tomorrow", "notice")], 2)
+
+        next_day = scanner.scan(reference_date=date(2024, 3, 5))
+        self.assertEqual(self._counts(next_day)[("today", "notice")], 2)
+
+    def test_legacy_payment_plan_dates_are_not_counted(self) -> None:
+        # Eski şemada odeme_plani'nda vade sütunu kalmış olabilir; trigger'ı yok
+        self._execute("ALTER TABLE odeme_plani ADD COLUMN vade_tarihi TEXT")
+        plan_finans_id = self._execute("INSERT INTO finans (dosya_id) VALUES (2)")
+        self._execute(
+            "INSERT INTO odeme_plani (finans_id, vade_tarihi) VALUES (?, '2024-03-04')", (plan_finans_id,)
+        )
+
+        scanner = AlertsScanner()
+        self.assertEqual(self._counts(scanner.scan(reference_date=TODAY))[("week", "payment")], 1)
+        self.assertNotIn(("today", "payment"), self._counts(scanner.scan(reference_date=TODAY)))
+
+        finans_id = self._execute("INSERT INTO finans (dosya_id) VALUES (3)")
+        self._execute("INSERT INTO taksitler (finans_id, vade_tarihi) VALUES (?, '2024-03-05')", (finans_id,))
+        self.assertEqual(self._counts(scanner.scan(reference_date=TODAY))[("tomorrow", "payment")], 1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Yedek kataloğunun ve arka plan denetiminin doğrulamaları."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import backup_catalog, db
+
+
+@unittest.skipIf(db.SQLCIPHER_AVAILABLE, "SQLCipher yedekleri ayrı test edilir")
+class BackupCatalogTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        temp_docs = Path(self._temp_dir.name)
+        for target, value in (
+            ("DOCS_DIR", str(temp_docs)),
+            ("DB_PATH", str(temp_docs / "data.db")),
+            ("BACKUP_DIR", str(temp_docs / "yedekler")),
+        ):
+            patcher = mock.patch.object(db, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(db.close_all_connections)
+
+        db.initialize_database()
+        with db.connection_scope() as conn:
+            conn.executemany(
+                "INSERT INTO dosyalar (muvekkil_adi) VALUES (?)", ((f"Müvekkil {i}",) for i in range(40))
+            )
+
+    def _no_file_access(self):
+        """Katalogdan okunması gereken bilgiler için dosya incelemesini yasaklar."""
+        failure = AssertionError("yedek dosyası incelendi")
+        return mock.patch.multiple(
+            db,
+            _describe_backup=mock.Mock(side_effect=failure),
+            _detect_backup_type=mock.Mock(side_effect=failure),
+            read_manifest=mock.Mock(side_effect=failure),
+        )
+
+    def _listed(self) -> dict:
+        return {backup["filename"]: backup for backup in db.list_backups()}
+
+    def test_backups_are_cataloged_at_creation(self) -> None:
+        backups = [db.create_backup()]
+        # Anlık görüntü kullanılamadığında alınan tam kopya da kataloglanır
+        with mock.patch.object(db, "create_snapshot_backup", return_value=None):
+            backups.append(db.create_backup())
+
+        expected_types = ["snapshot", "machine" if db.CRYPTOGRAPHY_AVAILABLE else "plain"]
+        with self._no_file_access():
+            listed = self._listed()
+            for backup_path, expected_type in zip(backups, expected_types):
+                backup = listed[os.path.basename(backup_path)]
+                self.assertEqual(backup["backup_type"], expected_type)
+                self.assertEqual(backup["dava_count"], 40)
+                self.assertEqual(backup["checksum"], backup_catalog.file_checksum(backup_path))
+                self.assertIsNotNone(backup["schema"])
+                self.assertIsNone(backup["validation"])
+                self.assertEqual(db.get_backup_type(backup_path), expected_type)
+                self.assertEqual(db.get_backup_info(backup_path)["user_count"], backup["user_count"])
+        self.assertEqual(len({listed[os.path.basename(p)]["schema"] for p in backups}), 1)
+
+    def test_uncataloged_backups_are_described_once(self) -> None:
+        legacy = os.path.join(db.get_backup_dir(), "data_backup_20240101_000000.db")
+        db.close_all_connections()
+        source = db.connect_database_file()
+        dest = sqlite3.connect(legacy)
+        source.backup(dest)
+        source.close()
+        dest.close()
+
+        self.assertEqual(self._listed()[os.path.basename(legacy)]["dava_count"], 40)
+        with self._no_file_access():
+            self.assertEqual(self._listed()[os.path.basename(legacy)]["backup_type"], "plain")
+
+        # Silinen yedeğin kaydı, dışarıdan silinenler de listelemede kaldırılır
+        second = os.path.join(db.get_backup_dir(), "data_backup_20240102_000000.db")
+        shutil.copy2(legacy, second)
+        self.assertEqual(len(self._listed()), 2)
+        self.assertTrue(db.safe_delete_file(legacy)[0])
+        os.remove(second)
+        self.assertEqual(self._listed(), {})
+        catalog = db.get_backup_catalog()
+        self.assertIsNone(catalog.lookup(legacy))
+        self.assertEqual(catalog.pending_checks(timedelta(0)), [])
+
+    def test_background_verifier_rechecks_checksums_lazily(self) -> None:
+        with mock.patch.object(db, "create_snapshot_backup", return_value=None):
+            backups = [db.create_backup() for _ in range(3)]
+
+        # İlk çalıştırma: hiç doğrulanmamış yedekler tam doğrulamadan geçer
+        with mock.patch.object(db, "_validate_backup_file", wraps=db._validate_backup_file) as full:
+            results = db.verify_backup_catalog(limit=2)
+        self.assertEqual(full.call_count, 2)
+        self.assertEqual([ok for _, ok, _ in results], [True, True])
+        self.assertEqual(len(db.verify_backup_catalog()), 1)
+        self.assertEqual(db.verify_backup_catalog(), [])  # hepsi yeni denetlendi
+
+        # Değişiklik zamanı korunarak bozulan yedek özetle yakalanır
+        target = backups[0]
+        stat = os.stat(target)
+        data = bytearray(Path(target).read_bytes())
+        data[len(data) // 2] ^= 1
+        Path(target).write_bytes(bytes(data))
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        with mock.patch.object(db, "_validate_backup_file", wraps=db._validate_backup_file) as full:
+            results = dict((name, ok) for name, ok, _ in db.verify_backup_catalog(max_age_days=0, limit=None))
+        full.assert_not_called()
+        self.assertFalse(results[os.path.basename(target)])
+        self.assertTrue(all(ok for name, ok in results.items() if name != os.path.basename(target)))
+
+        listed = self._listed()[os.path.basename(target)]
+        self.assertFalse(listed["validation"]["ok"])
+        self.assertIn("özet", listed["validation"]["message"])
+        # Başlığı sağlam olsa da tam doğrulama da özet uyuşmazlığını bildirir
+        self.assertFalse(db.validate_backup_file(target)[0])
+
+    def test_changed_backups_are_not_re_checksummed(self) -> None:
+        with mock.patch.object(db, "create_snapshot_backup", return_value=None):
+            touched, corrupted = db.create_backup(), db.create_backup()
+        self.assertTrue(all(ok for _, ok, _ in db.verify_backup_catalog(limit=None)))
+        checksums = {path: backup_catalog.file_checksum(path) for path in (touched, corrupted)}
+
+        # Yalnızca değişiklik zamanı değişen (ör. kopyalanan) yedek geçerli kalır
+        os.utime(touched, ns=(0, os.stat(touched).st_mtime_ns + 10**9))
+        # Değişiklik zamanını da güncelleyen bozulma kaydı yenileyerek gizlenemez
+        data = bytearray(Path(corrupted).read_bytes())
+        data[len(data) // 2] ^= 1
+        Path(corrupted).write_bytes(bytes(data))
+
+        listed = self._listed()
+        self.assertTrue(listed[os.path.basename(touched)]["validation"]["ok"])
+        self.assertFalse(listed[os.path.basename(corrupted)]["validation"]["ok"])
+        for path, checksum in checksums.items():
+            self.assertEqual(listed[os.path.basename(path)]["checksum"], checksum)
+
+        self.assertTrue(db.validate_backup_file(touched)[0])
+        is_valid, message = db.validate_backup_file(corrupted)
+        self.assertFalse(is_valid)
+        self.assertEqual(message, backup_catalog.CHANGED_MESSAGE)
+        results = dict((name, ok) for name, ok, _ in db.verify_backup_catalog(max_age_days=0, limit=None))
+        self.assertEqual(results, {os.path.basename(touched): True, os.path.basename(corrupted): False})
+
+    def test_changed_backup_is_caught_before_it_is_listed(self) -> None:
+        with mock.patch.object(db, "create_snapshot_backup", return_value=None):
+            target = db.create_backup()
+        data = bytearray(Path(target).read_bytes())
+        data[len(data) // 2] ^= 1
+        Path(target).write_bytes(bytes(data))
+
+        # Liste yenilenmeden önceki denetim ve doğrulama da ilk özeti kullanır
+        self.assertEqual(db.verify_backup_catalog(), [(os.path.basename(target), False, backup_catalog.CHANGED_MESSAGE)])
+        self.assertEqual(db.validate_backup_file(target), (False, backup_catalog.CHANGED_MESSAGE))
+        self.assertFalse(self._listed()[os.path.basename(target)]["validation"]["ok"])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
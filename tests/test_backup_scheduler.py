@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Arka plan yedekleme zamanlayıcısı, adımlı kopya ve saklama politikası doğrulamaları."""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import backup_scheduler, db
+from app.backup_scheduler import BackupJobError, BackupScheduler, RetentionPolicy
+
+
+def _backups(*moments: datetime) -> list[dict]:
+    return [{"filepath": moment.isoformat(), "created_at": moment} for moment in moments]
+
+
+class RetentionSelectionTestCase(unittest.TestCase):
+    def test_keeps_newest_backup_of_each_recent_bucket(self) -> None:
+        now = datetime(2026, 3, 18, 12, 30)  # Çarşamba
+        backups = _backups(
+            now,
+            now - timedelta(minutes=20),  # aynı saat: yalnızca en yenisi
+            now - timedelta(hours=1),
+            now - timedelta(hours=2),
+            now - timedelta(days=1),
+            now - timedelta(days=1, hours=3),  # aynı gün
+            now - timedelta(days=3),
+            now - timedelta(days=9),
+            now - timedelta(days=20),
+            now - timedelta(days=60),
+        )
+        keep = db.select_backups_to_keep(backups, keep_count=1, hourly=3, daily=3, weekly=3)
+        expected = {
+            now,  # son yedek + saatlik + günlük + haftalık
+            now - timedelta(minutes=20),  # MINIMUM_BACKUP_COUNT: en yeni 3 yedek
+            now - timedelta(hours=1),
+            now - timedelta(hours=2),
+            now - timedelta(days=1),
+            now - timedelta(days=3),  # 3. gün ve önceki ISO haftasının en yenisi
+            now - timedelta(days=20),  # üçüncü hafta
+        }
+        self.assertEqual(keep, {moment.isoformat() for moment in expected})
+
+    def test_counts_buckets_with_backups_not_calendar_time(self) -> None:
+        # Uygulama aylarca açılmadıysa eski yedekler topluca silinmemeli
+        start = datetime(2025, 1, 6, 9, 0)
+        backups = _backups(*(start - timedelta(days=day) for day in range(10)))
+        keep = db.select_backups_to_keep(backups, keep_count=0, daily=5)
+        self.assertEqual(len(keep), 5)
+
+    def test_settings_are_read_with_defaults(self) -> None:
+        stored = {"backup/hourly": 6, "backup/interval_hours": 0}
+
+        class Settings:
+            def value(self, key, default=None, type=None):  # noqa: A002 - QSettings imzası
+                return stored.get(key, default)
+
+        config = backup_scheduler.load_schedule_settings(Settings())
+        self.assertEqual(config["interval_hours"], 0)
+        self.assertTrue(config["auto_backup"])
+        self.assertEqual(config["policy"], RetentionPolicy(hourly=6))
+
+
+class BackupSchedulerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        temp_docs = Path(self._temp_dir.name)
+        for target, value in (
+            ("DOCS_DIR", str(temp_docs)),
+            ("DB_PATH", str(temp_docs / "data.db")),
+            ("BACKUP_DIR", str(temp_docs / "yedekler")),
+        ):
+            patcher = mock.patch.object(db, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(db.close_all_connections)
+
+        db.initialize_database()
+        with db.connection_scope() as conn:
+            conn.executemany(
+                "INSERT INTO dosyalar (muvekkil_adi, dosya_konusu) VALUES (?, ?)",
+                (("Müvekkil", "x" * 500) for _ in range(2000)),
+            )
+
+        self.events: list = []
+        self.scheduler = BackupScheduler(auto_backup=False, startup_delay=0)
+        self.scheduler.add_listener(self.events.append)
+        self.addCleanup(self.scheduler.stop)
+
+    def _states(self, job_id: int) -> list[str]:
+        return [event.state for event in self.events if event.job_id == job_id]
+
+    def test_backup_runs_in_worker_thread_and_reports_progress(self) -> None:
+        threads = set()
+        original = db.create_backup
+
+        def create_backup(**kwargs):
+            threads.add(threading.current_thread().name)
+            return original(**kwargs)
+
+        self.scheduler.start()
+        with mock.patch.object(db, "create_backup", create_backup):
+            future = self.scheduler.backup_now()
+            backup_path = future.result(timeout=60)
+
+        self.assertEqual(threads, {"backup-scheduler"})
+        self.assertEqual(db.validate_backup_file(backup_path)[0], True)
+        states = self._states(future.job_id)
+        self.assertEqual(states[0], backup_scheduler.STATE_STARTED)
+        self.assertEqual(states[-1], backup_scheduler.STATE_FINISHED)
+        progress = [e for e in self.events if e.state == backup_scheduler.STATE_PROGRESS]
+        self.assertTrue(progress)
+        self.assertEqual(progress[-1].done, progress[-1].total)
+
+    def test_failures_are_reported_and_queued_jobs_run_in_order(self) -> None:
+        order = []
+
+        def failing(progress):
+            order.append("failing")
+            raise BackupJobError("Yedekleme oluşturulamadı.")
+
+        failed = self.scheduler.submit("verify", "Bozuk", failing)
+        succeeded = self.scheduler.submit("verify", "Sağlam", lambda progress: order.append("ok") or 42)
+        self.scheduler.start()
+
+        self.assertEqual(succeeded.result(timeout=10), 42)
+        with self.assertRaises(BackupJobError):
+            failed.result(timeout=10)
+        self.assertEqual(order, ["failing", "ok"])
+        failure = [e for e in self.events if e.job_id == failed.job_id][-1]
+        self.assertEqual(failure.state, backup_scheduler.STATE_FAILED)
+        self.assertIn("oluşturulamadı", failure.error)
+
+    def test_startup_backup_applies_retention_policy(self) -> None:
+        finished = threading.Event()
+        self.scheduler.add_listener(
+            lambda event: event.state == backup_scheduler.STATE_FINISHED and finished.set()
+        )
+        with mock.patch.object(db, "apply_retention_policy", wraps=db.apply_retention_policy) as retention:
+            self.scheduler.configure(
+                auto_backup=True, interval_hours=0, policy=RetentionPolicy(keep_count=4, hourly=0)
+            )
+            self.scheduler.start()
+            self.assertTrue(finished.wait(60))
+            self.assertTrue(self.scheduler.stop())
+
+        retention.assert_called_once_with(keep_count=4, hourly=0, daily=7, weekly=4)
+        self.assertEqual(db.get_backup_count(), 1)
+
+    def test_stepped_copy_keeps_live_database_writable(self) -> None:
+        steps = []
+
+        def progress(done: int, total: int) -> None:
+            steps.append((done, total))
+            if len(steps) == 1:
+                # Kopya sürerken başka bir bağlantı beklemeden yazabilmeli
+                writer = sqlite3.connect(db._page_encrypted_db_uri() or db.DB_PATH, uri=True, timeout=0)
+                writer.execute("INSERT INTO dosyalar (muvekkil_adi) VALUES ('Kopya sırasında')")
+                writer.commit()
+                writer.close()
+
+        target = str(Path(self._temp_dir.name) / "tam_kopya.db")
+        with mock.patch.object(db, "BACKUP_STEP_PAGES", 16):
+            self.assertEqual(db.create_backup(target, encrypt=False, progress=progress), target)
+
+        self.assertGreater(len(steps), 2)
+        self.assertEqual(steps[-1][0], steps[-1][1])
+        conn = sqlite3.connect(target)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("PRAGMA integrity_check").fetchone()[0], "ok")
+        # Kaynak değişince SQLite kopyayı yeniden başlatır: yazılan satır da kopyadadır
+        self.assertEqual(
+            conn.execute("SELECT COUNT(*) FROM dosyalar WHERE muvekkil_adi = 'Kopya sırasında'").fetchone()[0],
+            1,
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""Artımlı, tekilleştirilmiş yedek deposunun doğrulamaları."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import backup_store, db
+
+
+@unittest.skipIf(db.get_snapshot_store is None or db.SQLCIPHER_AVAILABLE, "anlık görüntü deposu kullanılamıyor")
+class SnapshotBackupTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        temp_docs = Path(self._temp_dir.name)
+        for target, value in (
+            ("DOCS_DIR", str(temp_docs)),
+            ("DB_PATH", str(temp_docs / "data.db")),
+            ("BACKUP_DIR", str(temp_docs / "yedekler")),
+        ):
+            patcher = mock.patch.object(db, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Küçük parçalar: birkaç yüz KB'lık veritabanı çok sayıda parçaya bölünür
+        patcher = mock.patch.object(backup_store, "CHUNK_SIZE", 16 * 1024)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(db.close_all_connections)
+
+        db.initialize_database()
+        self._insert("Başlangıç", 2000)
+
+    def _insert(self, name: str, count: int) -> None:
+        with db.connection_scope() as conn:
+            conn.executemany(
+                "INSERT INTO dosyalar (muvekkil_adi, dosya_konusu) VALUES (?, ?)",
+                ((name, "x" * 200) for _ in range(count)),
+            )
+
+    def _count(self, name: str) -> int:
+        with db.connection_scope() as conn:
+            return conn.execute("SELECT COUNT(*) FROM dosyalar WHERE muvekkil_adi = ?", (name,)).fetchone()[0]
+
+    def test_unchanged_database_reuses_chunks_without_reading(self) -> None:
+        first = db.create_backup()
+        self.assertEqual(db.get_backup_type(first), "snapshot")
+        first_manifest = backup_store.read_manifest(first)
+        self.assertGreater(first_manifest["new_bytes"], 0)
+        self.assertEqual(first_manifest["counts"]["dosyalar"], 2000)
+
+        with mock.patch.object(db, "_read_database_blocks", side_effect=AssertionError("dosya okundu")):
+            second = db.create_backup()
+        second_manifest = backup_store.read_manifest(second)
+        self.assertNotEqual(first, second)
+        self.assertEqual(second_manifest["chunks"], first_manifest["chunks"])
+        self.assertEqual(second_manifest["new_bytes"], 0)
+
+        # Küçük bir değişiklik yalnızca değişen parçaları yazar
+        self._insert("Yeni", 5)
+        third_manifest = backup_store.read_manifest(db.create_backup())
+        changed = set(third_manifest["chunks"]) - set(first_manifest["chunks"])
+        self.assertGreater(third_manifest["new_bytes"], 0)
+        self.assertTrue(0 < len(changed) < len(first_manifest["chunks"]) / 4, (len(changed), len(first_manifest["chunks"])))
+
+        listed = {backup["filepath"]: backup for backup in db.list_backups()}
+        self.assertIn(first, listed)
+        self.assertEqual(listed[first]["size_bytes"], first_manifest["size"])
+        self.assertEqual(db.get_backup_info(first)["dava_count"], 2000)
+
+    def test_restore_reassembles_older_snapshot(self) -> None:
+        snapshot = db.create_backup()
+        self._insert("Sonradan", 10)
+        self.assertEqual(self._count("Sonradan"), 10)
+
+        self.assertEqual(db.validate_backup_file(snapshot)[0], True)
+        ok, message = db.restore_backup(snapshot)
+        self.assertTrue(ok, message)
+        self.assertEqual(self._count("Sonradan"), 0)
+        self.assertEqual(self._count("Başlangıç"), 2000)
+
+    def test_writes_during_snapshot_do_not_leak_into_it(self) -> None:
+        original = db._read_database_blocks
+
+        def read_while_writing(path, block_size):
+            for index, block in enumerate(original(path, block_size)):
+                if index == 1:
+                    # WAL kipinde yazıcı anlık görüntü sürerken engellenmez
+                    writer = sqlite3.connect(db._page_encrypted_db_uri() or db.DB_PATH, uri=True, timeout=1)
+                    writer.execute("INSERT INTO dosyalar (muvekkil_adi) VALUES ('Eşzamanlı')")
+                    writer.commit()
+                    writer.close()
+                yield block
+
+        with mock.patch.object(db, "_read_database_blocks", read_while_writing):
+            snapshot = db.create_backup()
+        self.assertEqual(self._count("Eşzamanlı"), 1)
+
+        exported = str(Path(self._temp_dir.name) / "export.db")
+        db.get_snapshot_store().export(snapshot, exported)
+        conn = sqlite3.connect(exported)
+        self.assertEqual(conn.execute("PRAGMA integrity_check").fetchone()[0], "ok")
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM dosyalar WHERE muvekkil_adi = 'Eşzamanlı'").fetchone()[0], 0)
+        conn.close()
+
+    def test_cleanup_collects_unreferenced_chunks_and_detects_corruption(self) -> None:
+        snapshots = []
+        for index in range(5):
+            self._insert(f"Tur {index}", 300)
+            snapshots.append(db.create_backup())
+        store = db.get_snapshot_store()
+        usage_before = store.disk_usage()
+
+        self.assertEqual(db.cleanup_old_backups(keep_count=3), 2)
+        self.assertLess(store.disk_usage(), usage_before)
+        for snapshot in snapshots[2:]:
+            self.assertTrue(db.validate_backup_file(snapshot)[0])
+
+        chunk_id = backup_store.read_manifest(snapshots[-1])["chunks"][0]
+        chunk_path = Path(store._chunk_path(chunk_id))
+        data = bytearray(chunk_path.read_bytes())
+        data[-1] ^= 1
+        chunk_path.write_bytes(bytes(data))
+        is_valid, message = db.validate_backup_file(snapshots[-1])
+        self.assertFalse(is_valid)
+        self.assertIn("bozuk", message)
+
+    def test_truncated_chunk_is_rewritten_by_next_snapshot(self) -> None:
+        first = db.create_backup()
+        store = db.get_snapshot_store()
+        self._insert("Sonra", 10)
+
+        # Yeni parçalar ve dizinleri manifestten önce diske indirilir
+        with mock.patch.object(backup_store.os, "fsync", wraps=os.fsync) as fsync:
+            second = db.create_backup()
+        shared = set(backup_store.read_manifest(first)["chunks"]) & set(backup_store.read_manifest(second)["chunks"])
+        self.assertTrue(shared)
+        self.assertGreater(fsync.call_count, 1)
+
+        # Çökme sonrası boş kalmış parça: dosya var ama içeriği yok
+        chunk_path = Path(store._chunk_path(sorted(shared)[0]))
+        chunk_path.write_bytes(b"")
+        self.assertFalse(db.validate_backup_file(second)[0])
+
+        self._insert("En son", 10)
+        db.create_backup()
+        self.assertGreater(chunk_path.stat().st_size, 0)
+        self.assertTrue(store.verify(second)[0])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
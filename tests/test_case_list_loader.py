@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Dosya listesini kuşaklar halinde yükleyen arka plan worker'ı için doğrulamalar."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import db
+from app.workers import CaseListLoadWorker
+
+
+class CaseListLoadWorkerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._orig_db_path = db.DB_PATH
+        self._orig_docs_dir = db.DOCS_DIR
+        temp_docs = Path(self._temp_dir.name)
+        db.DOCS_DIR = str(temp_docs)
+        os.makedirs(db.DOCS_DIR, exist_ok=True)
+        db.DB_PATH = str(temp_docs / "data.db")
+        db.initialize_database()
+        with db.connection_scope() as conn:
+            conn.executemany(
+                "INSERT INTO dosyalar (buro_takip_no, muvekkil_adi, is_archived) VALUES (?, ?, ?)",
+                [(bn, f"Müvekkil {bn}", 1 if bn > 7 else 0) for bn in range(1, 10)],
+            )
+
+        # Hazırlanan satırlar yerine takip numaraları; sinyaller doğrudan bağlantıyla toplanır
+        self.worker = CaseListLoadWorker(
+            lambda records: [record["buro_takip_no"] for record in records], batch_size=3
+        )
+        self.events: list[tuple] = []
+        self.worker.batchReady.connect(lambda *args: self.events.append(("batch", *args)))
+        self.worker.targetLoaded.connect(lambda *args: self.events.append(("loaded", *args)))
+        self.worker.loadFinished.connect(lambda *args: self.events.append(("finished", *args)))
+        self.worker.errorOccurred.connect(lambda *args: self.events.append(("error", *args)))
+
+    def tearDown(self) -> None:  # pragma: no cover - test cleanup
+        db.close_all_connections()
+        db.DB_PATH = self._orig_db_path
+        db.DOCS_DIR = self._orig_docs_dir
+        self._temp_dir.cleanup()
+
+    @staticmethod
+    def _request(**extra) -> dict:
+        return {"active": {"hex6": None}, "archived": {"hex6": None, "archived": True}, **extra}
+
+    def test_generation_is_emitted_in_batches(self) -> None:
+        self.worker.load(1, self._request())
+        self.assertEqual(
+            self.events,
+            [
+                ("batch", 1, "active", [1, 2, 3]),
+                ("batch", 1, "active", [4, 5, 6]),
+                ("batch", 1, "active", [7]),
+                ("loaded", 1, "active", 7, None),
+                ("batch", 1, "archived", [8, 9]),
+                ("loaded", 1, "archived", 2, None),
+                ("finished", 1),
+            ],
+        )
+
+    def test_stale_generation_is_dropped(self) -> None:
+        # Kuyrukta bekleyen eski istek, yenisi başladıktan sonra hiç çalışmaz
+        self.worker.cancel_before(3)
+        self.worker.load(2, self._request())
+        self.assertEqual(self.events, [])
+        self.assertTrue(self.worker.is_stale(2))
+
+        # Yükleme sürerken yeni kuşak başlarsa kalan partiler ve bitiş bildirilmez
+        def cancel_after_first_batch(generation: int, target: str, batch: object) -> None:
+            self.worker.cancel_before(generation + 1)
+
+        self.worker.batchReady.connect(cancel_after_first_batch)
+        self.worker.load(3, self._request())
+        self.worker.batchReady.disconnect(cancel_after_first_batch)
+        self.assertEqual(self.events, [("batch", 3, "active", [1, 2, 3])])
+
+        # Daha eski bir kuşağa geri dönülmez; yeni kuşak eksiksiz yüklenir
+        self.worker.cancel_before(2)
+        self.assertTrue(self.worker.is_stale(3))
+        self.events.clear()
+        self.worker.load(4, self._request(archived=None, post_filter=lambda records: records[::2]))
+        self.assertEqual(
+            self.events,
+            [
+                ("batch", 4, "active", [1, 3, 5]),
+                ("batch", 4, "active", [7]),
+                ("loaded", 4, "active", 4, None),
+                ("finished", 4),
+            ],
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover - manuel çalıştırma
+    unittest.main()
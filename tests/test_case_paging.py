@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Dosya listesi keyset sayfalaması için doğrulamalar."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import db
+from app.case_query import query_case_page, query_cases
+
+
+class CasePagingTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._orig_db_path = db.DB_PATH
+        self._orig_docs_dir = db.DOCS_DIR
+        temp_docs = Path(self._temp_dir.name)
+        db.DOCS_DIR = str(temp_docs)
+        os.makedirs(db.DOCS_DIR, exist_ok=True)
+        db.DB_PATH = str(temp_docs / "data.db")
+        db.initialize_database()
+        with db.connection_scope() as conn:
+            # Takip numarası olmayan iki dosya sıralamada başa düşer
+            conn.executemany(
+                "INSERT INTO dosyalar (buro_takip_no, muvekkil_adi, is_archived) VALUES (?, ?, 1)",
+                [(bn, f"Arşiv {index}") for index, bn in enumerate([None, 5, 3, None, 9, 1, 7])],
+            )
+
+    def tearDown(self) -> None:  # pragma: no cover - test cleanup
+        db.close_all_connections()
+        db.DB_PATH = self._orig_db_path
+        db.DOCS_DIR = self._orig_docs_dir
+        self._temp_dir.cleanup()
+
+    def test_pages_cover_full_result_in_order(self) -> None:
+        expected = [row["id"] for row in query_cases(archived=True)]
+        seen: list[int] = []
+        after = None
+        pages = 0
+        while True:
+            records, after = query_case_page(3, after=after, archived=True)
+            seen.extend(row["id"] for row in records)
+            pages += 1
+            if after is None:
+                break
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 3)
+        self.assertEqual(
+            [row["buro_takip_no"] for row in query_cases(archived=True)],
+            [None, None, 1, 3, 5, 7, 9],
+        )
+
+    def test_filters_apply_to_pages(self) -> None:
+        records, after = query_case_page(10, archived=True, search_text="arşiv 4")
+        self.assertEqual([row["muvekkil_adi"] for row in records], ["Arşiv 4"])
+        self.assertIsNone(after)
+
+
+if __name__ == "__main__":  # pragma: no cover - manuel çalıştırma
+    unittest.main()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""Özet tablo tabanlı dosya sorgusunun eski ``fetch_dosyalar_by_color_hex`` ile eşdeğerliği."""
+
+from __future__ import annotations
+
+import itertools
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import db
+from app.case_query import durusma_period_range
+from app.services.dosya_service import fetch_dosyalar_by_color_hex
+from app.utils import normalize_hex, normalize_str, resolve_owner_label
+
+
+_COMPARED_FIELDS = (
+    "id",
+    "aktif_durum",
+    "status_color",
+    "dava_durumu_color",
+    "tekrar_dava_durumu_2_color",
+    "dava_durumu_owner",
+    "tekrar_dava_durumu_2_owner",
+)
+
+
+def _legacy_fetch(
+    hex6: str | None,
+    search_text: str | None = None,
+    open_only: bool | None = None,
+    other_filters: Dict[str, Any] | None = None,
+    archived: bool = False,
+    assigned_user_id: int | None = None,
+) -> List[Dict[str, Any]]:
+    """Özet tablodan önceki ``fetch_dosyalar_by_color_hex`` (join + Python araması)."""
+    conn = db.get_connection()
+    conn.row_factory = sqlite3.Row
+    has_history = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='dosya_durumlari'"
+    ).fetchone() is not None
+
+    params: Dict[str, Any] = {"is_archived": 1 if archived else 0}
+    where_clauses = ["d.is_archived = :is_archived"]
+    if assigned_user_id is not None:
+        params["assigned_user_id"] = int(assigned_user_id)
+        where_clauses.append(
+            "EXISTS (SELECT 1 FROM dosya_atamalar da WHERE da.dosya_id = d.id AND da.user_id = :assigned_user_id)"
+        )
+    if hex6:
+        params["hex6"] = hex6
+        where_clauses.append(
+            "(UPPER(REPLACE(sd1.color_hex,'#','')) = :hex6 "
+            "OR UPPER(REPLACE(sd2.color_hex,'#','')) = :hex6 "
+            "OR UPPER(REPLACE(sa.color_hex,'#','')) = :hex6)"
+        )
+    if open_only and not archived:
+        where_clauses.append(
+            "NOT (UPPER(COALESCE(NULLIF(d.dava_durumu,''),'')) = 'DOSYA KAPANDI' "
+            "OR UPPER(COALESCE(NULLIF(d.tekrar_dava_durumu_2,''),'')) = 'DOSYA KAPANDI')"
+        )
+    period = durusma_period_range((other_filters or {}).get("durusma_period"))
+    if period:
+        where_clauses.append("d.durusma_tarihi BETWEEN :durusma_start AND :durusma_end")
+        params["durusma_start"], params["durusma_end"] = (day.isoformat() for day in period)
+
+    if has_history:
+        query = """
+        WITH last_status AS (
+            SELECT dd.dosya_id, dd.durum AS aktif_durum, MAX(dd.created_at) AS max_ts
+            FROM dosya_durumlari dd GROUP BY dd.dosya_id
+        )
+        SELECT d.*, ls.aktif_durum AS aktif_durum, sa.color_hex AS status_color,
+               sd1.owner AS dava_durumu_owner, sd2.owner AS tekrar_dava_durumu_2_owner,
+               sd1.color_hex AS dava_durumu_color, sd2.color_hex AS tekrar_dava_durumu_2_color
+        FROM dosyalar d
+        LEFT JOIN last_status ls ON ls.dosya_id = d.id
+        LEFT JOIN statuses sa ON sa.ad = ls.aktif_durum
+        LEFT JOIN statuses sd1 ON sd1.ad = d.dava_durumu
+        LEFT JOIN statuses sd2 ON sd2.ad = d.tekrar_dava_durumu_2
+        """
+    else:
+        query = """
+        SELECT d.*, COALESCE(NULLIF(d.tekrar_dava_durumu_2,''), d.dava_durumu) AS aktif_durum,
+               sa.color_hex AS status_color,
+               sd1.owner AS dava_durumu_owner, sd2.owner AS tekrar_dava_durumu_2_owner,
+               sd1.color_hex AS dava_durumu_color, sd2.color_hex AS tekrar_dava_durumu_2_color
+        FROM dosyalar d
+        LEFT JOIN statuses sd1 ON sd1.ad = d.dava_durumu
+        LEFT JOIN statuses sd2 ON sd2.ad = d.tekrar_dava_durumu_2
+        LEFT JOIN statuses sa ON sa.ad = COALESCE(NULLIF(d.tekrar_dava_durumu_2,''), d.dava_durumu)
+        """
+    query += " WHERE " + " AND ".join(where_clauses) + " ORDER BY d.buro_takip_no"
+    rows = [dict(row) for row in conn.execute(query, params).fetchall()]
+    conn.close()
+
+    needle = normalize_str(search_text) if search_text else None
+    result = []
+    for record in rows:
+        for field in ("status_color", "dava_durumu_color", "tekrar_dava_durumu_2_color"):
+            record[field] = normalize_hex(record.get(field))
+        for field in ("dava_durumu", "tekrar_dava_durumu_2"):
+            record[f"{field}_owner"] = resolve_owner_label(
+                record.get(f"{field}_owner"), record.get(f"{field}_color")
+            )
+        if needle:
+            haystack = " ".join(normalize_str(str(record.get(field, ""))) for field in db.DOSYA_SEARCH_FIELDS)
+            if needle not in haystack:
+                continue
+        result.append(record)
+    return result
+
+
+class CaseQueryParityTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._orig_db_path = db.DB_PATH
+        self._orig_docs_dir = db.DOCS_DIR
+        temp_docs = Path(self._temp_dir.name)
+        db.DOCS_DIR = str(temp_docs)
+        os.makedirs(db.DOCS_DIR, exist_ok=True)
+        db.DB_PATH = str(temp_docs / "data.db")
+        db.initialize_database()
+
+        today = date.today()
+        statuses = [
+            "DAVA AÇILACAK", "ARA KARAR BEKLENİYOR", "CEVABA CEVAP BEKLENİYOR",
+            "DOSYA KAPANDI", "ÖZEL DURUM", "", None,
+        ]
+        people = ["Ahmet Yılmaz", "IŞIK İnşaat", "Ayşe Kaya", "Mehmet Öztürk"]
+        subjects = ["Kira alacağı", "İşçilik alacağı", "Tazminat", "Boşanma"]
+        courts = ["Ankara 3. Asliye Hukuk", "İstanbul 5. İş Mahkemesi", "İzmir Sulh Hukuk"]
+        with db.connection_scope() as conn:
+            self.user_id = conn.execute(
+                "INSERT INTO users (username, password_hash, role) VALUES ('avukat', 'x', 'avukat')"
+            ).lastrowid
+            for index in range(60):
+                dosya_id = conn.execute(
+                    """
+                    INSERT INTO dosyalar (buro_takip_no, dosya_esas_no, muvekkil_adi, dosya_konusu,
+                        mahkeme_adi, dava_durumu, tekrar_dava_durumu_2, durusma_tarihi, is_archived)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        1000 - index,
+                        f"2024/{100 + index}",
+                        people[index % 4],
+                        subjects[index % 4],
+                        courts[index % 3],
+                        statuses[index % 7],
+                        statuses[(index * 3) % 7] if index % 5 == 0 else None,
+                        (today + timedelta(days=index % 40 - 5)).isoformat(),
+                        1 if index % 9 == 0 else 0,
+                    ),
+                ).lastrowid
+                if index % 4 == 1:
+                    conn.execute(
+                        "INSERT INTO dosya_atamalar (dosya_id, user_id) VALUES (?, ?)", (dosya_id, self.user_id)
+                    )
+
+    def tearDown(self) -> None:  # pragma: no cover - test cleanup
+        db.close_all_connections()
+        db.DB_PATH = self._orig_db_path
+        db.DOCS_DIR = self._orig_docs_dir
+        self._temp_dir.cleanup()
+
+    def _assert_same_rows(self) -> None:
+        filters = itertools.product(
+            (None, "FFD700", "FF8C00", "CD853F", "FF0000", "123456"),
+            (None, "ankara", "Yılmaz", "kira", "2024/15"),
+            (None, True),
+            (False, True),
+            (None, self.user_id),
+            (None, {"durusma_period": "bu_hafta"}, {"durusma_period": "bu_ay"}),
+        )
+        checked = 0
+        for hex6, search_text, open_only, archived, assigned_user_id, other_filters in filters:
+            kwargs = dict(
+                search_text=search_text,
+                open_only=open_only,
+                other_filters=other_filters,
+                archived=archived,
+                assigned_user_id=assigned_user_id,
+            )
+            expected = [
+                tuple(row[field] for field in _COMPARED_FIELDS) for row in _legacy_fetch(hex6, **kwargs)
+            ]
+            actual = [
+                tuple(row[field] for field in _COMPARED_FIELDS)
+                for row in fetch_dosyalar_by_color_hex(hex6, **kwargs)
+            ]
+            self.assertEqual(actual, expected, (hex6, kwargs))
+            checked += bool(expected)
+        # Karşılaştırmaların çoğu boş olmayan sonuç üzerinde yapılır
+        self.assertGreater(checked, 200)
+
+    def test_summary_table_matches_legacy_query(self) -> None:
+        self._assert_same_rows()
+
+    def test_summary_table_matches_legacy_query_with_status_history(self) -> None:
+        with db.connection_scope() as conn:
+            conn.execute(
+                "CREATE TABLE dosya_durumlari (id INTEGER PRIMARY KEY, dosya_id INTEGER, durum TEXT, created_at TEXT)"
+            )
+            ids = [row[0] for row in conn.execute("SELECT id FROM dosyalar ORDER BY id")]
+            conn.executemany(
+                "INSERT INTO dosya_durumlari (dosya_id, durum, created_at) VALUES (?, ?, ?)",
+                [
+                    (dosya_id, durum, f"2024-01-0{day}")
+                    for dosya_id in ids[::2]
+                    for day, durum in ((1, "DAVA AÇILACAK"), (2, "ARA KARAR BEKLENİYOR"))
+                ],
+            )
+        self._assert_same_rows()
+
+
+if __name__ == "__main__":  # pragma: no cover - manuel çalıştırma
+    unittest.main()
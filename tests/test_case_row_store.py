@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Sütun bazlı dosya satır deposu (CaseRowStore) için doğrulamalar."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app.case_row_store import CaseRowStore
+
+
+def _record(dosya_id: int, **overrides):
+    record = {
+        "id": dosya_id,
+        "buro_takip_no": dosya_id * 10,
+        "muvekkil_adi": f"Müvekkil {dosya_id}",
+        "dava_durumu": "DERDEST",
+        "durusma_tarihi": "2024-03-0%d" % dosya_id,
+        "updated_at": "2024-01-02 09:30:05",
+        "aktif_durum": None,
+    }
+    record.update(overrides)
+    return record
+
+
+class CaseRowStoreTestCase(unittest.TestCase):
+    def test_rows_round_trip_through_compact_columns(self) -> None:
+        records = [_record(1), _record(2, buro_takip_no=None, durusma_tarihi=None)]
+        store = CaseRowStore(records)
+        self.assertEqual(list(store), records)
+        self.assertEqual(store.ordinal(0, "durusma_tarihi"), 738946)
+        self.assertEqual(store.ordinal(1, "durusma_tarihi"), 0)
+        # Aynı durum metni havuzda tek indekstir
+        self.assertEqual(store.code(0, "dava_durumu"), store.code(1, "dava_durumu"))
+
+    def test_unexpected_values_fall_back_to_plain_column(self) -> None:
+        store = CaseRowStore([_record(1)])
+        store.append(_record(2, durusma_tarihi="05.03.2024", buro_takip_no="B-7"))
+        self.assertIsNone(store.ordinal(0, "durusma_tarihi"))
+        self.assertEqual(store.value(1, "durusma_tarihi"), "05.03.2024")
+        self.assertEqual(store.column("buro_takip_no"), [10, "B-7"])
+        self.assertEqual(store[0], _record(1))
+
+    def test_mutations_and_reorder(self) -> None:
+        store = CaseRowStore([_record(1), _record(2), _record(3)])
+        store.update(0, {"dava_durumu": "DOSYA KAPANDI", "yeni_alan": "x"})
+        store.insert(1, _record(4))
+        self.assertEqual(store.pop(3)["id"], 3)
+        store.reorder([2, 0, 1])
+        self.assertEqual(store.column("id"), [2, 1, 4])
+        self.assertEqual(store.index_by_id(), {2: 0, 1: 1, 4: 2})
+        self.assertEqual(store.view(1).get("dava_durumu"), "DOSYA KAPANDI")
+        self.assertIsNone(store[0]["yeni_alan"])
+
+        store[0] = _record(2, muvekkil_adi="Değişti")
+        self.assertEqual(store[0]["muvekkil_adi"], "Değişti")
+
+    def test_extend_from_store_remaps_pool_and_copy_is_independent(self) -> None:
+        first = CaseRowStore([_record(1, dava_durumu="A")])
+        second = CaseRowStore([_record(2, dava_durumu="B"), _record(3, dava_durumu="A")])
+        first.extend(second)
+        self.assertEqual(first.column("dava_durumu"), ["A", "B", "A"])
+        self.assertEqual(first.code(0, "dava_durumu"), first.code(2, "dava_durumu"))
+
+        clone = first.copy()
+        clone.update(0, {"dava_durumu": "C"})
+        self.assertEqual(first.value(0, "dava_durumu"), "A")
+
+
+if __name__ == "__main__":  # pragma: no cover - manuel çalıştırma
+    unittest.main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Satır bazlı değişiklik akışı (change_log imleci) için doğrulamalar."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from functools import partial
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import db, workers
+from app.case_query import query_cases
+
+
+class ChangeFeedTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._orig_db_path = db.DB_PATH
+        self._orig_docs_dir = db.DOCS_DIR
+        temp_docs = Path(self._temp_dir.name)
+        db.DOCS_DIR = str(temp_docs)
+        os.makedirs(db.DOCS_DIR, exist_ok=True)
+        db.DB_PATH = str(temp_docs / "data.db")
+        db.initialize_database()
+        self.cursor = db.get_change_cursor()
+
+    def tearDown(self) -> None:  # pragma: no cover - test cleanup
+        db.close_all_connections()
+        db.DB_PATH = self._orig_db_path
+        db.DOCS_DIR = self._orig_docs_dir
+        self._temp_dir.cleanup()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with db.connection_scope() as conn:
+            return conn.execute(sql, params).lastrowid
+
+    def test_changes_are_collapsed_per_row(self) -> None:
+        kept = self._execute("INSERT INTO dosyalar (buro_takip_no, muvekkil_adi) VALUES (1, 'A')")
+        gone = self._execute("INSERT INTO dosyalar (buro_takip_no, muvekkil_adi) VALUES (2, 'B')")
+        self._execute("UPDATE dosyalar SET muvekkil_adi = 'A2' WHERE id = ?", (kept,))
+        self._execute("DELETE FROM dosyalar WHERE id = ?", (gone,))
+
+        feed = db.get_changes_since(self.cursor)
+        self.assertFalse(feed["overflow"])
+        self.assertEqual(feed["rows"]["dosyalar"], {kept: "I", gone: "D"})
+        self.assertEqual(feed["cursor"], db.get_change_cursor())
+
+        self._execute("UPDATE dosyalar SET muvekkil_adi = 'A3' WHERE id = ?", (kept,))
+        later = db.get_changes_since(feed["cursor"])
+        self.assertEqual(later["rows"], {"dosyalar": {kept: "U"}})
+        self.assertEqual(db.get_changes_since(later["cursor"])["tables"], set())
+
+    def test_assignment_is_reported_as_case_update(self) -> None:
+        dosya_id = self._execute("INSERT INTO dosyalar (buro_takip_no) VALUES (1)")
+        user_id = self._execute("INSERT INTO users (username, role, active) VALUES ('u', 'avukat', 1)")
+        cursor = db.get_change_cursor()
+        self._execute(
+            "INSERT INTO dosya_atamalar (dosya_id, user_id) VALUES (?, ?)", (dosya_id, user_id)
+        )
+        self.assertEqual(db.get_changes_since(cursor)["rows"], {"dosyalar": {dosya_id: "U"}})
+
+    def test_limit_and_pruning_report_overflow(self) -> None:
+        for index in range(5):
+            self._execute("INSERT INTO dosyalar (buro_takip_no) VALUES (?)", (index,))
+        self.assertTrue(db.get_changes_since(self.cursor, limit=3)["overflow"])
+
+        db.prune_change_log(keep=2)
+        self.assertTrue(db.get_changes_since(self.cursor)["overflow"])
+        self.assertFalse(db.get_changes_since(db.get_change_cursor() - 1)["overflow"])
+
+    def test_pruning_keeps_unread_entries_and_batches_deletes(self) -> None:
+        for index in range(10):
+            self._execute("INSERT INTO dosyalar (buro_takip_no) VALUES (?)", (index,))
+        read_upto = self.cursor + 4
+
+        # Dört okunmuş kayıt eşiği (slack) aşmıyor: silme yapılmaz
+        self.assertEqual(db.prune_change_log(keep=2, before=read_upto, slack=5), 0)
+        self.assertEqual(db.prune_change_log(keep=2, before=read_upto, slack=3), 4)
+        self.assertFalse(db.get_changes_since(read_upto)["overflow"])
+        self.assertTrue(db.get_changes_since(self.cursor)["overflow"])
+
+    def test_change_detector_prunes_consumed_entries(self) -> None:
+        for index in range(6):
+            self._execute("INSERT INTO dosyalar (buro_takip_no) VALUES (?)", (index,))
+        emitted = []
+        worker = workers.ChangeDetectorWorker(self.cursor + 3)
+        worker.changesDetected.connect(emitted.append)
+        with mock.patch.multiple(
+            workers, prune_change_log=partial(db.prune_change_log, keep=1), CHANGE_LOG_PRUNE_SLACK=0
+        ):
+            worker.run()
+
+        self.assertEqual(len(emitted[0]["rows"]["dosyalar"]), 3)
+        # İmlecin geride bıraktığı kayıtlar silindi, okunmamış olanlar duruyor
+        self.assertTrue(db.get_changes_since(self.cursor)["overflow"])
+        self.assertEqual(len(db.get_changes_since(self.cursor + 3)["rows"]["dosyalar"]), 3)
+
+    def test_query_cases_restricted_to_ids(self) -> None:
+        first = self._execute("INSERT INTO dosyalar (buro_takip_no, muvekkil_adi) VALUES (1, 'Ali')")
+        self._execute("INSERT INTO dosyalar (buro_takip_no, muvekkil_adi) VALUES (2, 'Ali')")
+        self.assertEqual([r["id"] for r in query_cases(search_text="ali", ids=[first])], [first])
+        self.assertEqual(query_cases(ids=[]), [])
+
+
+if __name__ == "__main__":  # pragma: no cover - manuel çalıştırma
+    unittest.main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Akışlı dosya ve yedek şifrelemesinin doğrulamaları."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import db_crypto
+
+
+@unittest.skipUnless(db_crypto.CRYPTOGRAPHY_AVAILABLE, "cryptography kurulu değil")
+class StreamEncryptionTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        from cryptography.fernet import Fernet
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = str(Path(tmp.name) / "takibi.db")
+        self.key = Fernet.generate_key()
+        patcher = mock.patch.object(db_crypto, "STREAM_CHUNK_SIZE", 4096)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write(self, data: bytes) -> None:
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    def _read(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_round_trip_across_chunk_boundaries(self) -> None:
+        for size in (0, 1, 4096, 4096 * 3, 4096 * 3 + 17):
+            with self.subTest(size=size):
+                data = os.urandom(size)
+                self._write(data)
+                self.assertTrue(db_crypto.encrypt_file(self.path, self.key))
+                encrypted = self._read()
+                self.assertTrue(encrypted.startswith(db_crypto.ENC_MARKER))
+                self.assertTrue(db_crypto.is_fernet_encrypted(self.path))
+                self.assertTrue(db_crypto.decrypt_file(self.path, self.key))
+                self.assertEqual(self._read(), data)
+
+    def test_legacy_fernet_file_is_still_readable(self) -> None:
+        from cryptography.fernet import Fernet
+
+        data = os.urandom(10_000)
+        self._write(db_crypto.ENC_MARKER_V1 + Fernet(self.key).encrypt(data))
+        self.assertTrue(db_crypto.decrypt_file(self.path, self.key))
+        self.assertEqual(self._read(), data)
+
+    def test_truncated_or_tampered_file_is_rejected_untouched(self) -> None:
+        from cryptography.fernet import Fernet
+
+        data = os.urandom(3 * 4096)
+        self._write(data)
+        self.assertTrue(db_crypto.encrypt_file(self.path, self.key))
+        encrypted = self._read()
+        header_size = len(db_crypto.ENC_MARKER) + 4 + 7
+        block_size = 4096 + 16
+
+        # Son parçanın tamamı kesilmiş, bir bayt değiştirilmiş ve yanlış anahtar
+        truncated = encrypted[:header_size + 2 * block_size]
+        tampered = bytearray(encrypted)
+        tampered[header_size + 10] ^= 1
+        for content, key in ((truncated, self.key), (bytes(tampered), self.key), (encrypted, Fernet.generate_key())):
+            self._write(content)
+            self.assertFalse(db_crypto.decrypt_file(self.path, key))
+            self.assertEqual(self._read(), content)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_password_backup_round_trip_and_legacy(self) -> None:
+        from cryptography.fernet import Fernet
+
+        data = os.urandom(50_000)
+        self._write(data)
+        self.assertTrue(db_crypto.encrypt_backup_with_password(self.path, "gizli", "ipucu"))
+        self.assertTrue(self._read().startswith(db_crypto.BACKUP_MARKER))
+        self.assertEqual(db_crypto.get_backup_hint(self.path), "ipucu")
+        self.assertFalse(db_crypto.decrypt_backup_with_password(self.path, "yanlış"))
+        self.assertTrue(db_crypto.decrypt_backup_with_password(self.path, "gizli"))
+        self.assertEqual(self._read(), data)
+
+        salt = os.urandom(16)
+        legacy_key = db_crypto.derive_key_from_password("gizli", salt)
+        self._write(db_crypto.BACKUP_MARKER_V2 + (0).to_bytes(2, "little") + salt
+                    + Fernet(legacy_key).encrypt(data))
+        self.assertTrue(db_crypto.is_password_protected_backup(self.path))
+        self.assertTrue(db_crypto.decrypt_backup_with_password(self.path, "gizli"))
+        self.assertEqual(self._read(), data)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Bağlantı havuzu için doğrulamalar."""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.db_pool import ConnectionPool, PoolBusyError, pooled_connection_class
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+    """``ConnectionPool`` davranışlarını doğrular."""
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._temp_dir.name) / "pool.db")
+        self.pool = ConnectionPool(max_idle_per_thread=2)
+        self.opened = 0
+
+    def tearDown(self) -> None:  # pragma: no cover - test cleanup
+        self.pool.close_all()
+        self._temp_dir.cleanup()
+
+    def _opener(self) -> sqlite3.Connection:
+        self.opened += 1
+        conn = sqlite3.connect(
+            self.db_path, factory=pooled_connection_class(), check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _acquire(self, key: str | None = None) -> sqlite3.Connection:
+        return self.pool.acquire(key or self.db_path, self._opener)
+
+    def test_close_returns_connection_to_pool(self) -> None:
+        first = self._acquire()
+        first.close()
+        second = self._acquire()
+        self.assertIs(first, second)
+        self.assertEqual(self.opened, 1)
+
+    def test_nested_acquire_gets_separate_connection(self) -> None:
+        outer = self._acquire()
+        inner = self._acquire()
+        self.assertIsNot(outer, inner)
+        inner.close()
+        outer.close()
+        self.assertEqual(self.opened, 2)
+
+    def test_uncommitted_changes_are_rolled_back_on_release(self) -> None:
+        conn = self._acquire()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.close()
+
+        conn = self._acquire()
+        try:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+        finally:
+            conn.close()
+
+    def test_row_factory_is_reset_on_release(self) -> None:
+        conn = self._acquire()
+        conn.row_factory = None
+        conn.close()
+        self.assertIs(self._acquire().row_factory, sqlite3.Row)
+
+    def test_double_close_does_not_duplicate_idle_entry(self) -> None:
+        conn = self._acquire()
+        conn.close()
+        conn.close()
+        first = self._acquire()
+        second = self._acquire()
+        self.assertIsNot(first, second)
+
+    def test_key_change_discards_idle_connection(self) -> None:
+        conn = self._acquire()
+        conn.close()
+        other = self._acquire(str(Path(self._temp_dir.name) / "other.db"))
+        self.assertIsNot(conn, other)
+
+    def test_close_all_invalidates_connections_in_use(self) -> None:
+        idle = self._acquire()
+        busy = self._acquire()
+        idle.close()
+
+        self.assertEqual(self.pool.close_all(), 1)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            idle.execute("SELECT 1")
+
+        busy.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            busy.execute("SELECT 1")
+
+    def test_threads_do_not_share_connections(self) -> None:
+        main_conn = self._acquire()
+        main_conn.close()
+        seen: list[sqlite3.Connection] = []
+
+        def worker() -> None:
+            conn = self._acquire()
+            seen.append(conn)
+            conn.close()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertIsNot(seen[0], main_conn)
+
+    def test_exclusive_waits_for_other_threads_and_blocks_new_acquires(self) -> None:
+        leased = threading.Event()
+        finish_query = threading.Event()
+        order: list[str] = []
+
+        def reader() -> None:
+            conn = self._acquire()
+            leased.set()
+            finish_query.wait(5)
+            # Sorgu sürerken bağlantı başka iş parçacığından kapatılmamalı
+            conn.execute("SELECT 1").fetchone()
+            order.append("okuma bitti")
+            conn.close()
+
+        def late_reader() -> None:
+            conn = self._acquire()
+            order.append("geç okuma")
+            conn.close()
+
+        first = threading.Thread(target=reader)
+        first.start()
+        self.assertTrue(leased.wait(5))
+        threading.Timer(0.2, finish_query.set).start()
+
+        with self.pool.exclusive(timeout=5):
+            order.append("özel erişim")
+            late = threading.Thread(target=late_reader)
+            late.start()
+            late.join(0.2)
+            self.assertTrue(late.is_alive())
+            # Sahip iş parçacığı havuzu kullanmaya devam edebilir
+            self._acquire().close()
+        late.join(5)
+        first.join(5)
+        self.assertEqual(order, ["okuma bitti", "özel erişim", "geç okuma"])
+
+    def test_exclusive_times_out_while_connection_is_held(self) -> None:
+        leased = threading.Event()
+        release = threading.Event()
+
+        def holder() -> None:
+            conn = self._acquire()
+            leased.set()
+            release.wait(5)
+            conn.close()
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        self.assertTrue(leased.wait(5))
+        with self.assertRaises(PoolBusyError):
+            with self.pool.exclusive(timeout=0.1):
+                self.fail("özel erişim alınmamalıydı")
+        release.set()
+        thread.join(5)
+
+        # Havuz eski haline döner; diğer iş parçacıkları yeniden bağlantı alabilir
+        worker = threading.Thread(target=lambda: self._acquire().close())
+        worker.start()
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+        with self.pool.exclusive(timeout=1):
+            pass
+
+
+if __name__ == "__main__":  # pragma: no cover - manuel çalıştırma
+    unittest.main()
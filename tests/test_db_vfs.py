@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""Sayfa şifreli SQLite VFS'inin ve canlı veritabanı entegrasyonunun doğrulamaları."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import db, db_crypto, db_vfs, models
+from app.demo_manager import DemoManager
+
+PAGE_VFS = db_crypto.enable_page_encryption() if db_crypto.CRYPTOGRAPHY_AVAILABLE else None
+SECRET = "GIZLI-MUVEKKIL-ADI"
+
+
+@unittest.skipIf(PAGE_VFS is None, "şifreli VFS kullanılamıyor")
+class PageCipherVFSTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = str(Path(tmp.name) / "vfs.db")
+
+    def _connect(self, vfs_name: str = PAGE_VFS) -> sqlite3.Connection:
+        conn = sqlite3.connect(db_vfs.uri_for(self.path, vfs_name), uri=True)
+        self.addCleanup(conn.close)
+        return conn
+
+    def _fill(self, conn: sqlite3.Connection, journal_mode: str) -> None:
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, body TEXT)")
+        with conn:
+            conn.executemany(
+                "INSERT INTO t (body) VALUES (?)", ((f"{SECRET}-{i}" * 5,) for i in range(5000))
+            )
+
+    def _assert_no_plaintext(self) -> None:
+        for suffix in ("", "-wal", "-journal"):
+            if os.path.exists(self.path + suffix):
+                with open(self.path + suffix, "rb") as f:
+                    data = f.read()
+                self.assertNotIn(SECRET.encode(), data)
+                self.assertNotIn(b"SQLite format 3", data)
+
+    def test_round_trip_in_wal_and_rollback_journal_modes(self) -> None:
+        for journal_mode in ("WAL", "DELETE"):
+            with self.subTest(journal_mode=journal_mode):
+                conn = self._connect()
+                self._fill(conn, journal_mode)
+                other = self._connect()
+                self.assertEqual(other.execute("SELECT COUNT(*) FROM t").fetchone()[0], 5000)
+
+                # Geri alınan işlem ve VACUUM sonrası dosya kısalır, içerik korunur
+                conn.execute("BEGIN")
+                conn.execute("DELETE FROM t WHERE id > 100")
+                self._assert_no_plaintext()
+                conn.rollback()
+                conn.execute("DELETE FROM t WHERE id > 2500")
+                conn.commit()
+                conn.execute("VACUUM")
+                self.assertEqual(other.execute("SELECT COUNT(*) FROM t").fetchone()[0], 2500)
+                self.assertEqual(conn.execute("PRAGMA integrity_check").fetchone()[0], "ok")
+                self._assert_no_plaintext()
+                self.assertTrue(db_vfs.is_page_encrypted(self.path))
+
+                conn.close()
+                other.close()
+                for suffix in ("", "-wal", "-shm", "-journal"):
+                    if os.path.exists(self.path + suffix):
+                        os.remove(self.path + suffix)
+
+    def test_wrong_key_and_plain_open_are_rejected(self) -> None:
+        self._fill(self._connect(), "DELETE")
+        wrong = db_vfs.register_page_cipher_vfs("takibi_enc_test_wrong", os.urandom(64))
+        self.assertIsNotNone(wrong)
+
+        # Anahtar doğrulaması açılışta, düz SQLite ise ilk okumada hata verir
+        for uri in (db_vfs.uri_for(self.path, wrong.name), self.path):
+            with self.subTest(uri=uri):
+                with self.assertRaises(sqlite3.DatabaseError):
+                    conn = sqlite3.connect(uri, uri=True)
+                    try:
+                        conn.execute("SELECT COUNT(*) FROM t").fetchone()
+                    finally:
+                        conn.close()
+
+
+@unittest.skipIf(PAGE_VFS is None, "şifreli VFS kullanılamıyor")
+class PageEncryptedDatabaseTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        temp_docs = Path(self._temp_dir.name)
+        for target, value in (
+            ("DOCS_DIR", str(temp_docs)),
+            ("DB_PATH", str(temp_docs / "data.db")),
+            ("BACKUP_DIR", str(temp_docs / "yedekler")),
+        ):
+            patcher = mock.patch.object(db, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(db.close_all_connections)
+
+    def _insert_secret(self) -> None:
+        with db.connection_scope() as conn:
+            conn.execute("INSERT INTO dosyalar (muvekkil_adi) VALUES (?)", (SECRET,))
+
+    def _secret_count(self) -> int:
+        with db.connection_scope() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM dosyalar WHERE muvekkil_adi = ?", (SECRET,)
+            ).fetchone()[0]
+
+    def _assert_encrypted_on_disk(self) -> None:
+        self.assertTrue(db_vfs.is_page_encrypted(db.DB_PATH))
+        for suffix in ("", "-wal"):
+            if os.path.exists(db.DB_PATH + suffix):
+                self.assertNotIn(SECRET.encode(), Path(db.DB_PATH + suffix).read_bytes())
+
+    def test_new_database_is_page_encrypted_while_open(self) -> None:
+        db.initialize_database()
+        self._insert_secret()
+
+        self._assert_encrypted_on_disk()
+        self.assertFalse(db._db_needs_encryption)
+        self.assertFalse(db.encrypt_database_on_shutdown())
+        self.assertEqual(self._secret_count(), 1)
+
+    def test_plain_and_file_encrypted_databases_are_migrated_once(self) -> None:
+        for file_encrypted in (False, True):
+            with self.subTest(file_encrypted=file_encrypted):
+                db.close_all_connections()
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(db.DB_PATH + suffix):
+                        os.remove(db.DB_PATH + suffix)
+                conn = sqlite3.connect(db.DB_PATH)
+                conn.execute("CREATE TABLE dosyalar (id INTEGER PRIMARY KEY, muvekkil_adi TEXT)")
+                conn.execute("INSERT INTO dosyalar (muvekkil_adi) VALUES (?)", (SECRET,))
+                conn.commit()
+                conn.close()
+                if file_encrypted:
+                    self.assertTrue(db_crypto.encrypt_file(db.DB_PATH))
+
+                self.assertEqual(self._secret_count(), 1)
+                self._assert_encrypted_on_disk()
+                self.assertFalse(os.path.exists(db.DB_PATH + ".vfs.tmp"))
+
+    def test_backup_and_restore_round_trip(self) -> None:
+        db.initialize_database()
+        self._insert_secret()
+
+        # Tam kopya yedek (artımlı anlık görüntüler test_backup_store'da)
+        backup_path = db.create_backup(str(Path(self._temp_dir.name) / "tam_yedek.db"))
+        self.assertIsNotNone(backup_path)
+        self.assertTrue(db_crypto.is_fernet_encrypted(backup_path))
+
+        with db.connection_scope() as conn:
+            conn.execute("DELETE FROM dosyalar")
+        self.assertEqual(self._secret_count(), 0)
+
+        ok, message = db.restore_backup(backup_path)
+        self.assertTrue(ok, message)
+        self.assertEqual(self._secret_count(), 1)
+        self._assert_encrypted_on_disk()
+
+    def test_direct_openers_use_the_encrypted_live_database(self) -> None:
+        db.initialize_database()
+        self._insert_secret()
+        self._assert_encrypted_on_disk()
+
+        # Demo/lisans kontrolü açılışta canlı veritabanını doğrudan açar
+        demo = DemoManager(db.DB_PATH)
+        self.assertTrue(demo.start_demo("demo@example.com")["success"])
+        self.assertEqual(demo.get_demo_status()["status"], "demo_active")
+
+        self.assertEqual(models.validate_database_file(db.DB_PATH)[0], True)
+
+        # Dışa aktarılan/transfer kopyası şifresiz ve WAL içeriğiyle tutarlıdır
+        plain_copy = str(Path(self._temp_dir.name) / "kopya.db")
+        models.backup_database(plain_copy, plaintext=True)
+        conn = sqlite3.connect(plain_copy)
+        self.addCleanup(conn.close)
+        self.assertEqual(
+            conn.execute("SELECT COUNT(*) FROM dosyalar WHERE muvekkil_adi = ?", (SECRET,)).fetchone()[0], 1
+        )
+        conn.execute("DELETE FROM dosyalar")
+        conn.execute("INSERT INTO dosyalar (muvekkil_adi) VALUES ('Dosyadan yüklendi')")
+        conn.commit()
+        conn.close()
+
+        # Havuzda açık bağlantı ve şifreli WAL varken düz dosyayla değiştirme
+        pooled = db.get_connection()
+        pooled.execute("SELECT COUNT(*) FROM dosyalar").fetchone()
+        pooled.close()
+        self.assertTrue(os.path.exists(db.DB_PATH + "-wal"))
+        db.replace_database_file(plain_copy)
+        self.assertFalse(os.path.exists(db.DB_PATH + "-wal"))
+        self._assert_encrypted_on_disk()
+        self.assertEqual(self._secret_count(), 0)
+        with db.connection_scope() as conn:
+            self.assertEqual(conn.execute("SELECT muvekkil_adi FROM dosyalar").fetchone()[0], "Dosyadan yüklendi")
+        self.assertEqual(DemoManager(db.DB_PATH).get_demo_status()["status"], "demo_active")
+
+    def test_safety_copy_stays_encrypted_and_can_be_restored(self) -> None:
+        db.initialize_database()
+        self._insert_secret()
+
+        # Geri yükleme/içe aktarma öncesi güvenlik kopyası
+        safety_copy = str(Path(self._temp_dir.name) / "data_before_restore.db")
+        models.backup_database(safety_copy)
+        self.assertTrue(db_vfs.is_page_encrypted(safety_copy))
+        self.assertNotIn(SECRET.encode(), Path(safety_copy).read_bytes())
+        self.assertTrue(models.validate_database_file(safety_copy)[0])
+
+        with db.connection_scope() as conn:
+            conn.execute("DELETE FROM dosyalar")
+        self.assertEqual(self._secret_count(), 0)
+
+        # Başarısız geri yüklemenin geri alınması
+        db.replace_database_file(safety_copy)
+        self._assert_encrypted_on_disk()
+        self.assertEqual(self._secret_count(), 1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
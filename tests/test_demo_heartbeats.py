@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Demo heartbeat tamponunun ve periyodik yazıcıların doğrulamaları."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = PROJECT_ROOT / "server"
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+try:
+    import main as server
+except ImportError:  # pragma: no cover - sunucu bağımlılıkları kurulu değil
+    server = None
+
+from server_db import SqliteConnection
+
+
+@unittest.skipIf(server is None, "sunucu bağımlılıkları kurulu değil")
+class DemoHeartbeatBufferTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = SqliteConnection()
+        self.addCleanup(self.conn.db.close)
+        self.conn.db.execute(
+            "CREATE TABLE demo_sessions (machine_id TEXT PRIMARY KEY, status TEXT, demo_end_date TIMESTAMP,"
+            " machine_name TEXT, os_info TEXT, demo_start_date TIMESTAMP, last_heartbeat TIMESTAMP,"
+            " total_usage_minutes INTEGER DEFAULT 0, launch_count INTEGER DEFAULT 0)"
+        )
+        self.conn.db.executemany(
+            "INSERT INTO demo_sessions (machine_id, status, demo_end_date) VALUES (?, ?, ?)",
+            (
+                ("ESKI", "active", datetime.utcnow() + timedelta(days=5, hours=1)),
+                ("BITEN", "active", datetime.utcnow() - timedelta(days=1)),
+            ),
+        )
+        self.written: list[list[tuple]] = []
+        patcher = mock.patch.multiple(server, get_db=lambda: self.conn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            server.psycopg2.extras, "execute_values", side_effect=lambda cur, sql, rows, **kw: self.written.append(rows)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.buffer = server.DemoHeartbeatBuffer(interval=60, state_ttl=60)
+
+    def _beat(self, machine_id: str, minutes: int = 5, **kwargs) -> dict:
+        return self.buffer.record(server.DemoHeartbeatRequest(machine_id=machine_id, usage_minutes=minutes, **kwargs))
+
+    def test_heartbeats_are_coalesced_into_one_batch(self) -> None:
+        self.assertEqual(self._beat("YENI", machine_name="PC")["message"], "Demo başlatıldı")
+        self.assertEqual(self._beat("YENI")["days_remaining"], server.DEMO_LENGTH_DAYS - 1)
+        for _ in range(3):
+            self.assertEqual(self._beat("ESKI", 10), {"success": True, "status": "active", "days_remaining": 5})
+        # Her makinenin durumu bir kez okunur; yeni makine için okuma da bir kez
+        self.assertEqual(self.conn.executed("SELECT status, demo_end_date"), 2)
+        self.assertEqual(self.buffer.snapshot("ESKI")["usage_minutes"], 30)
+
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(len(self.written), 1)
+        rows = {row[0]: row for row in self.written[0]}
+        self.assertEqual(rows["ESKI"][4:], (30, 3, "active"))
+        self.assertEqual(rows["YENI"][1], "PC")
+        self.assertEqual(rows["YENI"][4:], (10, 2, "active"))
+        self.assertEqual(self.conn.commits, 1)
+        self.assertIsNone(self.buffer.snapshot("ESKI"))
+
+    def test_expired_sessions_are_marked_once_and_admin_extension_clears_it(self) -> None:
+        self.assertEqual(self._beat("BITEN")["status"], "expired")
+        self.assertTrue(self.buffer.snapshot("BITEN")["expire"])
+
+        # Admin süreyi uzattı: bekleyen süre-doldu işareti yazılmaz, durum yeniden okunur
+        self.conn.db.execute(
+            "UPDATE demo_sessions SET demo_end_date = ? WHERE machine_id = 'BITEN'",
+            (datetime.utcnow() + timedelta(days=3, hours=1),),
+        )
+        self.buffer.invalidate("BITEN")
+        self.assertFalse(self.buffer.snapshot("BITEN")["expire"])
+        self.assertEqual(self._beat("BITEN")["status"], "active")
+        self.buffer.flush()
+        self.assertEqual(self.written[0][0][4:], (10, 2, "active"))
+
+    def test_failed_flush_is_requeued_and_stop_flushes_the_rest(self) -> None:
+        self._beat("ESKI", 10)
+        with mock.patch.object(server, "get_db", side_effect=server.PoolTimeout("dolu")):
+            self.assertEqual(self.buffer.flush(), 0)
+        self._beat("ESKI", 5)
+        self.assertEqual(self.buffer.snapshot("ESKI")["usage_minutes"], 15)
+
+        self.buffer.start()
+        self.buffer.stop()
+        self.assertEqual([row[4:] for row in self.written[0]], [(15, 2, "active")])
+
+    def test_without_unique_index_rows_are_written_one_by_one(self) -> None:
+        self.buffer.use_upsert = False
+        self._beat("YENI", machine_name="PC")
+        self._beat("ESKI", 10)
+        self._beat("ESKI", 10)
+        self._beat("BITEN")
+        self.assertEqual(self.buffer.flush(), 3)
+        self.assertEqual(self.written, [])
+        self.assertEqual(self.conn.commits, 1)
+        self.assertEqual(
+            [tuple(row) for row in self.conn.db.execute(
+                "SELECT machine_id, machine_name, total_usage_minutes, launch_count, status"
+                " FROM demo_sessions ORDER BY machine_id"
+            )],
+            [("BITEN", None, 5, 1, "expired"), ("ESKI", None, 20, 2, "active"), ("YENI", "PC", 5, 1, "active")],
+        )
+        self.assertIsNone(self.buffer.snapshot("ESKI"))
+
+    def test_flusher_subclasses_must_implement_flush(self) -> None:
+        with self.assertRaises(TypeError):
+            server.PeriodicFlusher(1)
+
+        class _Counter(server.PeriodicFlusher):
+            calls = 0
+
+            def flush(self) -> int:
+                self.calls += 1
+                return 0
+
+        counter = _Counter(0.01)
+        counter.start()
+        counter.stop(flush=False)
+        stopped_at = counter.calls
+        counter.stop()
+        self.assertEqual(counter.calls, stopped_at + 1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Sunucunun e-posta kuyruğu için yerel bir SMTP sunucusuna karşı doğrulamalar."""
+
+from __future__ import annotations
+
+import socket
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = PROJECT_ROOT / "server"
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+try:
+    from aiosmtpd.controller import Controller
+    import main as server
+except ImportError:  # pragma: no cover - sunucu bağımlılıkları kurulu değil
+    Controller = None
+    server = None
+
+
+class _RecordingHandler:
+    """Gelen iletileri saklar; ``fail_once`` adreslerini ilk denemede 451 ile geri çevirir."""
+
+    def __init__(self, fail_once=()):
+        self.fail_once = set(fail_once)
+        self.messages = []
+        self.sessions = set()
+        self._lock = threading.Lock()
+
+    async def handle_DATA(self, smtp_server, session, envelope):
+        with self._lock:
+            self.sessions.add(id(session))
+            for recipient in envelope.rcpt_tos:
+                if recipient in self.fail_once:
+                    self.fail_once.discard(recipient)
+                    return "451 Requested action aborted: try again"
+            self.messages.append(envelope)
+        return "250 OK"
+
+
+class _ListLogWriter:
+    def __init__(self):
+        self.rows = []
+
+    def record(self, template_key, recipient, subject, status="sent", error=None, metadata=None):
+        self.rows.append((recipient, status))
+
+
+@unittest.skipIf(Controller is None, "aiosmtpd veya sunucu bağımlılıkları kurulu değil")
+class EmailDispatcherTestCase(unittest.TestCase):
+    def _start_smtp(self, handler: _RecordingHandler) -> None:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        controller = Controller(handler, hostname="127.0.0.1", port=port)
+        controller.start()
+        self.addCleanup(controller.stop)
+        config = mock.patch.dict(
+            server.EMAIL_CONFIG,
+            smtp_server="127.0.0.1",
+            smtp_port=port,
+            starttls=False,
+            password="",
+        )
+        config.start()
+        self.addCleanup(config.stop)
+
+    def test_workers_reuse_smtp_sessions(self) -> None:
+        handler = _RecordingHandler()
+        self._start_smtp(handler)
+        log_writer = _ListLogWriter()
+        dispatcher = server.EmailDispatcher(log_writer, workers=2, queue_size=50, backoff=0.01)
+
+        for index in range(20):
+            self.assertTrue(dispatcher.submit(f"user{index}@example.com", "Konu", "<p>Merhaba</p>"))
+        dispatcher.stop()
+
+        self.assertEqual(len(handler.messages), 20)
+        self.assertLessEqual(len(handler.sessions), 2)
+        self.assertEqual(sorted(status for _, status in log_writer.rows), ["sent"] * 20)
+        metrics = dispatcher.metrics()
+        self.assertEqual(metrics["sent"], 20)
+        self.assertLessEqual(metrics["sessions_opened"], 2)
+
+    def test_transient_failure_is_retried(self) -> None:
+        handler = _RecordingHandler(fail_once={"retry@example.com"})
+        self._start_smtp(handler)
+        log_writer = _ListLogWriter()
+        dispatcher = server.EmailDispatcher(log_writer, workers=1, queue_size=5, backoff=0.01)
+
+        dispatcher.submit("retry@example.com", "Konu", "<p>Merhaba</p>")
+        dispatcher.stop()
+
+        self.assertEqual([envelope.rcpt_tos for envelope in handler.messages], [["retry@example.com"]])
+        self.assertEqual(log_writer.rows, [("retry@example.com", "sent")])
+        self.assertEqual(dispatcher.metrics()["retried"], 1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Derlenmiş e-posta şablonlarının ve şablon önbelleğinin doğrulamaları."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = PROJECT_ROOT / "server"
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+try:
+    import main as server
+except ImportError:  # pragma: no cover - sunucu bağımlılıkları kurulu değil
+    server = None
+
+
+class _FakeCursor:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def cursor(self, **kwargs):
+        return _FakeCursor(self._rows)
+
+    def close(self):
+        pass
+
+
+@unittest.skipIf(server is None, "sunucu bağımlılıkları kurulu değil")
+class EmailTemplateTestCase(unittest.TestCase):
+    def test_render_matches_plain_substitution(self) -> None:
+        subject = "Merhaba {{name}}"
+        content = "<p>{{name}}, kalan {{days_left}} gün. {{unknown}}</p>"
+        template = server.CompiledEmailTemplate(subject, content)
+
+        variables = {"name": "Ayşe", "days_left": 3}
+        expected_subject, expected_content = subject, content
+        for key, value in variables.items():
+            expected_subject = expected_subject.replace(f"{{{{{key}}}}}", str(value))
+            expected_content = expected_content.replace(f"{{{{{key}}}}}", str(value))
+
+        self.assertEqual(
+            template.render(variables),
+            (expected_subject, server.get_email_template(expected_content)),
+        )
+
+    def test_cache_serves_renders_without_queries(self) -> None:
+        updated_at = datetime(2024, 1, 1)
+        rows = [{"template_key": "demo_expiring", "subject": "{{days_left}} gün",
+                 "html_content": "<p>{{days_left}}</p>", "updated_at": updated_at}]
+        cache = server.EmailTemplateCache(ttl=300)
+        connect = mock.Mock(return_value=_FakeConnection(rows))
+
+        with mock.patch.object(server, "get_db", connect):
+            first = cache.get("demo_expiring")
+            for _ in range(1000):
+                self.assertEqual(cache.get("demo_expiring").render({"days_left": 3})[0], "3 gün")
+            self.assertIsNone(cache.get("missing"))
+            self.assertEqual(connect.call_count, 1)
+
+            # Değişmeyen şablon yeniden derlenmez, değişen derlenir
+            cache.invalidate()
+            self.assertIs(cache.get("demo_expiring"), first)
+            rows[0] = dict(rows[0], subject="Son {{days_left}} gün", updated_at=datetime(2024, 1, 2))
+            cache.invalidate()
+            self.assertEqual(cache.get("demo_expiring").render({"days_left": 1})[0], "Son 1 gün")
+            self.assertEqual(connect.call_count, 3)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""``finans_summary`` özet tablosunun trigger'larla güncel kaldığını doğrular."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import db
+
+
+class FinanceSummaryTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._orig_db_path = db.DB_PATH
+        self._orig_docs_dir = db.DOCS_DIR
+        temp_docs = Path(self._temp_dir.name)
+        db.DOCS_DIR = str(temp_docs)
+        os.makedirs(db.DOCS_DIR, exist_ok=True)
+        db.DB_PATH = str(temp_docs / "data.db")
+        db.initialize_database()
+        self.dosya_id = self._execute(
+            "INSERT INTO dosyalar (buro_takip_no, muvekkil_adi) VALUES (1, 'A')"
+        )
+        self.finans_id = self._execute(
+            "INSERT INTO finans (dosya_id) VALUES (?)", (self.dosya_id,)
+        )
+
+    def tearDown(self) -> None:  # pragma: no cover - test cleanup
+        db.close_all_connections()
+        db.DB_PATH = self._orig_db_path
+        db.DOCS_DIR = self._orig_docs_dir
+        self._temp_dir.cleanup()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with db.connection_scope() as conn:
+            return conn.execute(sql, params).lastrowid
+
+    def _summary(self) -> dict:
+        with db.connection_scope() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                "SELECT * FROM finans_summary WHERE finans_id = ?", (self.finans_id,)
+            ).fetchone()
+        return dict(row) if row else {}
+
+    def test_contract_and_totals_follow_finans_updates(self) -> None:
+        self._execute(
+            """
+            UPDATE finans
+               SET sozlesme_ucreti = 1234.565, sozlesme_yuzdesi = 10,
+                   tahsil_hedef_cents = 100001, tahsil_edilen_cents = 5000,
+                   masraf_toplam_cents = 300, masraf_tahsil_cents = 100
+             WHERE id = ?
+            """,
+            (self.finans_id,),
+        )
+        summary = self._summary()
+        # 1234,565 TL + 1000,01 TL * %10 = 1334,566 TL -> 133457 kuruş
+        self.assertEqual(summary["toplam_ucret_cents"], 133457)
+        self.assertEqual(summary["tahsil_edilen_cents"], 5000)
+        self.assertEqual(summary["kalan_bakiye_cents"], 133457 - 5000 + 300 - 100)
+
+        self._execute(
+            "UPDATE finans SET sozlesme_ucreti = NULL, sozlesme_ucreti_cents = 250000,"
+            " sozlesme_yuzdesi = 0 WHERE id = ?",
+            (self.finans_id,),
+        )
+        self.assertEqual(self._summary()["toplam_ucret_cents"], 250000)
+
+    def test_next_due_date_tracks_unpaid_installments(self) -> None:
+        first = self._execute(
+            "INSERT INTO taksitler (finans_id, vade_tarihi, durum) VALUES (?, '2000-01-01', 'Ödenecek')",
+            (self.finans_id,),
+        )
+        self._execute(
+            "INSERT INTO taksitler (finans_id, vade_tarihi, durum) VALUES (?, '2999-01-01', 'Ödenecek')",
+            (self.finans_id,),
+        )
+        self.assertEqual(self._summary()["next_due_date"], "2000-01-01")
+
+        self._execute("UPDATE taksitler SET durum = 'Ödendi' WHERE id = ?", (first,))
+        self.assertEqual(self._summary()["next_due_date"], "2999-01-01")
+
+        self._execute("DELETE FROM taksitler WHERE finans_id = ?", (self.finans_id,))
+        self.assertIsNone(self._summary()["next_due_date"])
+
+    def test_assignments_and_deletes_are_mirrored(self) -> None:
+        user_id = self._execute(
+            "INSERT INTO users (username, role, active) VALUES ('avukat', 'avukat', 1)"
+        )
+        self._execute(
+            "INSERT INTO dosya_atamalar (dosya_id, user_id) VALUES (?, ?)",
+            (self.dosya_id, user_id),
+        )
+        self.assertEqual(self._summary()["assigned_user_ids"], str(user_id))
+
+        self._execute("DELETE FROM dosya_atamalar WHERE dosya_id = ?", (self.dosya_id,))
+        self.assertIsNone(self._summary()["assigned_user_ids"])
+
+        self._execute("DELETE FROM finans WHERE id = ?", (self.finans_id,))
+        self.assertEqual(self._summary(), {})
+
+    def test_reassignments_refresh_both_records(self) -> None:
+        other_dosya = self._execute("INSERT INTO dosyalar (buro_takip_no, muvekkil_adi) VALUES (2, 'B')")
+        other_finans = self._execute("INSERT INTO finans (dosya_id) VALUES (?)", (other_dosya,))
+        first, second = (
+            self._execute("INSERT INTO users (username, role, active) VALUES (?, 'avukat', 1)", (name,))
+            for name in ("avukat1", "avukat2")
+        )
+        atama_id = self._execute(
+            "INSERT INTO dosya_atamalar (dosya_id, user_id) VALUES (?, ?)", (self.dosya_id, first)
+        )
+
+        self._execute("UPDATE dosya_atamalar SET user_id = ? WHERE id = ?", (second, atama_id))
+        self.assertEqual(self._summary()["assigned_user_ids"], str(second))
+
+        # Atama başka dosyaya taşınınca eski kayıt boşalır, yenisi dolar
+        self._execute("UPDATE dosya_atamalar SET dosya_id = ? WHERE id = ?", (other_dosya, atama_id))
+        self.assertIsNone(self._summary()["assigned_user_ids"])
+        with db.connection_scope() as conn:
+            moved = conn.execute(
+                "SELECT assigned_user_ids FROM finans_summary WHERE finans_id = ?", (other_finans,)
+            ).fetchone()[0]
+        self.assertEqual(moved, str(second))
+
+    def test_rebuild_on_startup_when_rows_drift(self) -> None:
+        self._execute("DELETE FROM finans_summary")
+        with db.connection_scope() as conn:
+            db.setup_finans_summary_table(conn)
+        self.assertEqual(self._summary()["dosya_id"], self.dosya_id)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""/api/verify lisans önbelleğinin, geçersiz kılmanın ve toplu last_check yazımının doğrulamaları."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = PROJECT_ROOT / "server"
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+try:
+    from fastapi.testclient import TestClient
+    import main as server
+except ImportError:  # pragma: no cover - sunucu bağımlılıkları kurulu değil
+    server = None
+
+from server_db import SqliteConnection
+
+
+@unittest.skipIf(server is None, "sunucu bağımlılıkları kurulu değil")
+class LicenseStateCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = SqliteConnection()
+        self.addCleanup(self.conn.db.close)
+        self.conn.db.execute(
+            "CREATE TABLE licenses (license_key TEXT PRIMARY KEY, is_active INTEGER, machine_id TEXT,"
+            " transfer_count INTEGER DEFAULT 0, last_check TIMESTAMP)"
+        )
+        self.conn.db.execute("INSERT INTO licenses (license_key, is_active, machine_id) VALUES ('ANAHTAR', 1, 'M1')")
+        self.conn.db.commit()
+
+        self.cache = server.LicenseStateCache(ttl=60)
+        self.flusher = server.LastCheckFlusher(interval=60)
+        patcher = mock.patch.multiple(
+            server,
+            get_db=lambda: self.conn,
+            license_cache=self.cache,
+            last_check_flusher=self.flusher,
+            admin_stats_cache=server.AdminStatsCache(60),
+            log_activity=mock.Mock(),
+            verify_admin_token=lambda authorization: None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(server.app)
+
+    def _verify(self, machine_id: str = "M1") -> dict:
+        response = self.client.post("/api/verify", json={"license_key": "ANAHTAR", "machine_id": machine_id})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_repeated_verifies_are_served_from_memory(self) -> None:
+        first = self._verify()
+        self.assertTrue(first["valid"])
+        for _ in range(5):
+            self.assertEqual(self._verify()["offline_token"], first["offline_token"])
+        self.assertFalse(self._verify("BASKA")["valid"])
+        self.assertEqual(self.conn.executed("SELECT is_active, machine_id"), 1)
+
+        # Süresi dolan kayıt veritabanından yeniden okunur
+        self.cache.ttl = 0
+        self.cache.invalidate("ANAHTAR")
+        self._verify()
+        self._verify()
+        self.assertEqual(self.conn.executed("SELECT is_active, machine_id"), 3)
+
+    def test_admin_and_transfer_endpoints_invalidate_the_entry(self) -> None:
+        token = self._verify()["offline_token"]
+
+        self.assertTrue(self.client.post("/api/admin/license/toggle", json={"license_key": "ANAHTAR"}).json()["success"])
+        self.assertEqual(self._verify(), {"valid": False, "error": "Lisans devre dışı"})
+        self.client.post("/api/admin/license/toggle", json={"license_key": "ANAHTAR"})
+        self.assertTrue(self._verify()["valid"])
+
+        transfer = self.client.post(
+            "/api/transfer", json={"license_key": "ANAHTAR", "old_machine_id": "M1", "new_machine_id": "M2"}
+        )
+        self.assertTrue(transfer.json()["success"])
+        self.assertFalse(self._verify("M1")["valid"])
+        moved = self._verify("M2")
+        self.assertTrue(moved["valid"])
+        self.assertNotEqual(moved["offline_token"], token)
+        self.assertEqual(self.conn.executed("SELECT is_active, machine_id"), 4)
+
+    def test_last_check_is_written_in_one_batch(self) -> None:
+        self.conn.db.execute("INSERT INTO licenses (license_key, is_active, machine_id) VALUES ('IKINCI', 1, 'M9')")
+        for _ in range(3):
+            self._verify()
+        self.client.post("/api/verify", json={"license_key": "IKINCI", "machine_id": "M9"})
+        self.assertEqual(self.flusher._pending, {"ANAHTAR", "IKINCI"})
+
+        pg = mock.MagicMock()
+        with mock.patch.object(server, "get_db", return_value=pg):
+            self.assertEqual(self.flusher.flush(), 2)
+            self.assertEqual(self.flusher.flush(), 0)
+        pg.cursor.return_value.execute.assert_called_once_with(mock.ANY, (["ANAHTAR", "IKINCI"],))
+        pg.commit.assert_called_once_with()
+        pg.close.assert_called_once_with()
+
+        # Başarısız yazım bir sonraki tura bırakılır
+        self.flusher.record("ANAHTAR")
+        with mock.patch.object(server, "get_db", side_effect=server.PoolTimeout("dolu")):
+            self.assertEqual(self.flusher.flush(), 0)
+        self.assertEqual(self.flusher._pending, {"ANAHTAR"})
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Sürüm bildirimi önbelleği ve kurulum dosyası indirme uçlarının doğrulamaları."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = PROJECT_ROOT / "server"
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+try:
+    from fastapi.testclient import TestClient
+    import main as server
+except ImportError:  # pragma: no cover - sunucu bağımlılıkları kurulu değil
+    server = None
+
+
+@unittest.skipIf(server is None, "sunucu bağımlılıkları kurulu değil")
+class ReleaseDownloadTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.payload = os.urandom(300_000)
+        (self.tmp / "setup.exe").write_bytes(self.payload)
+
+        manifest = server.ReleaseManifest(str(self.tmp / "latest.json"), str(self.tmp / "history.json"))
+        for target, value in (
+            ("DOWNLOAD_DIR", str(self.tmp)),
+            ("release_manifest", manifest),
+            ("download_checksums", server.DownloadChecksums()),
+        ):
+            patcher = mock.patch.object(server, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(server.app)
+
+    def test_range_and_validators(self) -> None:
+        full = self.client.get("/download/setup.exe")
+        self.assertEqual(full.status_code, 200)
+        self.assertEqual(full.content, self.payload)
+        etag = full.headers["etag"]
+        self.assertEqual(etag, '"%s"' % hashlib.sha256(self.payload).hexdigest())
+
+        partial = self.client.get("/download/setup.exe", headers={"Range": "bytes=1000-", "If-Range": etag})
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.content, self.payload[1000:])
+        self.assertEqual(partial.headers["content-range"], f"bytes 1000-{len(self.payload) - 1}/{len(self.payload)}")
+
+        # Dosya değiştiyse If-Range tutmaz ve tamamı gönderilir
+        stale = self.client.get("/download/setup.exe", headers={"Range": "bytes=1000-", "If-Range": '"eski"'})
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(len(stale.content), len(self.payload))
+
+        self.assertEqual(self.client.get("/download/setup.exe", headers={"If-None-Match": etag}).status_code, 304)
+        unsatisfiable = self.client.get("/download/setup.exe", headers={"Range": f"bytes={len(self.payload)}-"})
+        self.assertEqual(unsatisfiable.status_code, 416)
+        self.assertEqual(self.client.get("/download/missing.exe").status_code, 404)
+
+    def test_manifest_cached_until_publish(self) -> None:
+        server.save_release({"version": "1.2.0", "download_url": "https://takibiesasi.com/download/setup.exe"})
+        first = self.client.get("/api/releases/latest")
+        self.assertEqual(first.json()["version"], "1.2.0")
+
+        with mock.patch("builtins.open", side_effect=AssertionError("manifest yeniden okundu")):
+            self.assertEqual(server.get_current_release()["version"], "1.2.0")
+        revalidated = self.client.get("/api/releases/latest", headers={"If-None-Match": first.headers["etag"]})
+        self.assertEqual(revalidated.status_code, 304)
+
+        server.save_release({"version": "1.3.0", "download_url": ""})
+        self.assertEqual(self.client.get("/api/releases/latest").json()["version"], "1.3.0")
+        history = json.loads((self.tmp / "history.json").read_text())
+        self.assertEqual([release["version"] for release in history], ["1.3.0", "1.2.0"])
+        self.assertTrue(server.release_manifest.set_current("1.2.0"))
+        self.assertEqual(server.get_current_release()["version"], "1.2.0")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
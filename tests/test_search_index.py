@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Genel arama (FTS5) indeksi için doğrulamalar."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import db, models
+from app.search import build_match_query, global_search
+
+
+class BuildMatchQueryTestCase(unittest.TestCase):
+    def test_tokens_are_folded_quoted_and_prefixed(self) -> None:
+        self.assertEqual(build_match_query("İSMAİL Işık"), '"ismail"* "işik"*')
+
+    def test_punctuation_splits_into_phrase(self) -> None:
+        self.assertEqual(build_match_query("2024/15"), '"2024 15"*')
+
+    def test_fts_syntax_is_neutralised(self) -> None:
+        self.assertEqual(build_match_query('a" OR NEAR(b'), '"a"* "or"* "near b"*')
+        self.assertIsNone(build_match_query(' "*() '))
+
+
+class SearchIndexTestCase(unittest.TestCase):
+    """``arama_fts`` trigger senkronizasyonu ve arama API'si."""
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._orig_db_path = db.DB_PATH
+        self._orig_docs_dir = db.DOCS_DIR
+        temp_docs = Path(self._temp_dir.name)
+        db.DOCS_DIR = str(temp_docs)
+        os.makedirs(db.DOCS_DIR, exist_ok=True)
+        db.DB_PATH = str(temp_docs / "data.db")
+        db.initialize_database()
+        if not db.is_fts5_available(db.get_connection()):  # pragma: no cover
+            self.skipTest("SQLite FTS5 desteği yok")
+
+    def tearDown(self) -> None:  # pragma: no cover - test cleanup
+        db.close_all_connections()
+        db.DB_PATH = self._orig_db_path
+        db.DOCS_DIR = self._orig_docs_dir
+        self._temp_dir.cleanup()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with db.connection_scope() as conn:
+            return conn.execute(sql, params).lastrowid
+
+    def test_case_search_is_turkish_case_insensitive(self) -> None:
+        dosya_id = self._execute(
+            "INSERT INTO dosyalar (buro_takip_no, muvekkil_adi, dosya_esas_no) VALUES (1, ?, ?)",
+            ("İsmail IŞIK", "2024/155"),
+        )
+        self._execute(
+            "INSERT INTO dosyalar (buro_takip_no, muvekkil_adi) VALUES (2, 'Ayşe Kaya')"
+        )
+
+        for text in ("ismail", "ISMAIL", "ışık", "isma ışı", "2024/15"):
+            with self.subTest(text=text):
+                ids = [row["id"] for row in models.fetch_dosyalar_by_color_hex(None, text)]
+                self.assertEqual(ids, [dosya_id])
+
+    def test_triggers_follow_updates_and_deletes(self) -> None:
+        dosya_id = self._execute(
+            "INSERT INTO dosyalar (buro_takip_no, muvekkil_adi) VALUES (1, 'Şule Demir')"
+        )
+        self._execute(
+            "UPDATE dosyalar SET muvekkil_adi = 'Ümit Çelik' WHERE id = ?", (dosya_id,)
+        )
+        self.assertEqual(global_search("şule"), [])
+        self.assertEqual([r["kayit_id"] for r in global_search("ümit")], [dosya_id])
+
+        self._execute("DELETE FROM dosyalar WHERE id = ?", (dosya_id,))
+        self.assertEqual(global_search("ümit"), [])
+
+    def test_global_search_covers_all_sources(self) -> None:
+        dosya_id = self._execute(
+            "INSERT INTO dosyalar (buro_takip_no, muvekkil_adi) VALUES (1, 'Kervan Lojistik')"
+        )
+        self._execute(
+            "INSERT INTO gorevler (konu, olusturma_zamani) VALUES ('Kervan bilirkişi raporu', '2024-01-01')"
+        )
+        self._execute(
+            "INSERT INTO tebligatlar (dosya_no, kurum, icerik) VALUES ('2024/1', 'İcra', 'Kervan ödeme emri')"
+        )
+        arb_id = self._execute(
+            "INSERT INTO arabuluculuk (davaci, davali, konu) VALUES ('Kervan AŞ', 'Ali', 'Alacak')"
+        )
+        self._execute(
+            "INSERT INTO dosya_timeline (dosya_id, title, body) VALUES (?, 'Not', 'kervan ile görüşüldü')",
+            (dosya_id,),
+        )
+
+        results = global_search("kervan")
+        self.assertEqual(
+            sorted(r["kaynak"] for r in results),
+            ["arabuluculuk", "dosya", "gorev", "tebligat", "timeline"],
+        )
+        timeline = next(r for r in results if r["kaynak"] == "timeline")
+        self.assertEqual(timeline["dosya_id"], dosya_id)
+
+        only_arb = global_search("kervan", kaynaklar=["arabuluculuk"])
+        self.assertEqual([(r["kaynak"], r["kayit_id"]) for r in only_arb], [("arabuluculuk", arb_id)])
+
+    def test_rebuild_indexes_existing_rows(self) -> None:
+        self._execute("INSERT INTO dosyalar (buro_takip_no, muvekkil_adi) VALUES (1, 'Irmak')")
+        with db.connection_scope() as conn:
+            conn.execute("DELETE FROM arama_fts")
+        self.assertEqual(global_search("irmak"), [])
+        with db.connection_scope() as conn:
+            db.rebuild_search_index(conn)
+        self.assertEqual(len(global_search("ırmak")), 1)
+
+
+if __name__ == "__main__":  # pragma: no cover - manuel çalıştırma
+    unittest.main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Sunucunun bağlantı havuzu, istek sonu iadesi ve havuz doluyken 503 yanıtı için doğrulamalar."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = PROJECT_ROOT / "server"
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+try:
+    import anyio
+    import psycopg2.extensions
+    from fastapi.testclient import TestClient
+    import main as server
+except ImportError:  # pragma: no cover - sunucu bağımlılıkları kurulu değil
+    server = None
+
+
+class _FakePgConnection:
+    """psycopg2 bağlantısının havuzun kullandığı kısmı."""
+
+    def __init__(self) -> None:
+        self.closed = 0
+        self.autocommit = False
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+    def get_transaction_status(self) -> int:
+        return self.status
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+@unittest.skipIf(server is None, "sunucu bağımlılıkları kurulu değil")
+class ConnectionPoolTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.opened: list[_FakePgConnection] = []
+
+        def connect(**kwargs):
+            conn = _FakePgConnection()
+            self.opened.append(conn)
+            return conn
+
+        patcher = mock.patch.object(server.psycopg2, "connect", side_effect=connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_exhausted_pool_waits_then_times_out(self) -> None:
+        pool = server.ConnectionPool(maxconn=2, timeout=0.05)
+        first, second = pool.acquire(), pool.acquire()
+        with self.assertRaises(server.PoolTimeout):
+            pool.acquire()
+
+        # Bekleyen istek, bir bağlantı iade edilince aynı (ılık) bağlantıyı alır
+        waiter = threading.Timer(0.02, first.close)
+        waiter.start()
+        pool.timeout = 1.0
+        third = pool.acquire()
+        waiter.join()
+        self.assertIs(third._conn, self.opened[0])
+        self.assertEqual(len(self.opened), 2)
+
+        second.close()
+        third.close()
+        second.close()  # ikinci iade yok sayılır
+        self.assertEqual(len(pool._idle), 2)
+        pool.closeall()
+        self.assertTrue(all(conn.closed for conn in self.opened))
+
+    def test_release_rolls_back_and_discards_broken_connections(self) -> None:
+        pool = server.ConnectionPool(maxconn=2, timeout=0.05)
+        lease = pool.acquire()
+        conn = lease._conn
+        conn.status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        conn.autocommit = True
+        lease.close()
+        self.assertEqual(conn.rollbacks, 1)
+        self.assertFalse(conn.autocommit)
+        with self.assertRaises(psycopg2.InterfaceError):
+            lease.cursor()
+
+        lease = pool.acquire()
+        self.assertIs(lease._conn, conn)
+        conn.status = psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+        lease.close()
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool._idle, [])
+
+        # Atılan bağlantının yeri boşalır; havuz yeni bağlantı açar
+        first, second = pool.acquire(), pool.acquire()
+        self.assertEqual(len(self.opened), 3)
+        first.close()
+        second.close()
+
+    def test_leaked_connections_are_returned_when_the_request_ends(self) -> None:
+        pool = server.ConnectionPool(maxconn=1, timeout=0.05)
+        leases = []
+
+        async def leaking_app(scope, receive, send):
+            # Handler close() çağırmadan çıkar; kira nesnesi hâlâ erişilebilir
+            leases.append(pool.acquire())
+
+        middleware = server.ReleaseRequestConnections(leaking_app)
+        for _ in range(3):
+            anyio.run(middleware, {"type": "http"}, None, None)
+        self.assertTrue(all(lease._conn is None for lease in leases))
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(len(pool._idle), 1)
+
+    def test_pool_timeout_is_answered_with_503(self) -> None:
+        with mock.patch.multiple(
+            server,
+            get_db=mock.Mock(side_effect=server.PoolTimeout("dolu")),
+            license_cache=server.LicenseStateCache(60),
+        ):
+            client = TestClient(server.app)
+            response = client.post("/api/verify", json={"license_key": "K", "machine_id": "M"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"detail": "Sunucu meşgul, lütfen tekrar deneyin"})
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Sunucunun PostgreSQL'e özgü sorgularının gerçek bir sunucuda doğrulamaları.
+
+Diğer sunucu testleri SQLite düzeneğiyle (``server_db``) çalışır ve
+``ON CONFLICT``, ``FILTER``, ``ANY(%s)``, ``execute_values``,
+``information_schema`` ve satır değeri karşılaştırmalarını sınamaz.
+Bu testler ``TEST_DATABASE_URL`` (psycopg2 DSN'i) tanımlıysa her test için
+ayrı bir şemada çalışır; sunucuya bağlanılamazsa atlanır.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = PROJECT_ROOT / "server"
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+try:
+    import psycopg2
+    import psycopg2.extras
+    import main as server
+except ImportError:  # pragma: no cover - sunucu bağımlılıkları kurulu değil
+    server = None
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+def _database_available() -> bool:
+    if server is None or not DATABASE_URL:
+        return False
+    try:
+        psycopg2.connect(DATABASE_URL, connect_timeout=3).close()
+    except psycopg2.Error:
+        return False
+    return True
+
+
+@unittest.skipUnless(_database_available(), "PostgreSQL test sunucusu yok (TEST_DATABASE_URL)")
+class PostgresQueriesTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.schema = f"takibi_test_{uuid.uuid4().hex[:12]}"
+        admin = psycopg2.connect(DATABASE_URL)
+        admin.autocommit = True
+        with admin.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA {self.schema}")
+
+        def drop_schema() -> None:
+            with admin.cursor() as cur:
+                cur.execute(f"DROP SCHEMA {self.schema} CASCADE")
+            admin.close()
+
+        self.addCleanup(drop_schema)
+
+        # Havuzun açtığı her bağlantı yalnızca test şemasını görür
+        patcher = mock.patch.dict(
+            server.DB_CONFIG, {"dsn": DATABASE_URL, "options": f"-c search_path={self.schema}"}, clear=True
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        pool = server.ConnectionPool(maxconn=4, timeout=5)
+        self.addCleanup(pool.closeall)
+        patcher = mock.patch.object(server, "db_pool", pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.conn = server.get_db()
+        self.addCleanup(self.conn.close)
+        self._execute("""
+            CREATE TABLE demo_sessions (
+                id SERIAL PRIMARY KEY,
+                machine_id VARCHAR(100) NOT NULL,
+                machine_name VARCHAR(200),
+                os_info VARCHAR(200),
+                user_id INTEGER,
+                demo_start_date TIMESTAMP,
+                demo_end_date TIMESTAMP,
+                last_heartbeat TIMESTAMP,
+                total_usage_minutes INTEGER DEFAULT 0,
+                launch_count INTEGER DEFAULT 0,
+                status VARCHAR(20) DEFAULT 'active',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # Benzersiz indeksten önceki sürümden kalan çift kayıt; kullanıcı bağlantısı ikincide
+        self._execute(
+            "INSERT INTO demo_sessions (machine_id, demo_end_date, total_usage_minutes, launch_count, user_id)"
+            " VALUES ('ESKI', %s, 10, 1, NULL), ('ESKI', %s, 5, 2, 7)",
+            (datetime.utcnow() + timedelta(days=5, hours=1),) * 2,
+        )
+        self.heartbeats = server.DemoHeartbeatBuffer(interval=60, state_ttl=60)
+        patcher = mock.patch.object(server, "demo_heartbeats", self.heartbeats)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with self.assertLogs(server.logger, "WARNING") as self.init_logs:
+            server.init_db()
+
+    def _execute(self, sql: str, params=()) -> list:
+        with self.conn.cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall() if cur.description else []
+        self.conn.commit()
+        return rows
+
+    def test_heartbeat_and_last_check_batches_upsert(self) -> None:
+        self.assertEqual(
+            self._execute(
+                "SELECT id, total_usage_minutes, launch_count, user_id FROM demo_sessions WHERE machine_id = 'ESKI'"
+            ),
+            [(1, 15, 3, 7)],
+        )
+        self.assertEqual(
+            [record.getMessage() for record in self.init_logs.records],
+            ["demo_sessions: merged duplicate rows [2] of machine ESKI into row 1 and deleted them"],
+        )
+        self.assertTrue(self.heartbeats.use_upsert)
+
+        buffer = self.heartbeats
+        for machine_id, minutes in (("ESKI", 10), ("ESKI", 10), ("YENI", 5)):
+            buffer.record(server.DemoHeartbeatRequest(machine_id=machine_id, usage_minutes=minutes))
+        self.assertEqual(buffer.flush(), 2)
+        buffer.record(server.DemoHeartbeatRequest(machine_id="YENI", usage_minutes=5, machine_name="PC"))
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(
+            self._execute(
+                "SELECT machine_id, machine_name, total_usage_minutes, launch_count, status"
+                " FROM demo_sessions ORDER BY machine_id"
+            ),
+            [("ESKI", None, 35, 5, "active"), ("YENI", "PC", 10, 2, "active")],
+        )
+
+        self._execute("INSERT INTO licenses (license_key) VALUES ('A'), ('B'), ('C')")
+        flusher = server.LastCheckFlusher(interval=60)
+        flusher.record("A")
+        flusher.record("B")
+        self.assertEqual(flusher.flush(), 2)
+        self.assertEqual(
+            self._execute("SELECT license_key FROM licenses WHERE last_check IS NOT NULL ORDER BY license_key"),
+            [("A",), ("B",)],
+        )
+
+    def test_admin_stat_groups_run_on_postgres(self) -> None:
+        self._execute(
+            "INSERT INTO licenses (license_key, machine_id, is_active, source, activated_at)"
+            " VALUES ('A', 'M1', TRUE, 'purchase', CURRENT_TIMESTAMP), ('B', NULL, TRUE, NULL, NULL),"
+            " ('C', 'M3', FALSE, 'manual', NULL)"
+        )
+        user_id = self._execute(
+            "INSERT INTO users (email, password_hash, email_verified) VALUES ('a@b.c', 'x', TRUE) RETURNING id"
+        )[0][0]
+        self._execute(
+            "INSERT INTO orders (user_id, order_number, product_name, payment_status, total_price_cents, paid_at)"
+            " VALUES (%s, 'O1', 'Lisans', 'completed', 12000, CURRENT_TIMESTAMP),"
+            " (%s, 'O2', 'Lisans', 'pending', 9000, NULL)",
+            (user_id, user_id),
+        )
+        self._execute("INSERT INTO demo_registrations (email, converted_to_license) VALUES ('d@e.f', TRUE)")
+        self._execute("INSERT INTO activity_log (activity_type) VALUES ('login'), ('login'), ('payment')")
+
+        stats = server.AdminStatsCache(ttl=60).get(self.conn, *server.ADMIN_STAT_GROUPS)
+        self.assertEqual(
+            {key: stats[key] for key in (
+                "total_licenses", "active_licenses", "purchased_licenses", "manual_licenses", "today_activations",
+                "total_users", "verified_users", "today_registrations",
+                "total_orders", "completed_orders", "pending_orders", "users_with_orders",
+                "total_revenue_cents", "today_revenue_cents", "total", "converted",
+            )},
+            {
+                "total_licenses": 3, "active_licenses": 1, "purchased_licenses": 1, "manual_licenses": 2,
+                "today_activations": 1,
+                "total_users": 1, "verified_users": 1, "today_registrations": 1,
+                "total_orders": 2, "completed_orders": 1, "pending_orders": 1, "users_with_orders": 1,
+                "total_revenue_cents": 12000, "today_revenue_cents": 12000, "total": 1, "converted": 1,
+            },
+        )
+        self.assertEqual(stats["activity_type_counts"], {"login": 2, "payment": 1})
+        self.assertEqual([row["orders"] for row in stats["monthly_revenue"]], [1])
+        self.assertEqual(stats["top_products"], [{"name": "Lisans", "count": 1, "revenue": 120.0}])
+
+    def test_keyset_pages_cover_backfilled_null_dates(self) -> None:
+        # Eski sürümden kalan NULL kabul eden sütun ve tarihsiz kayıtlar
+        self._execute("ALTER TABLE activity_log ALTER COLUMN created_at DROP NOT NULL")
+        start = datetime(2026, 5, 1, 9, 0)
+        for moment in (start, start, start + timedelta(hours=1), None, start - timedelta(days=3), None):
+            self._execute("INSERT INTO activity_log (activity_type, created_at) VALUES ('login', %s)", (moment,))
+
+        def page_through(limit: int = 2, **kwargs) -> list[int]:
+            ids, cursor = [], None
+            while True:
+                with self.conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                    rows, cursor = server.keyset_page(
+                        cur, "SELECT * FROM activity_log a", "a",
+                        cursor=cursor, limit=limit, table="activity_log", **kwargs
+                    )
+                ids.extend(row["id"] for row in rows)
+                if cursor is None:
+                    return ids
+
+        # Geçiş uygulanamadıysa NULL tarihliler en sonda, id sırasıyla listelenir
+        with mock.patch.object(server, "_keyset_nullable_tables", {"activity_log"}):
+            for limit in (1, 2, 4):
+                self.assertEqual(page_through(limit), [3, 2, 1, 5, 6, 4])
+
+        server.ensure_keyset_columns(self.conn)
+        self.assertEqual(
+            self._execute(
+                "SELECT is_nullable FROM information_schema.columns WHERE table_schema = current_schema()"
+                " AND table_name = 'activity_log' AND column_name = 'created_at'"
+            ),
+            [("NO",)],
+        )
+
+        self.assertEqual(page_through(), [3, 2, 1, 6, 5, 4])
+        self.assertEqual(page_through(since="2026-05-01T00:00:00"), [3, 2, 1])
+        self.assertEqual(page_through(filters={"activity_type": "login"}, until="2026-05-01 09:00"), [6, 5, 4])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Takvim görevleri toplu sorgusu ve önbellekleri için doğrulamalar."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+APP_DIR = PROJECT_ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from app import db
+from app.task_aggregation import TaskMetaCache, TaskRangeCache, query_task_window
+
+
+class TaskAggregationTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._orig_db_path = db.DB_PATH
+        self._orig_docs_dir = db.DOCS_DIR
+        temp_docs = Path(self._temp_dir.name)
+        db.DOCS_DIR = str(temp_docs)
+        os.makedirs(db.DOCS_DIR, exist_ok=True)
+        db.DB_PATH = str(temp_docs / "data.db")
+        db.initialize_database()
+
+        self.case_id = self._execute(
+            """
+            INSERT INTO dosyalar (buro_takip_no, muvekkil_adi, dava_durumu, aciklama,
+                                  durusma_tarihi, is_tarihi, is_tarihi_2)
+            VALUES (1, 'Ayşe', 'DERDEST', 'dosya notu', '2024-03-05', '2024-03-20', '2024-03-25')
+            """
+        )
+        self.task_id = self._execute(
+            "INSERT INTO gorevler (tarih, konu, aciklama, olusturma_zamani) "
+            "VALUES ('2024-03-10', 'Dilekçe', 'not', '2024-03-01 09:00:00')"
+        )
+
+    def tearDown(self) -> None:  # pragma: no cover - test cleanup
+        db.close_all_connections()
+        db.DB_PATH = self._orig_db_path
+        db.DOCS_DIR = self._orig_docs_dir
+        self._temp_dir.cleanup()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with db.connection_scope() as conn:
+            return conn.execute(sql, params).lastrowid
+
+    def test_window_matches_separate_queries(self) -> None:
+        tasks = query_task_window("2024-03-01", "2024-03-31")
+        manual = [task for task in tasks if task["source"] == "manual"]
+        auto = [task for task in tasks if task["source"] == "auto"]
+
+        self.assertEqual(
+            [task["id"] for task in manual],
+            [row["id"] for row in db.get_manual_tasks_between("2024-03-01", "2024-03-31")],
+        )
+        expected = db.get_case_tasks_between("2024-03-01", "2024-03-31")
+        self.assertEqual(
+            sorted(task["task_id"] for task in auto),
+            sorted(task["task_id"] for task in expected),
+        )
+        # Dosya açıklaması ek sorgu gerekmeden görevle gelir
+        self.assertTrue(all(task["aciklama"] == "dosya notu" for task in auto))
+        self.assertEqual([task["date"] for task in tasks], sorted(task["date"] for task in tasks))
+
+        # İş tarihi pencere dışındaysa yalnızca duruşma görevi döner
+        narrow = query_task_window("2024-03-01", "2024-03-09")
+        self.assertEqual([task["type"] for task in narrow], ["DURUSMA"])
+
+    def test_range_cache_slides_and_invalidates(self) -> None:
+        calls = []
+
+        def loader(start: str, end: str):
+            calls.append((start, end))
+            return query_task_window(start, end)
+
+        cache = TaskRangeCache(loader)
+        march = cache.get(date(2024, 3, 1), date(2024, 3, 31))
+        self.assertEqual(len(march), 3)  # is_tarihi_2 durum_2 olmadan görev üretmez
+        self.assertEqual(len(cache.get(date(2024, 3, 8), date(2024, 3, 12))), 1)
+        self.assertEqual(cache.loads, 1)
+
+        # Sonraki aya geçişte yalnızca eksik dilim okunur
+        cache.get(date(2024, 3, 15), date(2024, 4, 15))
+        self.assertEqual(calls[-1], ("2024-04-01", "2024-04-15"))
+        self.assertEqual(cache.loaded_range, (date(2024, 3, 1), date(2024, 4, 15)))
+
+        self._execute("UPDATE gorevler SET tamamlandi = 1 WHERE id = ?", (self.task_id,))
+        after = cache.get(date(2024, 3, 1), date(2024, 3, 31))
+        self.assertEqual(cache.loads, 3)
+        self.assertNotIn("manual", {task["source"] for task in after})
+
+    def test_meta_cache_reuses_parsed_rows(self) -> None:
+        cache = TaskMetaCache(max_entries=2)
+        raw = '__META__{"type": "TEBLIGAT", "dosya_no": "2024/1"}'
+        first = cache.get(1, raw)
+        self.assertEqual(first["type"], "TEBLIGAT")
+        self.assertIs(cache.get(1, raw), first)
+        self.assertEqual(cache.get(1, "düz metin"), {})
+        self.assertEqual(cache.get(2, "__META__{bozuk"), {})
+
+
+if __name__ == "__main__":  # pragma: no cover - manuel çalıştırma
+    unittest.main()
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""Güncelleme indiricisinin yerel bir HTTP sunucusuna karşı doğrulamaları."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    from app import updater
+except ImportError:  # pragma: no cover - requests kurulu değil
+    updater = None
+
+
+class _RangeServer(ThreadingHTTPServer):
+    """Range/If-Range destekleyen, istenirse bağlantıyı bir kez yarıda kesen sunucu."""
+
+    daemon_threads = True
+
+    def __init__(self, payload: bytes):
+        super().__init__(("127.0.0.1", 0), _RangeHandler)
+        self.payload = payload
+        self.etag = '"v1"'
+        self.drop_after = None  # ilk GET bu kadar bayttan sonra kesilir
+        self.ranges = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/download/setup.exe"
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _headers(self, status: int, length: int, content_range: str = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Accept-Ranges", "bytes")
+        if content_range:
+            self.send_header("Content-Range", content_range)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._headers(200, len(self.server.payload))
+
+    def do_GET(self):
+        payload = self.server.payload
+        start, end = 0, len(payload) - 1
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") in (None, self.server.etag):
+            first, _, last = range_header.split("=", 1)[1].partition("-")
+            start, end = int(first), min(int(last or end), end)
+            self._headers(206, end - start + 1, f"bytes {start}-{end}/{len(payload)}")
+        else:
+            self._headers(200, len(payload))
+        body = payload[start:end + 1]
+
+        with self.server._lock:
+            self.server.ranges.append((start, end))
+            drop_after, self.server.drop_after = self.server.drop_after, None
+        if drop_after is not None:
+            self.wfile.write(body[:drop_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@unittest.skipIf(updater is None, "requests kurulu değil")
+class UpdateDownloadTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.payload = os.urandom(3 * 1024 * 1024 + 123)
+        self.sha256 = hashlib.sha256(self.payload).hexdigest()
+        self.server = _RangeServer(self.payload)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        for target, value in (
+            ("PARALLEL_MIN_SIZE", 1024 * 1024),
+            ("PARALLEL_MIN_SEGMENT", 256 * 1024),
+        ):
+            patcher = mock.patch.object(updater, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(updater.tempfile, "gettempdir", return_value=str(self.tmp))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parallel_segments_are_verified(self) -> None:
+        progress = []
+        ok, path, error = updater.download_update(
+            self.server.url, progress.append, sha256=self.sha256, size=len(self.payload), segments=4
+        )
+
+        self.assertTrue(ok, error)
+        self.assertEqual(Path(path).read_bytes(), self.payload)
+        self.assertEqual(len(self.server.ranges), 4)
+        self.assertEqual(progress[-1].downloaded, len(self.payload))
+        self.assertEqual(progress[-1].percent, 100)
+        self.assertFalse((self.tmp / "setup.exe.part").exists())
+
+    def test_dropped_connection_resumes(self) -> None:
+        self.server.drop_after = 500_000
+        ok, path, error = updater.download_update(self.server.url, sha256=self.sha256, segments=1)
+
+        self.assertTrue(ok, error)
+        self.assertEqual(Path(path).read_bytes(), self.payload)
+        # Kopmadan önce yazılan baytlar korunur; yalnızca kalan kısım yeniden istenir
+        first, resumed = self.server.ranges
+        self.assertEqual(first, (0, len(self.payload) - 1))
+        self.assertTrue(0 < resumed[0] <= 500_000)
+
+    def test_partial_file_from_previous_run_is_resumed(self) -> None:
+        partial = updater._PartialDownload(str(self.tmp / "setup.exe.part"))
+        partial.create(self.server.etag, len(self.payload), 1)
+        with open(partial.part_path, "r+b") as f:
+            f.write(self.payload[:1_000_000])
+        partial.advance(partial.segments[0], 1_000_000)
+        partial.save(force=True)
+
+        ok, path, error = updater.download_update(self.server.url, sha256=self.sha256)
+
+        self.assertTrue(ok, error)
+        self.assertEqual(Path(path).read_bytes(), self.payload)
+        self.assertEqual(self.server.ranges, [(1_000_000, len(self.payload) - 1)])
+
+    def test_fully_downloaded_part_is_verified_without_fetching(self) -> None:
+        # Önceki çalışma SHA-256 kontrolü ya da yeniden adlandırma sırasında kapanmış
+        partial = updater._PartialDownload(str(self.tmp / "setup.exe.part"))
+        partial.create(self.server.etag, len(self.payload), 4)
+        with open(partial.part_path, "r+b") as f:
+            f.write(self.payload)
+            for segment in partial.segments:
+                partial.advance(segment, segment[1] + 1 - segment[0], f)
+        partial.save(force=True)
+
+        ok, path, error = updater.download_update(self.server.url, sha256=self.sha256, segments=4)
+
+        self.assertTrue(ok, error)
+        self.assertEqual(Path(path).read_bytes(), self.payload)
+        self.assertEqual(self.server.ranges, [])
+        self.assertFalse((self.tmp / "setup.exe.part.json").exists())
+
+    def test_unexpected_error_discards_the_partial_download(self) -> None:
+        with mock.patch.object(updater, "_file_sha256", side_effect=OSError("okunamadı")):
+            ok, path, error = updater.download_update(self.server.url, sha256=self.sha256, segments=4)
+
+        self.assertFalse(ok)
+        self.assertIn("Beklenmeyen hata", error)
+        self.assertFalse((self.tmp / "setup.exe.part").exists())
+        self.assertFalse((self.tmp / "setup.exe.part.json").exists())
+
+        ok, path, error = updater.download_update(self.server.url, sha256=self.sha256, segments=4)
+        self.assertTrue(ok, error)
+        self.assertEqual(Path(path).read_bytes(), self.payload)
+
+    def test_changed_file_restarts_and_bad_checksum_fails(self) -> None:
+        partial = updater._PartialDownload(str(self.tmp / "setup.exe.part"))
+        partial.create('"v0"', len(self.payload), 1)
+        partial.advance(partial.segments[0], 1_000_000)
+        partial.save(force=True)
+
+        ok, path, error = updater.download_update(self.server.url, sha256="0" * 64, segments=1)
+
+        self.assertFalse(ok)
+        self.assertIn("SHA-256", error)
+        self.assertEqual(self.server.ranges, [(0, len(self.payload) - 1)])
+        self.assertFalse((self.tmp / "setup.exe.part").exists())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()